@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark: status badge render vs cache hit.
+
+Compares the cost of rendering a participant-count badge with Pillow against
+fetching it from BadgeRenderer's cache, which is what each monitor tick pays
+once the cache is warm.
+
+Usage: python benchmarks/bench_badge_cache.py [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from status_badge import BadgeRenderer, render_badge, count_bucket, badge_state, PILLOW_AVAILABLE
+
+
+def time_per_call(func, repeat):
+    """Return the mean seconds per call of func over repeat calls"""
+    start = time.perf_counter()
+    for i in range(repeat):
+        func(i)
+    return (time.perf_counter() - start) / repeat
+
+
+def collect():
+    """Return (name, setup, operations_per_call) for benchmarks/run.py"""
+    if not PILLOW_AVAILABLE:
+        return []
+
+    def render_setup():
+        return lambda: render_badge("12", badge_state(12, 5), 2)
+
+    def hit_setup():
+        renderer = BadgeRenderer()
+        renderer.prerender(5)
+        return lambda: renderer.badge_for(12, 5, 2)
+
+    return [("badge/render", render_setup, 1), ("badge/cache_hit", hit_setup, 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000, help="calls per measurement")
+    parser.add_argument("--threshold", type=int, default=5)
+    args = parser.parse_args()
+
+    if not PILLOW_AVAILABLE:
+        print("Pillow not installed. Install with: pip install pillow")
+        return 1
+
+    threshold = args.threshold
+    counts = list(range(0, 120))
+
+    def render(i):
+        count = counts[i % len(counts)]
+        render_badge(count_bucket(count), badge_state(count, threshold), 2)
+
+    renderer = BadgeRenderer()
+    warm_start = time.perf_counter()
+    renderer.prerender(threshold)
+    warm_time = time.perf_counter() - warm_start
+
+    def cached(i):
+        renderer.badge_for(counts[i % len(counts)], threshold, 2)
+
+    render_repeat = max(1, args.repeat // 10)
+    render_cost = time_per_call(render, render_repeat)
+    hit_cost = time_per_call(cached, args.repeat)
+
+    print(f"Render (cache miss): {render_cost * 1e6:10.1f} us/badge  ({render_repeat} calls)")
+    print(f"Cache hit:           {hit_cost * 1e6:10.3f} us/badge  ({args.repeat} calls)")
+    print(f"Speedup:             {render_cost / hit_cost:10.0f}x")
+    print(f"Prerender {renderer.stats()['entries']} badges: {warm_time * 1000:.1f} ms")
+    print(f"Cache stats: {renderer.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Detection benchmarks: title parsing, window filtering, full monitor ticks,
+Zoom log tailing, config load/save, logging overhead and metrics rendering,
+for both platform monitors.
+
+Runs headless against the fake platform modules on synthetic desktops of
+10 to 10,000 windows. Collected by benchmarks/run.py.
+"""
+
+import os
+import tempfile
+
+from fake_platform import AcceleratedClock, StaticWindowProvider, SyntheticZoomLog, load_monitor, synthetic_titles
+from leaver_core.metrics import render
+from leaver_core.parser import find_participant_count, is_zoom_window
+from leaver_core.zoom_log import InotifyWatcher, StatWatcher, ZoomLogSource
+
+SIZES = [10, 100, 1000, 10000]
+PLATFORMS = ["windows", "macos"]
+
+# Monitor ticks per measured call of the tick benchmark
+TICKS_PER_CALL = 20
+
+_tmp_dir = tempfile.TemporaryDirectory(prefix="zoom_bench_")
+
+
+def make_leaver(platform, titles, config=None):
+    """Build a monitor instance wired to a fixed synthetic desktop"""
+    clock = AcceleratedClock()
+    provider = StaticWindowProvider(clock, titles)
+    config_file = os.path.join(_tmp_dir.name, f"{platform}_config.json")
+    settings = {"participant_threshold": 5, "check_interval": 2, "log_activity": True}
+    settings.update(config or {})
+    leaver = load_monitor(platform, provider, clock, config_file, settings)
+    return leaver, clock, provider
+
+
+def _parse(platform, size):
+    def setup():
+        leaver, _, _ = make_leaver(platform, synthetic_titles(size))
+        return leaver.get_participant_count_from_windows
+    return setup
+
+
+def _filter(platform, size):
+    def setup():
+        leaver, _, _ = make_leaver(platform, synthetic_titles(size))
+        return leaver.find_zoom_windows
+    return setup
+
+
+def _is_zoom_window(size):
+    def setup():
+        leaver, _, _ = make_leaver("macos", synthetic_titles(size))
+        titles = synthetic_titles(size)
+        is_zoom_window = leaver._is_zoom_window
+
+        def run():
+            for title in titles:
+                is_zoom_window(title)
+        return run
+    return setup
+
+
+def _core_parse(size):
+    def setup():
+        # The shared hot path both platforms run after enumeration
+        titles = synthetic_titles(size)
+        return lambda: find_participant_count([t for t in titles if is_zoom_window(t)])
+    return setup
+
+
+def _tick(platform, size):
+    def setup():
+        # Threshold 0 never triggers a leave, so every tick is a full detection pass
+        leaver, clock, _ = make_leaver(platform, synthetic_titles(size), {"participant_threshold": 0})
+        interval = leaver.config["check_interval"]
+        state = {"ticks": 0}
+
+        def on_sleep(seconds):
+            if seconds == interval:
+                state["ticks"] += 1
+                if state["ticks"] >= TICKS_PER_CALL:
+                    leaver.running = False
+
+        clock.on_sleep = on_sleep
+
+        def run():
+            state["ticks"] = 0
+            leaver.monitor_meeting()
+        return run
+    return setup
+
+
+def _zoom_log(watcher_class, append):
+    def setup():
+        # A log that already holds a long meeting; each call reads at most one new line
+        directory = tempfile.mkdtemp(dir=_tmp_dir.name)
+        log = SyntheticZoomLog(directory)
+        log.start_meeting()
+        log.report_count()
+        for _ in range(200):
+            log.noise(20)
+            log.join()
+        source = ZoomLogSource(directory, watcher=watcher_class(directory))
+        source.participant_count()
+
+        if not append:
+            return source.participant_count
+
+        def run():
+            log.join()
+            source.participant_count()
+        return run
+    return setup
+
+
+def _config(action):
+    def setup():
+        leaver, _, _ = make_leaver("windows", [])
+        return leaver.load_config if action == "load" else leaver.save_config
+    return setup
+
+
+def _metrics_render():
+    def setup():
+        # A scrape of a monitor that has been ticking for a while
+        leaver, clock, _ = make_leaver("windows", synthetic_titles(100), {"participant_threshold": 0})
+        clock.on_sleep = lambda seconds: setattr(leaver, "running", clock.sleeps < TICKS_PER_CALL)
+        leaver.monitor_meeting()
+        return lambda: render(leaver.monitor)
+    return setup
+
+
+def _log(enabled):
+    def setup():
+        leaver, _, _ = make_leaver("windows", [], {"log_activity": enabled})
+        return lambda: leaver.log("Current participants: 12")
+    return setup
+
+
+def collect(sizes=None):
+    """Return (name, setup, operations_per_call) for every detection benchmark"""
+    sizes = sizes or SIZES
+    benchmarks = []
+    for platform in PLATFORMS:
+        for size in sizes:
+            benchmarks.append((f"parse/{platform}/n={size}", _parse(platform, size), 1))
+            benchmarks.append((f"filter/{platform}/n={size}", _filter(platform, size), 1))
+            benchmarks.append((f"tick/{platform}/n={size}", _tick(platform, size), TICKS_PER_CALL))
+    for size in sizes:
+        benchmarks.append((f"core/parse/n={size}", _core_parse(size), 1))
+        benchmarks.append((f"is_zoom_window/n={size}", _is_zoom_window(size), size))
+    for watcher_class in (InotifyWatcher, StatWatcher):
+        benchmarks.append((f"zoomlog/{watcher_class.name}/idle", _zoom_log(watcher_class, False), 1))
+        benchmarks.append((f"zoomlog/{watcher_class.name}/append", _zoom_log(watcher_class, True), 1))
+    benchmarks.append(("config/load", _config("load"), 1))
+    benchmarks.append(("config/save", _config("save"), 1))
+    benchmarks.append(("log/enabled", _log(True), 1))
+    benchmarks.append(("log/disabled", _log(False), 1))
+    benchmarks.append(("metrics/render", _metrics_render(), 1))
+    return benchmarks
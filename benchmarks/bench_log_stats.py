@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Check and time the monitor log analyzer (leaver_core/log_stats.py).
+
+Writes synthetic monitor logs (the monitor's own messages, plus menu noise
+between sessions) with known per-session truth. Then it analyzes them and
+checks every session's peak, ticks, leave attempts, failures, outcome and
+threshold-to-leave time. Throughput is compared with a plain chunked read
+of the same files, which is roughly as fast as they can be read at all.
+
+Usage:
+    python benchmarks/bench_log_stats.py --megabytes 200
+    python benchmarks/bench_log_stats.py --megabytes 1000 --files 4 --workers 4
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from leaver_core.log_stats import SessionBuilder, analyze_logs
+
+MENU = ("\nZoom Auto Leaver - Windows Version\n========================================\n"
+        "1. Start monitoring\n2. Configure settings\n3. Test detection\n4. Exit\n\nSelect option (1-4): 1\n")
+
+
+def stamp(seconds):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(seconds))
+
+
+def write_sessions(f, rng, start, target_bytes):
+    """Write sessions until about target_bytes; returns the truth rows"""
+    truth = []
+    now = start
+    while f.tell() < target_bytes:
+        interval = rng.choice((5, 10, 15))
+        threshold = rng.randint(1, 6)
+        peak = rng.randint(threshold + 2, 60)
+        ticks = rng.randint(20, 600)
+        stop_early = rng.random() < 0.1
+        fail = rng.random() < 0.2
+        f.write(MENU)
+        begin = now
+        lines = [f"[{stamp(now)}] Starting Zoom Auto Leaver (Windows)...",
+                 f"[{stamp(now)}] Participant threshold: {threshold}",
+                 f"[{stamp(now)}] Check interval: {interval} seconds",
+                 f"[{stamp(now)}] Looking for participant count in Zoom window titles..."]
+        session = {"peak": None, "ticks": 0, "attempts": 0, "failed": 0, "threshold_to_leave": None}
+        crossed = None
+        for tick in range(ticks):
+            if tick < ticks // 4:
+                count = threshold + 1 + (peak - threshold - 1) * (tick + 1) // (ticks // 4)
+            elif tick < ticks - 5:
+                # Now and then someone reconnects and the count dips to the threshold
+                count = threshold if rng.random() < 0.003 else max(threshold + 1, peak - rng.randint(0, 2))
+            else:
+                count = threshold - rng.randint(0, min(threshold - 1, 1)) if threshold > 1 else 1
+            if tick % 50 == 7:
+                lines.append(f"[{stamp(now)}] No Zoom windows found. Waiting...")
+                now += interval
+                continue
+            ts = stamp(now)
+            lines.append(f"[{ts}] Found participant count: {count} in window: Zoom Meeting - {count} participants")
+            lines.append(f"[{ts}] Current participants: {count}")
+            session["ticks"] += 1
+            session["peak"] = count if session["peak"] is None else max(session["peak"], count)
+            if count > threshold:
+                crossed = None
+            if count <= threshold and not stop_early:
+                crossed = crossed if crossed is not None else now
+                session["attempts"] += 1
+                lines.append(f"[{ts}] Participant count ({count}) reached threshold ({threshold})")
+                lines.append(f"[{ts}] Leaving Zoom meeting... Focusing on: Zoom Meeting")
+                if fail and session["failed"] == 0:
+                    session["failed"] += 1
+                    lines.append(f"[{ts}] Error leaving meeting: window vanished")
+                    lines.append(f"[{ts}] Failed to leave meeting. Will try again.")
+                else:
+                    now += 1
+                    lines.append(f"[{stamp(now)}] Successfully executed leave meeting sequence!")
+                    lines.append(f"[{stamp(now)}] Meeting left successfully. Stopping monitor.")
+                    session.update(outcome="left", threshold_to_leave=now - crossed)
+                    break
+            if stop_early and tick == ticks // 2:
+                lines.append(f"[{ts}] Monitoring stopped by user")
+                session["outcome"] = "stopped"
+                break
+            now += interval
+        else:
+            lines.append(f"[{stamp(now)}] Monitoring stopped by user")
+            session["outcome"] = "stopped"
+        session["duration"] = now - begin
+        f.write("\n".join(lines) + "\n")
+        truth.append(session)
+        now += rng.randint(600, 86400)
+    return truth
+
+
+def generate(directory, megabytes, files, seed=1):
+    """Write files of about megabytes in total (copies of one generated log); returns (paths, truth per file)"""
+    rng = random.Random(seed)
+    first = os.path.join(directory, "monitor_0.log")
+    with open(first, "w") as f:
+        truth = write_sessions(f, rng, 1777600000, megabytes * 1024 * 1024 // files)
+    paths = [first]
+    for i in range(1, files):
+        paths.append(os.path.join(directory, f"monitor_{i}.log"))
+        shutil.copyfile(first, paths[-1])
+    return paths, truth
+
+
+def check(rows, truth):
+    """Compare one file's rows with its truth; returns a list of mismatches"""
+    if len(rows) != len(truth):
+        return [f"{len(rows)} sessions found, {len(truth)} written"]
+    problems = []
+    for i, (row, expected) in enumerate(zip(rows, truth)):
+        for key, value in expected.items():
+            if row[key] != value:
+                problems.append(f"session {i}: {key} {row[key]!r} != {value!r}")
+    return problems
+
+
+def read_speed(paths, chunk_size=16 * 1024 * 1024):
+    """Seconds to read the files in chunks without parsing"""
+    start = time.perf_counter()
+    for path in paths:
+        with open(path, "rb") as f:
+            while f.read(chunk_size):
+                pass
+    return time.perf_counter() - start
+
+
+def collect():
+    """Return (name, setup, operations_per_call) for benchmarks/run.py"""
+    def feed_setup():
+        # About 1 MB of monitor log scanned per call
+        import io
+        buffer = io.StringIO()
+        write_sessions(buffer, random.Random(1), 1777600000, 1024 * 1024)
+        data = buffer.getvalue().encode()
+        return lambda: SessionBuilder("bench").feed(data)
+
+    return [("logstats/feed_1mb", feed_setup, 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and time the monitor log analyzer")
+    parser.add_argument("--megabytes", type=int, default=200, help="total size of the generated logs")
+    parser.add_argument("--files", type=int, default=1, help="number of log files")
+    parser.add_argument("--workers", type=int, default=1, help="processes to spread the files over")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="zoom_logstats_")
+    try:
+        start = time.perf_counter()
+        paths, truth = generate(directory, args.megabytes, args.files, args.seed)
+        size = sum(os.path.getsize(path) for path in paths) / 1024 / 1024
+        print(f"Generated {len(paths)} file(s), {size:.0f} MB, {len(truth)} sessions each "
+              f"in {time.perf_counter() - start:.1f}s")
+
+        read_seconds = read_speed(paths)
+        start = time.perf_counter()
+        rows = analyze_logs(paths, workers=args.workers)
+        seconds = time.perf_counter() - start
+        print(f"Plain read: {read_seconds:.2f}s ({size / read_seconds:.0f} MB/s)")
+        print(f"Analyzed:   {seconds:.2f}s ({size / seconds:.0f} MB/s, {args.workers} worker(s)), "
+              f"{len(rows)} sessions")
+
+        problems = []
+        for path in paths:
+            problems += check([row for row in rows if row["file"] == path], truth)
+        for problem in problems[:10]:
+            print(f"   {problem}")
+        print("✅ Log analyzer benchmark passed" if not problems else f"❌ {len(problems)} mismatch(es)")
+        return 0 if not problems else 1
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Span tracing (leaver_core/spans.py): check the trace a bad leave produces, and what tracing costs.
+
+For each platform monitor it runs a meeting below the threshold against
+the fake platform modules, with span_trace set and a leave that fails
+once. The failure must write the trace file. The file has to be valid
+Chrome trace-event JSON, include the tick, enumeration, decision and leave
+steps (sleeps and key presses among them), and spans on one thread must
+nest. Prints the failed leave's steps. Sleeps run on the accelerated
+clock, so they show up but take no real time.
+
+Then it times a span and a traced call with tracing off and on, and a
+monitor tick on a 100-window desktop without and with tracing.
+
+Usage:
+    python benchmarks/bench_spans.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from fake_platform import AcceleratedClock, StaticWindowProvider, load_monitor, synthetic_titles
+from leaver_core import spans
+
+# Spans every trace of a leave must have, per platform
+EXPECTED = {
+    "windows": {"tick", "enumerate", "parse", "decide", "leave", "leave_zoom_meeting", "pygetwindow.getAllWindows",
+                "activate", "sleep", "hotkey", "press"},
+    "macos": {"tick", "enumerate", "parse", "decide", "leave", "leave_zoom_meeting", "osascript",
+              "_get_zoom_window_titles_direct", "_method_applescript_direct_quit", "sleep", "press"},
+}
+
+_tmp_dir = tempfile.TemporaryDirectory(prefix="zoom_spans_")
+
+
+def make_leaver(platform, titles, config):
+    clock = AcceleratedClock()
+    provider = StaticWindowProvider(clock, titles)
+    config_file = os.path.join(_tmp_dir.name, f"{platform}_config.json")
+    settings = {"check_interval": 2, "log_activity": False}
+    settings.update(config)
+    return load_monitor(platform, provider, clock, config_file, settings), clock
+
+
+def nesting_problems(events):
+    """Spans on one thread must nest or not overlap at all"""
+    problems = []
+    by_thread = {}
+    for event in events:
+        if event["ph"] == "X":
+            by_thread.setdefault(event["tid"], []).append(event)
+    for thread_events in by_thread.values():
+        thread_events.sort(key=lambda e: (e["ts"], -e["dur"]))
+        open_ends = []
+        for event in thread_events:
+            end = event["ts"] + event["dur"]
+            while open_ends and open_ends[-1] <= event["ts"] + 1:  # 1 us for rounding
+                open_ends.pop()
+            if open_ends and end > open_ends[-1] + 1:
+                problems.append(f"{event['name']} overlaps the end of its parent")
+            open_ends.append(end)
+    return problems
+
+
+def check_leave_trace(platform):
+    """Run a leave that fails once; returns (problems, events of the failed leave)"""
+    path = os.path.join(_tmp_dir.name, f"{platform}_spans.json")
+    leaver, clock = make_leaver(platform, ["Zoom Meeting", "Participants (3)"],
+                                {"participant_threshold": 5, "span_trace": path, "span_slow_leave": 0})
+    adapter = leaver.monitor.adapter
+    leave = adapter.leave
+    attempts = []
+
+    def flaky_leave(windows=None):
+        attempts.append(1)
+        return leave(windows) and len(attempts) > 1
+    adapter.leave = flaky_leave
+    clock.on_sleep = lambda seconds: len(attempts) > 3 and setattr(leaver, "running", False)
+    leaver.monitor_meeting()
+    spans.install(None)
+
+    if not os.path.exists(path):
+        return ["the failed leave wrote no trace"], []
+    with open(path) as f:
+        document = json.load(f)
+    events = document["traceEvents"]
+    problems = []
+    if document["otherData"]["reason"] != "leave_failed":
+        problems.append(f"trace written for {document['otherData']['reason']!r}, expected 'leave_failed'")
+    missing = EXPECTED[platform] - {event["name"] for event in events}
+    if missing:
+        problems.append("missing spans: " + ", ".join(sorted(missing)))
+    problems += nesting_problems(events)
+    leaves = [e for e in events if e["name"] == "leave"]
+    if not leaves:
+        return problems + ["no leave span"], []
+    leave_span = leaves[-1]
+    steps = [e for e in events if e["ph"] == "X" and e is not leave_span and e["tid"] == leave_span["tid"]
+             and leave_span["ts"] <= e["ts"] <= leave_span["ts"] + leave_span["dur"]]
+    return problems, [leave_span] + sorted(steps, key=lambda e: e["ts"])
+
+
+def per_call(function, repeat=200000):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def span_costs():
+    """{case: seconds per call} for spans and traced calls with tracing off and on"""
+    span = spans.span
+
+    def with_span():
+        with span("tick"):
+            pass
+
+    class Adapter:
+        def plain(self):
+            pass
+
+        @spans.traced("traced")
+        def traced(self):
+            pass
+    adapter = Adapter()
+
+    costs = {"plain call": per_call(adapter.plain)}
+    spans.install(None)
+    costs["span, off"] = per_call(with_span)
+    costs["traced call, off"] = per_call(adapter.traced)
+    spans.install(spans.SpanTracer())
+    costs["span, on"] = per_call(with_span)
+    costs["traced call, on"] = per_call(adapter.traced)
+    spans.install(None)
+    return costs
+
+
+def tick_cost(platform, traced, ticks=200):
+    """Seconds per monitor tick on a 100-window desktop"""
+    config = {"participant_threshold": 0}
+    if traced:
+        config["span_trace"] = os.path.join(_tmp_dir.name, f"{platform}_tick_spans.json")
+    leaver, clock = make_leaver(platform, synthetic_titles(100), config)
+    interval = leaver.config["check_interval"]
+    state = {"ticks": 0}
+
+    def on_sleep(seconds):
+        if seconds == interval:
+            state["ticks"] += 1
+            if state["ticks"] >= ticks:
+                leaver.running = False
+    clock.on_sleep = on_sleep
+    start = time.perf_counter()
+    leaver.monitor_meeting()
+    seconds = (time.perf_counter() - start) / ticks
+    spans.install(None)
+    return seconds
+
+
+def collect():
+    """Return (name, setup, operations_per_call) for benchmarks/run.py"""
+    def span_setup(enabled):
+        def setup():
+            tracer = spans.SpanTracer() if enabled else None
+            span = spans.span
+
+            def run():
+                spans.install(tracer)  # Only while it runs, so other benchmarks stay untraced
+                with span("tick"):
+                    pass
+                spans.install(None)
+            return run
+        return setup
+
+    def traced_off_setup():
+        # A traced adapter method with tracing off, which should cost what a plain call does
+        class Adapter:
+            @spans.traced("traced")
+            def traced(self):
+                pass
+        spans.install(None)
+        return Adapter().traced
+
+    def events_setup():
+        # Formatting a full default-size buffer, as a dump does
+        tracer = spans.SpanTracer()
+        now = time.perf_counter()
+        for i in range(tracer.capacity):
+            tracer.record("tick", now, now + 0.001, {"count": i} if i % 2 else None)
+        return tracer.events
+
+    return [("spans/off", span_setup(False), 1), ("spans/on", span_setup(True), 1),
+            ("spans/traced_off", traced_off_setup, 1), ("spans/events16k", events_setup, 1)]
+
+
+def main():
+    ok = True
+    for platform in ("windows", "macos"):
+        problems, steps = check_leave_trace(platform)
+        print(f"{platform}: failed leave traced in {len(steps)} span(s)")
+        if steps:
+            origin = steps[0]["ts"]
+            for event in steps[:20]:
+                args = ", ".join(f"{k}={v}" for k, v in (event.get("args") or {}).items())
+                print(f"   +{(event['ts'] - origin) / 1000:8.3f} ms  {event['dur'] / 1000:8.3f} ms  "
+                      f"{event['name']}{f' ({args})' if args else ''}")
+        for problem in problems:
+            print(f"   ❌ {problem}")
+        ok = ok and not problems
+
+    print("Cost per call:")
+    for case, seconds in span_costs().items():
+        print(f"   {case:<18} {seconds * 1e9:8.0f} ns")
+    for platform in ("windows", "macos"):
+        off, on = tick_cost(platform, False), tick_cost(platform, True)
+        print(f"   {platform} tick      {off * 1e6:8.1f} us off, {on * 1e6:.1f} us on ({(on - off) * 1e6:+.1f} us)")
+    print("✅ Span traces check out" if ok else "❌ Span trace check failed")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Time the offline threshold sweep (leaver_core/sweep.py) at scale.
+
+Generates simulated meeting traces and evaluates the full grid of
+thresholds x check intervals x leave confirmations over them, reporting the
+time taken and the throughput in trace-settings per second. Fails if the run
+takes longer than --budget seconds. Needs NumPy.
+
+Usage:
+    python benchmarks/bench_sweep.py --traces 10000
+    python benchmarks/bench_sweep.py --traces 10000 --workers 4 --budget 10
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from leaver_core.sweep import evaluate_chunk, np, sweep, synthetic_traces
+
+THRESHOLDS = list(range(1, 41))
+INTERVALS = [2, 5, 10, 15, 30]
+CONFIRMATIONS = [1, 2, 3, 4, 5]
+
+
+def collect():
+    """Return (name, setup, operations_per_call) for benchmarks/run.py"""
+    if np is None:
+        return []
+
+    def chunk_setup():
+        # 100 traces x 1000 settings: operations are trace-settings
+        traces = synthetic_traces(100)
+        return lambda: evaluate_chunk(traces, THRESHOLDS, INTERVALS, CONFIRMATIONS)
+
+    return [("sweep/chunk100x1000", chunk_setup, 100 * 1000)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the offline threshold sweep at scale")
+    parser.add_argument("--traces", type=int, default=10000, help="simulated meetings to evaluate")
+    parser.add_argument("--workers", type=int, default=1, help="processes to spread the traces over")
+    parser.add_argument("--budget", type=float, default=15.0, help="seconds the sweep may take")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    if np is None:
+        print("NumPy not installed. Install with: pip install numpy")
+        return 1
+
+    start = time.perf_counter()
+    traces = synthetic_traces(args.traces, args.seed)
+    generated = time.perf_counter() - start
+    points = sum(len(trace) for trace in traces)
+    print(f"Generated {len(traces)} traces ({points / len(traces):.0f} counts each) in {generated:.2f}s")
+
+    result = sweep(traces, THRESHOLDS, INTERVALS, CONFIRMATIONS, workers=args.workers)
+    rows_start = time.perf_counter()
+    result.rows()
+    summarized = time.perf_counter() - rows_start
+    rate = len(traces) * result.settings / result.seconds
+    print(f"Swept {len(traces)} traces x {result.settings} settings in {result.seconds:.2f}s "
+          f"({rate / 1e6:.2f}M trace-settings/s, {args.workers} worker(s)); summary in {summarized * 1000:.0f} ms")
+    ok = result.seconds <= args.budget
+    print("✅ Sweep benchmark passed" if ok else f"❌ Sweep took longer than {args.budget:.0f}s")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Window records (leaver_core/records.py) against the dicts they replaced.
+
+Replays the macOS enumeration: every tick the AppleScript window list and
+the direct zoom.us query come back as fresh strings (as parsed from
+osascript output). The Zoom windows are then merged from both sources.
+The old code built a dict per window and checked each direct title against
+a list rebuilt per title. The new code uses cached WindowRecords and a set.
+Also compares one Windows-style record holding a window handle, which
+can't be cached.
+
+For each it reports time per tick, the memory blocks a tick's result holds
+(what the monitor keeps until the next tick replaces it), the transient
+peak of a tick (tracemalloc) and the size of one record. Last,
+it times the merge as the number of Zoom windows grows: quadratic for the
+list, linear for the set.
+
+Usage:
+    python benchmarks/bench_window_records.py
+    python benchmarks/bench_window_records.py --windows 200 --zoom 20
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from leaver_core.parser import is_zoom_window
+from leaver_core.records import WindowRecord, merge_windows, window_record
+
+
+class Handle:
+    """Stands in for a pygetwindow window (a new object every enumeration)"""
+
+    __slots__ = ("title",)
+
+    def __init__(self, title):
+        self.title = title
+
+
+def desktop(windows, zoom):
+    """osascript outputs (all windows, zoom.us windows) for a desktop"""
+    titles = [f"Document {i} - Editor" for i in range(windows - zoom)]
+    zoom_titles = ["Zoom Meeting", f"Participants ({zoom + 10})"] + [f"Zoom Chat {i}" for i in range(zoom - 2)]
+    # The direct query sees the Zoom windows plus a couple System Events missed
+    direct = zoom_titles + ["Zoom Meeting Controls", "Zoom Share Toolbar"]
+    return ", ".join(titles + zoom_titles), ", ".join(direct)
+
+
+def dict_tick(all_output, direct_output):
+    """The old MacOSAdapter.zoom_windows"""
+    zoom_windows = []
+    for title in all_output.split(", "):
+        if title and is_zoom_window(title):
+            zoom_windows.append({'title': title, 'method': 'applescript', 'window': None})
+    for title in direct_output.split(", "):
+        if title not in [w['title'] for w in zoom_windows]:
+            zoom_windows.append({'title': title, 'method': 'direct', 'window': None})
+    return zoom_windows
+
+
+def record_tick(all_output, direct_output):
+    """The current MacOSAdapter.zoom_windows"""
+    zoom_windows = [window_record(title, 'applescript')
+                    for title in all_output.split(", ") if title and is_zoom_window(title)]
+    direct = [window_record(title, 'direct') for title in direct_output.split(", ")]
+    return merge_windows(zoom_windows, direct)
+
+
+def measure(tick, args, repeat=2000):
+    """(us per tick, memory blocks held by a tick's result, transient peak bytes)"""
+    result = tick(*args)  # Warm the caches
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = tick(*args)
+    seconds = (time.perf_counter() - start) / repeat
+
+    # Keep 100 results alive so freelists don't hide what each one holds
+    del result
+    gc.collect()
+    before = sys.getallocatedblocks()
+    results = [tick(*args) for _ in range(100)]
+    held = (sys.getallocatedblocks() - before) / len(results)
+    del results
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    result = tick(*args)
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return seconds * 1e6, held, peak
+
+
+def scaling(zoom_counts):
+    """Merge time (us) of the list-based and set-based dedupe per Zoom window count"""
+    rows = []
+    for zoom in zoom_counts:
+        all_output, direct_output = desktop(zoom + 10, zoom)
+        rows.append((zoom, measure(dict_tick, (all_output, direct_output), 20)[0],
+                     measure(record_tick, (all_output, direct_output), 20)[0]))
+    return rows
+
+
+def collect():
+    """Return (name, setup, operations_per_call) for benchmarks/run.py"""
+    def merge_setup():
+        # One macOS enumeration of a 40-window desktop with 4 Zoom windows
+        outputs = desktop(40, 4)
+        return lambda: record_tick(*outputs)
+
+    def handle_setup():
+        # A record that holds a window handle, built fresh each time
+        handle = Handle("Zoom Meeting")
+        return lambda: window_record(handle.title, 'pygetwindow', handle)
+
+    return [("records/merge", merge_setup, 1), ("records/handle", handle_setup, 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Window records against the old dicts")
+    parser.add_argument("--windows", type=int, default=40, help="windows on the desktop")
+    parser.add_argument("--zoom", type=int, default=4, help="Zoom windows among them")
+    args = parser.parse_args()
+
+    outputs = desktop(args.windows, args.zoom)
+    old, new = dict_tick(*outputs), record_tick(*outputs)
+    same = [(w['title'], w['method']) for w in old] == [(w.title, w.method) for w in new]
+
+    print(f"macOS tick, {args.windows} windows, {args.zoom} Zoom windows (+2 seen only by the direct query):")
+    print(f"{'':<10} {'us/tick':>8} {'blocks held':>12} {'peak bytes':>11}")
+    for name, tick in (("dicts", dict_tick), ("records", record_tick)):
+        micros, held, peak = measure(tick, outputs)
+        print(f"{name:<10} {micros:>8.2f} {held:>12.1f} {peak:>11}")
+
+    handle = Handle("Zoom Meeting")
+    legacy = {'title': handle.title, 'method': 'pygetwindow', 'window': handle}
+    record = WindowRecord(handle.title, 'pygetwindow', handle)
+    print(f"One record with a window handle: dict {sys.getsizeof(legacy)} bytes, "
+          f"WindowRecord {sys.getsizeof(record)} bytes")
+
+    print("Merge time by Zoom window count (us):")
+    for zoom, list_us, set_us in scaling([10, 100, 1000]):
+        print(f"   {zoom:>5} windows: list {list_us:>10.1f}   set {set_us:>8.1f}")
+    print("✅ Records match the dict results" if same else "❌ Records differ from the dict results")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
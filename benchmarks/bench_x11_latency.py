@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark: X11 detection latency, property-change events vs polling.
+
+Runs the shared Monitor loop against a dummy Zoom window on a real X server
+(Xvfb works) and changes its "Participants (N)" title at random moments.
+Latency is the time from the title change to the first monitor tick that
+reports the new count, for:
+
+  events   X11WindowSource: wait() wakes on PropertyNotify
+  polling  the monitor_meeting loop: sleep(check_interval), then re-read titles
+
+Usage:
+    Xvfb :99 &
+    DISPLAY=:99 python3 benchmarks/bench_x11_latency.py [--changes 10] [--interval 1]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tools"))
+
+from leaver_core.monitor import Monitor
+from leaver_core.platforms.linux_x11 import X11WindowSource
+from x11_dummy_window import DummyZoomWindow, participants_title
+
+FIRST_COUNT = 100  # Counts only go up from here, so the threshold never triggers
+
+
+class PollingX11Source(X11WindowSource):
+    """The polling loop: fixed sleep, then a full round-trip title scan"""
+
+    def zoom_windows(self):
+        return self.poll_windows()
+
+    def wait(self, seconds):
+        time.sleep(seconds)
+        return False
+
+
+class TickRecorder:
+    """Duck-typed status bus that timestamps each reported count"""
+
+    def __init__(self):
+        self.ticks = []  # (monotonic time, participant count)
+
+    def publish(self, kind, participant_count=None, **fields):
+        if participant_count is not None:
+            self.ticks.append((time.monotonic(), participant_count))
+
+
+def measure(source_class, changes, interval, seed):
+    """Return the per-change detection latencies in seconds"""
+    rng = random.Random(seed)
+    window = DummyZoomWindow(participants_title(FIRST_COUNT))
+    source = source_class(log=lambda message: None)
+    config = {"participant_threshold": 1, "check_interval": interval, "log_activity": False}
+    recorder = TickRecorder()
+    monitor = Monitor(source, config, status_bus=recorder)
+    thread = threading.Thread(target=monitor.run, daemon=True)
+    thread.start()
+
+    changed_at = {}
+    try:
+        time.sleep(interval)  # let the loop settle on the first title
+        for count in range(FIRST_COUNT + 1, FIRST_COUNT + 1 + changes):
+            # A random phase relative to the loop, as real title changes are
+            time.sleep(interval * rng.uniform(0.5, 1.5))
+            changed_at[count] = time.monotonic()
+            window.set_title(participants_title(count))
+        time.sleep(interval * 2)
+    finally:
+        monitor.stop()
+        thread.join(interval * 3)
+        window.close()
+
+    latencies = []
+    for count, change_time in changed_at.items():
+        seen = [t for t, c in recorder.ticks if c == count and t >= change_time]
+        if seen:
+            latencies.append(seen[0] - change_time)
+    return latencies
+
+
+def summarize(name, latencies, changes):
+    ms = sorted(latency * 1000 for latency in latencies)
+    if not ms:
+        print(f"{name:8s} no changes detected")
+        return
+    p95 = ms[min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))]
+    print(f"{name:8s} mean {statistics.mean(ms):8.1f} ms   median {statistics.median(ms):8.1f} ms   "
+          f"p95 {p95:8.1f} ms   max {ms[-1]:8.1f} ms   ({len(ms)}/{changes} detected)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="X11 detection latency: events vs polling")
+    parser.add_argument("--changes", type=int, default=10, help="title changes per mode")
+    parser.add_argument("--interval", type=float, default=1.0, help="monitor check interval in seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if not os.environ.get("DISPLAY"):
+        print("DISPLAY is not set. Start Xvfb first, e.g.: Xvfb :99 & export DISPLAY=:99")
+        return 1
+
+    print(f"Check interval {args.interval:.2f}s, {args.changes} title changes per mode\n")
+    summarize("events", measure(X11WindowSource, args.changes, args.interval, args.seed), args.changes)
+    summarize("polling", measure(PollingX11Source, args.changes, args.interval, args.seed), args.changes)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Crash the monitor mid-meeting and check that the next run resumes.
+
+Runs the Windows (or macOS) monitor against the fake window provider and an
+accelerated clock. In each meeting the process "dies" at a random check:
+the checkpoint writer is abandoned without a final write, as after a kill.
+In some meetings Zoom "hangs" instead: leaves fail until the process dies
+a few checks later, so failed attempts are part of the resumed state. A new
+run then has to resume from the checkpoint file: same session start, peak,
+leave attempts and failures. The checkpoint must be gone once the meeting
+has been left.
+
+Also reports what checkpointing costs the tick (update() plus building the
+state), how many updates were coalesced into each write, and write times.
+
+Usage:
+    python benchmarks/checkpoint_sim.py --meetings 30
+    python benchmarks/checkpoint_sim.py --interval 0.05
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from fake_platform import AcceleratedClock, FakeWindowProvider, load_monitor
+from leaver_core.checkpoint import MonitorCheckpoint
+from leaver_core.config import DEFAULT_CONFIG
+from leaver_core.monitor import Monitor
+
+
+class Crash(BaseException):
+    """Stands in for the process dying (not caught by the monitor loop)"""
+
+
+def kill(checkpoint):
+    """Abandon the writer thread the way a killed process would: no final write"""
+    checkpoint._closed = True
+    checkpoint._stop.set()
+    checkpoint._wake.set()
+    checkpoint.close = lambda clear=False: None
+
+
+def simulate(platform, meetings, interval, threshold, seed=1):
+    """Run crash-and-resume on each meeting; returns (problems, stats)"""
+    rng = random.Random(seed)
+    clock = AcceleratedClock()
+    provider = FakeWindowProvider(clock, seed=seed, peak_range=(threshold + 4, 40))
+    directory = tempfile.mkdtemp(prefix="zoom_checkpoint_")
+    leaver = load_monitor(platform, provider, clock, os.path.join(directory, "config.json"),
+                          {"participant_threshold": threshold, "check_interval": 10, "prearm_seconds": 0,
+                           "checkpoint_file": "monitor_state.json", "checkpoint_interval": interval})
+    adapter = leaver.adapter
+    adapter_wait, adapter_leave = adapter.wait, adapter.leave
+    run = {"checks": 0, "crash_at": None, "hang": False, "deadline": None, "live": None}
+
+    def tick_wait(seconds):
+        run["checks"] += 1
+        adapter_wait(seconds)
+        time.sleep(0.001)  # A sliver of the real wait, in which the writer thread gets to run
+        if clock.time() > run["deadline"]:
+            leaver.running = False
+        if run["checks"] == run["crash_at"]:
+            monitor = leaver.monitor
+            kill(monitor.checkpoint)
+            run["live"] = monitor.checkpoint_state()
+            time.sleep(0.01)  # Let a write already in progress finish, as the OS would
+            raise Crash()
+
+    def flaky_leave(windows=None):
+        if run["hang"] and run["crash_at"] is not None:
+            run["crash_at"] = min(run["crash_at"], run["checks"] + 5)
+            return False
+        return adapter_leave(windows)
+
+    adapter.wait, adapter.leave = tick_wait, flaky_leave
+    problems = []
+    stats = {"resumed": 0, "with_failures": 0, "lagging": 0, "updates": 0, "writes": 0, "unchanged": 0,
+             "write_ms": []}
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for number in range(meetings):
+            clock.now = max(clock.now, provider.next_meeting_at)
+            provider.participant_count()  # Starts the next meeting
+            meeting = provider.meeting
+            clock.now = meeting.start + min(300.0, meeting.duration * 0.1)  # Join after the ramp
+            hang = rng.random() < 0.3
+            run.update(checks=0, crash_at=10 ** 9 if hang else rng.randint(3, 60), hang=hang, live=None,
+                       deadline=meeting.start + meeting.duration + 60)
+            try:
+                leaver.monitor_meeting()
+            except Crash:
+                pass
+            checkpoint = leaver.monitor.checkpoint
+            for key in ("updates", "writes", "unchanged"):
+                stats[key] += getattr(checkpoint, key)
+            if checkpoint.writes:
+                stats["write_ms"].append(checkpoint.write_seconds / checkpoint.writes * 1000)
+            if run["live"] is None:
+                continue  # Left (or the meeting ended) before the crash
+            try:
+                with open(checkpoint.path) as f:
+                    saved = json.load(f)["state"]
+            except Exception as e:
+                problems.append(f"meeting {number}: no checkpoint after the crash ({e})")
+                continue
+            if saved != run["live"]:
+                stats["lagging"] += 1  # The crash came before the newest state was written
+
+            run["crash_at"] = None
+            leaver.monitor_meeting()  # The restarted process
+            monitor = leaver.monitor
+            stats["resumed"] += 1
+            stats["with_failures"] += saved["failed_leaves"] > 0
+            if monitor.session_started != saved["started_at"]:
+                problems.append(f"meeting {number}: session restarted cold instead of resuming")
+            if monitor.failed_leaves < saved["failed_leaves"] or monitor.leave_attempts < saved["leave_attempts"]:
+                problems.append(f"meeting {number}: leave attempts lost across the restart")
+            if saved["peak"] is not None and (monitor.peak is None or monitor.peak < saved["peak"]):
+                problems.append(f"meeting {number}: peak {saved['peak']} lost across the restart")
+            if os.path.exists(checkpoint.path) or os.path.exists(monitor.checkpoint.path):
+                problems.append(f"meeting {number}: checkpoint left behind after a clean leave")
+    return problems, stats
+
+
+def collect():
+    """Return (name, setup, operations_per_call) for benchmarks/run.py"""
+    def update_setup():
+        # What a tick pays: build the state and hand it to the writer thread
+        config = dict(DEFAULT_CONFIG)
+        monitor = Monitor(None, config)
+        monitor.reset_session()
+        monitor.checkpoint = MonitorCheckpoint(os.path.join(tempfile.mkdtemp(prefix="zoom_checkpoint_"), "state.json"),
+                                               interval=3600)
+        return lambda: monitor.checkpoint.update(monitor.checkpoint_state())
+
+    def write_setup():
+        # One atomic write (temporary file, fsync, rename) of a changed state
+        checkpoint = MonitorCheckpoint(os.path.join(tempfile.mkdtemp(prefix="zoom_checkpoint_"), "state.json"))
+        peaks = iter(range(10 ** 9))
+
+        def run():
+            checkpoint._pending = {"peak": next(peaks), "meetings": [["id:81234567731", "active", 14]]}
+            checkpoint.flush()
+        return run
+
+    return [("checkpoint/update", update_setup, 1), ("checkpoint/write", write_setup, 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crash the monitor mid-meeting and check that it resumes")
+    parser.add_argument("--platform", choices=["windows", "macos"], default="windows")
+    parser.add_argument("--meetings", type=int, default=30)
+    parser.add_argument("--interval", type=float, default=0.005,
+                        help="checkpoint_interval in real seconds (the simulated clock runs much faster)")
+    parser.add_argument("--threshold", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    problems, stats = simulate(args.platform, args.meetings, args.interval, args.threshold, args.seed)
+    coalesced = stats["updates"] / max(stats["writes"], 1)
+    write_ms = sum(stats["write_ms"]) / len(stats["write_ms"]) if stats["write_ms"] else 0.0
+    print(f"Crashed and resumed {stats['resumed']} of {args.meetings} meetings, {stats['with_failures']} with "
+          f"failed leaves ({stats['lagging']} crashed before the newest state was written)")
+    print(f"Checkpoint: {stats['updates']} updates, {stats['writes']} writes ({coalesced:.0f} updates per write), "
+          f"{stats['unchanged']} skipped as unchanged, {write_ms:.2f} ms per write")
+    for problem in problems[:10]:
+        print(f"   {problem}")
+    ok = not problems and stats["resumed"] > 0 and stats["with_failures"] > 0
+    print("✅ Checkpoint simulation passed" if ok else "❌ Checkpoint simulation failed")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
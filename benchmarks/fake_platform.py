@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Fake platform layer for running the monitors headless on Linux.
+
+Provides stand-ins for pygetwindow, pyautogui, AppKit/Cocoa and the osascript
+calls made through subprocess, all backed by a simulated meeting schedule,
+plus an accelerated clock that turns ``time.sleep`` into a jump of virtual
+time. Used by the soak harness and the benchmarks; never imported by the app.
+"""
+
+import importlib
+import os
+import random
+import sys
+import threading
+import time
+import types
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+# Unrelated windows that are always open on a typical desktop
+BACKGROUND_TITLES = [
+    "Inbox - Outlook",
+    "Visual Studio Code",
+    "zoom_auto_leaver.py - Visual Studio Code",
+    "Slack | general",
+    "Google Chrome",
+    "Finder",
+    "Terminal — bash",
+    "Spotify Premium",
+    "Calendar",
+    "Zoom Installer",
+]
+
+
+class FakeWindow:
+    """Minimal pygetwindow.Window stand-in"""
+
+    __slots__ = ("title", "provider")
+
+    def __init__(self, title, provider=None):
+        self.title = title
+        self.provider = provider
+
+    def activate(self):
+        if self.provider is not None:
+            self.provider.focused = self.title
+
+
+class Meeting:
+    """One simulated meeting with a rise / plateau / drain participant curve"""
+
+    def __init__(self, start, duration, peak, meeting_id, rng):
+        self.start = start
+        self.duration = duration
+        self.peak = peak
+        self.meeting_id = meeting_id
+        self.noise = rng.random
+
+    def count_at(self, now):
+        """Participant count at virtual time now"""
+        elapsed = now - self.start
+        ramp = min(300.0, self.duration * 0.1)
+        drain = min(600.0, self.duration * 0.2)
+        if elapsed < ramp:
+            fraction = elapsed / ramp
+        elif elapsed > self.duration - drain:
+            fraction = max(0.0, (self.duration - elapsed) / drain)
+        else:
+            fraction = 1.0
+        jitter = 1 if self.noise() < 0.1 else 0
+        return max(1, int(round(self.peak * fraction)) + jitter)
+
+
+class FakeWindowProvider:
+    """Generates window titles for a schedule of back-to-back meetings"""
+
+    def __init__(self, clock, seed=1, background_windows=None, extra_windows=0,
+                 meeting_minutes=(20, 90), gap_minutes=(2, 20), peak_range=(4, 40)):
+        self.clock = clock
+        self.rng = random.Random(seed)
+        self.meeting_minutes = meeting_minutes
+        self.gap_minutes = gap_minutes
+        self.peak_range = peak_range
+        titles = list(BACKGROUND_TITLES if background_windows is None else background_windows)
+        titles += [f"Document {i} - Editor" for i in range(extra_windows)]
+        self.background = [FakeWindow(title, self) for title in titles]
+        self.meeting = None
+        self.next_meeting_at = clock.time()
+        self.meetings_started = 0
+        self.leaves = 0
+        self.focused = None
+        self.key_presses = 0
+        self._meeting_counter = 0
+        self._lock = threading.Lock()  # The macOS adapter queries its window sources on worker threads
+
+    def _advance(self):
+        """Start or end meetings according to the current virtual time"""
+        with self._lock:
+            self._advance_locked()
+
+    def _advance_locked(self):
+        now = self.clock.time()
+        if self.meeting is not None and now >= self.meeting.start + self.meeting.duration:
+            self._end_meeting()
+        if self.meeting is None and now >= self.next_meeting_at:
+            self._meeting_counter += 1
+            duration = self.rng.uniform(*self.meeting_minutes) * 60
+            peak = self.rng.randint(*self.peak_range)
+            meeting_id = f"{self.rng.randint(100, 999)} {self.rng.randint(1000, 9999)} {self.rng.randint(1000, 9999)}"
+            self.meeting = Meeting(now, duration, peak, meeting_id, self.rng)
+            self.meetings_started += 1
+
+    def _end_meeting(self):
+        self.meeting = None
+        self.next_meeting_at = self.clock.time() + self.rng.uniform(*self.gap_minutes) * 60
+
+    def participant_count(self):
+        """Current simulated participant count, or None outside meetings"""
+        self._advance()
+        return self.meeting.count_at(self.clock.time()) if self.meeting else None
+
+    def titles(self):
+        """Return every window title currently on screen"""
+        return [w.title for w in self.windows()]
+
+    def zoom_titles(self):
+        """Return only the titles owned by the Zoom process"""
+        count = self.participant_count()
+        if count is None:
+            return ["Zoom"]
+        return ["Zoom Meeting", f"Participants ({count})"]
+
+    def windows(self):
+        """Return FakeWindow objects for every window currently on screen"""
+        count = self.participant_count()
+        windows = list(self.background)
+        if count is None:
+            windows.append(FakeWindow("Zoom", self))
+        else:
+            windows.append(FakeWindow("Zoom Meeting", self))
+            windows.append(FakeWindow(f"Participants ({count})", self))
+        return windows
+
+    def zoom_running(self):
+        return True
+
+    def leave(self):
+        """Leave the current meeting (the monitor's leave sequence reached Zoom)"""
+        with self._lock:
+            if self.meeting is not None:
+                self.leaves += 1
+                self._end_meeting()
+
+
+# Title shapes used to build synthetic desktops of arbitrary size
+_APP_TITLES = [
+    "Inbox ({n}) - Outlook",
+    "Document {n} - Word",
+    "Untitled {n} - Google Chrome",
+    "main.py - project{n} - Visual Studio Code",
+    "Terminal — ssh host{n}",
+    "Slack | channel-{n}",
+    "Spreadsheet {n}.xlsx - Excel",
+    "Notes ({n})",
+]
+_ZOOM_TITLES = [
+    "Zoom",
+    "Zoom Meeting",
+    "Zoom - Chat",
+    "Meeting ID: 812 {n:04d} 7731 (3)",
+    "Zoom Workplace Update",
+]
+
+
+def synthetic_titles(count, seed=1, zoom_fraction=0.05, participants=12, include_participants=True):
+    """Return count window titles, mostly unrelated apps plus some Zoom windows
+
+    When include_participants is set the last title is "Participants (N)", so
+    parsing has to get past every other Zoom window first.
+    """
+    rng = random.Random(seed)
+    titles = []
+    for i in range(count - (1 if include_participants else 0)):
+        shapes = _ZOOM_TITLES if rng.random() < zoom_fraction else _APP_TITLES
+        titles.append(rng.choice(shapes).format(n=i))
+    if include_participants:
+        titles.append(f"Participants ({participants})")
+    return titles
+
+
+class StaticWindowProvider(FakeWindowProvider):
+    """Window provider that always shows the same fixed set of titles"""
+
+    def __init__(self, clock, titles):
+        super().__init__(clock, background_windows=[])
+        self._titles = list(titles)
+        self._windows = [FakeWindow(title, self) for title in self._titles]
+        self._zoom_titles = [t for t in self._titles if "zoom" in t.lower() or "participant" in t.lower()]
+
+    def participant_count(self):
+        return None
+
+    def titles(self):
+        return list(self._titles)
+
+    def zoom_titles(self):
+        return list(self._zoom_titles)
+
+    def windows(self):
+        return list(self._windows)
+
+    def leave(self):
+        self.leaves += 1
+
+
+# Unrelated client chatter between meeting events
+_LOG_NOISE = [
+    "[INFO] zWebService: heartbeat ok",
+    "[INFO] VideoSession: frame rate 30",
+    "[DEBUG] AudioDevice: input level -42dB",
+    "[INFO] ChatUI: message list refreshed",
+]
+
+
+class SyntheticZoomLog:
+    """Writes Zoom-client-style log lines to a file on disk
+
+    Produces the lines leaver_core.zoom_log understands (meeting status,
+    OnUserJoin / OnUserLeft, explicit participant counts) mixed with noise,
+    and can rotate the file by rename or by truncation.
+    """
+
+    def __init__(self, directory, name="zoom_meeting.log", seed=1):
+        self.directory = directory
+        self.path = os.path.join(directory, name)
+        self.rng = random.Random(seed)
+        self.count = None
+        self.line_number = 0
+        self.rotations = 0
+        open(self.path, "a").close()
+
+    def write(self, *messages, newline=True):
+        with open(self.path, "a") as f:
+            for message in messages:
+                self.line_number += 1
+                f.write(f"2024-05-01 10:00:{self.line_number % 60:02d} {message}")
+                if newline:
+                    f.write("\n")
+
+    def noise(self, lines=1):
+        self.write(*(self.rng.choice(_LOG_NOISE) for _ in range(lines)))
+
+    def start_meeting(self):
+        self.count = 1
+        self.write("[INFO] MeetingStatus: MEETING_STATUS_INMEETING")
+
+    def join(self, users=1):
+        self.count += users
+        self.write(f"[INFO] ConfUI: OnUserJoin users={users}" if users > 1 else "[INFO] ConfUI: OnUserJoin")
+
+    def leave(self, users=1):
+        self.count = max(1, self.count - users)
+        self.write(f"[INFO] ConfUI: OnUserLeft users={users}" if users > 1 else "[INFO] ConfUI: OnUserLeft")
+
+    def report_count(self):
+        self.write(f"[INFO] ParticipantList: participant count: {self.count}")
+
+    def end_meeting(self):
+        self.count = None
+        self.write("[INFO] MeetingStatus: MEETING_STATUS_ENDED")
+
+    def rotate(self, mode="rename"):
+        """Rotate like logrotate: rename to .1 (default) or copytruncate"""
+        if mode == "rename":
+            os.replace(self.path, self.path + ".1")
+            open(self.path, "w").close()
+        else:
+            with open(self.path, "w"):
+                pass
+        self.rotations += 1
+
+
+class AcceleratedClock:
+    """Virtual clock: sleep() advances virtual time instantly
+
+    ``time()`` returns virtual wall time; ``perf_counter()`` stays real so
+    latency measurements are unaffected. ``on_sleep`` is called after every
+    sleep with the requested duration, which lets a harness observe ticks.
+    """
+
+    def __init__(self, start=1_700_000_000.0):
+        self.now = start
+        self.on_sleep = None
+        self.sleeps = 0
+
+    # Defined before time() below, which shadows the module name in the class body
+    perf_counter = staticmethod(time.perf_counter)
+    monotonic = staticmethod(time.monotonic)
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        self.sleeps += 1
+        if self.on_sleep is not None:
+            self.on_sleep(seconds)
+
+    def time_module(self):
+        """Return a module-like object to substitute for ``time`` in a target module"""
+        proxy = types.SimpleNamespace()
+        for name in dir(time):
+            if not name.startswith("_"):
+                setattr(proxy, name, getattr(time, name))
+        proxy.time = self.time
+        proxy.sleep = self.sleep
+        return proxy
+
+
+class _CompletedProcess:
+    def __init__(self, stdout="", returncode=0):
+        self.stdout = stdout
+        self.stderr = ""
+        self.returncode = returncode
+
+
+class FakeSubprocess:
+    """Answers the osascript/pkill calls made by the macOS monitor"""
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.calls = 0
+        self.CalledProcessError = Exception
+        self.TimeoutExpired = Exception
+
+    def run(self, args, **kwargs):
+        self.calls += 1
+        script = args[2] if len(args) > 2 and args[0] == "osascript" else ""
+        if 'process "zoom.us"' in script and "zoomTitles" in script:
+            return _CompletedProcess(", ".join(self.provider.zoom_titles()))
+        if "set windowList" in script:
+            return _CompletedProcess(", ".join(self.provider.titles()))
+        if 'tell application "zoom.us"' in script and "quit" in script:
+            self.provider.leave()
+            return _CompletedProcess("")
+        if args and args[0] in ("pkill", "killall"):
+            self.provider.leave()
+            return _CompletedProcess("")
+        return _CompletedProcess("success")
+
+
+def _module(name, **attrs):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    return module
+
+
+class _Anything:
+    """Object that accepts any attribute access or call (AppKit leftovers)"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        return _Anything()
+
+    def __call__(self, *args, **kwargs):
+        return _Anything()
+
+
+class _FakeApp:
+    def __init__(self, name):
+        self._name = name
+
+    def localizedName(self):
+        return self._name
+
+    def isTerminated(self):
+        return False
+
+    def activateWithOptions_(self, options):
+        return True
+
+
+def install_fake_modules(provider):
+    """Register fake pygetwindow / pyautogui / AppKit / Cocoa modules in sys.modules"""
+
+    def hotkey(*keys):
+        provider.key_presses += 1
+        if keys in (("alt", "q"), ("cmd", "q"), ("cmd", "shift", "w")):
+            provider.leave()
+
+    def press(key):
+        provider.key_presses += 1
+
+    sys.modules["pygetwindow"] = _module("pygetwindow", getAllWindows=provider.windows)
+    sys.modules["pyautogui"] = _module("pyautogui", hotkey=hotkey, press=press, FAILSAFE=False)
+
+    workspace = types.SimpleNamespace(runningApplications=lambda: [_FakeApp("Finder"), _FakeApp("zoom.us")])
+    appkit = _module("AppKit",
+                     NSWorkspace=types.SimpleNamespace(sharedWorkspace=lambda: workspace),
+                     NSVariableStatusItemLength=-1,
+                     NSApplicationActivationPolicyAccessory=1,
+                     NSTerminateNow=1)
+    appkit.__getattr__ = lambda name: _Anything
+    objc = _module("objc", python_method=lambda func: func,
+                   super=lambda cls, obj: super(cls, obj))
+    cocoa = _module("Cocoa", NSObject=object, objc=objc,
+                    NSApplicationActivateIgnoringOtherApps=1)
+    cocoa.__getattr__ = lambda name: _Anything
+    sys.modules["AppKit"] = appkit
+    sys.modules["Cocoa"] = cocoa
+    sys.modules["objc"] = objc
+
+
+def load_monitor(platform, provider, clock, config_file, config=None):
+    """Import a monitor script against the fakes and return a configured instance
+
+    platform is "windows" (zoom_auto_leaver.ZoomAutoLeaver) or
+    "macos" (zoom_auto_leaver_macos.ZoomAutoLeaverMacOS). The platform adapter
+    and the script are (re)imported so they bind to this provider's fakes.
+    """
+    install_fake_modules(provider)
+    if platform == "windows":
+        adapter_name, module_name = "leaver_core.platforms.windows", "zoom_auto_leaver"
+    else:
+        adapter_name, module_name = "leaver_core.platforms.macos", "zoom_auto_leaver_macos"
+
+    for name in (adapter_name, module_name):
+        if name in sys.modules:
+            importlib.reload(sys.modules[name])
+        else:
+            importlib.import_module(name)
+    adapter_module = sys.modules[adapter_name]
+    module = sys.modules[module_name]
+
+    # Every module that sleeps or times the loop sees the accelerated clock
+    time_module = clock.time_module()
+    for name in ("leaver_core.monitor", "leaver_core.forecast", "leaver_core.platforms.base", adapter_name):
+        sys.modules[name].time = time_module
+    if platform == "macos":
+        adapter_module.subprocess = FakeSubprocess(provider)
+
+    cls = module.ZoomAutoLeaver if platform == "windows" else module.ZoomAutoLeaverMacOS
+    leaver = cls(config_file=config_file)
+    if config:
+        leaver.config.update(config)
+    return leaver
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Run a fleet collector and many heartbeat agents on one machine.
+
+Starts a collector on a free local port and simulates monitors on many room
+PCs, each with its own HeartbeatAgent sending over real HTTP. Then it checks
+that every host shows up in the fleet summary. A second run points the
+agents at a port nobody listens on. That shows publish() stays cheap for the
+monitor thread when the collector is down: rows are dropped, never waited on.
+Malformed batches (a string tick_ms or seq, a row that isn't a list) must be
+refused with 400 and leave /fleet answering for everyone else.
+
+Usage:
+    python benchmarks/fleet_sim.py --agents 40 --seconds 5
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from leaver_core.fleet import (FleetCollector, HeartbeatAgent, decode_batch, encode_batch,
+                               http_sender, make_collector_server)
+from leaver_core.status_bus import EVENT_LEAVING, EVENT_STARTED, EVENT_STOPPED, EVENT_TICK
+
+
+def free_port():
+    """A local port with nothing listening on it"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# Batches a broken or hostile agent might send; each must get a 400
+BAD_BATCHES = [
+    {"host": "bad-tick", "rows": [[1, 0.0, "tick", True, 5, 2, "fast", None]]},
+    {"host": "bad-seq", "rows": [["1", 0.0, "tick", True, 5, 2, 4.0, None]]},
+    {"host": "bad-row", "rows": ["not a row"]},
+    {"host": "bad-mix", "rows": [[1, 0.0, "tick", True, 5, 2, 4.0, None], [2, 0.0, "tick", True, 5, 2, True, None]]},
+]
+
+
+def post(url, batch):
+    """POST one uncompressed batch; returns the HTTP status"""
+    request = urllib.request.Request(url + "/heartbeat", data=json.dumps(batch).encode(), method="POST",
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=2) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def simulate(url, agents, seconds, tick_interval, send_interval, seed=1):
+    """Drive agents with synthetic meetings; returns (agents, publish latencies in seconds)"""
+    rng = random.Random(seed)
+    fleet = [HeartbeatAgent(http_sender(url, timeout=0.5), host=f"room-{i:03d}", interval=send_interval)
+             for i in range(agents)]
+    counts = [rng.randint(6, 40) for _ in fleet]
+    latencies = []
+    for agent in fleet:
+        agent.publish(EVENT_STARTED, threshold=5)
+
+    end = time.time() + seconds
+    while time.time() < end:
+        for i, agent in enumerate(fleet):
+            counts[i] = max(1, counts[i] + rng.choice((-2, -1, 0, 0, 1)))
+            start = time.perf_counter()
+            agent.publish(EVENT_TICK, participant_count=counts[i], threshold=5,
+                          tick_latency=rng.uniform(0.0002, 0.004))
+            if counts[i] <= 5:
+                agent.publish(EVENT_LEAVING, threshold=5)
+                counts[i] = rng.randint(6, 40)
+            latencies.append(time.perf_counter() - start)
+        time.sleep(tick_interval)
+
+    for agent in fleet:
+        agent.publish(EVENT_STOPPED)
+        agent.close()
+    return fleet, latencies
+
+
+def report(title, fleet, latencies):
+    totals = {key: sum(agent.stats()[key] for agent in fleet)
+              for key in ("sent_batches", "sent_rows", "sent_bytes", "failed_batches", "failed_rows", "dropped")}
+    ordered = sorted(latencies)
+    print(f"\n{title}")
+    print(f"  publish:  median {statistics.median(ordered) * 1e6:.1f} us, "
+          f"p99 {ordered[int(len(ordered) * 0.99) - 1] * 1e6:.1f} us, max {ordered[-1] * 1e6:.0f} us "
+          f"({len(ordered)} calls)")
+    print(f"  sent:     {totals['sent_rows']} rows in {totals['sent_batches']} batches, "
+          f"{totals['sent_bytes'] / max(1, totals['sent_rows']):.1f} bytes/row")
+    print(f"  dropped:  {totals['failed_rows']} rows in failed batches, {totals['dropped']} from full queues")
+    return totals
+
+
+def collect():
+    """Return (name, setup, operations_per_call) for benchmarks/run.py"""
+    rows = [[i, 1700000000.0 + i, EVENT_TICK, True, 12, 5, 1.25, None] for i in range(50)]
+
+    def publish_setup():
+        agent = HeartbeatAgent(lambda body: None, host="bench", interval=3600)
+        return lambda: agent.publish(EVENT_TICK, participant_count=12, threshold=5, tick_latency=0.001)
+
+    def encode_setup():
+        return lambda: encode_batch("bench", rows)
+
+    def ingest_setup():
+        collector = FleetCollector()
+        _, heartbeats = decode_batch(encode_batch("bench", rows))
+        return lambda: collector.ingest("bench", heartbeats)
+
+    return [("fleet/publish", publish_setup, 1), ("fleet/encode_batch50", encode_setup, 1),
+            ("fleet/ingest_batch50", ingest_setup, 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a fleet of heartbeat agents against a local collector")
+    parser.add_argument("--agents", type=int, default=40, help="simulated room PCs")
+    parser.add_argument("--seconds", type=float, default=5.0, help="how long each run lasts")
+    parser.add_argument("--tick", type=float, default=0.05, help="seconds between simulated monitor ticks")
+    parser.add_argument("--send-interval", type=float, default=0.5, help="seconds between heartbeat batches")
+    args = parser.parse_args()
+
+    collector = FleetCollector()
+    server = make_collector_server(collector, "127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = "http://127.0.0.1:%d" % server.server_address[1]
+    print(f"Collector on {url}, {args.agents} agents, {args.seconds:.0f}s per run")
+
+    fleet, latencies = simulate(url, args.agents, args.seconds, args.tick, args.send_interval)
+    totals = report("Collector up", fleet, latencies)
+    accepted = [batch["host"] for batch in BAD_BATCHES if post(url, batch) != 400]
+    with urllib.request.urlopen(url + "/fleet", timeout=2) as response:
+        summary = json.loads(response.read())
+    server.shutdown()
+    server.server_close()
+    missing = {agent.host for agent in fleet} - {host["host"] for host in summary["fleet"]}
+    print(f"  fleet:    {summary['hosts']} hosts, {summary['batches']} batches received, "
+          f"{sum(host['missed'] for host in summary['fleet'])} heartbeats missed, {len(missing)} hosts missing")
+    stored = {batch["host"] for batch in BAD_BATCHES} & {host["host"] for host in summary["fleet"]}
+    print(f"  bad:      {summary['rejected']} of {len(BAD_BATCHES)} malformed batches refused"
+          + (f", accepted from {', '.join(accepted)}" if accepted else "")
+          + (f", stored for {', '.join(sorted(stored))}" if stored else ""))
+
+    down_url = f"http://127.0.0.1:{free_port()}"
+    down_fleet, down_latencies = simulate(down_url, args.agents, args.seconds, args.tick, args.send_interval)
+    report("Collector down", down_fleet, down_latencies)
+
+    ok = not missing and totals["failed_batches"] == 0 and not accepted and not stored
+    print("\n✅ Fleet simulation passed" if ok else "\n❌ Fleet simulation failed")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
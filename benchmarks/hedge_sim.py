@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Hedged window detection (leaver_core/sources.py) with fake, delayed sources.
+
+Two fake sources stand in for the macOS queries. "applescript" is slow
+and now and then reports the previous count, because a slow query reads
+the title before the count changes. "direct" is fast. Both stall now and
+then, and direct sometimes fails. Every tick's delays, stalls and stale
+answers are drawn up front from --seed. The same ticks then run serially,
+as before (applescript, then direct, merged), and through a
+SourceOrchestrator, --interval apart. The orchestrator asks direct first
+and applescript too once direct fails or takes longer than HEDGE_MS.
+
+Per mode it reports tick latency and how often the tick's count was the
+true one, missing (the monitor waits for the next check) or wrong (a stale
+count). For the orchestrator it also reports each source's win rate,
+latency, late and failed answers, the ticks that asked both sources and
+the ticks where the two disagreed.
+It checks that hedging is faster at the median and p99, gives no more
+wrong counts, that every tick returned within the timeout, and that a
+stalled source never started a second call (worker threads stay one per
+source). When a source stalls past the timeout, a hedged tick may find no
+count where the serial one would have waited for it.
+
+Delays are in milliseconds at real speed, divided by --speed.
+
+Usage:
+    python benchmarks/hedge_sim.py --ticks 300
+    python benchmarks/hedge_sim.py --stall 0.2 --speed 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from leaver_core.records import merge_windows, window_record
+from leaver_core.sources import DetectionSource, SourceOrchestrator, answer_count
+
+# (name, median ms, confidence, stale fraction, failure fraction) of the fake sources
+SOURCES = (("direct", 80, 0.9, 0.0, 0.02), ("applescript", 250, 0.7, 0.1, 0.0))
+STALL_MS = 2000   # how long a stalled call takes
+TIMEOUT_MS = 1000
+GRACE_MS = 150
+HEDGE_MS = 300
+
+
+class FakeSource:
+    """A window source that replays planned delays and answers"""
+
+    def __init__(self, name, speed):
+        self.name = name
+        self.speed = speed
+        self.plan = (0.0, [], False)  # (delay ms, titles, fail) of the next call
+
+    def fetch(self):
+        delay, titles, fail = self.plan
+        time.sleep(delay / 1000 / self.speed)
+        if fail:
+            raise RuntimeError("osascript failed")
+        return [window_record(title, self.name) for title in titles]
+
+
+def plan_ticks(ticks, stall, seed):
+    """[(true count, {source name: (delay ms, titles, fail)})] for every tick"""
+    rng = random.Random(seed)
+    plans = []
+    count = 40
+    for _ in range(ticks):
+        previous = count
+        count = max(1, count + rng.choice((-1, 0, 0, 1)))
+        plan = {}
+        for name, median, _, stale, failure in SOURCES:
+            delay = STALL_MS if rng.random() < stall else median * rng.lognormvariate(0, 0.3)
+            seen = previous if rng.random() < stale else count
+            plan[name] = (delay, ["Zoom Meeting", f"Participants ({seen})"], rng.random() < failure)
+        plans.append((count, plan))
+    return plans
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0
+
+
+def grade(found, count):
+    """"correct", "missing" (no count: the monitor waits) or "wrong" (a stale count)"""
+    if found is None:
+        return "missing"
+    return "correct" if found == count else "wrong"
+
+
+def run_serial(plans, speed, interval):
+    """The old order: applescript, then direct, merged; returns (latencies, grades)"""
+    fakes = {name: FakeSource(name, speed) for name, *_ in SOURCES}
+    latencies, results = [], []
+    for count, plan in plans:
+        start = time.perf_counter()
+        found = []
+        for name in ("applescript", "direct"):
+            fakes[name].plan = plan[name]
+            try:
+                found.append(fakes[name].fetch())
+            except Exception:
+                found.append([])
+        windows = merge_windows(*found)
+        latencies.append(time.perf_counter() - start)
+        results.append(grade(answer_count(windows), count))
+        time.sleep(interval / 1000 / speed)
+    return latencies, results
+
+
+def run_hedged(plans, speed, interval):
+    """Through a SourceOrchestrator; returns (latencies, grades, orchestrator, most threads)"""
+    fakes = {name: FakeSource(name, speed) for name, *_ in SOURCES}
+    orchestrator = SourceOrchestrator([DetectionSource(name, fakes[name].fetch, confidence)
+                                       for name, _, confidence, *_ in SOURCES],
+                                      timeout=TIMEOUT_MS / 1000 / speed, grace=GRACE_MS / 1000 / speed,
+                                      hedge_after=HEDGE_MS / 1000 / speed, log=lambda message: None)
+    latencies, results, threads = [], [], 0
+    for count, plan in plans:
+        for name, fake in fakes.items():
+            fake.plan = plan[name]  # A call still running from an earlier tick keeps its own plan
+        start = time.perf_counter()
+        windows = orchestrator.query()
+        latencies.append(time.perf_counter() - start)
+        results.append(grade(answer_count(windows), count))
+        threads = max(threads, threading.active_count())
+        time.sleep(interval / 1000 / speed)
+    orchestrator.close()
+    return latencies, results, orchestrator, threads
+
+
+def collect():
+    """Return (name, setup, operations_per_call) for benchmarks/run.py"""
+    def query_setup():
+        # Orchestration cost of one tick: two sources that answer at once
+        records = [window_record("Zoom Meeting", "direct"), window_record("Participants (14)", "direct")]
+        orchestrator = SourceOrchestrator([DetectionSource("direct", lambda: records, 0.9),
+                                           DetectionSource("applescript", lambda: records, 0.7)])
+        return orchestrator.query
+
+    def fuse_setup():
+        # Fusing two answers that disagree on the count
+        orchestrator = SourceOrchestrator([DetectionSource("direct", list, 0.9), DetectionSource("applescript", list, 0.7)])
+        direct, applescript = orchestrator.sources
+        answers = [
+            (1, applescript, [window_record("Zoom Meeting", "applescript"),
+                              window_record("Participants (15)", "applescript"),
+                              window_record("Zoom Chat", "applescript")], 15, False),
+            (1, direct, [window_record("Zoom Meeting", "direct"), window_record("Participants (14)", "direct")],
+             14, False),
+        ]
+        from leaver_core.sources import Answer
+        answers = [Answer(*answer) for answer in answers]
+        return lambda: orchestrator.fuse(answers)
+
+    return [("hedge/query", query_setup, 1), ("hedge/fuse", fuse_setup, 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hedged window detection with fake delayed sources")
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--stall", type=float, default=0.05, help="fraction of calls that stall")
+    parser.add_argument("--interval", type=float, default=1000, help="ms between ticks (the pre-armed check rate)")
+    parser.add_argument("--speed", type=float, default=10, help="divide every delay by this")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    plans = plan_ticks(args.ticks, args.stall, args.seed)
+    serial, serial_grades = run_serial(plans, args.speed, args.interval)
+    baseline_threads = threading.active_count()
+    hedged, hedged_grades, orchestrator, threads = run_hedged(plans, args.speed, args.interval)
+
+    scale = args.speed * 1000  # Report in real-speed milliseconds
+    print(f"{args.ticks} ticks, {args.stall:.0%} of calls stalling {STALL_MS} ms (delays shown at real speed):")
+    print(f"{'':<8} {'median ms':>10} {'p99 ms':>8} {'max ms':>8} {'correct':>8} {'missing':>8} {'wrong':>6}")
+    for name, latencies, grades in (("serial", serial, serial_grades), ("hedged", hedged, hedged_grades)):
+        print(f"{name:<8} {percentile(latencies, 0.5) * scale:>10.0f} {percentile(latencies, 0.99) * scale:>8.0f} "
+              f"{max(latencies) * scale:>8.0f} {grades.count('correct') / len(plans):>8.1%} "
+              f"{grades.count('missing'):>8} {grades.count('wrong'):>6}")
+    stats = orchestrator.stats()
+    for name, *_ in SOURCES:
+        source = stats[name]
+        median = source["latency_median"] or 0
+        print(f"   {name:<12} won {source['win_rate']:>6.1%} of {source['calls']} calls, "
+              f"median {median * scale:.0f} ms, {source['late']} late, {source['failures']} failed")
+    print(f"   {stats['hedges']} tick(s) asked both sources, "
+          f"{stats['disagreements']} where the sources disagreed on the count")
+
+    problems = []
+    if percentile(hedged, 0.5) >= percentile(serial, 0.5) or percentile(hedged, 0.99) >= percentile(serial, 0.99):
+        problems.append("hedged ticks were not faster than serial ones")
+    if hedged_grades.count("wrong") > serial_grades.count("wrong"):
+        problems.append(f"hedged ticks reported a stale count more often "
+                        f"({hedged_grades.count('wrong')} vs {serial_grades.count('wrong')})")
+    limit = (TIMEOUT_MS / 1000 + 0.05) / args.speed
+    if max(hedged) > limit:
+        problems.append(f"a hedged tick took {max(hedged) * scale:.0f} ms, past the {TIMEOUT_MS} ms timeout")
+    if threads > baseline_threads + len(SOURCES):
+        problems.append(f"{threads - baseline_threads} worker threads for {len(SOURCES)} sources")
+    for problem in problems:
+        print(f"   {problem}")
+    print("✅ Hedge simulation passed" if not problems else "❌ Hedge simulation failed")
+    return 0 if not problems else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
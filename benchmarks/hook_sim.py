@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Exercise event hooks against local HTTP stand-ins, including broken ones.
+
+Starts stand-in webhook receivers on free local ports: one that answers
+right away, one that is slow, one that hangs past the hook timeout and one
+that always fails. Then it emits a burst of hook events the way the monitor
+does. It checks that emit() stays cheap, that the healthy receivers get
+every event, and that the hanging and failing ones only cost their own
+drops and failures.
+
+Then it runs a monitor (fake Windows platform) into a meeting below the
+threshold, with a script hook. The monitor leaves on its first check and
+returns; the hook's "leaving" and "left" events must have been delivered
+by then, as the process would exit right after. A second monitor leaves
+with a webhook that hangs: it must return within hook_drain_seconds.
+
+Usage:
+    python benchmarks/hook_sim.py --events 200
+    python benchmarks/hook_sim.py --serve 9000     # just run a recording stand-in
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from fake_platform import AcceleratedClock, StaticWindowProvider, load_monitor
+from leaver_core.hooks import HOOK_THRESHOLD_NEAR, Hook, HookDispatcher, WebhookHook, create_hook_dispatcher
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        server = self.server
+        if server.delay:
+            time.sleep(server.delay)
+        status = 500 if server.fail else 200
+        if not server.fail:
+            with server.lock:
+                server.events.append(json.loads(body))
+            if server.verbose:
+                print(f"   {body.decode()}")
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class StandIn(ThreadingHTTPServer):
+    """Local webhook receiver that records events, optionally slow or failing"""
+
+    daemon_threads = True
+
+    def __init__(self, port=0, delay=0.0, fail=False, verbose=False):
+        super().__init__(("127.0.0.1", port), StandInHandler)
+        self.delay = delay
+        self.fail = fail
+        self.verbose = verbose
+        self.events = []
+        self.lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:%d/hook" % self.server_address[1]
+
+
+class NullHook(Hook):
+    """Accepts every event instantly"""
+
+    kind = "null"
+
+    def deliver(self, payload):
+        pass
+
+
+def check_leave_hooks():
+    """Events a script hook got by the time a monitor that left its meeting returned"""
+    with tempfile.TemporaryDirectory(prefix="zoom_hooks_") as directory:
+        output = os.path.join(directory, "events.jsonl")
+        clock = AcceleratedClock()
+        provider = StaticWindowProvider(clock, ["Zoom Meeting", "Participants (2)"])
+        leaver = load_monitor("windows", provider, clock, os.path.join(directory, "config.json"), {
+            "participant_threshold": 5, "log_activity": False,
+            "hooks": [{"type": "script", "events": ["leaving", "left"], "command": [
+                sys.executable, "-c", f"import sys; open({output!r}, 'a').write(sys.stdin.read() + chr(10))"]}]})
+        # The front end built its hooks before the config above was applied
+        leaver.monitor.hooks = create_hook_dispatcher(leaver.config)
+        clock.on_sleep = lambda seconds: clock.sleeps > 20 and setattr(leaver, "running", False)
+        leaver.monitor_meeting()
+        if not os.path.exists(output):
+            return []
+        with open(output) as f:
+            return [json.loads(line)["event"] for line in f if line.strip()]
+
+
+def time_hung_exit(url, drain):
+    """Seconds a monitor takes to return after leaving, with a webhook that never answers in time"""
+    with tempfile.TemporaryDirectory(prefix="zoom_hooks_") as directory:
+        clock = AcceleratedClock()
+        provider = StaticWindowProvider(clock, ["Zoom Meeting", "Participants (2)"])
+        leaver = load_monitor("windows", provider, clock, os.path.join(directory, "config.json"), {
+            "participant_threshold": 5, "log_activity": False, "hook_drain_seconds": drain,
+            "hooks": [{"type": "webhook", "url": url, "events": ["leaving", "left"], "timeout": 30}]})
+        leaver.monitor.hooks = create_hook_dispatcher(leaver.config)
+        clock.on_sleep = lambda seconds: clock.sleeps > 20 and setattr(leaver, "running", False)
+        start = time.perf_counter()
+        leaver.monitor_meeting()
+        return time.perf_counter() - start
+
+
+def collect():
+    """Return (name, setup, operations_per_call) for benchmarks/run.py"""
+    def emit_setup():
+        # Monitor-side cost of one event, with a worker draining it concurrently
+        dispatcher = HookDispatcher([NullHook()])
+        return lambda: dispatcher.emit(HOOK_THRESHOLD_NEAR, count=7, threshold=5, meeting="main meeting")
+
+    return [("hooks/emit", emit_setup, 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exercise event hooks against local HTTP stand-ins")
+    parser.add_argument("--events", type=int, default=200, help="events to emit")
+    parser.add_argument("--rate", type=float, default=200.0, help="events per second")
+    parser.add_argument("--timeout", type=float, default=0.5, help="hook timeout in seconds")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="only run a recording stand-in on this port")
+    args = parser.parse_args()
+
+    if args.serve is not None:
+        server = StandIn(args.serve, verbose=True)
+        print(f"🪝 Stand-in webhook on {server.url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            return 0
+
+    stand_ins = {
+        "fast": StandIn(),
+        "slow": StandIn(delay=0.5 / args.rate),  # Slow, but keeps up with the event rate
+        "hanging": StandIn(delay=args.timeout * 20),
+        "failing": StandIn(fail=True),
+    }
+    hooks = [WebhookHook(server.url, name=name, timeout=args.timeout, retries=1)
+             for name, server in stand_ins.items()]
+    dispatcher = HookDispatcher(hooks, queue_size=32)
+
+    latencies = []
+    for number in range(args.events):
+        start = time.perf_counter()
+        dispatcher.emit(HOOK_THRESHOLD_NEAR, count=number, threshold=5, meeting="main meeting")
+        latencies.append(time.perf_counter() - start)
+        time.sleep(1 / args.rate)
+    dispatcher.close(timeout=args.timeout * 4)
+
+    ordered = sorted(latencies)
+    print(f"emit(): median {statistics.median(ordered) * 1e6:.1f} us, "
+          f"p99 {ordered[int(len(ordered) * 0.99) - 1] * 1e6:.1f} us, max {ordered[-1] * 1e6:.0f} us")
+    print(f"{'hook':10} {'received':>9} {'delivered':>10} {'failed':>7} {'dropped':>8} {'mean ms':>8} {'max ms':>8}")
+    stats = dispatcher.stats()
+    for name, server in stand_ins.items():
+        hook = stats[name]
+        print(f"{name:10} {len(server.events):9d} {hook['delivered']:10d} {hook['failed']:7d} {hook['dropped']:8d} "
+              f"{hook['mean_ms'] if hook['mean_ms'] is not None else '-':>8} {hook['max_ms']:8}")
+
+    delivered = check_leave_hooks()
+    print(f"Script hook events delivered when the monitor returned after leaving: {', '.join(delivered) or 'none'}")
+    drain = 1.0
+    exit_seconds = time_hung_exit(stand_ins["hanging"].url, drain)
+    print(f"Monitor returned {exit_seconds:.2f}s after leaving with a hanging webhook (hook_drain_seconds {drain:g})")
+
+    ok = (len(stand_ins["fast"].events) == args.events and len(stand_ins["slow"].events) == args.events
+          and ordered[-1] < 0.05 and delivered == ["leaving", "left"] and exit_seconds < drain + 0.5)
+    print("\n✅ Hook simulation passed" if ok else "\n❌ Hook simulation failed")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
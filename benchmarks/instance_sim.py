@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Run several monitor processes on one config and check the leader election.
+
+Starts --processes monitors sharing one config directory, each with a fake
+adapter whose participant count comes from a file the harness controls.
+Every window enumeration is appended to a shared file, tagged with the
+process id, so the harness can tell who sampled when. Then it:
+
+    1. checks that only the leader samples
+    2. kills the leader (SIGKILL) --kills times and times how long it takes
+       a follower to start sampling; each new leader has to resume the
+       dead one's session from the checkpoint
+    3. drops the count to the threshold and checks that exactly one process
+       leaves and that every remaining process stops
+
+Last, in this process, /healthz has to call a follower healthy, say it is
+following, and call it the leader once it has taken over.
+
+Linux and macOS only (it kills with SIGKILL).
+
+Usage:
+    python benchmarks/instance_sim.py --processes 4 --kills 2
+    python benchmarks/instance_sim.py --poll 0.2
+"""
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from leaver_core.config import DEFAULT_CONFIG, LeaverConfig
+from leaver_core.instance import InstanceLock
+from leaver_core.metrics import health
+from leaver_core.monitor import Monitor
+from leaver_core.platforms.base import PlatformAdapter, window_record
+
+
+class FileAdapter(PlatformAdapter):
+    """Reads the count from a file the harness writes; logs samples and leaves"""
+
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+
+    def zoom_windows(self):
+        with open(os.path.join(self.directory, "count")) as f:
+            count = int(f.read() or 0)
+        with open(os.path.join(self.directory, "samples"), "a") as f:
+            f.write(f"{os.getpid()} {time.time():.4f}\n")
+        return [window_record("Zoom Meeting", "sim"), window_record(f"Participants ({count})", "sim")]
+
+    def leave(self, windows=None):
+        with open(os.path.join(self.directory, "leaves"), "a") as f:
+            f.write(f"{os.getpid()}\n")
+        return True
+
+
+def child(directory):
+    """One monitor process"""
+    config = LeaverConfig(os.path.join(directory, "config.json"))
+    config.load()
+    Monitor(FileAdapter(directory), config).run()
+    return 0
+
+
+def read_samples(directory):
+    """[(pid, time)] of every enumeration so far"""
+    try:
+        with open(os.path.join(directory, "samples")) as f:
+            return [(int(pid), float(at)) for pid, at in (line.split() for line in f if line.count(" ") == 1)]
+    except FileNotFoundError:
+        return []
+
+
+def wait_for(condition, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def simulate(processes, kills, interval, poll, threshold=2):
+    """Run the scenario; returns (problems, failover seconds per kill)"""
+    directory = tempfile.mkdtemp(prefix="zoom_instance_")
+    with open(os.path.join(directory, "config.json"), "w") as f:
+        json.dump({"participant_threshold": threshold, "check_interval": interval, "instance_poll": poll,
+                   "prearm_seconds": 0, "instance_lock": "monitor.lock", "checkpoint_file": "monitor_state.json",
+                   "checkpoint_interval": interval}, f)
+    with open(os.path.join(directory, "count"), "w") as f:
+        f.write(str(threshold + 10))
+    logs = [open(os.path.join(directory, f"monitor_{i}.log"), "w") for i in range(processes)]
+    children = {}
+    for log in logs:
+        process = subprocess.Popen([sys.executable, "-u", os.path.abspath(__file__), "--child", directory],
+                                   stdout=log, stderr=subprocess.STDOUT)
+        children[process.pid] = process
+        time.sleep(0.02)
+    problems, failovers = [], []
+    try:
+        if not wait_for(lambda: read_samples(directory), 10):
+            return ["no process started sampling"], failovers
+        for _ in range(kills):
+            time.sleep(interval * 10)
+            leader = read_samples(directory)[-1][0]
+            killed_at = time.time()
+            children[leader].send_signal(signal.SIGKILL)
+            children.pop(leader).wait()
+            if not wait_for(lambda: any(pid != leader and at > killed_at
+                                        for pid, at in read_samples(directory)[-3:]), 10):
+                problems.append(f"no process took over from {leader}")
+                return problems, failovers
+            first = next(at for pid, at in read_samples(directory) if at > killed_at and pid != leader)
+            failovers.append(first - killed_at)
+
+        time.sleep(interval * 10)
+        with open(os.path.join(directory, "count"), "w") as f:
+            f.write(str(threshold))
+        if not wait_for(lambda: all(process.poll() is not None for process in children.values()), 10):
+            problems.append(f"{sum(process.poll() is None for process in children.values())} process(es) "
+                            f"still running after the meeting was left")
+
+        # Each process samples in one unbroken run: never two samplers at once
+        samples = read_samples(directory)
+        runs = [pid for i, (pid, _) in enumerate(samples) if i == 0 or samples[i - 1][0] != pid]
+        if len(runs) != len(set(runs)):
+            problems.append(f"processes took turns sampling ({len(runs)} runs by {len(set(runs))} processes)")
+        if len(set(runs)) != kills + 1:
+            problems.append(f"{len(set(runs))} process(es) sampled, expected {kills + 1}")
+        try:
+            with open(os.path.join(directory, "leaves")) as f:
+                leaves = f.read().split()
+        except FileNotFoundError:
+            leaves = []
+        if len(leaves) != 1:
+            problems.append(f"{len(leaves)} leave(s), expected exactly 1")
+        resumed = 0
+        for log in logs:
+            log.flush()
+            with open(log.name) as f:
+                resumed += "Resuming session from checkpoint" in f.read()
+        if resumed != kills:
+            problems.append(f"{resumed} takeover(s) resumed the session, expected {kills}")
+        return problems, failovers
+    finally:
+        for process in children.values():
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+        for log in logs:
+            log.close()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def check_health(interval, poll):
+    """Problems with /healthz for a follower and for it once it has taken over"""
+    directory = tempfile.mkdtemp(prefix="zoom_instance_")
+    problems = []
+    try:
+        with open(os.path.join(directory, "count"), "w") as f:
+            f.write("12")
+        config = LeaverConfig(os.path.join(directory, "config.json"))
+        config.load()
+        config.update({"participant_threshold": 2, "check_interval": interval, "instance_poll": poll,
+                       "prearm_seconds": 0, "log_activity": False,
+                       "instance_lock": os.path.join(directory, "monitor.lock")})
+        leader = InstanceLock(config["instance_lock"])
+        leader.acquire()
+        monitor = Monitor(FileAdapter(directory), config)
+        thread = threading.Thread(target=monitor.run, daemon=True)
+        thread.start()
+        wait_for(lambda: monitor.role is not None, 5)
+        time.sleep(poll * 5)
+        healthy, reason = health(monitor)
+        if not healthy or not reason.startswith("follower"):
+            problems.append(f"following: /healthz said {healthy}, {reason!r}")
+        leader.release()
+        if not wait_for(lambda: monitor.role == "leader" and monitor.peak is not None, 5):
+            problems.append("the follower never took over")
+        healthy, reason = health(monitor)
+        if not healthy or not reason.startswith("leader"):
+            problems.append(f"after the takeover: /healthz said {healthy}, {reason!r}")
+        monitor.stop()
+        thread.join(5)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return problems
+
+
+def collect():
+    """Return (name, setup, operations_per_call) for benchmarks/run.py"""
+    def publish_setup():
+        # The leader writing a changed state to the status file
+        directory = tempfile.mkdtemp(prefix="zoom_instance_")
+        instance = InstanceLock(os.path.join(directory, "monitor.lock"))
+        instance.acquire()
+        counts = iter(range(10 ** 9))
+        return lambda: instance.publish("monitoring", count=next(counts), threshold=2, meeting="Zoom Meeting")
+
+    def poll_setup():
+        # One follower poll: read the status file and try the lock
+        config = dict(DEFAULT_CONFIG)
+        config["instance_lock"] = os.path.join(tempfile.mkdtemp(prefix="zoom_instance_"), "monitor.lock")
+        leader, follower = InstanceLock.from_config(config), InstanceLock.from_config(config)
+        leader.acquire()
+        leader.publish("monitoring", count=14, threshold=2, meeting="Zoom Meeting")
+
+        def run():
+            follower.read()
+            follower.acquire()
+        run.leader = leader  # Keeps the lock held while the benchmark runs
+        return run
+
+    return [("instance/publish", publish_setup, 1), ("instance/poll", poll_setup, 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check leader election between several monitor processes")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--kills", type=int, default=2, help="leaders to kill (fewer than --processes)")
+    parser.add_argument("--interval", type=float, default=0.02, help="check_interval of every monitor")
+    parser.add_argument("--poll", type=float, default=0.05, help="instance_poll of every monitor")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args.child)
+    if not hasattr(signal, "SIGKILL"):
+        print("❌ Needs SIGKILL (Linux or macOS)")
+        return 1
+
+    kills = min(args.kills, args.processes - 1)
+    problems, failovers = simulate(args.processes, kills, args.interval, args.poll)
+    problems += check_health(args.interval, args.poll)
+    if failovers:
+        print(f"Killed {len(failovers)} leader(s) of {args.processes} processes: failover mean "
+              f"{sum(failovers) / len(failovers) * 1000:.0f} ms, max {max(failovers) * 1000:.0f} ms "
+              f"(poll {args.poll * 1000:.0f} ms, check interval {args.interval * 1000:.0f} ms)")
+    for problem in problems:
+        print(f"   {problem}")
+    print("✅ Instance simulation passed" if not problems else "❌ Instance simulation failed")
+    return 0 if not problems else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Measure leave pre-arming on simulated meetings that drain below the threshold.
+
+Runs the Windows (or macOS) monitor against the fake window provider and an
+accelerated clock, joining each meeting once everyone is in and monitoring
+until the count drains to the threshold and the monitor leaves. The same
+meetings are run with pre-arming off and on. For each mode it reports how
+long after the count actually crossed the threshold the leave reached Zoom,
+how many checks that took, and the pre-arm outcomes (hit / expired /
+unarmed).
+
+Usage:
+    python benchmarks/prearm_sim.py --meetings 50
+    python benchmarks/prearm_sim.py --interval 10 --horizon 60 --prearm-interval 1
+"""
+
+import argparse
+import itertools
+import os
+import statistics
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+from fake_platform import AcceleratedClock, FakeWindowProvider, load_monitor
+from leaver_core.forecast import TrendForecaster
+
+
+class RecordingProvider(FakeWindowProvider):
+    """FakeWindowProvider that records when the leave reached Zoom"""
+
+    left_at = None
+
+    def leave(self):
+        if self.meeting is not None:
+            self.left_at = self.clock.time()
+        super().leave()
+
+
+def crossing_time(meeting, threshold):
+    """Virtual time the draining count first rounds to the threshold (jitter ignored)"""
+    drain = min(600.0, meeting.duration * 0.2)
+    return meeting.start + meeting.duration - drain * (threshold + 0.5) / meeting.peak
+
+
+def simulate(platform, meetings, interval, threshold, horizon, prearm_interval, seed=1):
+    """Run the meetings once; returns per-meeting delays, checks and the pre-arm outcomes"""
+    clock = AcceleratedClock()
+    provider = RecordingProvider(clock, seed=seed, peak_range=(threshold + 4, 40))
+    leaver = load_monitor(platform, provider, clock, os.path.join(tempfile.mkdtemp(prefix="zoom_prearm_"), "config.json"),
+                          {"participant_threshold": threshold, "check_interval": interval,
+                           "prearm_seconds": horizon, "prearm_interval": prearm_interval})
+    adapter = leaver.adapter
+    adapter_wait = adapter.wait
+    state = {"checks": 0, "deadline": None}
+
+    def tick_wait(seconds):
+        state["checks"] += 1
+        adapter_wait(seconds)
+        if clock.time() > state["deadline"]:
+            leaver.running = False  # The meeting ended without a leave
+
+    adapter.wait = tick_wait
+    delays, checks = [], []
+    outcomes = {"hits": 0, "expired": 0, "unarmed": 0}
+    prepare_ms = []
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for _ in range(meetings):
+            clock.now = max(clock.now, provider.next_meeting_at)
+            provider.participant_count()  # Starts the next meeting
+            meeting = provider.meeting
+            clock.now = meeting.start + min(300.0, meeting.duration * 0.1)  # Join after the ramp
+            state["checks"], state["deadline"] = 0, meeting.start + meeting.duration + 60
+            provider.left_at = None
+            leaver.monitor_meeting()
+            if provider.left_at is not None:
+                delays.append(provider.left_at - crossing_time(meeting, threshold))
+                checks.append(state["checks"])
+            prearm = leaver.monitor.prearm
+            if prearm is not None:
+                stats = prearm.stats()
+                for key in outcomes:
+                    outcomes[key] += stats[key]
+                if stats["mean_prepare_ms"] is not None:
+                    prepare_ms.append(stats["mean_prepare_ms"])
+    return delays, checks, outcomes, prepare_ms
+
+
+def report(label, delays, checks, outcomes, prepare_ms):
+    total = sum(outcomes.values())
+    hit_rate = f"{outcomes['hits'] / total:.0%}" if total else "-"
+    p95 = delays[min(len(delays) - 1, int(len(delays) * 0.95))]
+    print(f"{label:<12} {len(delays):>6} {statistics.mean(delays):>10.1f} {p95:>10.1f} "
+          f"{statistics.mean(checks):>9.0f} {outcomes['hits']:>5} {outcomes['expired']:>8} "
+          f"{outcomes['unarmed']:>8} {hit_rate:>7} "
+          f"{statistics.mean(prepare_ms) if prepare_ms else 0:>11.2f}")
+
+
+def collect():
+    """Return (name, setup, operations_per_call) for benchmarks/run.py"""
+    def observe_setup():
+        # One tick's forecaster work: add a count and re-estimate the crossing
+        forecaster = TrendForecaster()
+        ticks = itertools.count()
+
+        def run():
+            tick = next(ticks)
+            forecaster.observe(tick * 10.0, 40 - tick % 30)
+            forecaster.eta(5)
+        return run
+
+    return [("forecast/observe_eta", observe_setup, 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure leave pre-arming on simulated draining meetings")
+    parser.add_argument("--platform", choices=["windows", "macos"], default="windows")
+    parser.add_argument("--meetings", type=int, default=50)
+    parser.add_argument("--interval", type=int, default=10, help="check_interval in seconds")
+    parser.add_argument("--threshold", type=int, default=2)
+    parser.add_argument("--horizon", type=float, default=60, help="prearm_seconds")
+    parser.add_argument("--prearm-interval", type=float, default=1, help="prearm_interval in seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'mode':<12} {'leaves':>6} {'delay s':>10} {'p95 s':>10} {'checks':>9} {'hits':>5} "
+          f"{'expired':>8} {'unarmed':>8} {'hit rate':>7} {'prepare ms':>11}")
+    results = {}
+    for label, horizon in (("no prearm", 0), ("prearm", args.horizon)):
+        delays, checks, outcomes, prepare_ms = simulate(args.platform, args.meetings, args.interval,
+                                                        args.threshold, horizon, args.prearm_interval, args.seed)
+        delays.sort()
+        report(label, delays, checks, outcomes, prepare_ms)
+        results[label] = (delays, outcomes)
+
+    baseline, prearmed = results["no prearm"][0], results["prearm"][0]
+    saved = statistics.mean(baseline) - statistics.mean(prearmed)
+    print(f"\nMean time from crossing to leave: {statistics.mean(baseline):.1f}s -> "
+          f"{statistics.mean(prearmed):.1f}s ({saved:+.1f}s saved)")
+    ok = len(prearmed) == len(baseline) and saved > 0
+    print("✅ Pre-arm simulation passed" if ok else "❌ Pre-arm simulation failed")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
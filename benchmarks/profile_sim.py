@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+On-demand profiling (leaver_core/profiler.py) of a running monitor.
+
+For each platform monitor it starts the loop on a thread named
+"monitoring", as the macOS menu bar app does, against the fake platform
+modules. Window enumeration is made slow by slow_enumeration(), which blocks
+for --busy milliseconds per call, as a slow osascript would. While the monitor runs it checks that:
+
+    - before a profile is asked for, no sampler thread runs
+    - SIGUSR1 (or, without it, StackSampler.start()) writes profile_file,
+      in collapsed-stack format, with about --rate samples a second for
+      --seconds seconds
+    - the monitoring thread's samples are under Monitor.run(), and most
+      samples find a thread in slow_enumeration(), so the profile points
+      at the slow code (on macOS it runs on the window source threads)
+    - GET /profile on the metrics endpoint returns the same format, and
+      409 while another profile runs
+    - sampling slows the monitor by less than 20%
+
+Last, with profile_file empty, SIGUSR1 must still be handled, writing
+monitor_profile.folded next to config.json, and not end the process.
+
+It prints the samples per thread and the hottest stacks. Sleeps run on the
+accelerated clock, so the monitor ticks flat out.
+
+Usage:
+    python benchmarks/profile_sim.py
+    python benchmarks/profile_sim.py --seconds 2 --rate 100 --busy 5
+"""
+
+import argparse
+import os
+import re
+import signal
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from fake_platform import AcceleratedClock, StaticWindowProvider, load_monitor
+from leaver_core import profiler
+from leaver_core.config import LeaverConfig
+from leaver_core.metrics_server import MetricsServer
+
+LINE = re.compile(r"^(\S.*) (\d+)$")
+MAX_SLOWDOWN = 0.2
+
+_tmp_dir = tempfile.TemporaryDirectory(prefix="zoom_profile_")
+
+
+def slow_enumeration(milliseconds):
+    """Block the calling thread, as a slow osascript or window query does"""
+    time.sleep(milliseconds / 1000)
+
+
+def slowed(function, busy):
+    def slow(*args, **kwargs):
+        slow_enumeration(busy)
+        return function(*args, **kwargs)
+    return slow
+
+
+class RunningMonitor:
+    """A fake-platform monitor looping on its own "monitoring" thread"""
+
+    def __init__(self, platform, seconds, rate, busy):
+        self.clock = AcceleratedClock()
+        provider = StaticWindowProvider(self.clock, ["Zoom Meeting", "Participants (12)"])
+        self.path = os.path.join(_tmp_dir.name, f"{platform}_profile.folded")
+        config_file = os.path.join(_tmp_dir.name, f"{platform}_config.json")
+        self.leaver = load_monitor(platform, provider, self.clock, config_file, {
+            "check_interval": 2, "log_activity": False, "participant_threshold": 0,
+            "profile_file": self.path, "profile_seconds": seconds, "profile_rate": rate})
+        # The front end armed its sampler before the config above was applied
+        self.sampler = profiler.StackSampler.from_config(self.leaver.config)
+        self.armed = profiler.install(self.sampler)
+        adapter = self.leaver.monitor.adapter
+        if getattr(adapter, "sources", None) is not None:
+            # macOS: enumeration runs on the source threads, which the profile has to catch too
+            for source in adapter.sources.sources:
+                source.fetch = slowed(source.fetch, busy)
+        else:
+            adapter.zoom_windows = slowed(adapter.zoom_windows, busy)
+        self.ticks = 0
+        self.stopping = False
+        self.clock.on_sleep = self.on_sleep
+        self.thread = threading.Thread(target=self.leaver.monitor_meeting, name="monitoring", daemon=True)
+
+    def on_sleep(self, seconds):
+        self.ticks += 1
+        if self.stopping:
+            self.leaver.running = False
+
+    def ticks_per_second(self, seconds):
+        start_ticks, start = self.ticks, time.perf_counter()
+        time.sleep(seconds)
+        return (self.ticks - start_ticks) / (time.perf_counter() - start)
+
+    def stop(self):
+        self.stopping = True
+        self.thread.join(5)
+
+
+def sampler_threads():
+    return [thread for thread in threading.enumerate() if thread.name == "stack-sampler"]
+
+
+def parse_collapsed(text):
+    """{stack tuple: samples}; raises ValueError on a line that isn't "frames count" """
+    stacks = Counter()
+    for line in text.splitlines():
+        match = LINE.match(line)
+        if not match:
+            raise ValueError(f"not a collapsed stack line: {line[:80]!r}")
+        stacks[tuple(match.group(1).split(";"))] += int(match.group(2))
+    return stacks
+
+
+def check_profile(stacks, seconds, rate):
+    """Problems with one profile of the running monitor"""
+    problems = []
+    monitoring = {stack: count for stack, count in stacks.items() if stack[0] == "monitoring"}
+    samples = sum(monitoring.values())
+    if not samples:
+        return ["no samples of the monitoring thread"]
+    expected = seconds * rate
+    if not 0.5 * expected <= samples <= 1.2 * expected + 1:
+        problems.append(f"{samples} samples of the monitoring thread, expected about {expected:.0f}")
+    in_run = sum(count for stack, count in monitoring.items() if any(f.startswith("Monitor.run ") for f in stack))
+    if in_run < 0.9 * samples:
+        problems.append(f"only {in_run}/{samples} monitoring samples under Monitor.run")
+    # Per sample, at least one thread should be in the slow code most of the time
+    hot = sum(count for stack, count in stacks.items() if stack[-1].startswith("slow_enumeration "))
+    if hot < 0.5 * samples:
+        problems.append(f"only {hot} samples in slow_enumeration, over {samples} samples")
+    return problems
+
+
+def fetch(url):
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            return response.status, response.read().decode()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode()
+
+
+def run_platform(platform, seconds, rate, busy):
+    """Returns (problems, stacks of the signalled profile, slowdown)"""
+    problems = []
+    monitor = RunningMonitor(platform, seconds, rate, busy)
+    monitor.thread.start()
+    try:
+        time.sleep(0.2)
+        if sampler_threads():
+            problems.append("a sampler thread runs before any profile was asked for")
+        idle_rate = monitor.ticks_per_second(seconds)
+
+        # Ask as an operator would: SIGUSR1, handled on this (the main) thread
+        if monitor.armed:
+            os.kill(os.getpid(), signal.SIGUSR1)
+        else:
+            monitor.sampler.start(reason="sim")
+        deadline = time.perf_counter() + seconds + 10
+        while not monitor.sampler.running and time.perf_counter() < deadline:
+            time.sleep(0.001)
+        profiled_rate = monitor.ticks_per_second(seconds * 0.8)
+        while monitor.sampler.running and time.perf_counter() < deadline:
+            time.sleep(0.02)
+        if not os.path.exists(monitor.path):
+            return problems + ["the profile request wrote no file"], {}, 0.0
+        with open(monitor.path) as f:
+            stacks = parse_collapsed(f.read())
+        problems += check_profile(stacks, seconds, rate)
+
+        # Ask through the metrics endpoint, and while another profile runs
+        server = MetricsServer(monitor.leaver.monitor, 0).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/profile"
+        try:
+            status, body = fetch(f"{url}?seconds={seconds / 2}")
+            if status != 200:
+                problems.append(f"/profile answered {status}: {body.strip()}")
+            else:
+                problems += ["/profile: " + p for p in check_profile(parse_collapsed(body), seconds / 2, rate)]
+            monitor.sampler.start(seconds=1, reason="sim")
+            status, _ = fetch(f"{url}?seconds=1")
+            if status != 409:
+                problems.append(f"/profile during another profile answered {status}, expected 409")
+            status, _ = fetch(f"{url}?seconds=abc")
+            if status != 400:
+                problems.append(f"/profile?seconds=abc answered {status}, expected 400")
+        finally:
+            server.stop()
+        while monitor.sampler.running:
+            time.sleep(0.02)
+    finally:
+        monitor.stop()
+        profiler.install(None)
+
+    slowdown = 1 - profiled_rate / idle_rate if idle_rate else 0.0
+    if slowdown > MAX_SLOWDOWN:
+        problems.append(f"sampling slowed the monitor by {slowdown:.0%} (limit {MAX_SLOWDOWN:.0%})")
+    return problems, stacks, slowdown
+
+
+def check_default_file():
+    """Problems with SIGUSR1 sent to a process whose config leaves profile_file empty"""
+    directory = tempfile.mkdtemp(dir=_tmp_dir.name)
+    config = LeaverConfig(os.path.join(directory, "config.json"), {"profile_seconds": 0.2, "log_activity": False})
+    config.load()
+    sampler = profiler.start_profiler(config)
+    try:
+        path = os.path.join(directory, profiler.DEFAULT_FILE)
+        if sampler.path != path:
+            return [f"an empty profile_file profiles to {sampler.path}, not {path}"]
+        if not hasattr(signal, "SIGUSR1"):
+            return []
+        os.kill(os.getpid(), signal.SIGUSR1)  # The default action would end this process here
+        deadline = time.perf_counter() + 10
+        while not os.path.exists(path) and time.perf_counter() < deadline:
+            time.sleep(0.02)
+        return [] if os.path.exists(path) else ["SIGUSR1 with profile_file empty wrote no profile"]
+    finally:
+        while sampler.running:
+            time.sleep(0.02)
+        profiler.install(None)
+
+
+def collect():
+    """Return (name, setup, operations_per_call) for benchmarks/run.py"""
+    def sample_setup():
+        # One sample of every thread, as the sampler takes --rate times a second
+        sampler = profiler.StackSampler(None)
+        stacks = Counter()
+        own = threading.get_ident()
+        return lambda: sampler.sample_once(stacks, own)
+
+    return [("profile/sample", sample_setup, 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="On-demand stack profiles of a running monitor")
+    parser.add_argument("--seconds", type=float, default=1.0, help="length of each profile")
+    parser.add_argument("--rate", type=int, default=50, help="samples a second")
+    parser.add_argument("--busy", type=float, default=2.0, help="milliseconds slow_enumeration() burns per tick")
+    args = parser.parse_args()
+
+    ok = True
+    for platform in ("windows", "macos"):
+        problems, stacks, slowdown = run_platform(platform, args.seconds, args.rate, args.busy)
+        threads = Counter()
+        for stack, count in stacks.items():
+            threads[stack[0]] += count
+        print(f"{platform}: " + ", ".join(f"{name} {count}" for name, count in threads.most_common()) +
+              f" samples; monitor {slowdown:+.1%} slower while sampled")
+        total = sum(stacks.values())
+        for stack, count in stacks.most_common(4):
+            print(f"   {count / total:6.1%}  {stack[0]};...;" + ";".join(stack[-2:]))
+        for problem in problems:
+            print(f"   ❌ {problem}")
+        ok = ok and not problems
+    problems = check_default_file()
+    if not problems:
+        print(f"profile_file empty: SIGUSR1 wrote {profiler.DEFAULT_FILE}")
+    for problem in problems:
+        print(f"   ❌ {problem}")
+    ok = ok and not problems
+    print("✅ Profiling simulation passed" if ok else "❌ Profiling simulation failed")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
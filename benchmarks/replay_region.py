@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Replay screen-region captures through the visual count fallback, headless.
+
+Feeds PNG captures (recorded with tools/record_region.py, or synthesized
+here) to RegionCountSource as if they were consecutive monitor ticks and
+reports how often recognition actually ran. Captures whose file name ends in
+"_<count>.png" are checked against that count.
+
+Usage:
+    python benchmarks/replay_region.py                 # synthetic captures
+    python benchmarks/replay_region.py fixtures/dir    # recorded captures
+"""
+
+import argparse
+import glob
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from icon_drawing import PILLOW_AVAILABLE, load_font
+from screen_region import FixtureCapture, RegionCountSource, TemplateDigitRecognizer, default_recognizer
+
+if PILLOW_AVAILABLE:
+    from PIL import Image, ImageDraw
+
+EXPECTED = re.compile(r"_(\d+)\.png$")
+
+
+def render_capture(count, jitter=0):
+    """A toolbar-like Participants button: icon, then the count, light on dark"""
+    image = Image.new('RGB', (96, 28), (38, 38, 38))
+    draw = ImageDraw.Draw(image)
+    draw.ellipse((6, 6, 20, 20), fill=(210, 210, 210))
+    draw.text((28, 5), str(count), font=load_font(16), fill=(235, 235, 235))
+    if jitter:
+        # Faint noise the hash must ignore (compression, cursor blink elsewhere)
+        image.putpixel((90, 2), (38 + jitter, 38, 38))
+    return image
+
+
+def synthesize(directory, ticks=600, seed=1):
+    """Write a meeting's worth of captures: counts that change every few ticks"""
+    rng = random.Random(seed)
+    count = rng.randint(8, 40)
+    paths = []
+    for tick in range(ticks):
+        if rng.random() < 0.08:
+            count = max(1, count + rng.choice((-2, -1, -1, 1, 1, 2)))
+        path = os.path.join(directory, f"{tick:05d}_{count}.png")
+        render_capture(count, jitter=rng.randint(0, 6)).save(path)
+        paths.append(path)
+    return paths
+
+
+def replay(paths, recognizer=None):
+    """Run every capture through a fresh source; returns (source, correct, checked, seconds)"""
+    source = RegionCountSource(FixtureCapture(paths), recognizer)
+    correct = checked = 0
+    start = time.perf_counter()
+    for path in paths:
+        count = source.participant_count()
+        match = EXPECTED.search(path)
+        if match:
+            checked += 1
+            correct += count == int(match.group(1))
+    return source, correct, checked, time.perf_counter() - start
+
+
+def collect():
+    """Return (name, setup, operations_per_call) for benchmarks/run.py"""
+    if not PILLOW_AVAILABLE:
+        return []
+
+    def unchanged_setup():
+        image = render_capture(12)
+        source = RegionCountSource(lambda: image, TemplateDigitRecognizer())
+        source.participant_count()
+        return source.participant_count
+
+    def recognize_setup():
+        image = render_capture(12)
+        recognizer = TemplateDigitRecognizer()
+        return lambda: recognizer(image)
+
+    return [("region/unchanged", unchanged_setup, 1), ("region/recognize", recognize_setup, 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay screen-region captures through the visual fallback")
+    parser.add_argument("fixtures", nargs="?", help="directory of PNG captures (default: synthesize)")
+    parser.add_argument("--ticks", type=int, default=600, help="synthetic captures to generate")
+    parser.add_argument("--templates", action="store_true", help="force the built-in template recognizer")
+    args = parser.parse_args()
+
+    if not PILLOW_AVAILABLE:
+        print("Pillow not installed. Install with: pip install pillow")
+        return 1
+
+    recognizer = TemplateDigitRecognizer() if args.templates else default_recognizer()
+    with tempfile.TemporaryDirectory(prefix="zoom_region_") as tmp:
+        if args.fixtures:
+            paths = sorted(glob.glob(os.path.join(args.fixtures, "*.png")))
+        else:
+            paths = synthesize(tmp, args.ticks)
+        if not paths:
+            print(f"No PNG captures found in {args.fixtures}")
+            return 1
+
+        source, correct, checked, seconds = replay(paths, recognizer)
+
+    stats = source.stats()
+    print(f"Captures:      {stats['captures']}  ({seconds / len(paths) * 1e6:.0f} us/tick incl. PNG decode)")
+    print(f"Unchanged:     {stats['unchanged']}")
+    print(f"Cache hits:    {stats['cache_hits']}")
+    print(f"Recognitions:  {stats['recognitions']}  ({stats['recognizer']})")
+    if checked:
+        print(f"Accuracy:      {correct}/{checked}")
+    return 0 if correct == checked else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Benchmark runner with regression gates.
+
+Runs every benchmark suite headless (platform modules are faked), writes the
+results as JSON and compares them against a stored baseline. A benchmark
+regresses when its median time per operation is slower than the baseline by
+more than its threshold (default 25%). A benchmark that looks regressed is
+measured again, for longer (--retries times), and only fails if it stays
+over the limit: on a busy machine a short measurement can be off by that
+much.
+
+Usage:
+    python3 benchmarks/run.py                          # run and compare with baseline.json
+    python3 benchmarks/run.py --sizes 10 100 --quick   # smaller, faster run
+    python3 benchmarks/run.py --filter parse/          # only matching benchmarks
+    python3 benchmarks/run.py --update-baseline --runs 3   # store the typical of three runs as the baseline
+    python3 benchmarks/run.py --threshold tick/=0.5    # per-prefix regression threshold
+    python3 benchmarks/run.py --retries 0              # fail on the first measurement
+"""
+
+import argparse
+import json
+import os
+import platform as platform_info
+import statistics
+import sys
+import time
+from contextlib import redirect_stdout
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_RETRIES = 2
+RETRY_TIME_FACTOR = 5  # A re-measurement runs this many times longer, to average out bursts of load
+
+RESULTS_VERSION = 1
+
+
+def measure(func, operations=1, repeat=5, min_time=0.1):
+    """Time func; returns per-operation seconds for each repeat
+
+    Like timeit's autorange, the loop count is grown until one repeat takes at
+    least min_time, so fast and slow benchmarks both get stable numbers.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    samples = [elapsed / (number * operations)]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / (number * operations))
+    return samples, number
+
+
+def run_benchmark(setup, operations, repeat, min_time):
+    """Set up and measure one benchmark; returns its result entry"""
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        func = setup()
+        samples, number = measure(func, operations, repeat, min_time)
+    samples_us = [s * 1e6 for s in samples]
+    return {
+        "median_us": round(statistics.median(samples_us), 4),
+        "min_us": round(min(samples_us), 4),
+        "loops": number,
+        "operations": operations,
+    }
+
+
+def load_suites(sizes):
+    """Collect (name, setup, operations) from every benchmark suite"""
+    sys.path.insert(0, BENCH_DIR)
+    import bench_detection
+    import bench_badge_cache
+    import replay_region
+    import fleet_sim
+    import hook_sim
+    import prearm_sim
+    import bench_sweep
+    import bench_log_stats
+    import checkpoint_sim
+    import instance_sim
+    import status_page_sim
+    import status_bus_sim
+    import bench_window_records
+    import hedge_sim
+    import bench_spans
+    import profile_sim
+
+    benchmarks = bench_detection.collect(sizes)
+    benchmarks += bench_badge_cache.collect()
+    benchmarks += replay_region.collect()
+    benchmarks += fleet_sim.collect()
+    benchmarks += hook_sim.collect()
+    benchmarks += prearm_sim.collect()
+    benchmarks += bench_sweep.collect()
+    benchmarks += bench_log_stats.collect()
+    benchmarks += checkpoint_sim.collect()
+    benchmarks += instance_sim.collect()
+    benchmarks += status_page_sim.collect()
+    benchmarks += status_bus_sim.collect()
+    benchmarks += bench_window_records.collect()
+    benchmarks += hedge_sim.collect()
+    benchmarks += bench_spans.collect()
+    benchmarks += profile_sim.collect()
+    return benchmarks
+
+
+def parse_thresholds(values):
+    """Parse PREFIX=FRACTION options into a dict"""
+    thresholds = {}
+    for value in values or []:
+        prefix, _, fraction = value.partition("=")
+        thresholds[prefix] = float(fraction)
+    return thresholds
+
+
+def threshold_for(name, thresholds, default):
+    """Longest matching prefix wins"""
+    best = None
+    for prefix in thresholds:
+        if name.startswith(prefix) and (best is None or len(prefix) > len(best)):
+            best = prefix
+    return thresholds[best] if best is not None else default
+
+
+def compare(results, baseline, thresholds, default_threshold):
+    """Return (rows, regressions) comparing results with a baseline"""
+    rows = []
+    regressions = []
+    base_results = baseline.get("results", {})
+    for name, result in results.items():
+        base = base_results.get(name)
+        if base is None:
+            rows.append((name, result["median_us"], None, None, "new"))
+            continue
+        change = (result["median_us"] - base["median_us"]) / base["median_us"] if base["median_us"] else 0.0
+        limit = threshold_for(name, thresholds, default_threshold)
+        status = "REGRESSED" if change > limit else "ok"
+        rows.append((name, result["median_us"], base["median_us"], change, status))
+        if status == "REGRESSED":
+            regressions.append((name, change, limit))
+    return rows, regressions
+
+
+def format_us(value):
+    return f"{value:12.3f}" if value is not None else f"{'-':>12}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run benchmarks and check for regressions")
+    parser.add_argument("--sizes", type=int, nargs="+", help="synthetic window counts (default 10 100 1000 10000)")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.1, help="seconds per repeat")
+    parser.add_argument("--quick", action="store_true", help="shorthand for --repeat 3 --min-time 0.03")
+    parser.add_argument("--output", default="bench_results.json", help="JSON results file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--threshold", action="append", metavar="PREFIX=FRACTION",
+                        help="regression threshold for benchmarks starting with PREFIX")
+    parser.add_argument("--default-threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--runs", type=int, default=1,
+                        help="run everything this many times and keep each benchmark's median run")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES,
+                        help="times to measure a regressed benchmark again before failing it")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.repeat, args.min_time = 3, 0.03
+
+    suites = {name: (setup, operations) for name, setup, operations in load_suites(args.sizes)
+              if not args.filter or args.filter in name}
+    runs = {name: [] for name in suites}
+    for run in range(args.runs):
+        if args.runs > 1:
+            print(f"Run {run + 1} of {args.runs}")
+        # Whole passes rather than one benchmark N times, so a burst of load only hits one run of each
+        for name, (setup, operations) in suites.items():
+            result = run_benchmark(setup, operations, args.repeat, args.min_time)
+            runs[name].append(result)
+            print(f"{name:<32} {result['median_us']:12.3f} us/op  (min {result['min_us']:.3f})")
+    results = {name: sorted(measured, key=lambda result: result["median_us"])[(len(measured) - 1) // 2]
+               for name, measured in runs.items()}
+
+    document = {
+        "results_version": RESULTS_VERSION,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform_info.python_version(),
+        "host": platform_info.platform(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(document, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.update_baseline:
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                previous = json.load(f)
+            # Keep baseline entries for benchmarks that were filtered out of this run
+            document["results"] = {**previous.get("results", {}), **results}
+            document["thresholds"] = previous.get("thresholds", {})
+        with open(args.baseline, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --update-baseline to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    thresholds = {**baseline.get("thresholds", {}), **parse_thresholds(args.threshold)}
+    rows, regressions = compare(results, baseline, thresholds, args.default_threshold)
+    for _ in range(args.retries):
+        if not regressions:
+            break
+        print(f"\nMeasuring {len(regressions)} regressed benchmark(s) again")
+        for name, _, _ in regressions:
+            result = run_benchmark(*suites[name], args.repeat, args.min_time * RETRY_TIME_FACTOR)
+            print(f"{name:<32} {result['median_us']:12.3f} us/op  (min {result['min_us']:.3f})")
+            if result["median_us"] < results[name]["median_us"]:
+                results[name] = result
+        rows, regressions = compare(results, baseline, thresholds, args.default_threshold)
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)  # Holds the better measurements now
+
+    print(f"\n{'benchmark':<32} {'current us':>12} {'baseline us':>12} {'change':>8}")
+    for name, current, base, change, status in rows:
+        change_text = f"{change:+.1%}" if change is not None else "-"
+        print(f"{name:<32} {format_us(current)} {format_us(base)} {change_text:>8}  {status}")
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s):")
+        for name, change, limit in regressions:
+            print(f"   {name}: {change:+.1%} (limit {limit:+.0%})")
+        return 1
+
+    print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Long-run soak harness for the Zoom Auto Leaver monitors.
+
+Drives ZoomAutoLeaver (Windows) and ZoomAutoLeaverMacOS through hours of
+simulated back-to-back meetings using the fake window provider and an
+accelerated clock, so an 8-hour day takes a few seconds. Every tick's real
+latency is recorded and tracemalloc / RSS are sampled once per simulated
+bucket. The run fails if heap or RSS grow, or p99 tick latency drifts,
+beyond the configured bounds.
+
+A compact JSON report is written for comparison across versions:
+    python3 benchmarks/soak.py --hours 8 --report soak_report.json
+    python3 benchmarks/soak.py --compare old_report.json --report new_report.json
+"""
+
+import argparse
+import json
+import os
+import platform as platform_info
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+from fake_platform import AcceleratedClock, FakeWindowProvider, load_monitor
+from leaver_core.metrics import PREARMS
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+REPORT_VERSION = 1
+SAMPLE_COLUMNS = ["sim_hours", "ticks", "p50_us", "p99_us", "max_us", "heap_kb", "rss_kb"]
+
+
+def current_rss_kb():
+    """Resident set size of this process in KiB (None if unavailable)"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss // 1024
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage // 1024 if sys.platform == "darwin" else usage
+    except Exception:
+        return None
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+class SoakRun:
+    """Soaks one platform monitor and collects per-bucket samples"""
+
+    def __init__(self, platform, hours, bucket_minutes, interval, threshold, seed, extra_windows):
+        self.platform = platform
+        self.clock = AcceleratedClock()
+        self.provider = FakeWindowProvider(self.clock, seed=seed, extra_windows=extra_windows)
+        self.config_dir = tempfile.mkdtemp(prefix="zoom_soak_")
+        self.leaver = load_monitor(platform, self.provider, self.clock,
+                                   os.path.join(self.config_dir, "config.json"),
+                                   {"participant_threshold": threshold, "check_interval": interval,
+                                    "log_activity": True})
+        self.interval = interval
+        self.start = self.clock.time()
+        self.end = self.start + hours * 3600
+        self.bucket_seconds = bucket_minutes * 60
+        self.next_sample = self.start + self.bucket_seconds
+        self.tick_mark = time.perf_counter()
+        self.latencies = []
+        self.ticks = 0
+        self.samples = []
+        # The monitor waits on the adapter once per tick (check_interval, or less while pre-armed)
+        adapter = self.leaver.adapter
+        self._adapter_wait = adapter.wait
+        adapter.wait = self._tick_wait
+
+    def _tick_wait(self, seconds):
+        """Replaces adapter.wait: the wait at the end of every tick"""
+        self.latencies.append(time.perf_counter() - self.tick_mark)
+        self.ticks += 1
+        self._adapter_wait(seconds)
+        if self.clock.time() >= self.next_sample:
+            self._sample()
+        if self.clock.time() >= self.end:
+            self.leaver.running = False
+        self.tick_mark = time.perf_counter()
+
+    def _sample(self):
+        heap, _ = tracemalloc.get_traced_memory()
+        latencies_us = [v * 1e6 for v in self.latencies]
+        self.samples.append([
+            round((self.clock.time() - self.start) / 3600, 3),
+            len(self.latencies),
+            round(percentile(latencies_us, 0.50), 1),
+            round(percentile(latencies_us, 0.99), 1),
+            round(max(latencies_us) if latencies_us else 0.0, 1),
+            heap // 1024,
+            current_rss_kb(),
+        ])
+        self.latencies = []
+        self.next_sample += self.bucket_seconds
+
+    def run(self):
+        """Run monitor_meeting repeatedly until the simulated duration is over"""
+        wall_start = time.perf_counter()
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            while self.clock.time() < self.end:
+                self.leaver.monitor_meeting()
+                # A successful leave stops the monitor; restart it like a user would
+                self.tick_mark = time.perf_counter()
+        return time.perf_counter() - wall_start
+
+
+def prearm_outcomes(before):
+    """Pre-arm outcome counts since the before snapshot, with the hit rate"""
+    outcomes = {result: PREARMS.labels(result).value - before.get(result, 0)
+                for result in ("hit", "expired", "unarmed")}
+    total = sum(outcomes.values())
+    outcomes = {f"prearm_{result}": count for result, count in outcomes.items()}
+    outcomes["prearm_hit_rate"] = round(outcomes["prearm_hit"] / total, 3) if total else None
+    return outcomes
+
+
+def evaluate(samples, bounds, warmup_buckets):
+    """Compare early and late samples against the drift bounds; returns (summary, failures)"""
+    usable = samples[warmup_buckets:]
+    if len(usable) < 2:
+        return {}, ["not enough samples after warm-up; run longer or use smaller buckets"]
+
+    col = {name: i for i, name in enumerate(SAMPLE_COLUMNS)}
+    first, last = usable[0], usable[-1]
+    hours = max(last[col["sim_hours"]] - first[col["sim_hours"]], 1e-9)
+    third = max(1, len(usable) // 3)
+    # Rounded like the samples: the median of an even count averages two of them
+    early_p99 = round(statistics.median(s[col["p99_us"]] for s in usable[:third]), 1)
+    late_p99 = round(statistics.median(s[col["p99_us"]] for s in usable[-third:]), 1)
+
+    summary = {
+        "heap_growth_kb_per_hour": round((last[col["heap_kb"]] - first[col["heap_kb"]]) / hours, 2),
+        "early_p99_us": early_p99,
+        "late_p99_us": late_p99,
+        "p99_drift_ratio": round(late_p99 / early_p99, 3) if early_p99 else 1.0,
+    }
+    if first[col["rss_kb"]] is not None and last[col["rss_kb"]] is not None:
+        summary["rss_growth_kb_per_hour"] = round((last[col["rss_kb"]] - first[col["rss_kb"]]) / hours, 2)
+
+    failures = []
+    if summary["heap_growth_kb_per_hour"] > bounds["max_heap_growth_kb_per_hour"]:
+        failures.append(f"heap grows {summary['heap_growth_kb_per_hour']} KiB/h "
+                        f"(limit {bounds['max_heap_growth_kb_per_hour']})")
+    if summary.get("rss_growth_kb_per_hour", 0) > bounds["max_rss_growth_kb_per_hour"]:
+        failures.append(f"RSS grows {summary['rss_growth_kb_per_hour']} KiB/h "
+                        f"(limit {bounds['max_rss_growth_kb_per_hour']})")
+    # Ignore ratio drift when absolute latencies are tiny (scheduler noise)
+    if (summary["p99_drift_ratio"] > bounds["max_p99_drift_ratio"]
+            and late_p99 - early_p99 > bounds["min_p99_drift_us"]):
+        failures.append(f"p99 tick latency drifted {early_p99}us -> {late_p99}us "
+                        f"(ratio limit {bounds['max_p99_drift_ratio']})")
+    return summary, failures
+
+
+def compare_reports(old, new):
+    """Print per-platform summary deltas between two reports"""
+    print("\nComparison with previous report:")
+    for name, result in new["platforms"].items():
+        previous = old.get("platforms", {}).get(name)
+        if not previous:
+            print(f"  {name}: no previous data")
+            continue
+        for key, value in result["summary"].items():
+            before = previous.get("summary", {}).get(key)
+            if isinstance(value, (int, float)) and isinstance(before, (int, float)):
+                print(f"  {name:<8} {key:<26} {before:>12} -> {value:<12} ({value - before:+.2f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak the monitors with simulated meetings")
+    parser.add_argument("--platform", nargs="+", choices=["windows", "macos"], default=["windows", "macos"])
+    parser.add_argument("--hours", type=float, default=8.0, help="simulated hours per platform")
+    parser.add_argument("--bucket-minutes", type=float, default=30.0, help="simulated minutes per sample")
+    parser.add_argument("--warmup-buckets", type=int, default=1)
+    parser.add_argument("--interval", type=int, default=2, help="check_interval in seconds")
+    parser.add_argument("--threshold", type=int, default=2)
+    parser.add_argument("--extra-windows", type=int, default=0, help="additional background windows")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-heap-growth-kb-per-hour", type=float, default=64.0)
+    parser.add_argument("--max-rss-growth-kb-per-hour", type=float, default=1024.0)
+    parser.add_argument("--max-p99-drift-ratio", type=float, default=1.5)
+    parser.add_argument("--min-p99-drift-us", type=float, default=500.0)
+    parser.add_argument("--report", default="soak_report.json")
+    parser.add_argument("--compare", help="previous report to compare against")
+    args = parser.parse_args()
+
+    bounds = {
+        "max_heap_growth_kb_per_hour": args.max_heap_growth_kb_per_hour,
+        "max_rss_growth_kb_per_hour": args.max_rss_growth_kb_per_hour,
+        "max_p99_drift_ratio": args.max_p99_drift_ratio,
+        "min_p99_drift_us": args.min_p99_drift_us,
+    }
+    report = {
+        "report_version": REPORT_VERSION,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform_info.python_version(),
+        "host": platform_info.platform(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("report", "compare")},
+        "columns": SAMPLE_COLUMNS,
+        "platforms": {},
+    }
+
+    tracemalloc.start()
+    passed = True
+    for name in args.platform:
+        run = SoakRun(name, args.hours, args.bucket_minutes, args.interval,
+                      args.threshold, args.seed, args.extra_windows)
+        before = {values[0]: child.value for values, child in PREARMS.children.items()}
+        wall = run.run()
+        summary, failures = evaluate(run.samples, bounds, args.warmup_buckets)
+        summary.update({
+            "wall_seconds": round(wall, 2),
+            "ticks": run.ticks,
+            "meetings": run.provider.meetings_started,
+            "leaves": run.provider.leaves,
+        })
+        summary.update(prearm_outcomes(before))
+        report["platforms"][name] = {
+            "summary": summary,
+            "failures": failures,
+            "samples": run.samples,
+        }
+        status = "PASS" if not failures else "FAIL"
+        print(f"[{status}] {name}: {run.ticks} ticks, {run.provider.meetings_started} meetings, "
+              f"{args.hours}h simulated in {wall:.1f}s")
+        for key, value in summary.items():
+            print(f"    {key}: {value}")
+        for failure in failures:
+            print(f"    ❌ {failure}")
+        passed = passed and not failures
+    tracemalloc.stop()
+
+    report["passed"] = passed
+    with open(args.report, "w") as f:
+        json.dump(report, f, separators=(",", ":"))
+    print(f"Report written to {args.report}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare_reports(json.load(f), report)
+
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
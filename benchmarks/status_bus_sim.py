@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Drive the status bus and its UI dispatcher with a fake menu bar sink.
+
+A publisher thread plays the monitor: it publishes a start event, tick
+events (flat out, or --rate per second) and a stop event. This thread
+plays the UI and calls on_frame() every --frame-ms, applying snapshots to
+a sink that records them. Every tick is self-checking: threshold equals
+the count and tick_latency is count / 1000, and counts only go up, so a
+snapshot mixing two ticks or arriving out of order shows up. Also checks
+that the sink is only called from the UI thread, that it ends on the
+final published state, that ticks between two frames are coalesced into
+one refresh and that idle frames refresh nothing. Last, a sink that fails
+once must not stop the next refresh.
+
+Usage:
+    python benchmarks/status_bus_sim.py --ticks 10000 --rate 5000
+    python benchmarks/status_bus_sim.py --rate 0 --ticks 100000     # flat out
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from leaver_core.status_bus import (EVENT_STARTED, EVENT_STOPPED, EVENT_TICK, TREND_UP,
+                                    MainThreadDispatcher, StatusBus)
+
+
+class RecordingSink:
+    """Stands in for the menu bar: remembers every snapshot and the thread it came on"""
+
+    def __init__(self, fail_on=()):
+        self.applied = []
+        self.threads = set()
+        self.fail_on = set(fail_on)
+        self.calls = 0
+
+    def apply(self, snapshot):
+        self.calls += 1
+        if self.calls in self.fail_on:
+            raise RuntimeError(f"sink failure on call {self.calls}")
+        self.threads.add(threading.get_ident())
+        self.applied.append(snapshot)
+
+
+class NullSink:
+    """Applies nothing, for timing the dispatcher alone"""
+
+    def apply(self, snapshot):
+        pass
+
+
+def publisher(bus, ticks, rate, done):
+    """The monitor thread: start, `ticks` increasing self-checking ticks, stop"""
+    bus.publish(EVENT_STARTED, threshold=0)
+    for count in range(1, ticks + 1):
+        bus.publish(EVENT_TICK, participant_count=count, threshold=count, tick_latency=count / 1000)
+        if rate:
+            time.sleep(1 / rate)
+    bus.publish(EVENT_STOPPED)
+    done.set()
+
+
+def check_snapshots(applied):
+    """Problems with the order and consistency of the applied snapshots"""
+    problems = []
+    last_sequence, last_count = 0, 0
+    for snapshot in applied:
+        if snapshot.sequence <= last_sequence:
+            problems.append(f"sequence {snapshot.sequence} applied after {last_sequence}")
+        last_sequence = snapshot.sequence
+        count = snapshot.participant_count
+        if count is None:
+            continue
+        if count <= last_count:
+            problems.append(f"count {count} applied after {last_count}")
+        if last_count and snapshot.trend != TREND_UP:
+            problems.append(f"trend {snapshot.trend} for a rising count in {snapshot}")
+        last_count = count
+        if snapshot.threshold != count or round(snapshot.tick_latency * 1000) != count:
+            problems.append(f"mixed snapshot {snapshot}")
+    return problems
+
+
+def simulate(ticks, rate, frame_interval):
+    """Publish from a thread while this one runs frames; returns (problems, stats)"""
+    bus = StatusBus()
+    sink = RecordingSink()
+    dispatcher = MainThreadDispatcher(bus, sink, frame_interval)
+    done = threading.Event()
+    thread = threading.Thread(target=publisher, args=(bus, ticks, rate, done), daemon=True)
+    thread.start()
+    while not done.wait(frame_interval):
+        dispatcher.on_frame()
+    thread.join()
+    dispatcher.on_frame()  # Picks up whatever the last frame missed
+
+    problems = check_snapshots(sink.applied)
+    if sink.threads != {threading.get_ident()}:
+        problems.append(f"sink called from {len(sink.threads)} threads, not just the UI thread")
+    final = bus.peek()
+    last = sink.applied[-1] if sink.applied else None
+    if last is None or last.sequence != final.sequence or last.monitoring or last.participant_count != ticks:
+        problems.append(f"last applied {last}, final state {final}")
+    if dispatcher.refreshes > dispatcher.frames or dispatcher.refreshes != len(sink.applied):
+        problems.append(f"{dispatcher.refreshes} refreshes for {dispatcher.frames} frames "
+                        f"and {len(sink.applied)} applied snapshots")
+    if bus.published != ticks + 2 or dispatcher.coalesced != bus.published - dispatcher.refreshes:
+        problems.append(f"{bus.published} published, {dispatcher.coalesced} coalesced")
+
+    refreshes = dispatcher.refreshes
+    for _ in range(3):
+        if dispatcher.on_frame():
+            problems.append("an idle frame refreshed the sink")
+    if dispatcher.refreshes != refreshes:
+        problems.append("idle frames changed the refresh count")
+    return problems, dispatcher.stats()
+
+
+def check_coalescing():
+    """Problems with a burst between frames and a sink that fails once (no threads, exact counts)"""
+    problems = []
+    bus = StatusBus()
+    sink = RecordingSink(fail_on=(2,))
+    dispatcher = MainThreadDispatcher(bus, sink)
+    for count in range(1, 6):
+        bus.publish(EVENT_TICK, participant_count=count, threshold=count, tick_latency=count / 1000)
+    if not dispatcher.on_frame() or sink.applied[-1].participant_count != 5 or dispatcher.coalesced != 4:
+        problems.append(f"a burst of 5 ticks gave {sink.applied} with {dispatcher.coalesced} coalesced")
+    if dispatcher.on_frame():
+        problems.append("a frame with nothing new refreshed the sink")
+    bus.publish(EVENT_TICK, participant_count=6, threshold=6, tick_latency=0.006)
+    if dispatcher.on_frame():
+        problems.append("the failing apply counted as a refresh")
+    bus.publish(EVENT_TICK, participant_count=7, threshold=7, tick_latency=0.007)
+    if not dispatcher.on_frame() or sink.applied[-1].participant_count != 7:
+        problems.append(f"no refresh after the sink failed once: {sink.applied}")
+    if dispatcher.stats() != {"published": 7, "frames": 4, "refreshes": 2, "coalesced": 5}:
+        problems.append(f"counters {dispatcher.stats()}")
+    return problems
+
+
+def collect():
+    """Return (name, setup, operations_per_call) for benchmarks/run.py"""
+    def publish_setup():
+        # What the monitor thread pays per status event
+        bus = StatusBus()
+        return lambda: bus.publish(EVENT_TICK, participant_count=14, threshold=2, tick_latency=0.004)
+
+    def frame_setup():
+        # One tick and the UI frame that applies it
+        bus = StatusBus()
+        dispatcher = MainThreadDispatcher(bus, NullSink())
+
+        def frame():
+            bus.publish(EVENT_TICK, participant_count=14, threshold=2, tick_latency=0.004)
+            dispatcher.on_frame()
+        return frame
+
+    return [("statusbus/publish", publish_setup, 1), ("statusbus/frame", frame_setup, 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the status bus dispatcher with a fake sink")
+    parser.add_argument("--ticks", type=int, default=10000, help="tick events to publish")
+    parser.add_argument("--rate", type=float, default=5000, help="ticks per second (0: as fast as possible)")
+    parser.add_argument("--frame-ms", type=float, default=5, help="UI frame interval in milliseconds")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    problems, stats = simulate(args.ticks, args.rate, args.frame_ms / 1000)
+    elapsed = time.perf_counter() - start
+    print(f"{stats['published']} events in {elapsed:.2f}s: {stats['refreshes']} refreshes over "
+          f"{stats['frames']} frames, {stats['coalesced']} coalesced")
+    problems += check_coalescing()
+    for problem in problems[:10]:
+        print(f"   {problem}")
+    ok = not problems
+    print("✅ Status bus simulation passed" if ok else "❌ Status bus simulation failed")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Hammer the memory-mapped status page from another process.
+
+A writer process publishes tick events into a status page (flat out, or
+--rate per second) while this process reads it in a tight loop. Every
+record the writer publishes is self-checking: threshold equals the count
+and tick_latency is count / 1000. A record that breaks this was torn by
+a concurrent write, which the seqlock and checksum must never let
+through. Also checks that sequences never go backwards, and reports the
+read time, how often a read overlapped a write and had to retry (and how
+many of those only the checksum caught), and how old each new record was
+when the reader first saw it. On x86 the seqlock alone catches every
+overlap, so last it damages a record behind the writer's back, as a
+reordered store on ARM could, and checks that the reader refuses it.
+
+Usage:
+    python benchmarks/status_page_sim.py --seconds 3
+    python benchmarks/status_page_sim.py --rate 1000 --seconds 5
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from leaver_core.status_bus import EVENT_TICK
+from leaver_core.status_page import RECORD_OFFSET, StatusPage, StatusPageReader
+
+
+def writer(path, seconds, rate):
+    """The writer process: publish self-checking ticks for `seconds`"""
+    page = StatusPage(path)
+    page.open()
+    deadline = time.time() + seconds
+    n = 0
+    while time.time() < deadline:
+        n += 1
+        count = n % 1000
+        page.publish(EVENT_TICK, participant_count=count, threshold=count, tick_latency=count / 1000)
+        if rate:
+            time.sleep(1 / rate)
+    page.close()
+    return 0
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0
+
+
+def simulate(seconds, rate):
+    """Read while the writer runs; returns (problems, stats)"""
+    directory = tempfile.mkdtemp(prefix="zoom_status_page_")
+    path = os.path.join(directory, "monitor_status.bin")
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--writer", path,
+                                "--seconds", str(seconds), "--rate", str(rate)])
+    reader = StatusPageReader(path)
+    problems, read_ns, ages = [], [], []
+    last, reads, empty = 0, 0, 0
+    clock = time.perf_counter_ns
+    try:
+        while process.poll() is None:
+            start = clock()
+            record = reader.read()
+            read_ns.append(clock() - start)
+            reads += 1
+            if record is None:
+                empty += 1
+                continue
+            if record.sequence < last:
+                problems.append(f"sequence went back from {last} to {record.sequence}")
+            if record.sequence > last and record.last_tick:
+                ages.append(time.time() - record.last_tick)
+            last = record.sequence
+            if record.count is not None and (record.threshold != record.count or
+                                             round(record.tick_latency * 1000) != record.count):
+                problems.append(f"torn record {record}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+        reader.close()
+        shutil.rmtree(directory, ignore_errors=True)
+    stats = {"reads": reads, "empty": empty, "updates": last, "collisions": reader.collisions,
+             "mismatches": reader.mismatches,
+             "read_ns_mean": sum(read_ns) / max(len(read_ns), 1), "read_ns_p99": percentile(read_ns, 0.99),
+             "age_us_median": percentile(ages, 0.5) * 1e6, "age_us_p99": percentile(ages, 0.99) * 1e6}
+    return problems, stats
+
+
+def check_checksum():
+    """Problems with a record whose bytes changed without a new sequence"""
+    directory = tempfile.mkdtemp(prefix="zoom_status_page_")
+    page = StatusPage(os.path.join(directory, "monitor_status.bin"))
+    reader = StatusPageReader(page.path, retries=10)
+    problems = []
+    try:
+        page.open()
+        page.publish(EVENT_TICK, participant_count=14, threshold=2, tick_latency=0.004)
+        if reader.read() is None:
+            problems.append("an intact record was refused")
+        page._map[RECORD_OFFSET + 16] ^= 1  # One bit of the count, sequence left as it was
+        record = reader.read()
+        if record is not None or reader.mismatches != 10:
+            problems.append(f"a damaged record read as {record} ({reader.mismatches} checksum mismatches)")
+        page.publish(EVENT_TICK, participant_count=15, threshold=2, tick_latency=0.004)
+        record = reader.read()
+        if record is None or record.count != 15:
+            problems.append(f"the next write read as {record}")
+    finally:
+        reader.close()
+        page.close()
+        shutil.rmtree(directory, ignore_errors=True)
+    return problems
+
+
+def collect():
+    """Return (name, setup, operations_per_call) for benchmarks/run.py"""
+    def page():
+        status = StatusPage(os.path.join(tempfile.mkdtemp(prefix="zoom_status_page_"), "monitor_status.bin"))
+        status.open()
+        return status
+
+    def publish_setup():
+        # What the monitor pays per status event
+        status = page()
+        return lambda: status.publish(EVENT_TICK, participant_count=14, threshold=2, tick_latency=0.004)
+
+    def read_setup():
+        # One consistent read of the record
+        status = page()
+        status.publish(EVENT_TICK, participant_count=14, threshold=2, tick_latency=0.004)
+        reader = StatusPageReader(status.path)
+        reader.page = status  # Keeps the writer's mapping alive
+        return reader.read
+
+    return [("statuspage/publish", publish_setup, 1), ("statuspage/read", read_setup, 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hammer the status page from another process")
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--rate", type=float, default=0, help="writes per second (0: as fast as possible)")
+    parser.add_argument("--writer", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.writer:
+        return writer(args.writer, args.seconds, args.rate)
+
+    problems, stats = simulate(args.seconds, args.rate)
+    print(f"{stats['reads']} reads of {stats['updates']} updates ({stats['empty']} before the page existed), "
+          f"{stats['collisions']} retried after overlapping a write, "
+          f"{stats['mismatches']} of them caught by the checksum")
+    print(f"Read: mean {stats['read_ns_mean'] / 1000:.2f} us, p99 {stats['read_ns_p99'] / 1000:.2f} us")
+    print(f"Age of a new record when first read: median {stats['age_us_median']:.0f} us, "
+          f"p99 {stats['age_us_p99']:.0f} us")
+    problems += check_checksum()
+    for problem in problems[:10]:
+        print(f"   {problem}")
+    ok = not problems and stats["updates"] > 0
+    print("✅ Status page simulation passed" if ok else "❌ Status page simulation failed")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Shared Pillow drawing helpers for Zoom Auto Leaver icons.
+Used by tools/create_icon.py for the app icon and by status_badge.py
+for the menu bar participant badge.
+"""
+
+import os
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+
+# Steel blue used across the app icon and badges
+BRAND_COLOR = (70, 130, 180, 255)
+TEXT_COLOR = (255, 255, 255, 255)
+
+# System font paths tried in order (macOS first, then common Linux locations)
+FONT_PATHS = [
+    "/System/Library/Fonts/Helvetica.ttc",
+    "/Library/Fonts/Arial.ttf",
+    "/System/Library/Fonts/Arial.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+]
+
+_font_cache = {}
+
+
+def find_font_path(font_paths=None):
+    """Return the first existing font path, or None"""
+    for font_path in font_paths or FONT_PATHS:
+        if os.path.exists(font_path):
+            return font_path
+    return None
+
+
+def load_font(size, font_paths=None):
+    """Load a TrueType font at the given pixel size, falling back to the default font"""
+    font_path = find_font_path(font_paths)
+    key = (font_path, size)
+    font = _font_cache.get(key)
+    if font is not None:
+        return font
+
+    try:
+        font = ImageFont.truetype(font_path, size) if font_path else ImageFont.load_default()
+    except Exception:
+        font = ImageFont.load_default()
+
+    _font_cache[key] = font
+    return font
+
+
+def text_size(draw, text, font):
+    """Return (width, height) of text drawn with font"""
+    bbox = draw.textbbox((0, 0), text, font=font)
+    return bbox[2] - bbox[0], bbox[3] - bbox[1]
+
+
+def draw_centered_text(draw, size, text, font, fill=TEXT_COLOR, y_offset=0):
+    """Draw text centered on a square canvas of the given size; returns (x, y, w, h)"""
+    bbox = draw.textbbox((0, 0), text, font=font)
+    text_width = bbox[2] - bbox[0]
+    text_height = bbox[3] - bbox[1]
+
+    # Compensate for the font's top bearing so the glyphs are optically centered
+    x = (size - text_width) // 2 - bbox[0]
+    y = (size - text_height) // 2 - bbox[1] + y_offset
+
+    draw.text((x, y), text, font=font, fill=fill)
+    return x, y, text_width, text_height
+
+
+def new_canvas(size, background=(0, 0, 0, 0)):
+    """Create a square RGBA canvas and its drawing context"""
+    img = Image.new('RGBA', (size, size), background)
+    return img, ImageDraw.Draw(img)
@@ -0,0 +1,41 @@
+"""
+Platform-neutral core of Zoom Auto Leaver.
+
+Holds the configuration model, the window-title parser, the leave decision
+engine and the monitoring loop. Platform specifics (window enumeration,
+focus and leave actions) live in leaver_core.platforms adapters.
+
+The names below are imported on first access, so a short-lived command
+(see leaver_core.cli) only pays for the modules it actually uses.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "config": ("LeaverConfig", "DEFAULT_CONFIG"),
+    "engine": ("DecisionEngine", "ACTION_WAIT", "ACTION_LEAVE", "ACTION_UNKNOWN"),
+    "fleet": ("HeartbeatAgent", "FleetCollector", "create_heartbeat_agent"),
+    "hooks": ("HookDispatcher", "create_hook_dispatcher"),
+    "meetings": ("MeetingTracker", "group_windows"),
+    "monitor": ("Monitor", "log_message"),
+    "profiles": ("Profile", "ProfileTable"),
+    "parser": ("is_zoom_window", "parse_count", "parse_meeting_id", "find_participant_count"),
+    "zoom_log": ("ZoomLogSource", "create_log_source"),
+}
+
+_MODULE_FOR = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_MODULE_FOR)
+
+
+def __getattr__(name):
+    module = _MODULE_FOR.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
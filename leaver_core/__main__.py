@@ -0,0 +1,7 @@
+"""python -m leaver_core: the non-interactive command line (see leaver_core.cli)"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
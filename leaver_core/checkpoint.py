@@ -0,0 +1,175 @@
+"""
+Crash-safe checkpoint of the monitor's session state.
+
+If the monitor process dies mid-meeting (a crash, a kill, a relaunch with
+auto_start), the next run resumes from the checkpoint instead of starting
+cold. It keeps the session's start time, peak count, leave attempts and
+failures, the confirmation streak, and each tracked meeting's state.
+
+The tick only hands the latest state to MonitorCheckpoint.update(), which
+swaps a reference and sets an event. A writer thread does the I/O:
+
+    - at most one write every `interval` seconds; updates in between are
+      coalesced and only the newest state is written
+    - nothing is written when the state equals what is on disk, except
+      that the file is refreshed every max_age / 2 seconds so a monitor
+      that is alive keeps its checkpoint fresh
+    - each write goes to a temporary file that is fsynced and then moved
+      over the checkpoint with os.replace(), so the file is always either
+      the old or the new state
+
+A checkpoint older than max_age is ignored on start-up, and a clean stop
+(the meeting was left, or monitoring was stopped) deletes it. Write times
+and outcomes are exported as metrics.
+"""
+
+import json
+import os
+import threading
+import time
+
+from .metrics import CHECKPOINT_SECONDS, CHECKPOINT_WRITES
+
+CHECKPOINT_VERSION = 1
+DEFAULT_INTERVAL = 5.0    # seconds between writes at most
+DEFAULT_MAX_AGE = 600.0   # seconds a checkpoint stays good for resuming
+
+
+class MonitorCheckpoint:
+    """Debounced, atomic checkpoint file written from a background thread"""
+
+    def __init__(self, path, interval=DEFAULT_INTERVAL, max_age=DEFAULT_MAX_AGE, log=None):
+        self.path = path
+        self.interval = interval
+        self.max_age = max_age
+        self.log = log
+        self._pending = None   # Newest state handed over by the tick
+        self._written = None   # State last written to disk
+        self._last_write = 0.0  # time.monotonic() of the last write
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._closed = False
+        self.updates = 0
+        self.writes = 0
+        self.unchanged = 0
+        self.failures = 0
+        self.write_seconds = 0.0
+
+    @classmethod
+    def from_config(cls, config, log=None):
+        """Build a MonitorCheckpoint for the config's checkpoint_file (None if unset)
+
+        A relative path is taken relative to the config file's directory.
+        """
+        path = config.get("checkpoint_file")
+        if not path:
+            return None
+        path = os.path.expanduser(path)
+        config_file = getattr(config, "config_file", None)
+        if not os.path.isabs(path) and config_file:
+            path = os.path.join(os.path.dirname(os.path.abspath(config_file)), path)
+        return cls(path, config.get("checkpoint_interval", DEFAULT_INTERVAL),
+                   config.get("checkpoint_max_age", DEFAULT_MAX_AGE), log)
+
+    def load(self):
+        """The saved state if the checkpoint is fresh enough to resume from, else None"""
+        try:
+            with open(self.path) as f:
+                document = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            if self.log:
+                self.log(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+        age = time.time() - document.get("saved_at", 0)
+        if document.get("version") != CHECKPOINT_VERSION or not -60 < age <= self.max_age:
+            return None
+        state = document.get("state")
+        self._written = state
+        return state
+
+    def update(self, state):
+        """Hand over the newest state (called every tick; never touches the disk)"""
+        self._pending = state
+        self.updates += 1
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+            self._thread.start()
+        if not self._wake.is_set():
+            self._wake.set()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait()
+            # Debounce: let updates pile up until a write is allowed again
+            delay = self._last_write + self.interval - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+            self._wake.clear()
+            if not self._closed:
+                self.flush()
+
+    def flush(self):
+        """Write the newest state now if it changed (or the file needs refreshing)"""
+        state = self._pending
+        if state is None:
+            return
+        if state == self._written and time.monotonic() - self._last_write < self.max_age / 2:
+            self.unchanged += 1
+            CHECKPOINT_WRITES.labels("unchanged").inc()
+            return
+        start = time.perf_counter()
+        temporary = f"{self.path}.tmp"
+        try:
+            with open(temporary, "w") as f:
+                json.dump({"version": CHECKPOINT_VERSION, "saved_at": round(time.time(), 3),
+                           "pid": os.getpid(), "state": state}, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, self.path)
+        except Exception as e:
+            self.failures += 1
+            CHECKPOINT_WRITES.labels("failed").inc()
+            if self.log and self.failures == 1:
+                self.log(f"Error writing checkpoint {self.path}: {e}")
+            return
+        finally:
+            self._last_write = time.monotonic()
+        seconds = time.perf_counter() - start
+        self._written = state
+        self.writes += 1
+        self.write_seconds += seconds
+        CHECKPOINT_SECONDS.observe(seconds)
+        CHECKPOINT_WRITES.labels("written").inc()
+
+    def close(self, clear=False):
+        """Stop the writer; clear=True deletes the checkpoint (clean stop), else the last state is written"""
+        self._closed = True
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if clear:
+            for path in (self.path, f"{self.path}.tmp"):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    if self.log:
+                        self.log(f"Error removing checkpoint {path}: {e}")
+        else:
+            self.flush()
+
+    def stats(self):
+        return {
+            "updates": self.updates,
+            "writes": self.writes,
+            "unchanged": self.unchanged,
+            "coalesced": self.updates - self.writes - self.unchanged - self.failures,
+            "failures": self.failures,
+            "mean_write_ms": round(self.write_seconds / self.writes * 1000, 3) if self.writes else None,
+        }
@@ -0,0 +1,406 @@
+"""
+Non-interactive command line for Zoom Auto Leaver.
+
+    python -m leaver_core monitor --threshold 3 --interval 5
+    python -m leaver_core detect --json
+    python -m leaver_core status --format "{count}/{threshold}"
+    python -m leaver_core profile
+    python -m leaver_core replay log ~/.zoom/logs/zoom_stdout_stderr.log
+    python -m leaver_core replay region fixtures/meeting1
+    python -m leaver_core bench run --quick --filter tick/
+    python -m leaver_core config get participant_threshold
+    python -m leaver_core config set participant_threshold 3
+
+Every subcommand imports only what it uses. "detect" loads the config, the
+platform adapter and the title parser, and nothing of the monitor loop,
+the HTTP services or pyautogui. That makes it cheap enough for login
+scripts and health checks to call repeatedly.
+
+detect exits with 0 when a participant count was found, 1 when it wasn't
+and 2 when the platform could not be queried. "status" only reads the
+running monitor's status page (see leaver_core/status_page.py) and exits
+with 0 while a monitor is running and checking, 1 otherwise. "profile"
+sends SIGUSR1 to the running monitor (its pid is on the status page), which
+then samples its threads' stacks into profile_file (see
+leaver_core/profiler.py).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(ROOT_DIR, "benchmarks")
+
+BENCH_SCRIPTS = {
+    "run": "run.py",
+    "soak": "soak.py",
+    "fleet": "fleet_sim.py",
+    "hooks": "hook_sim.py",
+    "prearm": "prearm_sim.py",
+    "sweep": "bench_sweep.py",
+    "logstats": "bench_log_stats.py",
+    "checkpoint": "checkpoint_sim.py",
+    "instance": "instance_sim.py",
+    "statuspage": "status_page_sim.py",
+    "statusbus": "status_bus_sim.py",
+    "records": "bench_window_records.py",
+    "hedge": "hedge_sim.py",
+    "spans": "bench_spans.py",
+    "profile": "profile_sim.py",
+    "x11": "bench_x11_latency.py",
+}
+
+# Subcommands whose unknown arguments are handed on to a script
+PASS_THROUGH = ("bench", "replay region")
+
+# Settings "config set" refuses at or below zero, as the interactive menu does
+POSITIVE_SETTINGS = {
+    "participant_threshold": "Threshold must be greater than 0",
+    "check_interval": "Interval must be greater than 0",
+}
+
+# Whole-number defaults that still take a fraction from "config set", as --interval does
+FRACTIONAL_SETTINGS = ("check_interval",)
+
+
+def current_platform():
+    if sys.platform.startswith("win"):
+        return "windows"
+    if sys.platform == "darwin":
+        return "macos"
+    return "linux"
+
+
+def positive(convert):
+    """argparse type that converts a value and refuses it at or below zero, like POSITIVE_SETTINGS"""
+    def parse(text):
+        value = convert(text)
+        if value <= 0:
+            raise argparse.ArgumentTypeError(f"must be greater than 0, got {text}")
+        return value
+    parse.__name__ = convert.__name__  # So a non-number still reads "invalid int value"
+    return parse
+
+
+def stderr_log(message):
+    print(message, file=sys.stderr)
+
+
+def load_config(path):
+    from .config import LeaverConfig
+    config = LeaverConfig(path)
+    config.load()
+    return config
+
+
+def make_adapter(platform, display=None):
+    """Build only the platform adapter (no monitor, no entry script)"""
+    if platform == "windows":
+        from .platforms.windows import WindowsAdapter
+        return WindowsAdapter(stderr_log)
+    if platform == "macos":
+        from .platforms.macos import MacOSAdapter
+        return MacOSAdapter(stderr_log)
+    from .platforms.linux_x11 import X11WindowSource
+    return X11WindowSource(stderr_log, display)
+
+
+def make_leaver(platform, config_file, display=None):
+    """Build the platform's full ZoomAutoLeaver, as the interactive scripts do"""
+    sys.path.insert(0, ROOT_DIR)
+    if platform == "windows":
+        from zoom_auto_leaver import ZoomAutoLeaver
+        return ZoomAutoLeaver(config_file)
+    if platform == "macos":
+        from zoom_auto_leaver_macos import ZoomAutoLeaverMacOS
+        return ZoomAutoLeaverMacOS(config_file)
+    from zoom_auto_leaver_linux import ZoomAutoLeaverLinux
+    return ZoomAutoLeaverLinux(config_file, display)
+
+
+def run_script(path, args):
+    """Run a repository script as __main__ with the given arguments; returns its exit code"""
+    import runpy
+    saved_argv = sys.argv
+    sys.argv = [path] + list(args)
+    try:
+        runpy.run_path(path, run_name="__main__")
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    finally:
+        sys.argv = saved_argv
+    return 0
+
+
+def cmd_monitor(args):
+    leaver = make_leaver(args.platform, args.config, args.display)
+    # Overrides apply to this run only; config.json is left as it is
+    if args.threshold is not None:
+        leaver.config['participant_threshold'] = args.threshold
+    if args.interval is not None:
+        leaver.config['check_interval'] = args.interval
+    if args.quiet:
+        leaver.config['log_activity'] = False
+    try:
+        leaver.monitor_meeting()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_detect(args):
+    start = time.perf_counter()
+    config = load_config(args.config)
+    try:
+        adapter = make_adapter(args.platform, args.display)
+        all_windows = adapter.list_windows()
+        zoom_windows = adapter.zoom_windows()
+    except Exception as e:
+        if args.json:
+            print(json.dumps({"platform": args.platform, "error": str(e)}))
+        else:
+            print(f"Could not query windows on {args.platform}: {e}")
+        return 2
+
+    from .engine import DecisionEngine
+    from .meetings import MeetingTracker
+    from .profiles import ProfileTable
+    engine = DecisionEngine(config)
+    tracker = MeetingTracker(engine, profiles=ProfileTable.from_config(config))
+    meetings = tracker.update(zoom_windows)
+    focus = tracker.focus_meeting(meetings)
+    participant_count = focus.count if focus is not None else None
+
+    relevant = [w.title for w in all_windows if 'zoom' in w.title_lower or w.is_participants]
+    if args.json:
+        print(json.dumps({
+            "platform": args.platform,
+            "participant_count": participant_count,
+            "action": focus.action if focus is not None else engine.decide(None),
+            "threshold": engine.threshold_for(focus.profile if focus is not None else None),
+            "meetings": [{"meeting": m.label, "id": m.meeting_id, "count": m.count, "title": m.title,
+                          "windows": [w.title for w in m.windows]} for m in meetings],
+            "zoom_windows": [w.title for w in zoom_windows],
+            "relevant_windows": relevant,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        }, indent=2 if args.pretty else None))
+    else:
+        print(f"Found {len(relevant)} potentially relevant window(s):")
+        for i, title in enumerate(relevant):
+            print(f"  {i+1}. '{title}'")
+        print(f"\nAfter filtering, found {len(zoom_windows)} Zoom window(s):")
+        for i, window in enumerate(zoom_windows):
+            print(f"  {i+1}. '{window.title}'")
+        if participant_count is not None:
+            print(f"\nCurrent participant count: {participant_count}")
+        else:
+            print("\nCould not determine participant count from window titles")
+    return 0 if participant_count is not None else 1
+
+
+def status_fields(record, config):
+    """Printable fields of a status page record; "state" is "stale" when the monitor stopped checking"""
+    from .metrics import HEALTHY_INTERVALS
+    from .status_page import STATE_MONITORING, STATE_NAMES
+    age = time.time() - record.last_tick if record.last_tick else None
+    state = STATE_NAMES.get(record.state, "unknown")
+    if record.state == STATE_MONITORING and record.last_tick and \
+            age > max(config.get("check_interval", 10), 1) * HEALTHY_INTERVALS:
+        state = "stale"
+    return {**record._asdict(), "state": state,
+            "age": round(age, 3) if age is not None else None,
+            "tick_ms": round(record.tick_latency * 1000, 3) if record.tick_latency is not None else None}
+
+
+def cmd_status(args):
+    from .status_page import StatusPageReader, resolve_path
+    config = load_config(args.config)
+    path = resolve_path(config)
+    if path is None:
+        print("status_page is off in the configuration", file=sys.stderr)
+        return 1
+    reader = StatusPageReader(path)
+    while True:
+        record = reader.read()
+        fields = status_fields(record, config) if record is not None else None
+        if args.json:
+            print(json.dumps(fields), flush=True)
+        elif fields is None:
+            print(f"No monitor status at {path}", flush=True)
+        elif args.format:
+            print(args.format.format(**{key: "?" if value is None else value for key, value in fields.items()}),
+                  flush=True)
+        else:
+            count = fields["count"] if fields["count"] is not None else "?"
+            checked = f", checked {fields['age']:.1f}s ago in {fields['tick_ms']:.1f} ms" \
+                if fields["age"] is not None and fields["tick_ms"] is not None else ""
+            print(f"{fields['state']}: {count} participant(s), threshold {fields['threshold']}{checked} "
+                  f"(pid {fields['pid']}, update {fields['sequence']})", flush=True)
+        if not args.watch:
+            return 0 if fields is not None and fields["state"] in ("monitoring", "leaving") else 1
+        time.sleep(args.watch)
+
+
+def cmd_profile(args):
+    import signal
+    from .profiler import StackSampler
+    from .status_page import StatusPageReader, resolve_path
+    config = load_config(args.config)
+    sampler = StackSampler.from_config(config)
+    if not hasattr(signal, "SIGUSR1"):
+        print("No SIGUSR1 on this platform; use GET /profile on the metrics port", file=sys.stderr)
+        return 1
+    pid = args.pid
+    if pid is None:
+        path = resolve_path(config)
+        if path is None:
+            print("status_page is off in the configuration; pass --pid", file=sys.stderr)
+            return 1
+        record = StatusPageReader(path).read()
+        if record is None or not record.pid:
+            print("No running monitor found on the status page; pass --pid", file=sys.stderr)
+            return 1
+        pid = record.pid
+    try:
+        os.kill(pid, signal.SIGUSR1)
+    except OSError as e:
+        print(f"Could not signal pid {pid}: {e}", file=sys.stderr)
+        return 1
+    print(f"Profiling pid {pid} for {sampler.seconds:g}s; collapsed stacks go to {sampler.path}")
+    return 0
+
+
+def cmd_replay_log(args):
+    from .zoom_log import ParticipantTally
+    tally = ParticipantTally()
+    changes = []
+    with open(args.file, 'r', errors='replace') as f:
+        for number, line in enumerate(f, start=1):
+            if tally.feed(line):
+                changes.append((number, tally.count))
+    if args.json:
+        print(json.dumps({"file": args.file, "count": tally.count,
+                          "changes": [{"line": number, "count": count} for number, count in changes]}))
+    else:
+        for number, count in changes:
+            print(f"line {number:>7}: {count if count is not None else 'not in a meeting'}")
+        print(f"Final count: {tally.count} ({len(changes)} change(s))")
+    return 0
+
+
+def cmd_replay_region(args, extra):
+    return run_script(os.path.join(BENCH_DIR, "replay_region.py"), extra)
+
+
+def cmd_bench(args, extra):
+    return run_script(os.path.join(BENCH_DIR, BENCH_SCRIPTS[args.suite]), extra)
+
+
+def parse_value(text):
+    """JSON when it parses ("3", "true", "[1, 2]"), the plain string otherwise"""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def cmd_config(args):
+    from .config import DEFAULT_CONFIG
+    config = load_config(args.config)
+    if args.action == "get":
+        if args.key is None:
+            print(json.dumps(dict(config), indent=4))
+        elif args.key in config:
+            value = config[args.key]
+            print(value if isinstance(value, str) else json.dumps(value))
+        else:
+            print(f"Unknown setting: {args.key}", file=sys.stderr)
+            return 1
+        return 0
+
+    value = parse_value(args.value)
+    default = DEFAULT_CONFIG.get(args.key)
+    if default is not None and type(value) is not type(default) and \
+            not ((isinstance(default, float) or args.key in FRACTIONAL_SETTINGS) and isinstance(value, (int, float))):
+        print(f"{args.key} expects {type(default).__name__}, got {json.dumps(value)}", file=sys.stderr)
+        return 2
+    if args.key in POSITIVE_SETTINGS and isinstance(value, (int, float)) and value <= 0:
+        print(POSITIVE_SETTINGS[args.key], file=sys.stderr)
+        return 2
+    if args.key not in config:
+        print(f"Note: {args.key} is not a known setting; saving it anyway", file=sys.stderr)
+    config[args.key] = value
+    config.save()
+    print(f"{args.key} = {json.dumps(value)}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="zoom-auto-leaver",
+                                     description="Leave Zoom meetings when the participant count drops")
+    parser.add_argument("--config", default="config.json", help="configuration file (default: config.json)")
+    parser.add_argument("--platform", choices=("windows", "macos", "linux"), default=current_platform(),
+                        help="platform backend (default: this machine's)")
+    parser.add_argument("--display", help="X display for the Linux backend (default: $DISPLAY)")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    commands.required = True
+
+    monitor = commands.add_parser("monitor", help="monitor until the meeting is left")
+    monitor.add_argument("--threshold", type=positive(int), help="participant threshold for this run")
+    monitor.add_argument("--interval", type=positive(float), help="check interval in seconds for this run")
+    monitor.add_argument("--quiet", action="store_true", help="don't log activity")
+    monitor.set_defaults(handler=cmd_monitor)
+
+    detect = commands.add_parser("detect", help="one-shot window scan and participant count")
+    detect.add_argument("--json", action="store_true", help="print JSON")
+    detect.add_argument("--pretty", action="store_true", help="indent the JSON")
+    detect.set_defaults(handler=cmd_detect)
+
+    status = commands.add_parser("status", help="read the running monitor's status page")
+    status.add_argument("--json", action="store_true", help="print JSON")
+    status.add_argument("--format", help='format string, e.g. "{count}/{threshold} {state}"')
+    status.add_argument("--watch", type=float, metavar="SECONDS", help="print again every SECONDS until interrupted")
+    status.set_defaults(handler=cmd_status)
+
+    profile = commands.add_parser("profile", help="ask the running monitor for a stack profile (SIGUSR1)")
+    profile.add_argument("--pid", type=int, help="process to profile (default: the monitor on the status page)")
+    profile.set_defaults(handler=cmd_profile)
+
+    replay = commands.add_parser("replay", help="run recorded data through detection")
+    replay_kinds = replay.add_subparsers(dest="kind", metavar="KIND")
+    replay_kinds.required = True
+    replay_log = replay_kinds.add_parser("log", help="feed a Zoom client log through the participant tally")
+    replay_log.add_argument("file")
+    replay_log.add_argument("--json", action="store_true", help="print JSON")
+    replay_log.set_defaults(handler=cmd_replay_log)
+    replay_region = replay_kinds.add_parser("region", help="benchmarks/replay_region.py (arguments passed on)")
+    replay_region.set_defaults(handler=cmd_replay_region)
+
+    bench = commands.add_parser("bench", help="run a benchmark script (arguments passed on)")
+    bench.add_argument("suite", nargs="?", choices=sorted(BENCH_SCRIPTS), default="run")
+    bench.set_defaults(handler=cmd_bench)
+
+    config = commands.add_parser("config", help="read or change config.json")
+    config_actions = config.add_subparsers(dest="action", metavar="ACTION")
+    config_actions.required = True
+    config_get = config_actions.add_parser("get", help="print one setting, or all of them")
+    config_get.add_argument("key", nargs="?")
+    config_set = config_actions.add_parser("set", help="change a setting (VALUE is parsed as JSON if possible)")
+    config_set.add_argument("key")
+    config_set.add_argument("value")
+    config.set_defaults(handler=cmd_config)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    command = args.command if args.command != "replay" else f"replay {args.kind}"
+    if command in PASS_THROUGH:
+        return args.handler(args, extra)
+    if extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    return args.handler(args)
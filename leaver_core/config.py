@@ -0,0 +1,82 @@
+"""
+Configuration model shared by every platform.
+"""
+
+import json
+import os
+
+DEFAULT_CONFIG = {
+    "participant_threshold": 5,
+    "check_interval": 10,  # seconds
+    "auto_start": False,
+    "log_activity": True,
+    "zoom_log_source": False,  # also read counts from the Zoom client's logs
+    "zoom_log_dir": "",  # empty: the client's default log directory
+    "screen_region": [],  # [left, top, width, height] to read the count from when titles have none
+    "profiles": [],  # per-meeting thresholds, see leaver_core/profiles.py
+    "profiles_file": "",  # optional JSON file with more profiles
+    "fleet_collector": "",  # e.g. "http://10.0.0.5:8765" to send status heartbeats
+    "fleet_host": "",  # name shown in the fleet summary (empty: hostname)
+    "fleet_interval": 5,  # seconds between heartbeat batches
+    "metrics_port": 0,  # localhost port for /metrics and /healthz (0: off)
+    "hooks": [],  # webhook / script / pipe targets for events, see leaver_core/hooks.py
+    "hook_near_margin": 2,  # threshold_near fires when the count is this close above the threshold
+    "hook_detection_failures": 3,  # detection_failed fires after this many checks in a row without a count
+    "hook_drain_seconds": 2,  # how long stopping waits for queued hook events to be delivered
+    "prearm_seconds": 0,  # pre-arm the leave when the count trend reaches the threshold this soon (0: off)
+    "prearm_interval": 1,  # seconds between checks while pre-armed
+    "leave_confirmations": 1,  # checks in a row at or below the threshold before leaving
+    "trace_file": "",  # CSV file to record every check's count to, for tools/threshold_sweep.py
+    "checkpoint_file": "",  # session state to resume from after a crash (empty: off)
+    "checkpoint_interval": 5,  # seconds between checkpoint writes at most
+    "checkpoint_max_age": 600,  # seconds a checkpoint stays good for resuming
+    "instance_lock": "",  # lock file electing one monitor per config to sample and leave (empty: off)
+    "instance_poll": 1,  # seconds between a follower's attempts to take over
+    "status_page": "",  # memory-mapped status record for other programs to read (empty: off)
+    "span_trace": "",  # Chrome trace JSON of recent ticks and leaves, written when a leave fails or is slow (empty: off)
+    "span_buffer": 16384,  # spans kept for span_trace (the oldest are overwritten)
+    "span_slow_leave": 5,  # also write span_trace when a leave takes longer than this many seconds (0: failures only)
+    "profile_file": "",  # collapsed stacks written on SIGUSR1 or GET /profile (empty: monitor_profile.folded)
+    "profile_seconds": 30,  # how long a SIGUSR1 profile samples
+    "profile_rate": 50  # stack samples a second while profiling
+}
+
+
+class LeaverConfig(dict):
+    """Configuration dict bound to a JSON file
+
+    Values are merged over the defaults on load and updated in place, so code
+    holding a reference to the config always sees the current values.
+    """
+
+    def __init__(self, config_file="config.json", defaults=None):
+        super().__init__()
+        self.config_file = config_file
+        self.defaults = {**DEFAULT_CONFIG, **(defaults or {})}
+
+    def load(self):
+        """Load configuration from JSON file"""
+        config = dict(self.defaults)
+        if os.path.exists(self.config_file):
+            try:
+                with open(self.config_file, 'r') as f:
+                    # Merge with defaults
+                    config.update(json.load(f))
+            except Exception as e:
+                print(f"Error loading config: {e}")
+                config = dict(self.defaults)
+            self.clear()
+            self.update(config)
+        else:
+            self.clear()
+            self.update(config)
+            self.save()
+        return self
+
+    def save(self):
+        """Save current configuration to JSON file"""
+        try:
+            with open(self.config_file, 'w') as f:
+                json.dump(dict(self), f, indent=4)
+        except Exception as e:
+            print(f"Error saving config: {e}")
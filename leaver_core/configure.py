@@ -0,0 +1,87 @@
+"""
+Interactive (input()-driven) configuration menu shared by the console UIs.
+"""
+
+
+class ConfigOption:
+    """An extra, platform-specific entry in the configuration menu"""
+
+    def __init__(self, menu_label, summary_label, key, default, handler):
+        self.menu_label = menu_label
+        self.summary_label = summary_label
+        self.key = key
+        self.default = default
+        self.handler = handler  # handler(config) edits the config interactively
+
+
+def _read_positive_int(prompt, error):
+    """Prompt for a positive integer; returns None after printing an error"""
+    try:
+        value = int(input(prompt))
+    except ValueError:
+        print("Please enter a valid number")
+        return None
+    if value <= 0:
+        print(error)
+        return None
+    return value
+
+
+def interactive_configure(config, title="Zoom Auto Leaver", extra_options=()):
+    """Interactive configuration"""
+    print(f"\n=== {title} Configuration ===")
+    print(f"Current threshold: {config['participant_threshold']}")
+    print(f"Current check interval: {config['check_interval']} seconds")
+    print(f"Auto-start monitoring: {config['auto_start']}")
+    print(f"Log activity: {config['log_activity']}")
+    for option in extra_options:
+        print(f"{option.summary_label}: {config.get(option.key, option.default)}")
+
+    save_choice = str(5 + len(extra_options))
+
+    while True:
+        print("\nConfiguration options:")
+        print("1. Set participant threshold")
+        print("2. Set check interval")
+        print("3. Toggle auto-start")
+        print("4. Toggle logging")
+        for number, option in enumerate(extra_options, start=5):
+            print(f"{number}. {option.menu_label}")
+        print(f"{save_choice}. Save and return to main menu")
+
+        choice = input(f"\nEnter your choice (1-{save_choice}): ").strip()
+
+        if choice == '1':
+            threshold = _read_positive_int(
+                f"Enter participant threshold (current: {config['participant_threshold']}): ",
+                "Threshold must be greater than 0")
+            if threshold is not None:
+                config['participant_threshold'] = threshold
+                print(f"Threshold set to {threshold}")
+
+        elif choice == '2':
+            interval = _read_positive_int(
+                f"Enter check interval in seconds (current: {config['check_interval']}): ",
+                "Interval must be greater than 0")
+            if interval is not None:
+                config['check_interval'] = interval
+                print(f"Check interval set to {interval} seconds")
+
+        elif choice == '3':
+            config['auto_start'] = not config['auto_start']
+            print(f"Auto-start set to {config['auto_start']}")
+
+        elif choice == '4':
+            config['log_activity'] = not config['log_activity']
+            print(f"Logging set to {config['log_activity']}")
+
+        elif choice == save_choice:
+            config.save()
+            print("Configuration saved!")
+            break
+
+        elif choice.isdigit() and 5 <= int(choice) < 5 + len(extra_options):
+            extra_options[int(choice) - 5].handler(config)
+
+        else:
+            print("Invalid choice. Please try again.")
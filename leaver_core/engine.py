@@ -0,0 +1,37 @@
+"""
+Leave decision engine.
+"""
+
+ACTION_WAIT = "wait"        # count known, above the threshold
+ACTION_LEAVE = "leave"      # count at or below the threshold
+ACTION_UNKNOWN = "unknown"  # no count could be determined
+
+
+class DecisionEngine:
+    """Decides what the monitor should do with each participant count"""
+
+    def __init__(self, config):
+        self.config = config
+
+    @property
+    def threshold(self):
+        return self.config['participant_threshold']
+
+    def threshold_for(self, profile=None):
+        """The threshold in effect for a meeting's profile (None: never leave)"""
+        if profile is None:
+            return self.threshold
+        if not profile.auto_leave:
+            return None
+        if profile.participant_threshold is not None:
+            return profile.participant_threshold
+        return self.threshold
+
+    def decide(self, participant_count, profile=None):
+        """Return the action for a participant count (None when unknown)"""
+        if participant_count is None:
+            return ACTION_UNKNOWN
+        threshold = self.threshold if profile is None else self.threshold_for(profile)
+        if threshold is not None and participant_count <= threshold:
+            return ACTION_LEAVE
+        return ACTION_WAIT
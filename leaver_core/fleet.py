@@ -0,0 +1,391 @@
+"""
+Fleet heartbeats: push monitor status from many machines to one collector.
+
+Each monitor can carry a HeartbeatAgent next to its status bus. The agent
+takes the same status events (publish() has the StatusBus signature), turns
+them into compact heartbeat rows and queues them in memory. A background
+thread sends everything queued every few seconds as one gzip-compressed
+JSON batch. The monitor thread never waits on the network. When the queue
+is full, the oldest rows are dropped. When the collector is unreachable,
+the batch is dropped and the agent backs off.
+
+The collector keeps a bounded history per host in memory and serves it over
+HTTP:
+
+    POST /heartbeat     a batch from an agent (gzip or plain JSON, at most
+                        MAX_BODY bytes before and after decompressing)
+    GET  /fleet         one summary line per host
+    GET  /hosts/<host>  that host's recent heartbeats
+
+Run it with tools/fleet_collector.py. benchmarks/fleet_sim.py runs a
+collector and many agents on one machine.
+"""
+
+import gzip
+import json
+import socket
+import threading
+import time
+import urllib.request
+import zlib
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .status_bus import EVENT_LEAVING, EVENT_STARTED, EVENT_STOPPED
+
+BATCH_VERSION = 1
+
+# Heartbeat rows are lists in this field order, to keep batches small
+FIELDS = ("seq", "time", "event", "monitoring", "count", "threshold", "tick_ms", "last_leave")
+
+DEFAULT_INTERVAL = 5.0     # seconds between sends
+DEFAULT_QUEUE_SIZE = 256   # rows kept while the collector is slow or down
+MAX_BACKOFF = 60.0         # longest wait between sends after failures
+SEND_TIMEOUT = 2.0
+
+DEFAULT_PORT = 8765
+DEFAULT_HISTORY = 120      # heartbeats kept per host
+DEFAULT_MAX_HOSTS = 1000
+STALE_AFTER = 30.0         # seconds without a heartbeat before a host is stale
+MAX_BODY = 1024 * 1024
+
+
+def encode_batch(host, rows):
+    """Serialize a batch of heartbeat rows as gzip-compressed JSON"""
+    batch = {"v": BATCH_VERSION, "host": host, "fields": FIELDS, "rows": rows}
+    return gzip.compress(json.dumps(batch, separators=(",", ":")).encode(), compresslevel=6)
+
+
+def gunzip(body, limit=MAX_BODY):
+    """Decompress a gzip body, refusing one that inflates past limit bytes"""
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    data = decompressor.decompress(body, limit + 1)  # Stops after limit + 1 bytes of output
+    if len(data) > limit:
+        raise ValueError(f"more than {limit} bytes uncompressed")
+    if not decompressor.eof:
+        raise ValueError("truncated gzip data")
+    return data
+
+
+def decode_batch(body, compressed=True):
+    """Parse a batch; returns (host, [heartbeat dicts])"""
+    if compressed:
+        body = gunzip(body)
+    batch = json.loads(body)
+    fields = batch.get("fields") or FIELDS
+    return str(batch["host"]), [dict(zip(fields, row)) for row in batch.get("rows", ())]
+
+
+def http_sender(url, timeout=SEND_TIMEOUT):
+    """Return a send(body) function that POSTs a batch to a collector URL"""
+    endpoint = url.rstrip("/") + "/heartbeat"
+
+    def send(body):
+        request = urllib.request.Request(endpoint, data=body, method="POST", headers={
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip",
+        })
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+
+    return send
+
+
+class HeartbeatAgent:
+    """Queues status events as heartbeats and sends them in batches from a thread"""
+
+    def __init__(self, send, host=None, interval=DEFAULT_INTERVAL, queue_size=DEFAULT_QUEUE_SIZE, log=None):
+        self.send = send  # send(body) -> raises on failure
+        self.host = host or socket.gethostname()
+        self.interval = interval
+        self.log = log
+        self._queue = deque(maxlen=queue_size)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._generation = 0  # Bumped by close(); the sender thread of an older one exits
+        self.monitoring = False
+        self.threshold = None
+        self.last_leave = None
+        self.sequence = 0
+        self.dropped = 0        # rows pushed out of a full queue
+        self.sent_batches = 0
+        self.sent_rows = 0
+        self.sent_bytes = 0
+        self.failed_batches = 0
+        self.failed_rows = 0
+
+    def publish(self, kind, participant_count=None, threshold=None, tick_latency=None, message=None):
+        """Queue a heartbeat for a status event (never blocks on the network)"""
+        now = time.time()
+        with self._lock:
+            if kind == EVENT_STARTED:
+                self.monitoring = True
+            elif kind == EVENT_STOPPED:
+                self.monitoring = False
+            elif kind == EVENT_LEAVING:
+                self.last_leave = now
+            if threshold is not None:
+                self.threshold = threshold
+            self.sequence += 1
+            queue = self._queue
+            if len(queue) == queue.maxlen:
+                self.dropped += 1
+            queue.append([self.sequence, round(now, 3), kind, self.monitoring, participant_count,
+                          self.threshold, round(tick_latency * 1000, 2) if tick_latency is not None else None,
+                          self.last_leave])
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, args=(self._generation,),
+                                                name="heartbeat-agent", daemon=True)
+                self._thread.start()
+        if kind == EVENT_STOPPED:
+            self._wake.set()  # Report the stop right away
+
+    def _take(self):
+        with self._lock:
+            rows = list(self._queue)
+            self._queue.clear()
+        return rows
+
+    def flush(self):
+        """Send everything queued now; returns True if the batch went out (or was empty)"""
+        rows = self._take()
+        if not rows:
+            return True
+        body = encode_batch(self.host, rows)
+        try:
+            self.send(body)
+        except Exception as e:
+            # Drop the batch rather than hold rows for a collector that may never come back
+            self.failed_batches += 1
+            self.failed_rows += len(rows)
+            if self.log and self.failed_batches == 1:
+                self.log(f"Fleet collector unreachable ({e}). Dropping heartbeats until it is back.")
+            return False
+        self.sent_batches += 1
+        self.sent_rows += len(rows)
+        self.sent_bytes += len(body)
+        return True
+
+    def _run(self, generation):
+        delay = self.interval
+        while generation == self._generation:
+            self._wake.wait(delay)
+            if generation != self._generation:
+                break  # close() sends the rest itself
+            self._wake.clear()
+            if self.flush():
+                delay = self.interval
+            else:
+                delay = min(delay * 2, MAX_BACKOFF)
+
+    def close(self, flush=True):
+        """Stop the sender thread and send what is queued
+
+        The agent can be used again; the next heartbeat starts a new thread.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._generation += 1
+        self._wake.set()
+        if thread is not None:
+            thread.join(timeout=SEND_TIMEOUT * 2)
+        self._wake.clear()
+        if flush:
+            self.flush()
+
+    def stats(self):
+        return {
+            "host": self.host,
+            "queued": len(self._queue),
+            "dropped": self.dropped,
+            "sent_batches": self.sent_batches,
+            "sent_rows": self.sent_rows,
+            "sent_bytes": self.sent_bytes,
+            "failed_batches": self.failed_batches,
+            "failed_rows": self.failed_rows,
+        }
+
+
+_TICK_MS_TYPES = {int, float, type(None)}  # Exact types: a bool is not a latency
+
+
+def _heartbeat_problem(beat):
+    """Why a heartbeat can't be stored (None if it can)"""
+    if not isinstance(beat, dict):
+        return "not an object"
+    seq = beat.get("seq")
+    if isinstance(seq, bool) or not isinstance(seq, int):
+        return f"seq must be a whole number, not {seq!r}"
+    tick_ms = beat.get("tick_ms")
+    if tick_ms is not None and (isinstance(tick_ms, bool) or not isinstance(tick_ms, (int, float))):
+        return f"tick_ms must be a number, not {tick_ms!r}"
+    return None
+
+
+class HostRecord:
+    """Recent heartbeats of one host"""
+
+    __slots__ = ("host", "history", "last_seen", "received", "gaps", "last_seq")
+
+    def __init__(self, host, history):
+        self.host = host
+        self.history = deque(maxlen=history)
+        self.last_seen = 0.0
+        self.received = 0
+        self.gaps = 0  # heartbeats the agent produced but the collector never got
+        self.last_seq = None
+
+    def summary(self, now):
+        latest = self.history[-1] if self.history else {}
+        latencies = sorted(beat["tick_ms"] for beat in self.history if beat.get("tick_ms") is not None)
+        age = now - self.last_seen
+        return {
+            "host": self.host,
+            "age": round(age, 1),
+            "stale": age > STALE_AFTER,
+            "monitoring": latest.get("monitoring"),
+            "count": latest.get("count"),
+            "threshold": latest.get("threshold"),
+            "last_leave": latest.get("last_leave"),
+            "tick_ms_median": latencies[len(latencies) // 2] if latencies else None,
+            "tick_ms_max": latencies[-1] if latencies else None,
+            "received": self.received,
+            "missed": self.gaps,
+        }
+
+
+class FleetCollector:
+    """In-memory fleet state: bounded heartbeat history per host"""
+
+    def __init__(self, history=DEFAULT_HISTORY, max_hosts=DEFAULT_MAX_HOSTS):
+        self.history = history
+        self.max_hosts = max_hosts
+        self.hosts = OrderedDict()  # host -> HostRecord, least recently seen first
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.evicted = 0
+        self.rejected = 0  # batches refused for a malformed heartbeat
+
+    def ingest(self, host, heartbeats, now=None):
+        """Record a batch of heartbeats from one host
+
+        Raises ValueError, storing nothing, if any heartbeat is malformed:
+        one bad value in the history would break every later summary.
+        """
+        now = time.time() if now is None else now
+        tick_ms_types = _TICK_MS_TYPES
+        for number, beat in enumerate(heartbeats):
+            # type() checks keep this cheap for good batches; _heartbeat_problem says what is wrong
+            if type(beat) is not dict or type(beat.get("seq")) is not int or \
+                    type(beat.get("tick_ms")) not in tick_ms_types:
+                with self._lock:
+                    self.rejected += 1
+                raise ValueError(f"heartbeat {number}: {_heartbeat_problem(beat) or 'not a plain object'}")
+        with self._lock:
+            record = self.hosts.get(host)
+            if record is None:
+                if len(self.hosts) >= self.max_hosts:
+                    self.hosts.popitem(last=False)
+                    self.evicted += 1
+                self.hosts[host] = record = HostRecord(host, self.history)
+            else:
+                self.hosts.move_to_end(host)
+            for beat in heartbeats:
+                seq = beat.get("seq")
+                if record.last_seq is not None and seq > record.last_seq + 1:
+                    record.gaps += seq - record.last_seq - 1
+                record.last_seq = seq
+                record.history.append(beat)
+            record.received += len(heartbeats)
+            record.last_seen = now
+            self.batches += 1
+
+    def summary(self, now=None):
+        """Fleet overview: totals and one line per host"""
+        now = time.time() if now is None else now
+        with self._lock:
+            hosts = [record.summary(now) for record in self.hosts.values()]
+        return {
+            "hosts": len(hosts),
+            "monitoring": sum(1 for host in hosts if host["monitoring"] and not host["stale"]),
+            "stale": sum(1 for host in hosts if host["stale"]),
+            "batches": self.batches,
+            "evicted": self.evicted,
+            "rejected": self.rejected,
+            "fleet": sorted(hosts, key=lambda host: host["host"]),
+        }
+
+    def host_history(self, host):
+        """Recent heartbeats of one host (None if unknown)"""
+        with self._lock:
+            record = self.hosts.get(host)
+            return list(record.history) if record is not None else None
+
+
+class CollectorHandler(BaseHTTPRequestHandler):
+    """HTTP front end of a FleetCollector (set as the server's collector)"""
+
+    def log_message(self, format, *args):
+        pass  # One line per heartbeat batch is too much
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if self.path != "/heartbeat":
+            return self._reply(404, {"error": "not found"})
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0 or length > MAX_BODY:
+            return self._reply(413, {"error": "bad body size"})
+        try:
+            body = self.rfile.read(length)
+            host, heartbeats = decode_batch(body, self.headers.get("Content-Encoding") == "gzip")
+            self.server.collector.ingest(host, heartbeats)
+        except Exception as e:
+            return self._reply(400, {"error": f"bad batch: {e}"})
+        self._reply(200, {"ok": True, "received": len(heartbeats)})
+
+    def do_GET(self):
+        collector = self.server.collector
+        if self.path in ("/", "/fleet"):
+            return self._reply(200, collector.summary())
+        if self.path.startswith("/hosts/"):
+            history = collector.host_history(urllib.request.unquote(self.path[len("/hosts/"):]))
+            if history is None:
+                return self._reply(404, {"error": "unknown host"})
+            return self._reply(200, {"fields": FIELDS, "heartbeats": history})
+        self._reply(404, {"error": "not found"})
+
+
+class CollectorServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the collector its handlers use"""
+
+    daemon_threads = True
+    request_queue_size = 128  # A whole fleet may send at the same moment
+
+    def __init__(self, address, collector):
+        super().__init__(address, CollectorHandler)
+        self.collector = collector
+
+
+def make_collector_server(collector, bind="127.0.0.1", port=DEFAULT_PORT):
+    """An HTTP server for a collector; call serve_forever() (port 0 picks a free port)"""
+    return CollectorServer((bind, port), collector)
+
+
+def create_heartbeat_agent(config, log=None):
+    """Build a HeartbeatAgent when fleet_collector is configured (None otherwise)"""
+    url = config.get("fleet_collector")
+    if not url:
+        return None
+    agent = HeartbeatAgent(http_sender(url), host=config.get("fleet_host") or None,
+                           interval=config.get("fleet_interval", DEFAULT_INTERVAL), log=log)
+    if log:
+        log(f"Sending fleet heartbeats as '{agent.host}' to {url}")
+    return agent
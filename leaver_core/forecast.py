@@ -0,0 +1,184 @@
+"""
+Count-trend forecasting that pre-arms the leave before the threshold is crossed.
+
+TrendForecaster fits an exponentially weighted linear regression to the
+recent participant counts and estimates when the count will reach the
+threshold. When that is less than prearm_seconds away, LeavePrearm asks
+the adapter to prepare() the leave (import pyautogui, resolve the window to
+focus, warm helper processes) and shortens the poll interval to
+prearm_interval, so the leave starts sooner after the crossing and
+does none of that setup itself.
+
+Each arming ends in one of three ways, counted in the metrics:
+    hit      the leave happened while armed
+    expired  the count recovered, the meeting changed or ended first
+    unarmed  a leave happened without a prior arming (forecast missed it)
+"""
+
+import math
+import time
+
+from .metrics import PREARM_SECONDS, PREARMS
+
+DEFAULT_HALF_LIFE = 60.0   # seconds; older counts weigh half as much per half-life
+MIN_POINTS = 3             # counts needed before the trend is trusted
+EXPIRE_FACTOR = 2          # disarm when the crossing moves this many horizons away
+
+
+class TrendForecaster:
+    """Exponentially weighted linear regression of the count over time"""
+
+    def __init__(self, half_life=DEFAULT_HALF_LIFE, min_points=MIN_POINTS):
+        self.half_life = half_life
+        self.min_points = min_points
+        self.reset()
+
+    def reset(self):
+        self.origin = None  # Time of the first count; times are kept relative to it
+        self.last = None
+        self.points = 0
+        # Decayed sums of w, w*t, w*c, w*t*t, w*t*c
+        self.s0 = self.st = self.sc = self.stt = self.stc = 0.0
+
+    def observe(self, now, count):
+        if self.origin is None:
+            self.origin = self.last = now
+        decay = math.pow(0.5, max(0.0, now - self.last) / self.half_life)
+        t = now - self.origin
+        self.s0 = self.s0 * decay + 1.0
+        self.st = self.st * decay + t
+        self.sc = self.sc * decay + count
+        self.stt = self.stt * decay + t * t
+        self.stc = self.stc * decay + t * count
+        self.last = now
+        self.points += 1
+
+    def trend(self):
+        """(level at the last count, slope in participants per second), or None"""
+        if self.points < self.min_points:
+            return None
+        denominator = self.s0 * self.stt - self.st * self.st
+        if denominator <= 1e-9:
+            return None
+        slope = (self.s0 * self.stc - self.st * self.sc) / denominator
+        intercept = (self.sc - slope * self.st) / self.s0
+        return intercept + slope * (self.last - self.origin), slope
+
+    def eta(self, threshold):
+        """Estimated seconds from the last count until it reaches threshold (None: not heading there)"""
+        trend = self.trend()
+        if trend is None or threshold is None:
+            return None
+        level, slope = trend
+        if level <= threshold:
+            return 0.0
+        if slope >= 0:
+            return None
+        return (level - threshold) / -slope
+
+
+class LeavePrearm:
+    """Arms the adapter's leave path when the forecast crossing is near"""
+
+    def __init__(self, adapter, horizon, interval, half_life=DEFAULT_HALF_LIFE, log=None):
+        self.adapter = adapter
+        self.horizon = horizon
+        self.interval = interval
+        self.forecaster = TrendForecaster(half_life)
+        self.log = log
+        self.meeting_key = None
+        self.armed_at = None  # Time the current arming started
+        self.hits = 0
+        self.expired = 0
+        self.unarmed = 0
+        self.prepare_seconds = 0.0  # Setup time moved off the leave path, summed over hits
+        self.lead_seconds = 0.0     # Time between arming and the leave, summed over hits
+        self._pending_prepare = 0.0
+
+    @classmethod
+    def from_config(cls, adapter, config, log=None):
+        """Build a LeavePrearm from the config (None when prearm_seconds is 0)"""
+        horizon = config.get("prearm_seconds", 0)
+        if not horizon:
+            return None
+        return cls(adapter, horizon, config.get("prearm_interval", 1), log=log)
+
+    @property
+    def armed(self):
+        return self.armed_at is not None
+
+    def update(self, meeting_key, count, threshold, windows=None):
+        """Feed one tick's count; arms or expires the leave path as the forecast moves"""
+        if count is None or meeting_key != self.meeting_key:
+            self._expire()
+            self.forecaster.reset()
+            self.meeting_key = meeting_key
+            if count is None:
+                return
+        now = time.time()
+        self.forecaster.observe(now, count)
+        if threshold is None:
+            self._expire()
+            return
+        eta = self.forecaster.eta(threshold)
+        if not self.armed:
+            # Arm only ahead of the crossing; a tick already at the threshold leaves unarmed
+            if eta is not None and eta <= self.horizon and count > threshold:
+                self._arm(now, eta, windows)
+        elif eta is None or eta > self.horizon * EXPIRE_FACTOR:
+            self._expire()
+
+    def _arm(self, now, eta, windows):
+        start = time.perf_counter()
+        try:
+            self.adapter.prepare(windows)
+        except Exception as e:
+            if self.log:
+                self.log(f"Error pre-arming leave: {e}")
+        self._pending_prepare = time.perf_counter() - start
+        PREARM_SECONDS.observe(self._pending_prepare)
+        PREARMS.labels("armed").inc()
+        self.armed_at = now
+        if self.log:
+            self.log(f"Count heading for the threshold in ~{eta:.0f}s; leave pre-armed "
+                     f"in {self._pending_prepare * 1000:.0f} ms, polling every {self.interval}s")
+
+    def _expire(self):
+        if self.armed:
+            self.expired += 1
+            PREARMS.labels("expired").inc()
+            self.armed_at = None
+            self.adapter.disarm()
+
+    def leaving(self):
+        """Record a leave attempt: a hit if armed, unarmed otherwise"""
+        if self.armed:
+            lead = time.time() - self.armed_at
+            self.hits += 1
+            self.prepare_seconds += self._pending_prepare
+            self.lead_seconds += lead
+            PREARMS.labels("hit").inc()
+            if self.log:
+                self.log(f"Leave was pre-armed {lead:.0f}s ahead "
+                         f"({self._pending_prepare * 1000:.0f} ms of setup done early)")
+        else:
+            self.unarmed += 1
+            PREARMS.labels("unarmed").inc()
+        self.armed_at = None
+        self.forecaster.reset()
+        self.meeting_key = None
+
+    def wait_interval(self, check_interval):
+        """Poll interval for the next wait: shortened while armed"""
+        return min(check_interval, self.interval) if self.armed else check_interval
+
+    def stats(self):
+        outcomes = self.hits + self.expired + self.unarmed
+        return {
+            "hits": self.hits,
+            "expired": self.expired,
+            "unarmed": self.unarmed,
+            "hit_rate": round(self.hits / outcomes, 3) if outcomes else None,
+            "mean_prepare_ms": round(self.prepare_seconds / self.hits * 1000, 2) if self.hits else None,
+            "mean_lead_seconds": round(self.lead_seconds / self.hits, 1) if self.hits else None,
+        }
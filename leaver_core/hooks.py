@@ -0,0 +1,332 @@
+"""
+Event hooks: tell other systems when a meeting nears its threshold, when
+it is left, or when detection keeps failing.
+
+Hooks are configured in the "hooks" list of config.json:
+
+    {"hooks": [
+        {"type": "webhook", "url": "http://127.0.0.1:9000/zoom", "events": ["left"]},
+        {"type": "script", "command": ["/usr/local/bin/notify", "--zoom"], "timeout": 10},
+        {"type": "pipe", "path": "/tmp/zoom_events"}
+    ]}
+
+Each event is a JSON object ({"event": "left", "time": ..., "host": ...,
+"count": 3, ...}). A webhook gets it as a POST body, a script on stdin (and
+the event name in ZOOM_LEAVER_EVENT), and a pipe as one line.
+
+emit() only appends the event to each interested hook's bounded queue and
+returns; a small pool of worker threads delivers them with each hook's
+timeout and retries. When a hook's queue is full the event is dropped and
+counted for that hook, so a slow or hanging hook can never hold up
+detection or a leave.
+"""
+
+import json
+import os
+import shlex
+import socket
+import subprocess
+import threading
+import time
+import urllib.request
+from collections import deque
+
+from .metrics import HOOK_DELIVERIES, HOOK_SECONDS
+
+# Event names
+HOOK_THRESHOLD_NEAR = "threshold_near"      # count came within near_margin of the threshold
+HOOK_LEAVING = "leaving"                    # threshold reached, leave sequence starting
+HOOK_LEFT = "left"                          # leave sequence succeeded
+HOOK_LEAVE_FAILED = "leave_failed"          # leave sequence failed (will be retried)
+HOOK_DETECTION_FAILED = "detection_failed"  # no count for detection_failures ticks in a row
+HOOK_EVENTS = (HOOK_THRESHOLD_NEAR, HOOK_LEAVING, HOOK_LEFT, HOOK_LEAVE_FAILED, HOOK_DETECTION_FAILED)
+
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_RETRIES = 2
+RETRY_DELAY = 0.5        # doubled after every failed attempt
+MAX_WORKERS = 4          # default pool: one per hook, up to this many
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_NEAR_MARGIN = 2
+DEFAULT_DETECTION_FAILURES = 3
+DEFAULT_DRAIN_SECONDS = 2.0  # How long a finished monitor waits for queued events to be delivered
+
+
+class Hook:
+    """One configured hook target, with its own delivery counters"""
+
+    kind = "hook"
+
+    def __init__(self, name=None, events=None, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES):
+        self.name = name or self.default_name()
+        self.events = frozenset(events) if events else None  # None: every event
+        self.timeout = timeout
+        self.retries = retries
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.retried = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_error = None
+        self.pending = deque()  # Events waiting for delivery (managed by HookDispatcher)
+        self.busy = False
+
+    def default_name(self):
+        return self.kind
+
+    def wants(self, event_name):
+        return self.events is None or event_name in self.events
+
+    def deliver(self, payload):
+        """Send one encoded event; raises on failure"""
+        raise NotImplementedError
+
+    def stats(self):
+        attempts = self.delivered + self.failed
+        return {
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "retried": self.retried,
+            "mean_ms": round(self.total_seconds / attempts * 1000, 2) if attempts else None,
+            "max_ms": round(self.max_seconds * 1000, 2),
+            "last_error": self.last_error,
+        }
+
+
+class WebhookHook(Hook):
+    """POSTs the event as JSON to a URL"""
+
+    kind = "webhook"
+
+    def __init__(self, url, **options):
+        self.url = url
+        super().__init__(**options)
+
+    def default_name(self):
+        return f"webhook:{self.url}"
+
+    def deliver(self, payload):
+        request = urllib.request.Request(self.url, data=payload, method="POST",
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class ScriptHook(Hook):
+    """Runs a command with the event on stdin (killed after the timeout)"""
+
+    kind = "script"
+
+    def __init__(self, command, **options):
+        self.command = shlex.split(command) if isinstance(command, str) else list(command)
+        super().__init__(**options)
+
+    def default_name(self):
+        return f"script:{os.path.basename(self.command[0]) if self.command else '?'}"
+
+    def deliver(self, payload):
+        event_name = json.loads(payload)["event"]
+        result = subprocess.run(self.command, input=payload, capture_output=True, timeout=self.timeout,
+                                env={**os.environ, "ZOOM_LEAVER_EVENT": event_name})
+        if result.returncode != 0:
+            raise RuntimeError(f"exit status {result.returncode}")
+
+
+class PipeHook(Hook):
+    """Writes the event as one line to a named pipe (or file)"""
+
+    kind = "pipe"
+
+    def __init__(self, path, **options):
+        self.path = path
+        super().__init__(**options)
+
+    def default_name(self):
+        return f"pipe:{self.path}"
+
+    def deliver(self, payload):
+        flags = os.O_WRONLY | os.O_APPEND
+        # Without a reader, a FIFO open would block; non-blocking it fails right away (ENXIO)
+        flags |= getattr(os, "O_NONBLOCK", 0)
+        fd = os.open(self.path, flags)
+        try:
+            os.write(fd, payload + b"\n")
+        finally:
+            os.close(fd)
+
+
+HOOK_TYPES = {"webhook": (WebhookHook, "url"), "script": (ScriptHook, "command"), "pipe": (PipeHook, "path")}
+
+
+def build_hook(entry):
+    """Create a Hook from a config entry"""
+    cls, target = HOOK_TYPES[entry["type"]]
+    return cls(entry[target], name=entry.get("name"), events=entry.get("events"),
+               timeout=entry.get("timeout", DEFAULT_TIMEOUT), retries=entry.get("retries", DEFAULT_RETRIES))
+
+
+class HookDispatcher:
+    """Queues hook events per hook and delivers them from a worker pool
+
+    Every hook has its own bounded queue and at most one delivery in flight,
+    so a hanging hook occupies one worker and fills only its own queue; the
+    other hooks keep being served by the remaining workers.
+    """
+
+    def __init__(self, hooks, workers=None, queue_size=DEFAULT_QUEUE_SIZE,
+                 near_margin=DEFAULT_NEAR_MARGIN, detection_failures=DEFAULT_DETECTION_FAILURES,
+                 host=None, log=None):
+        self.hooks = list(hooks)
+        self.workers = workers or max(1, min(len(self.hooks), MAX_WORKERS))
+        self.queue_size = queue_size
+        self.near_margin = near_margin
+        self.detection_failures = detection_failures
+        self.host = host or socket.gethostname()
+        self.log = log
+        self._ready = threading.Condition()
+        self._threads = []
+        self._cursor = 0  # Round-robin start, so no hook is always served first
+        self._closed = False
+        self._generation = 0  # Bumped by close(), so a worker still delivering then exits afterwards
+        self.emitted = 0
+
+    def emit(self, event_name, **fields):
+        """Queue an event for every hook that wants it; never blocks on delivery"""
+        hooks = [hook for hook in self.hooks if hook.wants(event_name)]
+        if not hooks:
+            return
+        event = {"event": event_name, "time": round(time.time(), 3), "host": self.host}
+        event.update(fields)
+        with self._ready:
+            if self._closed:
+                return
+            if not self._threads:
+                self._start()
+            self.emitted += 1
+            for hook in hooks:
+                if len(hook.pending) >= self.queue_size:
+                    hook.dropped += 1
+                    HOOK_DELIVERIES.labels(hook.name, "dropped").inc()
+                else:
+                    hook.pending.append(event)
+            self._ready.notify(len(hooks))
+
+    def _start(self):
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._work, args=(self._generation,), name=f"hook-worker-{number}",
+                                      daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _next_job(self):
+        """Pop the next event of a hook that is not busy (lock held)"""
+        hooks = self.hooks
+        for offset in range(len(hooks)):
+            hook = hooks[(self._cursor + offset) % len(hooks)]
+            if hook.pending and not hook.busy:
+                self._cursor = (self._cursor + offset + 1) % len(hooks)
+                hook.busy = True
+                return hook, hook.pending.popleft()
+        return None
+
+    def _work(self, generation):
+        while True:
+            with self._ready:
+                job = None
+                while job is None:
+                    if self._closed or generation != self._generation:
+                        return
+                    job = self._next_job()
+                    if job is None:
+                        self._ready.wait()
+            hook, event = job
+            try:
+                self._deliver(hook, event)
+            finally:
+                with self._ready:
+                    hook.busy = False
+                    self._ready.notify()  # The hook may have more events queued
+
+    def _deliver(self, hook, event):
+        payload = json.dumps(event).encode()
+        delay = RETRY_DELAY
+        for attempt in range(hook.retries + 1):
+            if attempt:
+                hook.retried += 1
+                time.sleep(delay)
+                delay *= 2
+            start = time.perf_counter()
+            try:
+                hook.deliver(payload)
+                error = None
+            except Exception as e:
+                error = e
+            elapsed = time.perf_counter() - start
+            hook.total_seconds += elapsed
+            hook.max_seconds = max(hook.max_seconds, elapsed)
+            HOOK_SECONDS.labels(hook.name).observe(elapsed)
+            if error is None:
+                hook.delivered += 1
+                HOOK_DELIVERIES.labels(hook.name, "ok").inc()
+                return True
+            hook.failed += 1
+            hook.last_error = str(error)
+            HOOK_DELIVERIES.labels(hook.name, "failed").inc()
+        if self.log:
+            self.log(f"Hook {hook.name} failed for '{event['event']}': {hook.last_error}")
+        return False
+
+    def pending(self):
+        """Events queued or being delivered"""
+        with self._ready:
+            return sum(len(hook.pending) + hook.busy for hook in self.hooks)
+
+    def wait(self, timeout=None):
+        """Block until every queued event has been handled (for tests and shutdown)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.pending():
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout=1.0):
+        """Stop the workers once the queued events are delivered; after the timeout the rest is discarded
+
+        A later emit() starts new workers, so a monitor can close its
+        dispatcher at the end of every run.
+        """
+        self.wait(timeout)
+        with self._ready:
+            self._closed = True
+            self._ready.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=0.1)
+        with self._ready:
+            for hook in self.hooks:
+                hook.pending.clear()
+            self._threads = []
+            self._generation += 1
+            self._closed = False
+
+    def stats(self):
+        return {hook.name: hook.stats() for hook in self.hooks}
+
+
+def create_hook_dispatcher(config, log=None):
+    """Build a HookDispatcher for the config's hooks (None if there are none)"""
+    hooks = []
+    for entry in config.get("hooks") or []:
+        try:
+            hooks.append(build_hook(entry))
+        except Exception as e:
+            if log:
+                log(f"Ignoring invalid hook {entry!r}: {e}")
+    if not hooks:
+        return None
+    if log:
+        log(f"Event hooks: {', '.join(hook.name for hook in hooks)}")
+    return HookDispatcher(hooks, near_margin=config.get("hook_near_margin", DEFAULT_NEAR_MARGIN),
+                          detection_failures=config.get("hook_detection_failures", DEFAULT_DETECTION_FAILURES),
+                          log=log)
@@ -0,0 +1,227 @@
+"""
+Single-instance coordination between monitors on one machine.
+
+Two copies of the monitor easily end up running at once: auto_start at
+login plus a manual run, or the menu bar app plus the CLI. Each would poll
+Zoom on its own and both would race to leave. Instead the copies sharing a
+config elect a leader through an OS lock on a file next to the config
+(flock on macOS and Linux, msvcrt.locking on Windows):
+
+    - the process holding the lock is the leader; it does all the sampling
+      and leaving, and whenever its state (count, threshold, meeting, state)
+      changes it publishes it to a small status file next to the lock
+    - every other process is a follower; it reads the status file instead
+      of polling Zoom and retries the lock every `poll` seconds
+    - the OS drops the lock when the leader exits or dies, so a follower
+      takes over within one poll interval (and resumes the leader's
+      session from its checkpoint, see leaver_core/checkpoint.py)
+    - when the leader has left the meeting, its followers stop as well
+
+The leader keeps the status file open and rewrites it in place, a single
+write instead of a temporary file and a rename per change. A follower that
+catches it half-written gets invalid JSON and reads it again at its next
+poll. The last state ("left" or "stopped") is the exception: followers act
+on it once the lock is free, so it replaces the file atomically, and a
+follower that gets the lock reads it again before taking over.
+The lock file is never deleted: removing a locked file would let a new
+process lock a different file of the same name.
+"""
+
+import json
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from .metrics import INSTANCE_ROLES
+from .status_bus import EVENT_STARTED, EVENT_TICK
+
+DEFAULT_POLL = 1.0  # seconds between a follower's attempts to take over
+
+# A monitor's role, shown by /healthz
+ROLE_LEADER = "leader"
+ROLE_FOLLOWER = "follower"
+
+# Leader states published in the status file
+STATE_MONITORING = "monitoring"
+STATE_LEAVING = "leaving"
+STATE_LEFT = "left"
+STATE_STOPPED = "stopped"
+
+
+class InstanceLock:
+    """Leader election over a lock file, plus the leader's status file"""
+
+    def __init__(self, path, poll=DEFAULT_POLL, log=None):
+        self.path = path
+        self.status_path = os.path.splitext(path)[0] + "_status.json"
+        self.poll = poll
+        self.log = log
+        self._file = None  # Open lock file while this process leads
+        self._status = None  # Open status file while this process leads
+        self._published = None  # (state, fields) last written to the status file
+        self.sequence = 0
+        self.publish_failures = 0
+
+    @classmethod
+    def from_config(cls, config, log=None):
+        """Build an InstanceLock for the config's instance_lock (None if unset)
+
+        A relative path is taken relative to the config file's directory.
+        """
+        path = config.get("instance_lock")
+        if not path:
+            return None
+        path = os.path.expanduser(path)
+        config_file = getattr(config, "config_file", None)
+        if not os.path.isabs(path) and config_file:
+            path = os.path.join(os.path.dirname(os.path.abspath(config_file)), path)
+        return cls(path, config.get("instance_poll", DEFAULT_POLL), log)
+
+    @property
+    def leading(self):
+        return self._file is not None
+
+    def acquire(self):
+        """Try to become the leader without blocking; returns whether this process leads"""
+        if self._file is not None or self.path is None:
+            return True
+        try:
+            f = open(self.path, "a+")
+        except Exception as e:
+            if self.log:
+                self.log(f"Error opening instance lock {self.path}: {e}; running without it")
+            self.path = None
+            return True
+        try:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            f.close()
+            return False
+        self._file = f
+        return True
+
+    def release(self):
+        """Give up the lead (the OS does the same when the process dies)"""
+        f, self._file = self._file, None
+        if f is None:
+            return
+        status, self._status = self._status, None
+        try:
+            if status is not None:
+                status.close()
+            if fcntl is None:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            f.close()
+        except Exception as e:
+            if self.log:
+                self.log(f"Error releasing instance lock {self.path}: {e}")
+
+    def publish(self, state, **fields):
+        """Rewrite the status file with the leader's current state (leader only)"""
+        if self._file is None or self.path is None:
+            return
+        published = (state, fields)
+        if published == self._published:
+            return  # Followers only need changes; the lock itself says the leader is alive
+        self._published = published
+        self.sequence += 1
+        document = {"pid": os.getpid(), "sequence": self.sequence, "updated_at": round(time.time(), 3),
+                    "state": state, **fields}
+        try:
+            if state in (STATE_LEFT, STATE_STOPPED):
+                self._replace_status(document)
+                return
+            if self._status is None:
+                # Not "w": truncating a file to zero makes some filesystems (ext4) flush it on close
+                self._status = open(os.open(self.status_path, os.O_RDWR | os.O_CREAT, 0o644), "w")
+            f = self._status
+            f.seek(0)
+            f.write(json.dumps(document, separators=(",", ":")))
+            f.truncate()
+            f.flush()
+        except Exception as e:
+            self.publish_failures += 1
+            if self.log and self.publish_failures == 1:
+                self.log(f"Error publishing instance status {self.status_path}: {e}")
+
+    def _replace_status(self, document):
+        """Write the status file whole through a temporary file and a rename"""
+        status, self._status = self._status, None
+        if status is not None:
+            status.close()
+        temporary = f"{self.status_path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(document, f, separators=(",", ":"))
+        os.replace(temporary, self.status_path)
+
+    def read(self):
+        """The leader's last published state, or None"""
+        try:
+            with open(self.status_path) as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+
+def follow(instance, monitor):
+    """Follow the leading monitor until this process leads; returns False if it should stop instead
+
+    Runs in Monitor.run() before the session starts. The leader's counts
+    are passed on to the monitor's status bus, so a follower's menu bar
+    keeps showing them.
+    """
+    if instance.acquire():
+        INSTANCE_ROLES.labels(ROLE_LEADER).inc()
+        monitor.role = ROLE_LEADER
+        return True
+    INSTANCE_ROLES.labels(ROLE_FOLLOWER).inc()
+    monitor.role = ROLE_FOLLOWER
+    since = time.time()
+    monitor.last_tick = since  # The lock we just missed says the leader is alive
+    state = instance.read()
+    leader = state.get("pid") if state else None
+    monitor.log(f"Another monitor is running{f' (pid {leader})' if leader else ''}; "
+                f"following it and taking over if it stops")
+    if monitor.status_bus is not None:
+        monitor.status_bus.publish(EVENT_STARTED, message="Following another monitor")
+    seen = None
+    try:
+        while monitor.running:
+            monitor.adapter.wait(instance.poll)
+            # Read before trying the lock: a leader publishes "left" before it lets go
+            state = instance.read()
+            key = (state.get("pid"), state.get("sequence")) if state else None
+            if key is not None and key != seen:
+                seen = key
+                if state.get("state") == STATE_LEFT and state.get("updated_at", 0) >= since:
+                    monitor.log(f"Meeting left by the leading monitor (pid {state.get('pid')}). Stopping monitor.")
+                    return False
+                monitor.last_count = state.get("count")
+                if monitor.status_bus is not None:
+                    monitor.status_bus.publish(EVENT_TICK, participant_count=state.get("count"),
+                                               threshold=state.get("threshold"))
+            monitor.last_tick = time.time()  # The leader is alive and checking for both of us
+            if instance.acquire():
+                # The leader's last state is whole once it has let go; it may have left after the read above
+                state = instance.read()
+                if state and state.get("state") == STATE_LEFT and state.get("updated_at", 0) >= since:
+                    instance.release()
+                    monitor.log(f"Meeting left by the leading monitor (pid {state.get('pid')}). Stopping monitor.")
+                    return False
+                INSTANCE_ROLES.labels("takeover").inc()
+                monitor.role = ROLE_LEADER
+                monitor.log("The leading monitor stopped; taking over")
+                return True
+    except KeyboardInterrupt:
+        monitor.log("Monitoring stopped by user")
+    return False
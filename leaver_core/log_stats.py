@@ -0,0 +1,301 @@
+"""
+Session statistics from the monitor's own log output.
+
+The monitor logs lines like
+
+    [2026-05-01 10:00:02] Starting Zoom Auto Leaver (Windows)...
+    [2026-05-01 10:00:02] Participant threshold: 5
+    [2026-05-01 10:00:02] Current participants: 14
+    [2026-05-01 10:47:12] Participant count (4) reached threshold (5)
+    [2026-05-01 10:47:13] Meeting left successfully. Stopping monitor.
+
+analyze_file() rebuilds the sessions (one per "Starting Zoom Auto Leaver")
+from captured stdout and returns one row per session:
+
+    start, end          Unix times of the session's first and last lines
+    duration            seconds between them
+    threshold           participant threshold the session ran with
+    ticks, peak, last   counts logged, the highest and the final one
+    threshold_at        start of the run of checks at or below the threshold
+                        that ended in the first leave
+    threshold_to_leave  seconds from threshold_at to that leave (None: never left)
+    attempts, failed    leave attempts and failed ones
+    meetings_left       meetings left (more than one with several meetings open)
+    outcome             left, stopped, error, restarted (a new session began
+                        without the old one stopping) or truncated (the file ended)
+
+Files are scanned in constant memory. A bytes regex finds the few event
+lines, and the count lines between two events are folded in bulk. Plain
+files are memory-mapped and scanned in windows of CHUNK_SIZE bytes, with
+the pages of each scanned window released. Other files (.gz logs, pipes)
+are read in chunks.
+Timestamps are parsed only where a session needs them. They are local
+time, read as if they were UTC, so differences are right except across
+a DST change. A session split across rotated files counts as two.
+
+analyze_logs() spreads files over a process pool; write_columns() stores
+the rows column by column.
+"""
+
+import calendar
+import csv
+import gzip
+import json
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+CHUNK_SIZE = 16 * 1024 * 1024
+
+COLUMNS = ("file", "start", "end", "duration", "threshold", "ticks", "peak", "last", "threshold_at",
+           "threshold_to_leave", "attempts", "failed", "meetings_left", "outcome")
+
+# Every line other than the counts; the group that matched (match.lastindex) says which
+EVENT = re.compile(
+    rb"\] (?:"
+    rb"Participant count \(\d+\) (reached|at) threshold"       # 1
+    rb"|Participant threshold: (\d+)"                           # 2
+    rb"|(Starting Zoom Auto Leaver)"                            # 3
+    rb"|(Meeting left successfully|Left .*?\. Still monitoring)"  # 4
+    rb"|(Failed to leave meeting)"                              # 5
+    rb"|(Monitoring stopped by user)"                           # 6
+    rb"|(Error in monitoring loop)"                             # 7
+    rb")")
+AT_THRESHOLD, THRESHOLD, STARTING, LEFT, FAILED, STOPPED, ERROR = range(1, 8)
+CLOSING = {LEFT: "left", STOPPED: "stopped", ERROR: "error"}
+
+COUNT_TEXT = b"] Current participants: "
+COUNT = re.compile(rb"\] Current participants: (\d+)")
+STAMP = 19  # len("YYYY-MM-DD HH:MM:SS")
+
+
+def _days(date, cache={}):
+    """Days since the epoch of a b"YYYY-MM-DD" date"""
+    days = cache.get(date)
+    if days is None:
+        days = cache[date] = calendar.timegm((int(date[:4]), int(date[5:7]), int(date[8:10]), 0, 0, 0)) // 86400
+    return days
+
+
+def parse_stamp(stamp):
+    """Seconds since the epoch of a b"YYYY-MM-DD HH:MM:SS" log timestamp (read as UTC)"""
+    return _days(stamp[:10]) * 86400 + int(stamp[11:13]) * 3600 + int(stamp[14:16]) * 60 + int(stamp[17:19])
+
+
+class SessionBuilder:
+    """Rebuilds sessions from the log lines of one file
+
+    Only the rare event lines are handled one by one. The count lines
+    between two events are taken in bulk: one findall, then their number,
+    maximum and last value.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = []
+        self.session = None
+
+    def _open(self, stamp):
+        self.session = {"start": stamp, "end": stamp, "threshold": None, "ticks": 0, "peak": None,
+                        "last": None, "streak": None, "threshold_at": None, "left_at": None,
+                        "attempts": 0, "failed": 0, "meetings_left": 0}
+
+    def _close(self, outcome):
+        session, self.session = self.session, None
+        start, end = parse_stamp(session["start"]), parse_stamp(session["end"])
+        threshold_at = parse_stamp(session["threshold_at"]) if session["threshold_at"] else None
+        left_at = parse_stamp(session["left_at"]) if session["left_at"] else None
+        self.rows.append({
+            "file": self.name, "start": start, "end": end, "duration": end - start,
+            "threshold": session["threshold"], "ticks": session["ticks"], "peak": session["peak"],
+            "last": session["last"], "threshold_at": threshold_at,
+            "threshold_to_leave": left_at - threshold_at if left_at is not None and threshold_at is not None
+            else None,
+            "attempts": session["attempts"], "failed": session["failed"],
+            "meetings_left": session["meetings_left"], "outcome": outcome,
+        })
+
+    def _counts(self, buffer, pos, endpos):
+        """Fold the count lines in buffer[pos:endpos] into the open session"""
+        found = COUNT.findall(buffer, pos, endpos)
+        if not found:
+            return
+        counts = list(map(int, found))
+        session = self.session
+        if session is None:
+            first = buffer.find(COUNT_TEXT, pos, endpos)
+            self._open(buffer[first - STAMP:first])
+            session = self.session
+        highest = max(counts)
+        session["ticks"] += len(counts)
+        session["peak"] = highest if session["peak"] is None else max(session["peak"], highest)
+        session["last"] = counts[-1]
+        if session["threshold"] is not None and highest > session["threshold"]:
+            session["streak"] = None  # The count went back above the threshold
+        last = buffer.rfind(COUNT_TEXT, pos, endpos)
+        session["end"] = buffer[last - STAMP:last]
+
+    def _event(self, kind, match, stamp):
+        if kind == STARTING:
+            if self.session is not None:
+                self._close("restarted")
+            self._open(stamp)
+        elif self.session is None:
+            self._open(stamp)
+        session = self.session
+        session["end"] = stamp
+        if kind == THRESHOLD:
+            session["threshold"] = int(match.group(THRESHOLD))
+        elif kind == AT_THRESHOLD:
+            if session["streak"] is None:
+                session["streak"] = stamp
+            if match.group(AT_THRESHOLD) == b"reached":
+                session["attempts"] += 1
+        elif kind == FAILED:
+            session["failed"] += 1
+        elif kind == LEFT:
+            session["meetings_left"] += 1
+            if session["left_at"] is None:
+                session["left_at"] = stamp
+                session["threshold_at"] = session["streak"] or stamp
+            session["streak"] = None
+            if match.group(LEFT).startswith(b"Meeting"):
+                self._close("left")
+        elif kind in CLOSING:
+            self._close(CLOSING[kind])
+
+    def feed(self, buffer, pos=0, endpos=None):
+        """Scan buffer[pos:endpos], which must start and end on line boundaries"""
+        endpos = len(buffer) if endpos is None else endpos
+        for match in EVENT.finditer(buffer, pos, endpos):
+            start = match.start()
+            if start - STAMP - 1 < pos or buffer[start - STAMP - 1:start - STAMP] != b"[":
+                continue  # "] " inside some other line
+            self._counts(buffer, pos, start)
+            pos = match.end()
+            self._event(match.lastindex, match, buffer[start - STAMP:start])
+        self._counts(buffer, pos, endpos)
+
+    def finish(self):
+        """Close a session the file ended in; returns all rows"""
+        if self.session is not None:
+            self._close("truncated")
+        return self.rows
+
+
+def iter_windows(path, chunk_size=CHUNK_SIZE):
+    """Yield (buffer, start, end) windows of a file that end on line boundaries
+
+    Plain files are memory-mapped and yielded as windows of one mapping;
+    .gz files, empty files and anything that can't be mapped are read in
+    chunks of about chunk_size bytes.
+    """
+    if not path.endswith(".gz"):
+        with open(path, "rb") as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                mapped = None  # Empty file, pipe or a filesystem without mmap
+            if mapped is not None:
+                with mapped:
+                    advise = getattr(mapped, "madvise", None)  # Python 3.8+
+                    if advise is not None:
+                        advise(mmap.MADV_SEQUENTIAL)
+                    size, pos = len(mapped), 0
+                    while pos < size:
+                        end = mapped.rfind(b"\n", pos, pos + chunk_size) + 1 if pos + chunk_size < size else size
+                        if end <= pos:  # A line longer than a chunk
+                            end = mapped.find(b"\n", pos + chunk_size) + 1 or size
+                        yield mapped, pos, end
+                        if advise is not None and hasattr(mmap, "MADV_DONTNEED"):
+                            # Drop the scanned pages so resident memory stays at about one window
+                            advise(mmap.MADV_DONTNEED, 0, end - end % mmap.PAGESIZE)
+                        pos = end
+                return
+
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        rest = b""
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            data = rest + chunk
+            end = data.rfind(b"\n") + 1
+            rest = data[end:]
+            if end:
+                yield data, 0, end
+        if rest:
+            yield rest, 0, len(rest)
+
+
+def analyze_file(path, chunk_size=CHUNK_SIZE):
+    """Session rows (see the module docstring) for one log file"""
+    builder = SessionBuilder(path)
+    for buffer, start, end in iter_windows(path, chunk_size):
+        builder.feed(buffer, start, end)
+    return builder.finish()
+
+
+def analyze_logs(paths, workers=1, chunk_size=CHUNK_SIZE):
+    """Session rows of several log files, in file order; files go to a process pool with workers > 1"""
+    chunk_sizes = [chunk_size] * len(paths)
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(min(workers, len(paths))) as pool:
+            parts = list(pool.map(analyze_file, paths, chunk_sizes))
+    else:
+        parts = list(map(analyze_file, paths, chunk_sizes))
+    return [row for part in parts for row in part]
+
+
+def write_columns(path, rows):
+    """Write session rows column by column
+
+    ".csv" writes plain rows. Anything else is JSON holding one list per
+    column, with file names stored once in "files" and referenced by index.
+    A ".gz" suffix compresses it.
+    """
+    if path.endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+        return
+    files = sorted(set(row["file"] for row in rows))
+    index = {name: i for i, name in enumerate(files)}
+    columns = {name: [row[name] for row in rows] for name in COLUMNS}
+    columns["file"] = [index[name] for name in columns["file"]]
+    document = json.dumps({"version": 1, "rows": len(rows), "files": files, "columns": columns},
+                          separators=(",", ":"))
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wt") as f:
+        f.write(document)
+
+
+def read_columns(path):
+    """Read a file written by write_columns back into session rows"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as f:
+        document = json.load(f)
+    columns = dict(document["columns"])
+    columns["file"] = [document["files"][i] for i in columns["file"]]
+    return [dict(zip(COLUMNS, values)) for values in zip(*(columns[name] for name in COLUMNS))]
+
+
+def summarize(rows):
+    """Totals over session rows"""
+    delays = sorted(row["threshold_to_leave"] for row in rows if row["threshold_to_leave"] is not None)
+    outcomes = {}
+    for row in rows:
+        outcomes[row["outcome"]] = outcomes.get(row["outcome"], 0) + 1
+    return {
+        "sessions": len(rows),
+        "outcomes": outcomes,
+        "hours": round(sum(row["duration"] for row in rows) / 3600, 1),
+        "attempts": sum(row["attempts"] for row in rows),
+        "failed": sum(row["failed"] for row in rows),
+        "mean_threshold_to_leave": round(sum(delays) / len(delays), 1) if delays else None,
+        "p95_threshold_to_leave": delays[min(len(delays) - 1, int(len(delays) * 0.95))] if delays else None,
+        "max_peak": max((row["peak"] for row in rows if row["peak"] is not None), default=None),
+    }
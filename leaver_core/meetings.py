@@ -0,0 +1,185 @@
+"""
+Multi-meeting tracking: group Zoom windows into meetings, one state machine each.
+
+A breakout room, a second meeting or a webinar can be open next to the main
+meeting. Windows are grouped by the meeting ID in their title, then by
+breakout room name. Windows that carry neither (the "Zoom Meeting" main
+window, "Participants (12)") belong to the only meeting with an ID if there
+is exactly one, otherwise to the primary meeting. Each group gets its own
+count and state, so only the meeting that crossed its threshold is left.
+
+Grouping is one pass over the windows and counting one pass per group, so a
+tick stays linear in the number of windows.
+"""
+
+from .engine import ACTION_LEAVE, ACTION_UNKNOWN, ACTION_WAIT
+from .parser import find_participant_count, parse_breakout_room, parse_meeting_id
+
+PRIMARY = "primary"
+
+# Per-meeting states
+STATE_WATCHING = "watching"  # windows seen, no count yet
+STATE_ACTIVE = "active"      # count known and above the threshold
+STATE_LEAVING = "leaving"    # crossed the threshold; leave pending or being retried
+STATE_LEFT = "left"          # leave sequence succeeded
+
+# Ticks a meeting may go unseen before it is forgotten
+FORGET_AFTER = 3
+
+
+def meeting_key(title):
+    """Group key for a window title, or None if the title doesn't identify a meeting"""
+    meeting_id = parse_meeting_id(title)
+    if meeting_id is not None:
+        return "id:" + meeting_id
+    room = parse_breakout_room(title)
+    if room is not None:
+        return "breakout:" + room
+    return None
+
+
+def group_windows(windows):
+    """Group window records by meeting; returns {key: [records]} in first-seen order"""
+    groups = {}
+    unkeyed = []
+    id_keys = 0
+    only_id_key = None
+    for record in windows:
+        key = meeting_key(record.title)
+        if key is None:
+            unkeyed.append(record)
+            continue
+        records = groups.get(key)
+        if records is None:
+            groups[key] = records = []
+            if key.startswith("id:"):
+                id_keys += 1
+                only_id_key = key
+        records.append(record)
+    if unkeyed:
+        target = only_id_key if id_keys == 1 else PRIMARY
+        groups.setdefault(target, []).extend(unkeyed)
+    return groups
+
+
+class Meeting:
+    """State of one tracked meeting"""
+
+    __slots__ = ("key", "state", "count", "title", "peak", "action", "windows", "last_seen", "profile")
+
+    def __init__(self, key):
+        self.key = key
+        self.state = STATE_WATCHING
+        self.count = None
+        self.title = None  # Title the count was read from
+        self.peak = None
+        self.action = ACTION_UNKNOWN
+        self.windows = []
+        self.last_seen = 0
+        self.profile = None  # Matching ProfileTable entry, resolved once
+
+    @property
+    def meeting_id(self):
+        return self.key[3:] if self.key.startswith("id:") else None
+
+    @property
+    def label(self):
+        """Human-readable name for log lines"""
+        if self.key.startswith("id:"):
+            digits = self.key[3:]
+            return f"meeting {digits[:3]} {digits[3:-4]} {digits[-4:]}"
+        if self.key.startswith("breakout:"):
+            return f"breakout room {self.key[9:]}".rstrip()
+        return "main meeting"
+
+
+class MeetingTracker:
+    """Keeps a Meeting per group of windows across ticks"""
+
+    def __init__(self, engine, forget_after=FORGET_AFTER, profiles=None, log=None):
+        self.engine = engine
+        self.profiles = profiles  # Optional ProfileTable
+        self.log = log
+        self.forget_after = forget_after
+        self.meetings = {}  # key -> Meeting
+        self.ticks = 0
+        self.restored = {}  # key -> (state, peak) from a checkpoint, applied when the meeting is seen
+
+    def observe(self, meeting, count):
+        """Apply a participant count to a meeting and advance its state"""
+        meeting.count = count
+        if count is not None and (meeting.peak is None or count > meeting.peak):
+            meeting.peak = count
+        meeting.action = action = self.engine.decide(count, meeting.profile)
+        if meeting.state == STATE_LEFT:
+            # Left meetings stay left unless the count rises above the threshold again
+            if action == ACTION_WAIT:
+                meeting.state = STATE_ACTIVE
+            return meeting
+        if action == ACTION_LEAVE:
+            meeting.state = STATE_LEAVING
+        elif action == ACTION_WAIT:
+            meeting.state = STATE_ACTIVE
+        return meeting
+
+    def update(self, windows):
+        """Regroup this tick's windows; returns the meetings seen, in first-seen order"""
+        self.ticks += 1
+        meetings = self.meetings
+        seen = []
+        for key, records in group_windows(windows).items():
+            meeting = meetings.get(key)
+            if meeting is None:
+                meetings[key] = meeting = Meeting(key)
+                if self.profiles is not None:
+                    self._assign_profile(meeting, records)
+                if key in self.restored:
+                    meeting.state, meeting.peak = self.restored.pop(key)
+            meeting.windows = records
+            meeting.last_seen = self.ticks
+            count, meeting.title = find_participant_count([record.title for record in records])
+            seen.append(self.observe(meeting, count))
+
+        if len(meetings) > len(seen):
+            for key in [key for key, meeting in meetings.items()
+                        if self.ticks - meeting.last_seen > self.forget_after]:
+                del meetings[key]
+        return seen
+
+    def _assign_profile(self, meeting, records):
+        meeting.profile = profile = self.profiles.lookup(meeting.meeting_id, [r.title for r in records])
+        if profile is not None and self.log is not None:
+            self.log(f"Using {profile.describe(self.engine.threshold)} for {meeting.label}")
+
+    def snapshot(self):
+        """[[key, state, peak], ...] of the tracked meetings, for a checkpoint"""
+        return [[meeting.key, meeting.state, meeting.peak] for meeting in self.meetings.values()]
+
+    def restore(self, snapshot):
+        """Resume meeting states from snapshot() output once their windows show up again"""
+        self.restored = {key: (state, peak) for key, state, peak in snapshot}
+
+    def mark_left(self, meeting):
+        meeting.state = STATE_LEFT
+
+    def active(self):
+        """Meetings that are still being watched (not left)"""
+        return [meeting for meeting in self.meetings.values() if meeting.state != STATE_LEFT]
+
+    @staticmethod
+    def watching(meetings):
+        """Whether any of meetings (say, one tick's) is still being watched"""
+        return any(meeting.state != STATE_LEFT for meeting in meetings)
+
+    @staticmethod
+    def focus_meeting(meetings):
+        """The meeting a tick reports on: one to leave, else the first with a count"""
+        fallback = None
+        for meeting in meetings:
+            if meeting.state == STATE_LEFT:
+                continue
+            if meeting.state == STATE_LEAVING:
+                return meeting
+            if fallback is None or (fallback.count is None and meeting.count is not None):
+                fallback = meeting
+        return fallback
@@ -0,0 +1,251 @@
+"""
+Prometheus-style metrics and health endpoint for a running monitor.
+
+Metrics are plain module-level counters and histograms, updated in place by
+the monitor loop, the platform adapters and the hook workers (tick and
+enumeration time, leave attempts per strategy, subprocess spawns, hook
+deliveries, leave pre-arming, checkpoint writes). Updating one is a dict lookup and an integer add; nothing is
+formatted until a scrape asks for it. Cache hit rates and source
+statistics are read at scrape time from the objects that already keep them.
+
+render() and health() back the /metrics and /healthz endpoint in
+leaver_core.metrics_server, kept separate so that recording metrics never
+imports the HTTP stack.
+"""
+
+import functools
+import time
+from bisect import bisect_left
+
+from . import parser
+
+PREFIX = "zoom_leaver_"
+
+# Seconds; ticks are sub-millisecond to tens of milliseconds, leaves take seconds
+TICK_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+LEAVE_BUCKETS = (0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 30.0)
+
+# /healthz fails once the last tick is older than this many check intervals
+HEALTHY_INTERVALS = 3
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value):
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels"""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.value = 0
+        self.children = {}  # label values -> Counter
+
+    def labels(self, *values):
+        child = self.children.get(values)
+        if child is None:
+            child = self.children[values] = Counter(self.name, self.help)
+        return child
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def samples(self):
+        if not self.labelnames:
+            yield self.name, "", self.value
+            return
+        for values, child in list(self.children.items()):
+            yield self.name, _format_labels(self.labelnames, values), child.value
+
+
+class Histogram:
+    """Bucketed distribution of observed values, optionally split by labels"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.labelnames = tuple(labelnames)
+        self.counts = [0] * (len(self.buckets) + 1)  # Per bucket, not cumulative; last is +Inf
+        self.total = 0.0
+        self.children = {}
+
+    def labels(self, *values):
+        child = self.children.get(values)
+        if child is None:
+            child = self.children[values] = Histogram(self.name, self.help, self.buckets)
+        return child
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def _own_samples(self, labels):
+        base = labels[1:-1] + "," if labels else ""
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), list(self.counts)):
+            cumulative += count
+            yield self.name + "_bucket", "{" + base + f'le="{_format_value(float(bound))}"' + "}", cumulative
+        yield self.name + "_sum", labels, self.total
+        yield self.name + "_count", labels, cumulative
+
+    def samples(self):
+        if not self.labelnames:
+            yield from self._own_samples("")
+            return
+        for values, child in list(self.children.items()):
+            yield from child._own_samples(_format_labels(self.labelnames, values))
+
+
+TICKS = Counter(PREFIX + "ticks_total", "Monitor ticks by resulting action", ("action",))
+TICK_SECONDS = Histogram(PREFIX + "tick_seconds", "Duration of one monitor tick", TICK_BUCKETS)
+ENUMERATE_SECONDS = Histogram(PREFIX + "enumerate_seconds", "Time spent listing Zoom windows per tick", TICK_BUCKETS)
+PARSE_SECONDS = Histogram(PREFIX + "parse_seconds", "Time spent grouping and parsing window titles per tick", TICK_BUCKETS)
+LEAVE_ATTEMPTS = Counter(PREFIX + "leave_attempts_total", "Leave attempts by strategy and result", ("strategy", "result"))
+LEAVE_SECONDS = Histogram(PREFIX + "leave_seconds", "Duration of a leave strategy", LEAVE_BUCKETS, ("strategy",))
+SPAWNS = Counter(PREFIX + "subprocess_spawns_total", "Child processes started, by command", ("command",))
+HOOK_DELIVERIES = Counter(PREFIX + "hook_deliveries_total", "Hook deliveries by hook and result (ok, failed, dropped)",
+                          ("hook", "result"))
+HOOK_SECONDS = Histogram(PREFIX + "hook_seconds", "Duration of one hook delivery attempt", LEAVE_BUCKETS, ("hook",))
+PREARMS = Counter(PREFIX + "prearms_total", "Leave pre-arming outcomes (armed, hit, expired, unarmed)", ("result",))
+PREARM_SECONDS = Histogram(PREFIX + "prearm_seconds", "Leave setup done ahead of the crossing by a pre-arm",
+                           LEAVE_BUCKETS)
+
+CHECKPOINT_WRITES = Counter(PREFIX + "checkpoint_writes_total", "Checkpoint flushes by result (written, unchanged, failed)",
+                            ("result",))
+CHECKPOINT_SECONDS = Histogram(PREFIX + "checkpoint_seconds", "Duration of one checkpoint write (off the tick)",
+                               TICK_BUCKETS)
+INSTANCE_ROLES = Counter(PREFIX + "instance_roles_total", "Single-instance roles taken (leader, follower, takeover)",
+                         ("role",))
+SOURCE_CALLS = Counter(PREFIX + "source_calls_total", "Window source answers by source and outcome (won, used, late, failed)",
+                       ("source", "outcome"))
+SOURCE_SECONDS = Histogram(PREFIX + "source_seconds", "Duration of one window source call", TICK_BUCKETS, ("source",))
+
+METRICS = [TICKS, TICK_SECONDS, ENUMERATE_SECONDS, PARSE_SECONDS, LEAVE_ATTEMPTS, LEAVE_SECONDS, SPAWNS,
+           HOOK_DELIVERIES, HOOK_SECONDS, PREARMS, PREARM_SECONDS, CHECKPOINT_WRITES, CHECKPOINT_SECONDS,
+           INSTANCE_ROLES, SOURCE_CALLS, SOURCE_SECONDS]
+
+# lru_cached parser functions whose hit rates are exported
+PARSER_CACHES = ("is_zoom_window", "names_zoom", "parse_count", "parse_meeting_id", "parse_breakout_room")
+
+
+def leave_strategy(strategy):
+    """Decorator counting and timing a leave strategy (a False return or an exception is a failure)"""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            result = "error"
+            try:
+                value = method(*args, **kwargs)
+                result = "failed" if value is False else "ok"
+                return value
+            finally:
+                LEAVE_SECONDS.labels(strategy).observe(time.perf_counter() - start)
+                LEAVE_ATTEMPTS.labels(strategy, result).inc()
+        return wrapper
+    return decorate
+
+
+def count_spawn(args):
+    """Record a subprocess about to be started with this argv"""
+    SPAWNS.labels(args[0] if args else "?").inc()
+
+
+def _cache_samples(monitor):
+    """(cache, hits, misses) for every cache that keeps statistics"""
+    for name in PARSER_CACHES:
+        info = getattr(parser, name).cache_info()
+        yield name, info.hits, info.misses
+    sources = []
+    if monitor is not None:
+        fallback = monitor.fallback_source
+        sources = [monitor.count_source] + (list(fallback) if isinstance(fallback, (list, tuple)) else [fallback])
+    for source in sources:
+        stats = source.stats() if source is not None and hasattr(source, "stats") else None
+        if stats and "recognitions" in stats:
+            yield "screen_region", stats["unchanged"] + stats["cache_hits"], stats["recognitions"]
+
+
+def render(monitor=None):
+    """Render every metric, plus the monitor's live state, in text exposition format"""
+    lines = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in metric.samples())
+
+    caches = list(_cache_samples(monitor))
+    for suffix, index, help_text in (("hits", 1, "Cache lookups answered from the cache"),
+                                     ("misses", 2, "Cache lookups that had to compute")):
+        name = f"{PREFIX}cache_{suffix}_total"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        lines.extend(f'{name}{{cache="{cache[0]}"}} {cache[index]}' for cache in caches)
+
+    if monitor is not None:
+        gauges = [
+            ("monitoring", "1 while the monitor loop runs", int(monitor.running)),
+            ("participants", "Last participant count (NaN when unknown)",
+             monitor.last_count if monitor.last_count is not None else float("nan")),
+            ("threshold", "Global participant threshold", monitor.config["participant_threshold"]),
+            ("meetings", "Meetings seen on the last tick", len(monitor.meetings)),
+        ]
+        age = monitor.tick_age()
+        if age is not None:
+            gauges.append(("last_tick_age_seconds", "Seconds since the last tick finished", round(age, 3)))
+        for name, help_text, value in gauges:
+            lines.append(f"# HELP {PREFIX}{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}{name} gauge")
+            lines.append(f"{PREFIX}{name} {_format_value(value)}")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def health(monitor):
+    """Return (healthy, reason) from the age of the monitor's last tick
+
+    A follower doesn't tick; its last tick is its last look at the leader,
+    and the reason says which role the monitor has.
+    """
+    role = f"{monitor.role}, " if monitor.role else ""
+    if not monitor.running:
+        return False, role + "not monitoring"
+    age = monitor.tick_age()
+    if monitor.role == "follower":  # instance.ROLE_FOLLOWER; instance imports this module
+        limit = HEALTHY_INTERVALS * max(1, monitor.instance.poll)
+        checked = "leader seen"
+    else:
+        limit = HEALTHY_INTERVALS * max(1, monitor.config["check_interval"])
+        checked = "last tick"
+    if age is None:
+        return False, role + "no tick yet"
+    if age > limit:
+        return False, role + f"{checked} {age:.0f}s ago (limit {limit}s)"
+    return True, role + f"{checked} {age:.1f}s ago"
@@ -0,0 +1,104 @@
+"""
+Localhost HTTP endpoint for a running monitor's metrics.
+
+    GET /metrics   Prometheus text exposition format
+    GET /healthz   200 while the last tick is recent, 503 otherwise
+    GET /trace     recent spans as Chrome trace-event JSON (404 unless span_trace is set)
+    GET /profile?seconds=N   sample every thread's stack for N seconds, as collapsed stacks
+                             (409 while another profile runs)
+
+Enable it with the "metrics_port" config key (0 turns it off).
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from . import profiler, spans
+from .metrics import health, render
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves /metrics, /healthz, /trace and /profile for the server's monitor"""
+
+    def log_message(self, format, *args):
+        pass  # Scrapes every second would flood the activity log
+
+    def _reply(self, status, body, content_type):
+        body = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        monitor = self.server.monitor
+        if self.path == "/metrics":
+            return self._reply(200, render(monitor), "text/plain; version=0.0.4; charset=utf-8")
+        if self.path == "/healthz":
+            healthy, reason = health(monitor)
+            return self._reply(200 if healthy else 503, ("ok: " if healthy else "unhealthy: ") + reason + "\n",
+                               "text/plain; charset=utf-8")
+        if self.path == "/trace":
+            tracer = spans.active()
+            if tracer is None:
+                return self._reply(404, "span tracing is off (set span_trace)\n", "text/plain; charset=utf-8")
+            return self._reply(200, json.dumps(tracer.events(), default=str), "application/json")
+        url = urlsplit(self.path)
+        if url.path == "/profile":
+            return self._profile(parse_qs(url.query))
+        self._reply(404, "not found\n", "text/plain; charset=utf-8")
+
+    def _profile(self, query):
+        sampler = profiler.active()
+        if sampler is None:
+            return self._reply(404, "no profiler in this process\n", "text/plain; charset=utf-8")
+        try:
+            seconds = float(query.get("seconds", [sampler.seconds])[0])
+        except ValueError:
+            return self._reply(400, "seconds must be a number\n", "text/plain; charset=utf-8")
+        if not 0 < seconds <= profiler.MAX_SECONDS:
+            return self._reply(400, f"seconds must be between 0 and {profiler.MAX_SECONDS}\n",
+                               "text/plain; charset=utf-8")
+        text = sampler.profile(seconds, reason="/profile")
+        if text is None:
+            return self._reply(409, "a profile is already running\n", "text/plain; charset=utf-8")
+        return self._reply(200, text, "text/plain; charset=utf-8")
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """Localhost HTTP server for one monitor's metrics, run on a daemon thread"""
+
+    daemon_threads = True
+
+    def __init__(self, monitor, port, bind="127.0.0.1"):
+        super().__init__((bind, port), MetricsHandler)
+        self.monitor = monitor
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, name="metrics-server", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def start_metrics_server(config, monitor, log=None):
+    """Start a MetricsServer when metrics_port is configured (None otherwise)"""
+    port = config.get("metrics_port", 0)
+    if not port:
+        return None
+    try:
+        server = MetricsServer(monitor, int(port)).start()
+    except OSError as e:
+        if log:
+            log(f"Could not start metrics endpoint on port {port}: {e}")
+        return None
+    if log:
+        log(f"Metrics on http://127.0.0.1:{server.server_address[1]}/metrics (health: /healthz)")
+    return server
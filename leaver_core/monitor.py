@@ -0,0 +1,419 @@
+"""
+Monitoring loop shared by every platform.
+"""
+
+import time
+from datetime import datetime
+
+from .checkpoint import MonitorCheckpoint
+from .engine import DecisionEngine, ACTION_LEAVE, ACTION_UNKNOWN
+from .forecast import LeavePrearm
+from .hooks import DEFAULT_DRAIN_SECONDS, HOOK_DETECTION_FAILED, HOOK_LEAVE_FAILED, HOOK_LEAVING, HOOK_LEFT, HOOK_THRESHOLD_NEAR
+from .instance import STATE_LEAVING, STATE_LEFT, STATE_MONITORING, STATE_STOPPED, InstanceLock, follow
+from .meetings import MeetingTracker
+from .metrics import ENUMERATE_SECONDS, PARSE_SECONDS, TICKS, TICK_SECONDS
+from .profiles import ProfileTable
+from . import spans
+from .status_bus import EVENT_STARTED, EVENT_TICK, EVENT_LEAVING, EVENT_STOPPED
+from .status_page import StatusPage
+from .traces import TraceRecorder
+
+
+def log_message(config, message):
+    """Log activity if enabled"""
+    if config.get("log_activity", True):
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        print(f"[{timestamp}] {message}")
+
+
+class Monitor:
+    """Polls a platform adapter and leaves when the count reaches the threshold"""
+
+    def __init__(self, adapter, config, status_bus=None, count_source=None, fallback_source=None,
+                 heartbeat=None, hooks=None):
+        self.adapter = adapter
+        self.config = config
+        self.engine = DecisionEngine(config)
+        self.status_bus = status_bus  # Optional StatusBus the monitor publishes to
+        self.heartbeat = heartbeat  # Optional fleet HeartbeatAgent, fed the same events
+        self.hooks = hooks  # Optional HookDispatcher for threshold / leave / detection events
+        self.unknown_ticks = 0  # Ticks in a row without a count
+        self.near_threshold = False
+        self.count_source = count_source  # Optional cheaper source tried before window titles
+        self.fallback_source = fallback_source  # Optional source, or list tried in order, when titles have no count
+        self.profiles = None
+        self.prearm = None  # LeavePrearm, rebuilt from the config on every run
+        self.trace = None  # TraceRecorder when trace_file is set, rebuilt on every run
+        self.leave_streak = 0  # Ticks in a row at or below the threshold
+        self.checkpoint = None  # MonitorCheckpoint when checkpoint_file is set, rebuilt on every run
+        self.instance = None  # InstanceLock when instance_lock is set, rebuilt on every run
+        self.status_page = None  # StatusPage when status_page is set, opened by the leading monitor
+        self.spans = None  # SpanTracer when span_trace is set, rebuilt on every run
+        self.session_started = None  # Wall time this session started (kept across a resume)
+        self.peak = None
+        self.leave_attempts = 0
+        self.failed_leaves = 0
+        self.tracker = self.new_tracker()
+        self.meetings = []  # Meetings seen on the last tick
+        self.meeting = None  # The meeting the last tick reported on
+        self.last_tick = None  # Wall time the last tick finished
+        self.last_count = None
+        self.role = None  # ROLE_LEADER or ROLE_FOLLOWER while single_instance is set
+        self.running = False
+
+    def log(self, message):
+        log_message(self.config, message)
+
+    def new_tracker(self):
+        """Fresh per-meeting state, picking up profile changes in the config"""
+        self.profiles = ProfileTable.from_config(self.config)  # Loaded on the first meeting
+        return MeetingTracker(self.engine, profiles=self.profiles, log=self.log)
+
+    def publish_status(self, kind, **fields):
+        """Publish a status event to the status bus, heartbeat agent and status page, if attached"""
+        if self.status_bus is not None:
+            self.status_bus.publish(kind, threshold=self.config['participant_threshold'], **fields)
+        if self.status_page is not None:
+            self.status_page.publish(kind, threshold=self.config['participant_threshold'], **fields)
+        if self.heartbeat is not None:
+            self.heartbeat.publish(kind, threshold=self.config['participant_threshold'], **fields)
+
+    def emit_hook(self, event_name, **fields):
+        """Queue a hook event if hooks are configured (returns immediately)"""
+        if self.hooks is not None:
+            self.hooks.emit(event_name, **fields)
+
+    def meeting_fields(self, participant_count):
+        """Hook event fields describing the meeting the last tick reported on"""
+        meeting = self.meeting
+        return {
+            "count": participant_count,
+            "threshold": self.engine.threshold_for(meeting.profile if meeting else None),
+            "meeting": meeting.label if meeting else None,
+        }
+
+    def hook_tick(self, participant_count):
+        """Emit threshold_near / detection_failed hook events for this tick's count"""
+        hooks = self.hooks
+        if participant_count is None:
+            self.unknown_ticks += 1
+            if self.unknown_ticks == hooks.detection_failures:
+                hooks.emit(HOOK_DETECTION_FAILED, ticks=self.unknown_ticks)
+            return
+        self.unknown_ticks = 0
+        fields = self.meeting_fields(participant_count)
+        threshold = fields["threshold"]
+        near = threshold is not None and threshold < participant_count <= threshold + hooks.near_margin
+        if near and not self.near_threshold:
+            hooks.emit(HOOK_THRESHOLD_NEAR, **fields)
+        self.near_threshold = near
+
+    def participant_count(self, windows):
+        """Extract the participant count of the meeting needing attention from Zoom window records"""
+        try:
+            if not windows:
+                return None
+            tracker = MeetingTracker(self.engine, profiles=self.profiles)
+            meeting = tracker.focus_meeting(tracker.update(windows))
+            return meeting.count if meeting is not None else None
+        except Exception as e:
+            self.log(f"Error getting participant count: {e}")
+            return None
+
+    def tick(self):
+        """Run one detection pass; returns (participant_count, windows, action)
+
+        Windows are grouped into meetings and the result is for the meeting
+        that needs attention (see MeetingTracker.focus_meeting); windows are
+        that meeting's windows only. windows is None when the count source
+        answered without enumerating windows; the adapter then finds the
+        window itself if it has to leave.
+        """
+        participant_count = self.source_count(self.count_source)
+        if participant_count is not None:
+            self.meetings, self.meeting = [], None
+            return participant_count, None, self.engine.decide(participant_count)
+
+        enumerate_start = time.perf_counter()
+        windows = self.adapter.zoom_windows()
+        parse_start = time.perf_counter()
+        self.meetings = self.tracker.update(windows)
+        decide_start = time.perf_counter()
+        ENUMERATE_SECONDS.observe(parse_start - enumerate_start)
+        PARSE_SECONDS.observe(decide_start - parse_start)
+        self.meeting = meeting = self.tracker.focus_meeting(self.meetings)
+
+        if meeting is None:
+            if self.meetings:  # Every meeting on screen has already been left
+                result = None, [], ACTION_UNKNOWN
+            else:
+                participant_count = self.source_count(self.fallback_source)
+                result = participant_count, windows, self.engine.decide(participant_count)
+        else:
+            if meeting.count is None:
+                fallback_count = self.source_count(self.fallback_source)
+                if fallback_count is not None:
+                    self.tracker.observe(meeting, fallback_count)
+            result = meeting.count, meeting.windows, meeting.action
+
+        tracer = spans.active()
+        if tracer is not None:
+            tracer.record("enumerate", enumerate_start, parse_start, {"windows": len(windows)})
+            tracer.record("parse", parse_start, decide_start, {"meetings": len(self.meetings)})
+            tracer.record("decide", decide_start, time.perf_counter(),
+                          {"count": result[0], "action": result[2], "meeting": meeting.label if meeting else None})
+        return result
+
+    def tick_age(self):
+        """Seconds since the last tick finished (None before the first tick)"""
+        if self.last_tick is None:
+            return None
+        return time.time() - self.last_tick
+
+    def source_count(self, source):
+        """Ask an optional count source (or each of a list, in order) for the participant count"""
+        if source is None:
+            return None
+        if isinstance(source, (list, tuple)):
+            for each in source:
+                count = self.source_count(each)
+                if count is not None:
+                    return count
+            return None
+        try:
+            with spans.span("count_source", source=type(source).__name__):
+                return source.participant_count()
+        except Exception as e:
+            self.log(f"Error reading participant count source: {e}")
+            return None
+
+    def reset_session(self):
+        self.session_started = time.time()
+        self.peak = None
+        self.leave_attempts = self.failed_leaves = self.leave_streak = 0
+
+    def start_session(self):
+        """Start a new session, or resume one from a fresh checkpoint"""
+        self.reset_session()
+        state = self.checkpoint.load() if self.checkpoint is not None else None
+        if not state:
+            return
+        try:
+            self.session_started = state["started_at"]
+            self.peak = state["peak"]
+            self.leave_attempts = state["leave_attempts"]
+            self.failed_leaves = state["failed_leaves"]
+            self.leave_streak = state["leave_streak"]
+            self.tracker.restore(state["meetings"])
+        except Exception as e:
+            self.log(f"Ignoring checkpoint that could not be restored: {e}")
+            self.reset_session()
+            self.tracker.restore([])
+            return
+        self.log(f"Resuming session from checkpoint: started {(time.time() - self.session_started) / 60:.0f} min ago, "
+                 f"peak {self.peak if self.peak is not None else '?'}, "
+                 f"{self.leave_attempts} leave attempt(s), {self.failed_leaves} failed")
+
+    def checkpoint_state(self):
+        """The session state a restarted monitor resumes from"""
+        return {
+            "started_at": self.session_started,
+            "peak": self.peak,
+            "leave_attempts": self.leave_attempts,
+            "failed_leaves": self.failed_leaves,
+            "leave_streak": self.leave_streak,
+            "meetings": self.tracker.snapshot(),
+        }
+
+    def publish_instance(self, state):
+        """Publish the leader's state for the monitors following this one"""
+        meeting = self.meeting
+        self.instance.publish(state, count=self.last_count, peak=self.peak,
+                              threshold=self.engine.threshold_for(meeting.profile if meeting else None),
+                              meeting=meeting.label if meeting else None)
+
+    def run(self):
+        """Main monitoring loop"""
+        self.running = True
+        self.role = None
+        self.tracker = self.new_tracker()
+        self.prearm = LeavePrearm.from_config(self.adapter, self.config, self.log)
+        self.trace = TraceRecorder.from_config(self.config, self.log)
+        self.checkpoint = MonitorCheckpoint.from_config(self.config, self.log)
+        self.spans = tracer = spans.SpanTracer.from_config(self.config, self.log)
+        previous_tracer = spans.active()  # Put back when the run ends, e.g. a harness's own tracer
+        spans.install(tracer)
+        self.log(f"Starting Zoom Auto Leaver{self.adapter.label}...")
+        self.log(f"Participant threshold: {self.config['participant_threshold']}")
+        self.log(f"Check interval: {self.config['check_interval']} seconds")
+        for line in self.adapter.describe(self.config):
+            self.log(line)
+        if self.prearm is not None:
+            self.log(f"Leave pre-arming: {self.prearm.horizon}s ahead of the forecast crossing")
+        if self.config.get("leave_confirmations", 1) > 1:
+            self.log(f"Leave confirmations: {self.config['leave_confirmations']} checks in a row")
+        if self.trace is not None:
+            self.log(f"Recording participant counts to {self.trace.path}")
+        if tracer is not None:
+            self.log(f"Span tracing on; failed or slow leaves are written to {tracer.path}")
+        self.log("Looking for participant count in Zoom window titles...")
+        self.status_page = None
+        self.instance = InstanceLock.from_config(self.config, self.log)
+        if self.instance is not None and not follow(self.instance, self):
+            self.running = False
+            self.publish_status(EVENT_STOPPED)
+            spans.install(previous_tracer)
+            return
+        self.status_page = StatusPage.from_config(self.config, self.log)
+        self.start_session()
+        run_id = int(self.session_started)  # A resumed session keeps appending to the same traces
+        clean = False  # Left or stopped on purpose: the checkpoint is no longer needed
+        meeting_left = False
+        meetings_left = 0  # Meetings left while others were still being monitored
+        closed_streak = 0  # Checks in a row since then that saw no meeting still being watched
+
+        self.publish_status(EVENT_STARTED)
+
+        try:
+            while self.running:
+                tick_start = time.perf_counter()
+                participant_count, windows, action = self.tick()
+                tick_end = time.perf_counter()
+                tick_latency = tick_end - tick_start
+                if tracer is not None:
+                    tracer.record("tick", tick_start, tick_end, {"count": participant_count, "action": action})
+                TICK_SECONDS.observe(tick_latency)
+                TICKS.labels(action).inc()
+                self.last_tick = time.time()
+                self.last_count = participant_count
+                if participant_count is not None and (self.peak is None or participant_count > self.peak):
+                    self.peak = participant_count
+                self.publish_status(EVENT_TICK, participant_count=participant_count,
+                                    tick_latency=tick_latency)
+                if self.hooks is not None:
+                    self.hook_tick(participant_count)
+                if self.prearm is not None:
+                    meeting = self.meeting
+                    self.prearm.update(meeting.key if meeting else None, participant_count,
+                                       self.engine.threshold_for(meeting.profile if meeting else None), windows)
+                if self.trace is not None:
+                    trace = f"{run_id}:{self.meeting.key}" if self.meeting is not None else str(run_id)
+                    self.trace.record(trace, self.last_tick, participant_count)
+                self.leave_streak = self.leave_streak + 1 if action == ACTION_LEAVE else 0
+                confirmations = self.config.get("leave_confirmations", 1)
+
+                if len(self.meetings) > 1:
+                    self.log("Tracking meetings: " + ", ".join(
+                        f"{m.label} ({m.count if m.count is not None else '?'}, {m.state})" for m in self.meetings))
+
+                if meetings_left and windows is not None and not self.tracker.watching(self.meetings):
+                    # The meetings still being monitored after a leave have closed on their own
+                    closed_streak += 1
+                    if closed_streak >= confirmations:
+                        self.log("No other meetings remain. Stopping monitor.")
+                        meeting_left = True
+                        break
+                else:
+                    closed_streak = 0
+
+                if action == ACTION_UNKNOWN:
+                    if windows:
+                        self.log(f"Found {len(windows)} Zoom window(s) but could not determine participant count")
+                        for i, window in enumerate(windows):
+                            self.log(f"  Window {i+1}: {window.title}")
+                    else:
+                        self.log("No Zoom windows found. Waiting...")
+                else:
+                    if self.meeting is not None and self.meeting.title:
+                        self.log(f"Found participant count: {participant_count} in window: {self.meeting.title}")
+                    self.log(f"Current participants: {participant_count}")
+
+                    if action == ACTION_LEAVE and self.leave_streak < confirmations:
+                        self.log(f"Participant count ({participant_count}) at threshold; "
+                                 f"confirming ({self.leave_streak}/{confirmations})")
+                    elif action == ACTION_LEAVE:
+                        threshold = self.engine.threshold_for(self.meeting.profile if self.meeting else None)
+                        self.log(f"Participant count ({participant_count}) reached threshold ({threshold})")
+                        self.publish_status(EVENT_LEAVING, message="Leaving meeting...")
+                        self.emit_hook(HOOK_LEAVING, **self.meeting_fields(participant_count))
+                        if self.prearm is not None:
+                            self.prearm.leaving()
+                        if self.instance is not None:
+                            self.publish_instance(STATE_LEAVING)
+                        leave_start = time.perf_counter()
+                        self.leave_attempts += 1
+                        with spans.span("leave", count=participant_count, attempt=self.leave_attempts):
+                            left = self.adapter.leave(windows)
+                        leave_seconds = time.perf_counter() - leave_start
+                        self.emit_hook(HOOK_LEFT if left else HOOK_LEAVE_FAILED, seconds=round(leave_seconds, 3),
+                                       **self.meeting_fields(participant_count))
+                        if tracer is not None:
+                            slow = self.config.get("span_slow_leave", 0)
+                            if not left:
+                                tracer.dump("leave_failed")
+                            elif slow and leave_seconds > slow:
+                                tracer.dump(f"slow_leave ({leave_seconds:.1f}s)")
+                        if left:
+                            self.leave_streak = 0
+                            remaining = []
+                            if self.adapter.leaves_all_meetings:
+                                # Quitting the client ended the other meetings too
+                                others = [m for m in self.tracker.active() if m is not self.meeting]
+                                for meeting in self.tracker.active():
+                                    self.tracker.mark_left(meeting)
+                                if others:
+                                    self.log(f"Leaving quit Zoom, which also left {len(others)} other meeting(s): "
+                                             + ", ".join(m.label for m in others))
+                            elif self.meeting is not None:
+                                self.tracker.mark_left(self.meeting)
+                                remaining = self.tracker.active()
+                            if not remaining:
+                                self.log("Meeting left successfully. Stopping monitor.")
+                                meeting_left = True
+                                break
+                            meetings_left += 1
+                            self.log(f"Left {self.meeting.label}. Still monitoring {len(remaining)} other meeting(s).")
+                        else:
+                            self.failed_leaves += 1
+                            self.log("Failed to leave meeting. Will try again.")
+
+                if self.checkpoint is not None:
+                    self.checkpoint.update(self.checkpoint_state())
+                if self.instance is not None:
+                    self.publish_instance(STATE_MONITORING)
+                interval = self.config['check_interval']
+                with spans.span("wait"):
+                    self.adapter.wait(self.prearm.wait_interval(interval) if self.prearm is not None else interval)
+
+            clean = True
+        except KeyboardInterrupt:
+            self.log("Monitoring stopped by user")
+            clean = True
+        except Exception as e:
+            self.log(f"Error in monitoring loop: {e}")
+            if tracer is not None:
+                tracer.dump(f"error: {e}")
+        finally:
+            self.running = False
+            if self.checkpoint is not None:
+                self.checkpoint.close(clear=clean)
+            if self.trace is not None:
+                self.trace.close()
+            if self.instance is not None:
+                # Followers stop when the meeting was left, and take over otherwise
+                self.publish_instance(STATE_LEFT if meeting_left else STATE_STOPPED)
+                self.instance.release()
+            self.publish_status(EVENT_STOPPED)
+            if self.heartbeat is not None:
+                # The stop heartbeat would otherwise wait for a sender thread that dies with the process
+                self.heartbeat.close(flush=True)
+            if self.status_page is not None:
+                self.status_page.close()
+            if self.hooks is not None:
+                # The workers are daemon threads: without this, exiting right after a leave drops its hooks
+                self.hooks.close(timeout=self.config.get("hook_drain_seconds", DEFAULT_DRAIN_SECONDS))
+            spans.install(previous_tracer)
+
+    def stop(self):
+        """Stop the monitoring loop"""
+        self.running = False
@@ -0,0 +1,136 @@
+"""
+Window title classification and participant-count parsing.
+
+This is the per-tick hot path for every platform: titles are lowercased once,
+patterns are compiled once at import, and titles without any digit skip the
+regex scan entirely since every pattern captures a number.
+"""
+
+import re
+from functools import lru_cache
+
+# Substrings marking a window as Zoom-related, and ones that rule it out
+ZOOM_INDICATORS = ('zoom', 'participant', 'meeting')
+# The ones a title can be trusted on alone. "meeting" also matches other apps ("Meeting notes (3)"), so
+# it only counts where the window list is Zoom's own (macOS) or the window's owner is checked (Windows)
+NAMED_INDICATORS = ('zoom', 'participant')
+SKIP_INDICATORS = ('installer', 'update', 'uninstall', 'visual studio', 'vscode')
+
+# Patterns that might contain the participant count, most specific first
+COUNT_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'participants?\s*\((\d+)\)',  # "Participants (15)"
+    r'participants?\s*:\s*(\d+)',  # "Participants: 15"
+    r'participants?\s+(\d+)',      # "Participants 15"
+    r'\((\d+)\)\s*participants?',  # "(15) Participants"
+    r'(\d+)\s+participants?',      # "15 participants"
+    r'meeting\s+id.*?\((\d+)\)',   # Meeting with participant count
+    r'\((\d+)\)',                  # Any number in parentheses (as fallback)
+)]
+
+# Meeting IDs are 9-11 digits, shown grouped ("Meeting ID: 123 4567 8901")
+MEETING_ID_PATTERN = re.compile(r'meeting\s+id\s*[:#]?\s*(\d(?:[\s-]?\d){8,10})(?!\d)', re.IGNORECASE)
+
+# Breakout room windows: "Breakout Room 2", "Breakout Room: Design Review"
+BREAKOUT_PATTERN = re.compile(r'breakout\s+room\s*:?\s*([^()|\-\u2013\u2014]*)', re.IGNORECASE)
+
+# Sanity range for a participant count
+MIN_COUNT = 1
+MAX_COUNT = 10000
+
+# Window titles barely change between ticks, so classification is memoized
+TITLE_CACHE_SIZE = 32768
+
+_DIGIT = re.compile(r'\d')
+
+
+@lru_cache(maxsize=TITLE_CACHE_SIZE)
+def is_zoom_window(title):
+    """Check if a window title indicates a Zoom window"""
+    if not title:
+        return False
+    title_lower = title.lower()
+    # Plain loops: this runs for every window on screen, every tick
+    for indicator in ZOOM_INDICATORS:
+        if indicator in title_lower:
+            break
+    else:
+        return False
+    for skip in SKIP_INDICATORS:
+        if skip in title_lower:
+            return False
+    return True
+
+
+@lru_cache(maxsize=TITLE_CACHE_SIZE)
+def names_zoom(title):
+    """Check if a Zoom window title names Zoom or participants, not just a meeting"""
+    title_lower = title.lower()
+    for indicator in NAMED_INDICATORS:
+        if indicator in title_lower:
+            return True
+    return False
+
+
+@lru_cache(maxsize=TITLE_CACHE_SIZE)
+def parse_meeting_id(title):
+    """Return the meeting ID in a title as a digit string, or None"""
+    if not title or not _DIGIT.search(title):
+        return None
+    match = MEETING_ID_PATTERN.search(title)
+    if match is None:
+        return None
+    return re.sub(r'\D', '', match.group(1))
+
+
+@lru_cache(maxsize=TITLE_CACHE_SIZE)
+def parse_breakout_room(title):
+    """Return the breakout room name in a title ("" if unnamed), or None"""
+    if not title:
+        return None
+    match = BREAKOUT_PATTERN.search(title)
+    if match is None:
+        return None
+    return match.group(1).strip().lower()
+
+
+@lru_cache(maxsize=TITLE_CACHE_SIZE)
+def parse_count(title):
+    """Return the participant count in a single title, or None"""
+    if not _DIGIT.search(title):
+        return None
+    for pattern in COUNT_PATTERNS:
+        match = pattern.search(title)
+        if match:
+            count = int(match.group(1))
+            # Sanity check - participant count should be reasonable
+            if MIN_COUNT <= count <= MAX_COUNT:
+                return count
+    return None
+
+
+def prioritize(titles):
+    """Order titles with Participants windows first, keeping relative order"""
+    participant_titles = []
+    other_titles = []
+    for title in titles:
+        if 'participant' in title.lower():
+            participant_titles.append(title)
+        else:
+            other_titles.append(title)
+    return participant_titles + other_titles
+
+
+def find_participant_count(titles, log=None):
+    """Extract the participant count from the first title that has one
+
+    Returns (count, title), or (None, None) when no title contains a count.
+    """
+    for title in prioritize(titles):
+        if log is not None:
+            log(f"Checking window: {title}")
+        count = parse_count(title)
+        if count is not None:
+            if log is not None:
+                log(f"Found participant count: {count} in window: {title}")
+            return count, title
+    return None, None
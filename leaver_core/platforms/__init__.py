@@ -0,0 +1,10 @@
+"""
+Platform adapters: window enumeration, focus and leave actions.
+
+Each adapter module imports its platform libraries at import time, so only
+import the one for the platform you are running on. pyautogui is the
+exception: it is slow to import and only needed to leave, so the adapters
+import it when they leave.
+"""
+
+from .base import PlatformAdapter, WindowRecord, window_record
@@ -0,0 +1,60 @@
+"""
+Base class for platform adapters.
+"""
+
+import time
+
+from ..records import WindowRecord, window_record  # noqa: F401 (re-exported)
+from ..spans import span
+
+
+def pause(seconds):
+    """time.sleep for a leave or focus step, recorded as a "sleep" span when span tracing is on"""
+    with span("sleep", seconds=seconds):
+        time.sleep(seconds)
+
+
+class PlatformAdapter:
+    """Enumerates Zoom windows and performs focus / leave actions
+
+    Subclasses implement list_windows(), focus() and leave(); the monitor
+    loop in leaver_core.monitor only talks to this interface.
+    """
+
+    # Appended to "Starting Zoom Auto Leaver" in the startup log line
+    label = ""
+    # True when leave() quits the Zoom client, which ends every meeting at once
+    leaves_all_meetings = False
+
+    def __init__(self, log=print):
+        self.log = log
+
+    def describe(self, config):
+        """Extra platform settings to log when monitoring starts"""
+        return []
+
+    def list_windows(self):
+        """Return records for every window on screen"""
+        raise NotImplementedError
+
+    def zoom_windows(self):
+        """Return records for the Zoom-related windows"""
+        return [w for w in self.list_windows() if w.is_zoom]
+
+    def focus(self, windows=None):
+        """Bring the Zoom meeting window to the front; returns success"""
+        raise NotImplementedError
+
+    def leave(self, windows=None):
+        """Execute the platform's leave sequence; returns success"""
+        raise NotImplementedError
+
+    def prepare(self, windows=None):
+        """Do the leave's setup ahead of time (called when a leave is forecast)"""
+
+    def disarm(self):
+        """Drop whatever prepare() cached (the forecast leave didn't come)"""
+
+    def wait(self, seconds):
+        """Wait until the next tick (event-driven adapters may return early)"""
+        time.sleep(seconds)
@@ -0,0 +1,252 @@
+"""
+Linux adapter: X11 window titles via EWMH, updated by PropertyNotify events.
+
+Titles are read once per window and then kept current from PropertyNotify
+events on _NET_WM_NAME / WM_NAME, so a tick costs no X round trips and
+wait() returns as soon as a Zoom title such as "Participants (12)" changes,
+instead of after a full check interval. Leaving uses XTEST key events.
+
+Requires python-xlib. Works without a window manager (e.g. under Xvfb) by
+falling back to the root window's children when _NET_CLIENT_LIST is absent.
+"""
+
+import select
+import time
+
+from Xlib import X, XK, display as xdisplay, error as xerror
+from Xlib.ext import xtest
+from Xlib.protocol import event as xevent
+
+from .base import PlatformAdapter, pause, window_record
+from ..metrics import leave_strategy
+from ..parser import is_zoom_window
+from ..spans import span, traced
+
+# Zoom's Linux client leaves with Alt+Q, confirmed with Return
+LEAVE_KEYS = ('Alt_L', 'q')
+CONFIRM_KEY = 'Return'
+
+# Shortest gap between two event-triggered ticks, to ride out title storms
+MIN_EVENT_SPACING = 0.05
+
+
+class X11WindowSource(PlatformAdapter):
+    """Event-driven X11 window source with XTEST leave actions"""
+
+    label = " (Linux/X11)"
+
+    def __init__(self, log=print, display_name=None):
+        super().__init__(log)
+        self.display = xdisplay.Display(display_name)
+        self.root = self.display.screen().root
+        self.NET_CLIENT_LIST = self.display.intern_atom('_NET_CLIENT_LIST')
+        self.NET_WM_NAME = self.display.intern_atom('_NET_WM_NAME')
+        self.NET_ACTIVE_WINDOW = self.display.intern_atom('_NET_ACTIVE_WINDOW')
+        self.WM_NAME = self.display.intern_atom('WM_NAME')
+        self.UTF8_STRING = self.display.intern_atom('UTF8_STRING')
+
+        self._titles = {}  # window id -> current title
+        self._keycodes = {}  # keysym name -> keycode
+        self.armed_window = None  # Window record resolved by prepare()
+        self.events_seen = 0
+        self.last_change = None  # monotonic time the last relevant change was processed
+        self._last_wake = 0.0
+
+        # Client list changes (with a WM) and top-level create/destroy (without one)
+        self.root.change_attributes(event_mask=X.PropertyChangeMask | X.SubstructureNotifyMask)
+        self._refresh_clients()
+
+    def describe(self, config):
+        source = "_NET_CLIENT_LIST" if self._has_client_list() else "root children (no EWMH window manager)"
+        return [f"Window source: X11 events ({source})"]
+
+    # --- enumeration -------------------------------------------------------
+
+    def _has_client_list(self):
+        return self.root.get_full_property(self.NET_CLIENT_LIST, X.AnyPropertyType) is not None
+
+    def _client_ids(self):
+        """Return ids of the top-level client windows"""
+        prop = self.root.get_full_property(self.NET_CLIENT_LIST, X.AnyPropertyType)
+        if prop is not None:
+            return list(prop.value)
+        return [child.id for child in self.root.query_tree().children]
+
+    def _read_title(self, window_id):
+        """Read a window's title with a round trip (None if the window is gone)"""
+        window = self.display.create_resource_object('window', window_id)
+        try:
+            prop = window.get_full_property(self.NET_WM_NAME, self.UTF8_STRING)
+            if prop is not None and prop.value:
+                value = prop.value
+                return value.decode('utf-8', 'replace') if isinstance(value, bytes) else str(value)
+            name = window.get_wm_name()
+            if isinstance(name, bytes):
+                name = name.decode('latin-1')
+            return name or None
+        except xerror.XError:
+            return None
+
+    def _refresh_clients(self):
+        """Sync the title cache with the current client list"""
+        current = set(self._client_ids())
+        for window_id in list(self._titles):
+            if window_id not in current:
+                del self._titles[window_id]
+        for window_id in current:
+            if window_id in self._titles:
+                continue
+            window = self.display.create_resource_object('window', window_id)
+            try:
+                window.change_attributes(event_mask=X.PropertyChangeMask)
+            except xerror.XError:
+                continue
+            self._titles[window_id] = self._read_title(window_id)
+
+    def _drain_events(self):
+        """Apply queued X events to the cache; returns True if a Zoom title changed"""
+        relevant = False
+        while self.display.pending_events():
+            ev = self.display.next_event()
+            self.events_seen += 1
+            if ev.type == X.PropertyNotify:
+                if ev.window.id == self.root.id:
+                    if ev.atom == self.NET_CLIENT_LIST:
+                        self._refresh_clients()
+                        relevant = True
+                elif ev.atom in (self.NET_WM_NAME, self.WM_NAME):
+                    window_id = ev.window.id
+                    old_title = self._titles.get(window_id)
+                    new_title = self._read_title(window_id)
+                    if new_title != old_title:
+                        self._titles[window_id] = new_title
+                        if is_zoom_window(old_title) or is_zoom_window(new_title):
+                            relevant = True
+            elif ev.type in (X.CreateNotify, X.DestroyNotify, X.ReparentNotify):
+                self._refresh_clients()
+                relevant = True
+        if relevant:
+            self.last_change = time.monotonic()
+        return relevant
+
+    def list_windows(self):
+        """Return records for every titled client window (from the event-fed cache)"""
+        self._drain_events()
+        return [window_record(title, 'x11', window_id)
+                for window_id, title in self._titles.items() if title]
+
+    def zoom_windows(self):
+        """Find all Zoom-related windows (from the event-fed cache)"""
+        self._drain_events()
+        return [window_record(title, 'x11', window_id)
+                for window_id, title in self._titles.items() if is_zoom_window(title)]
+
+    def poll_windows(self):
+        """Re-read every title with round trips, like a polling source would"""
+        return [window_record(title, 'x11-poll', window_id)
+                for window_id in self._client_ids()
+                for title in (self._read_title(window_id),) if is_zoom_window(title)]
+
+    def wait(self, seconds):
+        """Wait up to seconds, returning early when a Zoom window title changes
+
+        A change within MIN_EVENT_SPACING of the last early return is kept,
+        and the wait returns once the spacing has passed.
+        """
+        deadline = time.monotonic() + seconds
+        changed = False
+        while True:
+            changed = self._drain_events() or changed
+            now = time.monotonic()
+            wake_at = self._last_wake + MIN_EVENT_SPACING
+            if changed and now >= wake_at:
+                self._last_wake = now
+                return True
+            remaining = deadline - now
+            if remaining <= 0:
+                return False
+            select.select([self.display], [], [], min(remaining, wake_at - now) if changed else remaining)
+
+    # --- actions -----------------------------------------------------------
+
+    def find_main_window(self, windows=None):
+        """Find the main Zoom meeting window for focusing"""
+        if windows is None:
+            windows = self.zoom_windows()
+        if not windows:
+            return None
+        for window in windows:
+            if window.is_main:
+                return window
+        return windows[0]
+
+    def prepare(self, windows=None):
+        """Resolve the window to focus and the leave keycodes before the leave"""
+        self.armed_window = self.find_main_window(windows)
+        for name in LEAVE_KEYS + (CONFIRM_KEY,):
+            self.keycode(name)
+
+    def disarm(self):
+        self.armed_window = None
+
+    def focus(self, windows=None):
+        """Activate the main Zoom window via _NET_ACTIVE_WINDOW and input focus"""
+        if windows is None and self.armed_window is not None:
+            windows = [self.armed_window]
+        zoom_window = self.find_main_window(windows)
+        if not zoom_window:
+            self.log("No Zoom window found to focus on!")
+            return False
+
+        self.log(f"Leaving Zoom meeting... Focusing on: {zoom_window.title}")
+        window = self.display.create_resource_object('window', zoom_window.window)
+        try:
+            message = xevent.ClientMessage(window=window, client_type=self.NET_ACTIVE_WINDOW,
+                                           data=(32, [1, X.CurrentTime, 0, 0, 0]))
+            self.root.send_event(message, event_mask=X.SubstructureRedirectMask | X.SubstructureNotifyMask)
+            window.set_input_focus(X.RevertToParent, X.CurrentTime)
+            self.display.sync()
+        except xerror.XError as e:
+            self.log(f"Error focusing Zoom window: {e}")
+            return False
+        pause(1)  # Give time for window to focus
+        return True
+
+    def keycode(self, keysym_name):
+        """Keycode for a keysym name, cached"""
+        keycode = self._keycodes.get(keysym_name)
+        if keycode is None:
+            keycode = self._keycodes[keysym_name] = self.display.keysym_to_keycode(XK.string_to_keysym(keysym_name))
+        return keycode
+
+    def press_keys(self, *keysym_names):
+        """Press a key chord with XTEST (press in order, release in reverse)"""
+        keycodes = [self.keycode(name) for name in keysym_names]
+        for keycode in keycodes:
+            xtest.fake_input(self.display, X.KeyPress, keycode)
+        for keycode in reversed(keycodes):
+            xtest.fake_input(self.display, X.KeyRelease, keycode)
+        self.display.sync()
+
+    @leave_strategy("xtest_alt_q")
+    @traced("leave_zoom_meeting")
+    def leave(self, windows=None):
+        """Execute the sequence to leave Zoom meeting"""
+        try:
+            if not self.focus(windows):
+                return False
+
+            with span("xtest", keys="+".join(LEAVE_KEYS)):
+                self.press_keys(*LEAVE_KEYS)
+            pause(0.5)  # Give time for dialog to appear
+            with span("xtest", keys=CONFIRM_KEY):
+                self.press_keys(CONFIRM_KEY)
+
+            self.log("Successfully executed leave meeting sequence!")
+            return True
+
+        except Exception as e:
+            self.log(f"Error leaving meeting: {e}")
+            return False
+        finally:
+            self.armed_window = None
@@ -0,0 +1,379 @@
+"""
+macOS adapter: AppleScript / AppKit enumeration and the Zoom quit sequences.
+"""
+
+import subprocess
+
+from AppKit import NSWorkspace
+from Cocoa import NSApplicationActivateIgnoringOtherApps
+
+from .base import PlatformAdapter, pause, window_record
+from ..records import merge_windows
+from ..metrics import count_spawn, leave_strategy
+from ..parser import is_zoom_window
+from ..sources import DetectionSource, SourceOrchestrator
+from ..spans import span, traced
+
+# How far each window source's counts are trusted (see leaver_core/sources.py)
+DIRECT_CONFIDENCE = 0.9       # zoom.us's own windows, asked directly
+APPLESCRIPT_CONFIDENCE = 0.7  # every app's windows via System Events: slower, so older by the time it answers
+
+
+def run_command(args, **kwargs):
+    """subprocess.run, counted in the subprocess spawn metrics (and a span when tracing)"""
+    count_spawn(args)
+    with span(args[0] if args else "subprocess"):
+        return subprocess.run(args, **kwargs)
+
+
+class MacOSAdapter(PlatformAdapter):
+    """AppleScript / AppKit based adapter"""
+
+    label = " (macOS)"
+    leaves_all_meetings = True  # The leave quits zoom.us
+
+    def __init__(self, log=print, hedged=True):
+        super().__init__(log)
+        self.workspace = NSWorkspace.sharedWorkspace()
+        # Ask zoom.us directly, and System Events too when that is slow or finds no count (hedged=False: both in turn)
+        self.sources = SourceOrchestrator([
+            DetectionSource('direct', self._direct_zoom_windows, DIRECT_CONFIDENCE),
+            DetectionSource('applescript', self._applescript_zoom_windows, APPLESCRIPT_CONFIDENCE),
+        ], log=log) if hedged else None
+
+    def describe(self, config):
+        return [f"Leave shortcut: {config.get('leave_shortcut', 'cmd+q')}"]
+
+    @traced("get_window_list_via_applescript")
+    def get_window_list_via_applescript(self):
+        """Get window list using AppleScript for better compatibility"""
+        try:
+            # AppleScript to get all window titles from all applications
+            script = '''
+            tell application "System Events"
+                set windowList to {}
+                repeat with proc in (every process whose background only is false)
+                    try
+                        repeat with win in (every window of proc)
+                            set windowList to windowList & {name of win as string}
+                        end repeat
+                    end try
+                end repeat
+                return windowList
+            end tell
+            '''
+            
+            result = run_command(['osascript', '-e', script], 
+                               capture_output=True, text=True, check=True)
+            window_titles = result.stdout.strip().split(', ')
+            return [title.strip() for title in window_titles if title.strip()]
+        except Exception as e:
+            self.log(f"Error getting window list via AppleScript: {e}")
+            return []
+    
+    def list_windows(self):
+        """Return records for every window title visible to System Events"""
+        return [window_record(title, 'applescript') for title in self.get_window_list_via_applescript()]
+    
+    def zoom_windows(self):
+        """Find all Zoom-related windows using multiple methods"""
+        zoom_windows = []
+        
+        try:
+            if self.sources is not None:
+                return self.sources.query()
+
+            # Method 1: Get window titles via AppleScript
+            zoom_windows = self._applescript_zoom_windows()
+            
+            # Method 2: Try to get Zoom window titles directly (titles not found above)
+            zoom_windows = merge_windows(zoom_windows, self._direct_zoom_windows())
+                    
+        except Exception as e:
+            self.log(f"Error finding Zoom windows: {e}")
+        
+        return zoom_windows
+    
+    def _applescript_zoom_windows(self):
+        """Records for the Zoom windows among every app's windows"""
+        return [window_record(title, 'applescript')
+                for title in self.get_window_list_via_applescript() if title and is_zoom_window(title)]
+    
+    def _direct_zoom_windows(self):
+        """Records for zoom.us's own windows"""
+        return [window_record(title, 'direct') for title in self._get_zoom_window_titles_direct()]
+    
+    @traced("_get_zoom_window_titles_direct")
+    def _get_zoom_window_titles_direct(self):
+        """Get Zoom window titles using direct AppleScript query"""
+        try:
+            script = '''
+            tell application "System Events"
+                set zoomTitles to {}
+                try
+                    tell process "zoom.us"
+                        repeat with win in (every window)
+                            set zoomTitles to zoomTitles & {name of win as string}
+                        end repeat
+                    end tell
+                end try
+                return zoomTitles
+            end tell
+            '''
+            
+            result = run_command(['osascript', '-e', script], 
+                               capture_output=True, text=True, check=True)
+            if result.stdout.strip():
+                titles = result.stdout.strip().split(', ')
+                return [title.strip() for title in titles if title.strip()]
+        except Exception:
+            pass
+        
+        return []
+    
+    @traced("activate_zoom_meeting_window")
+    def activate_zoom_meeting_window(self):
+        """Activate/focus the main Zoom meeting window (not participants or other windows)"""
+        try:
+            # Method 1: Try to focus specifically on the main meeting window via AppleScript
+            script = '''
+            tell application "System Events"
+                try
+                    tell process "zoom.us"
+                        -- Look for the main meeting window (usually contains "Zoom Meeting" or similar)
+                        set meetingWindows to (every window whose name contains "Zoom Meeting" or name contains "Meeting" or name contains "zoom.us")
+                        if (count of meetingWindows) > 0 then
+                            set frontmost to true
+                            click (first window of meetingWindows)
+                            return "success"
+                        end if
+                        
+                        -- If no specific meeting window, try to find any zoom window that's not participants
+                        set allWindows to (every window)
+                        repeat with win in allWindows
+                            set winName to name of win
+                            if winName does not contain "Participant" and winName does not contain "Chat" and winName does not contain "Breakout" then
+                                set frontmost to true
+                                click win
+                                return "success"
+                            end if
+                        end repeat
+                        
+                        -- Fallback: just activate the first window
+                        if (count of allWindows) > 0 then
+                            set frontmost to true
+                            click (first window of allWindows)
+                            return "success"
+                        end if
+                    end tell
+                end try
+                return "failed"
+            end tell
+            '''
+            
+            result = run_command(['osascript', '-e', script], 
+                               capture_output=True, text=True)
+            
+            if result.returncode == 0 and "success" in result.stdout:
+                self.log("Successfully focused on Zoom meeting window")
+                pause(1)  # Give time for window focus
+                return True
+            
+            # Method 2: Try general Zoom app activation as fallback
+            running_apps = self.workspace.runningApplications()
+            for app in running_apps:
+                if (app.localizedName() and 
+                    'zoom' in app.localizedName().lower() and 
+                    not app.isTerminated()):
+                    success = app.activateWithOptions_(NSApplicationActivateIgnoringOtherApps)
+                    if success:
+                        self.log(f"Activated Zoom application: {app.localizedName()}")
+                        
+                        # Try to bring the main meeting window to front
+                        focus_script = '''
+                        tell application "System Events"
+                            tell process "zoom.us"
+                                try
+                                    set meetingWin to (first window whose name does not contain "Participant" and name does not contain "Chat")
+                                    click meetingWin
+                                end try
+                            end tell
+                        end tell
+                        '''
+                        run_command(['osascript', '-e', focus_script], 
+                                  capture_output=True, text=True)
+                        
+                        pause(1)
+                        return True
+            
+            # Method 3: Basic AppleScript activation
+            script = '''
+            tell application "zoom.us"
+                activate
+            end tell
+            '''
+            
+            result = run_command(['osascript', '-e', script], 
+                               capture_output=True, text=True)
+            if result.returncode == 0:
+                self.log("Activated Zoom via AppleScript")
+                pause(1)
+                return True
+                
+        except Exception as e:
+            self.log(f"Error activating Zoom meeting window: {e}")
+        
+        return False
+    
+    @traced("leave_zoom_meeting")
+    def leave_zoom_meeting(self):
+        """Execute the sequence to leave Zoom meeting on macOS"""
+        try:
+            self.log("Attempting to leave Zoom meeting...")
+            
+            # Use AppleScript direct quit + Enter (fast method)
+            self._method_applescript_direct_quit()
+            
+            self.log("✅ Leave sequence completed!")
+            return True
+            
+        except Exception as e:
+            self.log(f"Error leaving meeting: {e}")
+            return False
+    
+    
+    
+    @leave_strategy("applescript_direct_quit")
+    @traced("_method_applescript_direct_quit")
+    def _method_applescript_direct_quit(self):
+        """Fast AppleScript quit + Enter confirmation"""
+        import pyautogui  # Slow to import and only needed to leave, so detection doesn't pay for it
+        script = '''
+        tell application "zoom.us"
+            quit
+        end tell
+        '''
+        
+        try:
+            # Execute AppleScript quit
+            run_command(['osascript', '-e', script], 
+                       capture_output=True, text=True, timeout=5)
+            
+            # Immediately press Enter to confirm
+            pause(0.5)  # Brief pause for dialog
+            with span("press", key="return"):
+                pyautogui.press('return')
+            
+        except Exception:
+            # Fallback: just press Enter
+            with span("press", key="return"):
+                pyautogui.press('return')
+    
+    @leave_strategy("keyboard_shortcuts")
+    @traced("_method_keyboard_shortcuts")
+    def _method_keyboard_shortcuts(self):
+        """Method 3: Try various keyboard shortcuts"""
+        import pyautogui
+        self.log("Using keyboard shortcuts method...")
+        
+        # Focus on Zoom first
+        if not self.activate_zoom_meeting_window():
+            return False
+        
+        shortcuts_to_try = [
+            ('cmd', 'shift', 'w'),  # Zoom's Leave Meeting shortcut
+            ('cmd', 'w'),           # Close window
+            ('alt', 'f4'),          # Windows-style close
+            ('cmd', 'q'),           # Quit application
+        ]
+        
+        for shortcut in shortcuts_to_try:
+            try:
+                self.log(f"Trying shortcut: {'+'.join(shortcut)}")
+                with span("hotkey", keys='+'.join(shortcut)):
+                    pyautogui.hotkey(*shortcut)
+                pause(0.5)
+                
+                # Try to confirm any dialog that appears
+                for _ in range(3):
+                    with span("press", key="return"):
+                        pyautogui.press('return')
+                    pause(0.2)
+                    with span("press", key="enter"):
+                        pyautogui.press('enter')
+                    pause(0.2)
+                
+                # Check if it worked
+                pause(1)
+                if not self._is_zoom_running():
+                    return True
+                    
+            except Exception as e:
+                self.log(f"Shortcut {shortcut} failed: {e}")
+        
+        return False
+    
+    @leave_strategy("force_kill")
+    @traced("_method_force_kill")
+    def _method_force_kill(self):
+        """Method 4: Force kill Zoom process as last resort"""
+        self.log("Using force kill method as last resort...")
+        
+        try:
+            # Try to kill zoom.us process
+            result = run_command(['pkill', '-f', 'zoom.us'], 
+                               capture_output=True, text=True, timeout=5)
+            
+            # Also try killall
+            run_command(['killall', 'zoom.us'], 
+                      capture_output=True, text=True, timeout=5)
+            
+            return True
+            
+        except Exception as e:
+            self.log(f"Force kill error: {e}")
+            return False
+    
+    @traced("_is_zoom_running")
+    def _is_zoom_running(self):
+        """Check if Zoom application is currently running"""
+        try:
+            # Method 1: Check via NSWorkspace
+            running_apps = self.workspace.runningApplications()
+            for app in running_apps:
+                if (app.localizedName() and 
+                    'zoom' in app.localizedName().lower() and 
+                    not app.isTerminated()):
+                    return True
+            
+            # Method 2: Check via AppleScript
+            script = '''
+            tell application "System Events"
+                return (count of (every process whose name is "zoom.us")) > 0
+            end tell
+            '''
+            
+            result = run_command(['osascript', '-e', script], 
+                               capture_output=True, text=True)
+            if result.returncode == 0 and "true" in result.stdout.lower():
+                return True
+                
+            return False
+            
+        except Exception as e:
+            self.log(f"Error checking if Zoom is running: {e}")
+            return False
+    
+    def prepare(self, windows=None):
+        """Import pyautogui and warm osascript before the leave needs them"""
+        import pyautogui  # noqa: F401
+        # A throwaway script pages in osascript and the AppleScript component
+        run_command(['osascript', '-e', 'return'], capture_output=True, text=True, timeout=5)
+
+    def focus(self, windows=None):
+        """Focus the main Zoom meeting window"""
+        return self.activate_zoom_meeting_window()
+    
+    def leave(self, windows=None):
+        """Leave the meeting using the default (fast) method"""
+        return self.leave_zoom_meeting()
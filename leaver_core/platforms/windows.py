@@ -0,0 +1,138 @@
+"""
+Windows adapter: pygetwindow enumeration and the Alt+Q leave sequence.
+"""
+
+import ctypes
+import os
+
+import pygetwindow as gw
+
+from .base import PlatformAdapter, pause, window_record
+from ..metrics import leave_strategy
+from ..parser import is_zoom_window, names_zoom
+from ..spans import span, traced
+
+ZOOM_PROCESS = "zoom.exe"
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+
+def process_name(hwnd):
+    """Executable name (lowercased) of the process owning a window, or None"""
+    user32, kernel32 = ctypes.windll.user32, ctypes.windll.kernel32
+    pid = ctypes.c_ulong()
+    user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid.value)
+    if not handle:
+        return None
+    try:
+        path = ctypes.create_unicode_buffer(260)
+        size = ctypes.c_ulong(len(path))
+        if not kernel32.QueryFullProcessImageNameW(handle, 0, path, ctypes.byref(size)):
+            return None
+        return os.path.basename(path.value).lower()
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+class WindowsAdapter(PlatformAdapter):
+    """pygetwindow / pyautogui based adapter"""
+
+    armed_window = None  # Window record resolved by prepare()
+    owners = None  # hwnd -> process name, for titles that only say "meeting"
+
+    def list_windows(self):
+        """Return records for every titled window"""
+        with span("pygetwindow.getAllWindows"):
+            windows = gw.getAllWindows()
+        return [window_record(window.title, 'pygetwindow', window) for window in windows if window.title]
+
+    def zoom_windows(self):
+        """Find all Zoom-related windows (filtered before building records)"""
+        with span("pygetwindow.getAllWindows"):
+            windows = gw.getAllWindows()
+        return [window_record(window.title, 'pygetwindow', window) for window in windows
+                if is_zoom_window(window.title) and (names_zoom(window.title) or self.owned_by_zoom(window))]
+
+    def owned_by_zoom(self, window):
+        """Whether Zoom.exe owns a window ("Meeting notes (3)" in Word doesn't count)"""
+        hwnd = getattr(window, "_hWnd", None)
+        if hwnd is None:
+            return False
+        if self.owners is None or len(self.owners) > 1024:
+            self.owners = {}
+        name = self.owners.get(hwnd)
+        if name is None:
+            try:
+                name = process_name(hwnd) or ""
+            except Exception as e:
+                self.log(f"Could not tell which process owns {window.title!r}: {e}")
+                name = ""
+            self.owners[hwnd] = name
+        return name == ZOOM_PROCESS
+
+    def find_main_window(self, windows=None):
+        """Find the main Zoom meeting window for focusing"""
+        if windows is None:
+            windows = self.zoom_windows()
+
+        if not windows:
+            return None
+
+        # Prefer windows that look like main meeting windows
+        for window in windows:
+            if window.is_main:
+                return window
+
+        # Return the first available zoom window
+        return windows[0]
+
+    def prepare(self, windows=None):
+        """Import pyautogui and resolve the window to focus before the leave"""
+        import pyautogui  # noqa: F401
+        self.armed_window = self.find_main_window(windows)
+
+    def disarm(self):
+        self.armed_window = None
+
+    def focus(self, windows=None):
+        """Focus the main Zoom window"""
+        if windows is None and self.armed_window is not None:
+            windows = [self.armed_window]  # Skip enumerating every window again
+        zoom_window = self.find_main_window(windows)
+        if not zoom_window:
+            self.log("No Zoom window found to focus on!")
+            return False
+
+        self.log(f"Leaving Zoom meeting... Focusing on: {zoom_window.title}")
+        with span("activate", title=zoom_window.title):
+            zoom_window.window.activate()
+        pause(1)  # Give time for window to focus
+        return True
+
+    @leave_strategy("alt_q")
+    @traced("leave_zoom_meeting")
+    def leave(self, windows=None):
+        """Execute the sequence to leave Zoom meeting"""
+        import pyautogui  # Slow to import and only needed to leave, so detection doesn't pay for it
+        try:
+            # Step 1: Focus to Zoom
+            if not self.focus(windows):
+                return False
+
+            # Step 2: Press Alt+Q (Leave Meeting shortcut)
+            with span("hotkey", keys="alt+q"):
+                pyautogui.hotkey('alt', 'q')
+            pause(0.5)  # Give time for dialog to appear
+
+            # Step 3: Press Enter (Confirm leaving)
+            with span("press", key="enter"):
+                pyautogui.press('enter')
+
+            self.log("Successfully executed leave meeting sequence!")
+            return True
+
+        except Exception as e:
+            self.log(f"Error leaving meeting: {e}")
+            return False
+        finally:
+            self.armed_window = None
@@ -0,0 +1,204 @@
+"""
+On-demand stack sampling for a monitor that has been running for hours.
+
+When a monitor gets slow on someone's machine, there is no debugger to
+attach, so the process can be asked for a profile while it runs:
+
+    kill -USR1 <pid>                          # or: python -m leaver_core profile
+    curl 'http://127.0.0.1:9464/profile?seconds=10'   # with metrics_port set
+
+Either way, a background thread takes "profile_rate" samples a second of
+every thread's stack (sys._current_frames()), including the monitoring
+thread of the menu bar app, for "profile_seconds" seconds. The stacks are
+written to profile_file (monitor_profile.folded next to config.json when
+it is empty) in the collapsed format of flamegraph.pl,
+speedscope and inferno, one line per distinct stack:
+
+    monitoring;Monitor.run (monitor.py:228);Monitor.tick (monitor.py:122);MacOSAdapter.zoom_windows (macos.py:77) 41
+
+Frames are labelled with the function and the line it starts on, so
+samples anywhere in a function add up. /profile also returns the stacks
+in its response. Only one profile runs at a time.
+
+Only Python frames are seen, and a sample is taken when the sampler gets
+the interpreter lock. A thread blocked in a call (osascript, a lock, a
+sleep) is caught where it waits; a thread busy in pure Python is caught
+at its next switch.
+
+Until a profile is asked for, nothing runs: no thread, no hook on the
+interpreter, only the SIGUSR1 handler. The handler is installed whatever
+the config says, because SIGUSR1's default action ends the process: a
+`profile` sent to a monitor started without profile_file would otherwise
+kill it mid-meeting. Python runs signal handlers on the
+main thread, between two bytecodes. In the menu bar app the main thread
+is in the Cocoa run loop, so the signal is handled at the next frame
+timer callback. Windows has no SIGUSR1; use /profile there.
+"""
+
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+
+DEFAULT_SECONDS = 30
+DEFAULT_RATE = 50     # samples a second
+MAX_SECONDS = 600     # longest profile /profile accepts
+DEFAULT_FILE = "monitor_profile.folded"  # next to config.json, when profile_file is empty
+
+_sampler = None  # The installed StackSampler, or None until start_profiler()
+
+
+def active():
+    """The installed StackSampler (None until start_profiler())"""
+    return _sampler
+
+
+def _on_signal(signum, frame):
+    # Runs on the main thread between bytecodes: start the sampler thread and return, no logging
+    sampler = _sampler
+    if sampler is not None:
+        sampler.start(reason="SIGUSR1")
+
+
+def install(sampler):
+    """Make `sampler` the process-wide sampler and start it on SIGUSR1; returns whether the signal is armed"""
+    global _sampler
+    _sampler = sampler
+    if sampler is None or not hasattr(signal, "SIGUSR1"):
+        return False
+    try:
+        signal.signal(signal.SIGUSR1, _on_signal)
+    except ValueError:  # Only the main thread may set signal handlers
+        return False
+    return True
+
+
+def collapse(stacks):
+    """Collapsed-stack text ("frame;frame;frame count" lines, most samples first)"""
+    lines = [";".join(stack) + f" {count}" for stack, count in stacks.most_common()]
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+class StackSampler:
+    """Samples every thread's stack for a while and writes them as collapsed stacks"""
+
+    def __init__(self, path, seconds=DEFAULT_SECONDS, rate=DEFAULT_RATE, log=None):
+        self.path = path
+        self.seconds = seconds
+        self.rate = max(1, rate)
+        self.log = log
+        self.runs = 0
+        self.samples = 0       # Samples taken by the latest profile
+        self._busy = threading.Lock()
+        self._labels = {}      # code object -> frame label, for the profile that is running
+
+    @classmethod
+    def from_config(cls, config, log=None):
+        """Build a StackSampler for the config's profile_file (DEFAULT_FILE when empty)
+
+        A relative path is taken relative to the config file's directory.
+        """
+        path = os.path.expanduser(config.get("profile_file") or DEFAULT_FILE)
+        config_file = getattr(config, "config_file", None)
+        if not os.path.isabs(path) and config_file:
+            path = os.path.join(os.path.dirname(os.path.abspath(config_file)), path)
+        return cls(path, config.get("profile_seconds", DEFAULT_SECONDS), config.get("profile_rate", DEFAULT_RATE), log)
+
+    @property
+    def running(self):
+        return self._busy.locked()
+
+    def start(self, seconds=None, reason="requested"):
+        """Profile on a background thread; False if a profile is already running"""
+        if not self._busy.acquire(blocking=False):
+            return False
+        threading.Thread(target=self._profile, args=(seconds, reason), name="stack-sampler", daemon=True).start()
+        return True
+
+    def profile(self, seconds=None, reason="requested"):
+        """Profile on this thread and write the file; returns the collapsed stacks (None if one is running)"""
+        if not self._busy.acquire(blocking=False):
+            return None
+        return self._profile(seconds, reason)
+
+    def _profile(self, seconds, reason):
+        try:
+            seconds = min(seconds or self.seconds, MAX_SECONDS)
+            if self.log:
+                self.log(f"📊 Profiling all threads for {seconds:g}s ({reason}, {self.rate} samples/s)")
+            text = collapse(self.sample(seconds))
+            self.runs += 1
+            self.write(text, f"{reason}, {self.samples} samples")
+            return text
+        finally:
+            self._labels = {}
+            self._busy.release()
+
+    def sample(self, seconds):
+        """Counter of (thread name, outermost frame, ..., innermost frame) stacks over `seconds`"""
+        stacks = Counter()
+        own = threading.get_ident()
+        interval = 1.0 / self.rate
+        clock = time.perf_counter
+        deadline = clock() + seconds
+        next_sample = clock()
+        self.samples = 0
+        while True:
+            self.sample_once(stacks, own)
+            self.samples += 1
+            next_sample += interval
+            if next_sample >= deadline:
+                break
+            delay = next_sample - clock()
+            if delay > 0:
+                time.sleep(delay)
+        return stacks
+
+    def sample_once(self, stacks, own=None):
+        """Add the stack of every thread but `own` to stacks"""
+        frames = sys._current_frames()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        labels = self._labels
+        for ident, frame in frames.items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = (f"{getattr(code, 'co_qualname', code.co_name)} "
+                                            f"({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                stack.append(label)
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread {ident}").replace(";", ","))
+            stack.reverse()
+            stacks[tuple(stack)] += 1
+        del frames
+
+    def write(self, text, reason=None):
+        """Write collapsed stacks to profile_file; returns the path, or None on error"""
+        path = self.path
+        try:
+            temp = f"{path}.{os.getpid()}.tmp"
+            with open(temp, "w") as f:
+                f.write(text)
+            os.replace(temp, path)
+        except Exception as e:
+            if self.log:
+                self.log(f"Error writing profile {path}: {e}")
+            return None
+        if self.log:
+            self.log(f"📊 Profile ({reason or 'requested'}) written to {path}")
+        return path
+
+
+def start_profiler(config, log=None):
+    """Arm the config's StackSampler for SIGUSR1 and /profile"""
+    sampler = StackSampler.from_config(config, log)
+    armed = install(sampler)
+    if armed and log:
+        log(f"Profiling on request: kill -USR1 {os.getpid()} writes {sampler.seconds:g}s of stacks to {sampler.path}")
+    return sampler
@@ -0,0 +1,227 @@
+"""
+Per-meeting threshold profiles, looked up by meeting ID or title pattern.
+
+A profile overrides the global participant_threshold (and can turn
+auto-leave off) for the meetings it matches:
+
+    {"profiles": [
+        {"name": "standup", "meeting_ids": ["812 3456 7731"], "participant_threshold": 2},
+        {"name": "lectures", "title_pattern": "lecture|CS ?101", "participant_threshold": 10},
+        {"name": "1:1s", "id_pattern": "^9", "auto_leave": false}
+    ]}
+
+Profiles come from the "profiles" list in config.json and/or a separate
+"profiles_file" with the same layout. Exact IDs go into a dict. All
+id_patterns are combined into one alternation regex, and all title_patterns
+into another. Patterns that can't share an alternation (backreferences,
+inline global flags such as "(?i)", group names used twice) are matched on
+their own. An exact ID beats an ID pattern, which beats a title pattern;
+among patterns, the earliest match in the text wins, and ties go to the
+profile listed first. Everything is loaded and compiled on the first
+lookup, so a profile file with thousands of entries costs nothing until a
+meeting shows up. Each meeting is resolved once when it is first seen
+(MeetingTracker keeps the result), so a tick costs O(1).
+"""
+
+import json
+import os
+import re
+
+
+class Profile:
+    """Thresholds and rules for one kind of meeting"""
+
+    __slots__ = ("name", "participant_threshold", "auto_leave")
+
+    def __init__(self, name, participant_threshold=None, auto_leave=True):
+        self.name = name
+        self.participant_threshold = participant_threshold  # None: use the global threshold
+        self.auto_leave = auto_leave
+
+    def describe(self, default_threshold):
+        if not self.auto_leave:
+            return f"profile '{self.name}' (auto-leave off)"
+        threshold = self.participant_threshold if self.participant_threshold is not None else default_threshold
+        return f"profile '{self.name}' (threshold {threshold})"
+
+
+def normalize_meeting_id(value):
+    """"812 3456-7731" -> "81234567731", matching parser.parse_meeting_id"""
+    return re.sub(r'\D', '', str(value))
+
+
+def _shareable(pattern):
+    """Whether a pattern means the same inside the combined alternation"""
+    if re.search(r"\\[1-9]|\(\?P=", pattern):
+        return False  # Backreferences would point at another pattern's groups
+    try:
+        re.compile(f"(?P<p0>{pattern})")
+    except re.error:
+        return False  # e.g. "(?i)..." is only allowed at the start of the whole regex
+    return True
+
+
+def _combine(patterns):
+    """Compile [(pattern, profile)] for lookups: (alternation, [(position, profile)], [(regex, position, profile)])
+
+    The alternation's match.lastgroup indexes the first list. Patterns that
+    can't share it, or all of them if it doesn't compile, go in the last
+    list, each compiled on its own. Positions in the profile list break ties.
+    """
+    shared = [(position, pattern, profile) for position, (pattern, profile) in enumerate(patterns)
+              if _shareable(pattern)]
+    separate = [(position, pattern, profile) for position, (pattern, profile) in enumerate(patterns)
+                if not _shareable(pattern)]
+    regex = None
+    if shared:
+        try:
+            regex = re.compile("|".join(f"(?P<p{i}>{pattern})" for i, (_, pattern, _) in enumerate(shared)),
+                               re.IGNORECASE)
+        except re.error:  # Say, two patterns naming the same group
+            separate, shared = sorted(shared + separate, key=lambda item: item[0]), []
+    return (regex, [(position, profile) for position, _, profile in shared],
+            [(re.compile(pattern, re.IGNORECASE), position, profile) for position, pattern, profile in separate])
+
+
+def _entry_problem(entry):
+    """Why a profile entry can't be used (None if it can)"""
+    if not isinstance(entry, dict):
+        return "not an object"
+    threshold = entry.get("participant_threshold")
+    if threshold is not None and (isinstance(threshold, bool) or not isinstance(threshold, int) or threshold < 1):
+        return f"participant_threshold must be a whole number of at least 1, not {threshold!r}"
+    if not isinstance(entry.get("auto_leave", True), bool):
+        return f"auto_leave must be true or false, not {entry['auto_leave']!r}"
+    meeting_ids = entry.get("meeting_ids", ())
+    if not isinstance(meeting_ids, (list, tuple, str, int)):
+        return f"meeting_ids must be a list of IDs, not {meeting_ids!r}"
+    for key in ("id_pattern", "title_pattern"):
+        if entry.get(key) is not None and not isinstance(entry[key], str):
+            return f"{key} must be a string, not {entry[key]!r}"
+    return None
+
+
+class ProfileTable:
+    """Meeting-ID indexed profile lookup, loaded and compiled on first use"""
+
+    def __init__(self, entries=(), profiles_file=None):
+        self._entries = list(entries)
+        self.profiles_file = profiles_file
+        self.loaded = False
+        self.profiles = []
+        self._by_id = {}
+        self._id_regex = None
+        self._id_profiles = []
+        self._id_separate = []
+        self._title_regex = None
+        self._title_profiles = []
+        self._title_separate = []
+        self.lookups = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """Table for the config's inline profiles and profiles_file (None if there are none)"""
+        entries = config.get("profiles") or []
+        profiles_file = config.get("profiles_file") or None
+        if not entries and not profiles_file:
+            return None
+        return cls(entries, profiles_file)
+
+    def _read_file(self):
+        with open(self.profiles_file, 'r') as f:
+            data = json.load(f)
+        return data.get("profiles", []) if isinstance(data, dict) else data
+
+    def load(self):
+        """Parse every entry and build the ID index and combined patterns"""
+        entries = list(self._entries)
+        if self.profiles_file and os.path.exists(self.profiles_file):
+            try:
+                entries.extend(self._read_file())
+            except Exception as e:
+                print(f"Error loading profiles from {self.profiles_file}: {e}")
+
+        by_id = {}
+        id_patterns = []
+        title_patterns = []
+        profiles = []
+        for number, entry in enumerate(entries, start=1):
+            problem = _entry_problem(entry)
+            if problem is not None:
+                name = entry.get("name", f"profile {number}") if isinstance(entry, dict) else f"profile {number}"
+                print(f"Ignoring profile '{name}': {problem}")
+                continue
+            profile = Profile(entry.get("name", f"profile {number}"),
+                              entry.get("participant_threshold"),
+                              entry.get("auto_leave", True))
+            profiles.append(profile)
+            meeting_ids = entry.get("meeting_ids", ())
+            if isinstance(meeting_ids, (str, int)):
+                meeting_ids = [meeting_ids]  # One ID, not a list of its characters
+            for meeting_id in meeting_ids:
+                by_id.setdefault(normalize_meeting_id(meeting_id), profile)
+            for key, patterns in (("id_pattern", id_patterns), ("title_pattern", title_patterns)):
+                pattern = entry.get(key)
+                if not pattern:
+                    continue
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    print(f"Ignoring invalid {key} in profile '{profile.name}': {e}")
+                    continue
+                patterns.append((pattern, profile))
+
+        self.profiles = profiles
+        self._by_id = by_id
+        self._id_regex, self._id_profiles, self._id_separate = _combine(id_patterns)
+        self._title_regex, self._title_profiles, self._title_separate = _combine(title_patterns)
+        self.loaded = True
+        return self
+
+    @staticmethod
+    def _first(regex, profiles, separate, text):
+        """The profile whose pattern matches earliest in text (ties: listed first), or None"""
+        best = None
+        if regex is not None:
+            match = regex.search(text)
+            if match:
+                # lastgroup is the outermost alternative that matched, i.e. "p<index>"
+                position, profile = profiles[int(match.lastgroup[1:])]
+                best = (match.start(), position, profile)
+        for pattern, position, profile in separate:
+            match = pattern.search(text)
+            if match and (best is None or (match.start(), position) < best[:2]):
+                best = (match.start(), position, profile)
+        return best[2] if best else None
+
+    def lookup(self, meeting_id=None, titles=()):
+        """Return the Profile for a meeting, or None for the global defaults"""
+        if not self.loaded:
+            self.load()
+        self.lookups += 1
+
+        if meeting_id:
+            profile = self._by_id.get(meeting_id)
+            if profile is not None:
+                return profile
+            if self._id_regex is not None or self._id_separate:
+                profile = self._first(self._id_regex, self._id_profiles, self._id_separate, meeting_id)
+                if profile is not None:
+                    return profile
+
+        if self._title_regex is not None or self._title_separate:
+            for title in titles:
+                profile = self._first(self._title_regex, self._title_profiles, self._title_separate, title)
+                if profile is not None:
+                    return profile
+        return None
+
+    def stats(self):
+        return {
+            "loaded": self.loaded,
+            "profiles": len(self.profiles),
+            "meeting_ids": len(self._by_id),
+            "id_patterns": len(self._id_profiles) + len(self._id_separate),
+            "title_patterns": len(self._title_profiles) + len(self._title_separate),
+            "lookups": self.lookups,
+        }
@@ -0,0 +1,125 @@
+"""
+Window records: what a platform adapter reports for each window.
+
+Every tick the adapters list the windows on screen, and the same few titles
+come back each time. A WindowRecord is slotted and immutable, and holds
+everything later stages ask about a title, worked out once per title:
+
+    title           the title, interned
+    method          how it was found ('applescript', 'direct', 'pygetwindow', 'x11', ...)
+    window          the platform's handle (pygetwindow window, X11 window id) or None
+    title_lower     the lowercased title
+    is_zoom         parser.is_zoom_window(title)
+    is_participants the Participants window ("participant" in the title)
+    is_main         looks like the main meeting window (PRIORITY_KEYWORDS), preferred for focusing
+
+Because records can't change, window_record() hands out the same record
+again when a title comes back with the same method and a window id that
+can be hashed (None, or an X11 id). An unchanged macOS window list then
+allocates no new records at all. pygetwindow handles are new objects each
+enumeration, so those records are built fresh, but the title work still
+comes from the per-title cache.
+
+Records still answer record['title'] like the dicts they replace.
+"""
+
+import sys
+
+from .parser import is_zoom_window
+
+# Titles that look like the main meeting window, preferred for focusing
+PRIORITY_KEYWORDS = ('meeting', 'zoom meeting', 'participants')
+
+# Bounds for the title and record caches; both are simply cleared when full
+TITLE_CACHE_SIZE = 4096
+RECORD_CACHE_SIZE = 4096
+
+_titles = {}   # title -> (interned title, lowercased, is_zoom, is_participants, is_main)
+_records = {}  # (title, method, window) -> WindowRecord, for hashable window ids only
+
+
+def title_info(title):
+    """(interned title, lowercased, is_zoom, is_participants, is_main) for a title"""
+    info = _titles.get(title)
+    if info is None:
+        if len(_titles) >= TITLE_CACHE_SIZE:
+            _titles.clear()
+        title = sys.intern(title)
+        lower = title.lower()
+        info = _titles[title] = (title, lower, is_zoom_window(title), 'participant' in lower,
+                                 any(keyword in lower for keyword in PRIORITY_KEYWORDS))
+    return info
+
+
+class WindowRecord:
+    """One detected window (immutable; build it with window_record())"""
+
+    __slots__ = ("title", "method", "window", "title_lower", "is_zoom", "is_participants", "is_main")
+
+    def __init__(self, title, method, window=None):
+        _fill(self, title, method, window)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("WindowRecord is immutable")
+
+    __delattr__ = __setattr__
+
+    def __getitem__(self, key):
+        """record['title'] and record['window'], as with the old dict records"""
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __repr__(self):
+        return f"WindowRecord({self.title!r}, {self.method!r}, {self.window!r})"
+
+
+# Slot setters, which bypass the __setattr__ guard while a record is built
+(_set_title, _set_method, _set_window, _set_title_lower,
+ _set_is_zoom, _set_is_participants, _set_is_main) = (getattr(WindowRecord, name).__set__
+                                                      for name in WindowRecord.__slots__)
+_new = object.__new__
+
+
+def _fill(record, title, method, window):
+    # Unrolled: pygetwindow records are built fresh for every Zoom window on every tick
+    title, lower, is_zoom, is_participants, is_main = title_info(title)
+    _set_title(record, title)
+    _set_method(record, method)
+    _set_window(record, window)
+    _set_title_lower(record, lower)
+    _set_is_zoom(record, is_zoom)
+    _set_is_participants(record, is_participants)
+    _set_is_main(record, is_main)
+
+
+def window_record(title, method, window=None):
+    """The record for a detected window, reused when the same window was seen before"""
+    if window is None or window.__class__ is int:
+        key = (title, method, window)
+        record = _records.get(key)
+        if record is None:
+            if len(_records) >= RECORD_CACHE_SIZE:
+                _records.clear()
+            record = _records[key] = WindowRecord(title, method, window)
+        return record
+    record = _new(WindowRecord)  # Skips the __init__ call
+    _fill(record, title, method, window)
+    return record
+
+
+def merge_windows(*sources):
+    """Merge record lists from several detection sources, keeping the first record per title
+
+    The first source is taken whole; a later source only adds titles not
+    seen before. Titles are checked against a set, so merging is linear.
+    """
+    merged = list(sources[0]) if sources else []
+    seen = {record.title for record in merged}
+    for source in sources[1:]:
+        for record in source:
+            if record.title not in seen:
+                seen.add(record.title)
+                merged.append(record)
+    return merged
@@ -0,0 +1,261 @@
+"""
+Hedged window detection: ask the most trusted window source, hedge when it is slow.
+
+The macOS adapter can list Zoom windows two ways: the global System Events
+query (every window of every app, slow) and the direct query of the
+zoom.us process (fast). Run one after the other, a tick costs both plus
+any stall. A SourceOrchestrator runs each DetectionSource on its own
+worker thread. A tick asks the most confident source first, and the next
+one only when that one failed, answered without a count, or hasn't
+answered after `hedge_after` seconds (0: ask every source at once). Most
+ticks therefore wake one worker and run one query. The tick returns once
+it has an answer it trusts:
+
+    - an answer with a participant count from a source whose confidence is
+      at least high_confidence returns at once
+    - a count from a less trusted source, or one left over from an earlier
+      tick, waits up to `grace` seconds more for a better one
+    - otherwise it waits for every source asked, at most `timeout` seconds
+
+Sources that haven't answered by then are ignored for the tick. A call
+can't be cancelled, so it keeps running, and the source isn't asked again
+until it returns. If it returns while a later tick is waiting, that tick
+can use its answer; if it returns between ticks, the answer is thrown away
+as late. A hung osascript therefore holds one worker, not the monitor.
+
+When answers disagree on a count, an answer asked for in this tick beats
+one left over from an earlier tick, then the most confident source wins.
+Other sources still add the windows it didn't report, but not a count
+window for a meeting the winner already counted.
+
+Per source, calls, wins (its count was used), late and failed answers are
+counted, along with recent latencies, and ticks that asked more than one
+source are counted as hedges. They are also exported as
+zoom_leaver_source_calls_total and zoom_leaver_source_seconds.
+"""
+
+import threading
+import time
+from collections import deque, namedtuple
+
+from .meetings import meeting_key
+from .metrics import SOURCE_CALLS, SOURCE_SECONDS
+from .parser import parse_count
+from .records import merge_windows
+
+DEFAULT_TIMEOUT = 5.0       # seconds to wait for the sources in one tick
+DEFAULT_GRACE = 0.5         # seconds a less trusted count waits for a better one
+DEFAULT_HEDGE_AFTER = 0.3   # seconds before the next source is asked too
+HIGH_CONFIDENCE = 0.8       # a count from a source this trusted returns at once
+LATENCY_SAMPLES = 256       # recent latencies kept per source
+
+# One source's answer in one round; count is None when its windows carry none
+Answer = namedtuple("Answer", "round source records count failed")
+
+
+def answer_count(records):
+    """The first participant count in a list of window records (None if none has one)"""
+    for record in records:
+        count = parse_count(record.title)
+        if count is not None:
+            return count
+    return None
+
+
+class DetectionSource:
+    """One way of listing Zoom windows, and how far its counts are trusted
+
+    fetch() returns window records. confidence is between 0 and 1.
+    """
+
+    def __init__(self, name, fetch, confidence=0.5):
+        self.name = name
+        self.fetch = fetch
+        self.confidence = confidence
+        self.calls = 0
+        self.wins = 0
+        self.late = 0
+        self.failures = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.round = 0       # Round of the latest call asked for
+        self.done_round = 0  # Round of the latest call finished
+        self.started = 0.0
+        self.answer = None   # Answer of the latest finished call
+        self.answered_in = 0  # Round that was waiting when it finished (0: none, it came late)
+        self.warned = False
+        self.thread = None
+
+    @property
+    def running(self):
+        return self.round != self.done_round
+
+    def stats(self):
+        """Counters and latency summary (seconds) for reports"""
+        latencies = sorted(self.latencies)
+        return {
+            "calls": self.calls,
+            "wins": self.wins,
+            "win_rate": self.wins / self.calls if self.calls else 0.0,
+            "late": self.late,
+            "failures": self.failures,
+            "latency_median": latencies[len(latencies) // 2] if latencies else None,
+            "latency_max": latencies[-1] if latencies else None,
+        }
+
+
+class SourceOrchestrator:
+    """Queries detection sources concurrently and fuses their answers"""
+
+    def __init__(self, sources, timeout=DEFAULT_TIMEOUT, grace=DEFAULT_GRACE, high_confidence=HIGH_CONFIDENCE,
+                 hedge_after=DEFAULT_HEDGE_AFTER, log=None):
+        self.sources = list(sources)
+        self.ranked = sorted(self.sources, key=lambda source: -source.confidence)  # The order sources are asked in
+        self.timeout = timeout
+        self.grace = grace
+        self.high_confidence = high_confidence
+        self.hedge_after = hedge_after
+        self.log = log
+        self.round = 0
+        self.closed_round = 0  # Answers for this round or older are late
+        self.disagreements = 0  # Rounds where two sources reported different counts
+        self.hedges = 0  # Rounds that asked more than the first source
+        self._ready = threading.Condition()
+        self._closed = False
+
+    def query(self):
+        """Window records for this tick (see the module docstring for when it returns)"""
+        ready = self._ready
+        clock = time.perf_counter
+        with ready:
+            self.round += 1
+            current = self.round
+            deadline = clock() + self.timeout
+            pending = list(self.ranked)  # Not asked yet, most confident first
+            self._ask(pending, current)
+            hedge_at = clock() + self.hedge_after
+            hedged = False
+            sources = self.sources
+            while True:
+                # A call left over from an earlier tick counts too if it answers now
+                answers = [s.answer for s in sources if s.answered_in == current]
+                counted = [a for a in answers if a.count is not None]
+                if counted:
+                    if any(a.round == current and a.source.confidence >= self.high_confidence for a in counted):
+                        break
+                    deadline = min(deadline, clock() + self.grace)
+                running = any(s.running for s in sources)
+                if pending and (not running or clock() >= hedge_at):
+                    # The sources asked so far failed, have no trusted count, or are slow
+                    self.hedges += not hedged
+                    hedged = True
+                    self._ask(pending, current)
+                    hedge_at = clock() + self.hedge_after
+                    continue
+                if not running:
+                    break
+                remaining = (min(deadline, hedge_at) if pending else deadline) - clock()
+                if remaining > 0:
+                    ready.wait(remaining)
+                elif clock() >= deadline:
+                    break
+            self.closed_round = current
+        return self.fuse(answers)
+
+    def _ask(self, pending, current):
+        """Start the first source in pending that isn't still busy with an earlier call (under the lock)
+
+        Busy sources are taken off pending too; they may still answer this round.
+        """
+        while pending:
+            source = pending.pop(0)
+            if source.running:
+                self._warn_stuck(source)
+                continue
+            source.round = current
+            source.started = time.perf_counter()
+            source.calls += 1
+            if source.thread is None:
+                source.thread = threading.Thread(target=self._work, args=(source,),
+                                                 name=f"source-{source.name}", daemon=True)
+                source.thread.start()
+            self._ready.notify_all()
+            return
+
+    def fuse(self, answers):
+        """Merge one round's answers, newest round then most confident first; its count decides disagreements"""
+        ranked = sorted((a for a in answers if not a.failed), key=lambda a: (-a.round, -a.source.confidence))
+        winner = next((a for a in ranked if a.count is not None), None)
+        if winner is None:
+            for answer in ranked:
+                SOURCE_CALLS.labels(answer.source.name, "used").inc()
+            return merge_windows(*(a.records for a in ranked))
+
+        winner.source.wins += 1
+        SOURCE_CALLS.labels(winner.source.name, "won").inc()
+        counted = {meeting_key(r.title) for r in winner.records if parse_count(r.title) is not None}
+        sources = [winner.records]
+        disagreed = False
+        for answer in ranked:
+            if answer is winner:
+                continue
+            SOURCE_CALLS.labels(answer.source.name, "used").inc()
+            if answer.count is not None and answer.count != winner.count:
+                disagreed = True
+            sources.append([r for r in answer.records
+                            if parse_count(r.title) is None or meeting_key(r.title) not in counted])
+        self.disagreements += disagreed
+        return merge_windows(*sources)
+
+    def _work(self, source):
+        """Worker thread of one source: run fetch() whenever a round asks for it"""
+        ready = self._ready
+        while True:
+            with ready:
+                while not source.running and not self._closed:
+                    ready.wait()
+                if self._closed:
+                    return
+                current = source.round
+            start = time.perf_counter()
+            failed = False
+            try:
+                records = list(source.fetch())
+            except Exception as e:
+                records, failed = [], True
+                if self.log:
+                    self.log(f"Error in window source {source.name}: {e}")
+            seconds = time.perf_counter() - start
+            count = answer_count(records)
+            SOURCE_SECONDS.labels(source.name).observe(seconds)
+            with ready:
+                source.latencies.append(seconds)
+                source.answer = Answer(current, source, records, count, failed)
+                source.done_round = current
+                source.answered_in = waiting = self.round if self.round != self.closed_round else 0
+                source.warned = False
+                if failed:
+                    source.failures += 1
+                    SOURCE_CALLS.labels(source.name, "failed").inc()
+                elif not waiting:
+                    source.late += 1
+                    SOURCE_CALLS.labels(source.name, "late").inc()
+                ready.notify_all()
+
+    def _warn_stuck(self, source):
+        stuck = time.perf_counter() - source.started
+        if stuck > self.timeout and not source.warned and self.log:
+            source.warned = True
+            self.log(f"⚠️ Window source {source.name} still running after {stuck:.1f}s; checking without it")
+
+    def stats(self):
+        """{source name: stats} plus the disagreement count"""
+        stats = {source.name: source.stats() for source in self.sources}
+        stats["disagreements"] = self.disagreements
+        stats["hedges"] = self.hedges
+        return stats
+
+    def close(self):
+        """Stop the worker threads (a running fetch() finishes first)"""
+        with self._ready:
+            self._closed = True
+            self._ready.notify_all()
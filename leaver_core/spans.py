@@ -0,0 +1,235 @@
+"""
+Span tracing: where each tick and leave spent its time, as Chrome trace events.
+
+Aggregate metrics say that leaves are slow, not why one was. With
+"span_trace" set in config.json, the monitor records a span for each tick
+and its parts (count source, enumeration, each osascript or pygetwindow
+call, parsing, the decision), for the wait between ticks, and for each
+step of a leave, including its sleeps:
+
+    with span("hotkey", keys="alt+q"):
+        pyautogui.hotkey('alt', 'q')
+
+    @traced("leave_zoom_meeting")
+    def leave_zoom_meeting(self): ...
+
+Spans go into a ring buffer preallocated for "span_buffer" spans. When it
+is full, the oldest spans are overwritten. The buffer is written to the
+span_trace file as Chrome trace-event JSON when a leave fails, when a
+leave takes longer than "span_slow_leave" seconds, or when the monitoring
+loop fails. GET /trace on the metrics endpoint returns it on demand. Open
+the file in Perfetto (ui.perfetto.dev) or chrome://tracing.
+
+The tracer is process-wide, so adapters and source threads record into it
+without being handed anything. While tracing is off, span() returns a
+shared object that does nothing. A traced method is the plain function
+on its class while tracing is off: install() swaps the recording wrapper
+in when a tracer arrives and back out when it goes, so an untraced call
+costs nothing extra. A traced function outside a class, or under another
+decorator, can't be swapped and pays one extra call and a None check.
+"""
+
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from array import array
+
+DEFAULT_CAPACITY = 16384
+
+_tracer = None  # The installed SpanTracer, or None while tracing is off
+# Every traced method, for install() to swap: (module, class name, attribute) -> (class, function, wrapper).
+# Keyed by name so a reloaded module replaces its entries instead of adding more.
+_methods = {}
+
+
+class _NoSpan:
+    """What span() returns while tracing is off"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        args = self.args
+        if exc_type is not None:
+            args = dict(args or (), error=f"{exc_type.__name__}: {exc}")
+        self.tracer.record(self.name, self.start, time.perf_counter(), args)
+        return False
+
+
+def span(name, **args):
+    """Context manager recording a span named `name` (args are shown with it)"""
+    tracer = _tracer
+    if tracer is None:
+        return NO_SPAN
+    return _Span(tracer, name, args or None)
+
+
+class _TracedMethod:
+    """What traced() leaves in a class body; once the class exists it puts the right function there"""
+
+    def __init__(self, function, wrapper):
+        self.function = function
+        self.wrapper = wrapper
+        functools.update_wrapper(self, function)
+
+    def __set_name__(self, owner, attribute):
+        _methods[owner.__module__, owner.__qualname__, attribute] = (owner, self.function, self.wrapper)
+        setattr(owner, attribute, self.wrapper if _tracer is not None else self.function)
+
+    def __call__(self, *args, **kwargs):
+        # Outside a class (no __set_name__), it stays a wrapper
+        return self.wrapper(*args, **kwargs)
+
+
+def traced(name):
+    """Decorator recording every call of a function as a span"""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:  # Turned off while a swapped-in method was being called
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            error = None
+            try:
+                return function(*args, **kwargs)
+            except BaseException as e:
+                error = {"error": f"{type(e).__name__}: {e}"}
+                raise
+            finally:
+                tracer.record(name, start, time.perf_counter(), error)
+        return _TracedMethod(function, wrapper)
+    return decorate
+
+
+def active():
+    """The installed SpanTracer (None while tracing is off)"""
+    return _tracer
+
+
+def install(tracer):
+    """Make `tracer` the process-wide tracer (None turns tracing off)"""
+    global _tracer
+    was_on = _tracer is not None
+    _tracer = tracer
+    if (tracer is not None) != was_on:
+        for (_, _, attribute), (owner, function, wrapper) in _methods.items():
+            setattr(owner, attribute, wrapper if tracer is not None else function)
+
+
+class SpanTracer:
+    """Ring buffer of finished spans, dumped as Chrome trace-event JSON"""
+
+    def __init__(self, path=None, capacity=DEFAULT_CAPACITY, log=None):
+        self.path = path
+        self.capacity = capacity = max(1, int(capacity))
+        self.log = log
+        # One slot per span: parallel arrays, allocated once
+        self.names = [None] * capacity
+        self.args = [None] * capacity
+        self.starts = array("d", bytes(8 * capacity))
+        self.ends = array("d", bytes(8 * capacity))
+        self.threads = array("Q", bytes(8 * capacity))
+        self.recorded = 0
+        self._slots = itertools.count()  # next() is atomic, so threads never share a slot
+        # perf_counter() -> wall time, so traces from several processes line up
+        self.wall_offset = time.time() - time.perf_counter()
+        self.dumps = 0
+
+    @classmethod
+    def from_config(cls, config, log=None):
+        """Build a SpanTracer for the config's span_trace (None if unset)
+
+        A relative path is taken relative to the config file's directory.
+        """
+        path = config.get("span_trace")
+        if not path:
+            return None
+        path = os.path.expanduser(path)
+        config_file = getattr(config, "config_file", None)
+        if not os.path.isabs(path) and config_file:
+            path = os.path.join(os.path.dirname(os.path.abspath(config_file)), path)
+        return cls(path, config.get("span_buffer", DEFAULT_CAPACITY), log)
+
+    def record(self, name, start, end, args=None):
+        """Add a finished span (start and end are time.perf_counter() values)"""
+        number = next(self._slots)
+        slot = number % self.capacity
+        self.names[slot] = name
+        self.args[slot] = args
+        self.starts[slot] = start
+        self.ends[slot] = end
+        self.threads[slot] = threading.get_ident()
+        self.recorded = number + 1
+
+    @property
+    def dropped(self):
+        """Spans overwritten because the buffer was full"""
+        return max(0, self.recorded - self.capacity)
+
+    def events(self, reason=None):
+        """The buffered spans, oldest first, as a Chrome trace-event document"""
+        recorded, capacity = self.recorded, self.capacity
+        first = recorded - min(recorded, capacity)
+        pid = os.getpid()
+        offset = self.wall_offset
+        events = []
+        threads = set()
+        for number in range(first, recorded):
+            slot = number % capacity
+            start = self.starts[slot]
+            tid = self.threads[slot]
+            threads.add(tid)
+            event = {"name": self.names[slot], "ph": "X", "pid": pid, "tid": tid,
+                     "ts": round((start + offset) * 1e6, 1), "dur": round((self.ends[slot] - start) * 1e6, 1)}
+            if self.args[slot]:
+                event["args"] = self.args[slot]
+            events.append(event)
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        events.extend({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                       "args": {"name": names.get(tid, f"thread {tid}")}} for tid in sorted(threads))
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": {"reason": reason or "requested", "dropped": self.dropped,
+                              "written_at": time.time()}}
+
+    def dump(self, reason=None, path=None):
+        """Write the buffer to path (default: span_trace); returns the path, or None on error"""
+        path = path or self.path
+        try:
+            document = json.dumps(self.events(reason), default=str)
+            temp = f"{path}.{os.getpid()}.tmp"
+            with open(temp, "w") as f:
+                f.write(document)
+            os.replace(temp, path)
+        except Exception as e:
+            if self.log:
+                self.log(f"Error writing span trace {path}: {e}")
+            return None
+        self.dumps += 1
+        if self.log:
+            self.log(f"Span trace ({reason or 'requested'}) written to {path}")
+        return path
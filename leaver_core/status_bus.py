@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Status event bus for Zoom Auto Leaver.
+
+The monitor publishes status events from its background thread and a
+dispatcher on the UI thread applies them. Events are folded into a single
+pending snapshot as they arrive, so however many ticks happen between two
+frames the UI is refreshed at most once per frame, always with the latest
+state. Nothing here depends on AppKit: a UI sink is any object with an
+``apply(snapshot)`` method.
+"""
+
+import threading
+import time
+
+# Event kinds published by the monitor
+EVENT_STARTED = "started"
+EVENT_TICK = "tick"
+EVENT_LEAVING = "leaving"
+EVENT_STOPPED = "stopped"
+
+TREND_UP = "↑"
+TREND_DOWN = "↓"
+TREND_FLAT = "→"
+
+# Default UI frame interval in seconds (the menu bar does not need more than 10 fps)
+DEFAULT_FRAME_INTERVAL = 0.1
+
+
+class StatusSnapshot:
+    """Latest known monitor state as seen by the UI"""
+
+    __slots__ = ("monitoring", "participant_count", "threshold", "trend",
+                 "tick_latency", "message", "updated_at", "sequence")
+
+    def __init__(self):
+        self.monitoring = False
+        self.participant_count = None
+        self.threshold = None
+        self.trend = TREND_FLAT
+        self.tick_latency = None  # seconds
+        self.message = "Stopped"
+        self.updated_at = None
+        self.sequence = 0
+
+    def copy(self):
+        """Return an independent copy safe to hand to another thread"""
+        clone = StatusSnapshot()
+        for name in self.__slots__:
+            setattr(clone, name, getattr(self, name))
+        return clone
+
+    def __repr__(self):
+        return (f"StatusSnapshot(seq={self.sequence}, monitoring={self.monitoring}, "
+                f"count={self.participant_count}, trend={self.trend}, "
+                f"latency={self.tick_latency}, message={self.message!r})")
+
+
+class StatusBus:
+    """Thread-safe publisher that coalesces events into one pending snapshot"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = StatusSnapshot()
+        self._dirty = False
+        self.published = 0
+        self.taken = 0
+
+    def publish(self, kind, participant_count=None, threshold=None,
+                tick_latency=None, message=None):
+        """Fold an event into the pending snapshot (callable from any thread)"""
+        with self._lock:
+            state = self._state
+            if kind == EVENT_STARTED:
+                state.monitoring = True
+                state.participant_count = None
+                state.trend = TREND_FLAT
+                state.message = message or "Monitoring"
+            elif kind == EVENT_STOPPED:
+                state.monitoring = False
+                state.message = message or "Stopped"
+            elif kind == EVENT_TICK:
+                previous = state.participant_count
+                if participant_count is not None and previous is not None:
+                    if participant_count > previous:
+                        state.trend = TREND_UP
+                    elif participant_count < previous:
+                        state.trend = TREND_DOWN
+                    else:
+                        state.trend = TREND_FLAT
+                state.participant_count = participant_count
+                if message is not None:
+                    state.message = message
+                elif participant_count is None:
+                    state.message = "Count unknown"
+                else:
+                    state.message = "Monitoring"
+            elif message is not None:
+                state.message = message
+
+            if threshold is not None:
+                state.threshold = threshold
+            if tick_latency is not None:
+                state.tick_latency = tick_latency
+            state.updated_at = time.time()
+            state.sequence += 1
+            self._dirty = True
+            self.published += 1
+
+    def take(self):
+        """Return a copy of the pending snapshot, or None if nothing changed"""
+        with self._lock:
+            if not self._dirty:
+                return None
+            self._dirty = False
+            self.taken += 1
+            return self._state.copy()
+
+    def peek(self):
+        """Return a copy of the current snapshot without consuming it"""
+        with self._lock:
+            return self._state.copy()
+
+
+class MainThreadDispatcher:
+    """Applies coalesced bus snapshots to a UI sink, at most once per frame
+
+    ``on_frame()`` must be called from the UI thread, typically by a repeating
+    timer firing every ``frame_interval`` seconds.
+    """
+
+    def __init__(self, bus, sink, frame_interval=DEFAULT_FRAME_INTERVAL):
+        self.bus = bus
+        self.sink = sink
+        self.frame_interval = frame_interval
+        self.frames = 0
+        self.refreshes = 0
+
+    def on_frame(self):
+        """Apply the latest snapshot if anything was published since last frame"""
+        self.frames += 1
+        snapshot = self.bus.take()
+        if snapshot is None:
+            return False
+        try:
+            self.sink.apply(snapshot)
+        except Exception as e:
+            print(f"Error applying status update: {e}")
+            return False
+        self.refreshes += 1
+        return True
+
+    @property
+    def coalesced(self):
+        """Number of published events that never got their own refresh"""
+        return self.bus.published - self.refreshes
+
+    def stats(self):
+        """Return dispatcher counters"""
+        return {
+            "published": self.bus.published,
+            "frames": self.frames,
+            "refreshes": self.refreshes,
+            "coalesced": self.coalesced,
+        }
+
+
+def format_status_lines(snapshot):
+    """Render a snapshot into the menu lines shown by the UI"""
+    if snapshot.participant_count is None:
+        count_text = "Participants: —"
+    else:
+        count_text = f"Participants: {snapshot.participant_count} {snapshot.trend}"
+        if snapshot.threshold is not None:
+            count_text += f" (leave at {snapshot.threshold})"
+
+    if snapshot.tick_latency is None:
+        latency_text = "Last tick: —"
+    else:
+        latency_text = f"Last tick: {snapshot.tick_latency * 1000:.0f} ms"
+
+    if snapshot.monitoring:
+        status_text = f"Status: {snapshot.message}"
+    else:
+        status_text = "Status: Stopped"
+
+    return status_text, count_text, latency_text
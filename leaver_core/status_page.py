@@ -0,0 +1,245 @@
+"""
+Memory-mapped status page for external readers.
+
+The kiosk overlay, shell prompts and other tools want the monitor's count
+and state many times a second. Calling into the process or parsing its log
+for that is wasteful, so the monitor keeps a small fixed-layout record in a
+memory-mapped file (status_page, next to config.json; empty, and off, by
+default) and rewrites it on every status event. Readers map the same file and copy the record out;
+neither side makes a system call per update.
+
+Layout (little-endian, PAGE_SIZE bytes):
+
+    0   4s  magic b"ZALS"
+    4   H   layout version
+    6   H   page size
+    8   Q   sequence (odd while the record is being written)
+    16  d   last_tick      wall time of the last check (0: none yet)
+    24  d   tick_latency   seconds the last check took (-1: unknown)
+    32  i   count          participant count (-1: unknown)
+    36  i   threshold      participant threshold (-1: unknown)
+    40  I   state          STATE_STOPPED, STATE_MONITORING or STATE_LEAVING
+    44  I   pid            the writing monitor's process id
+    48  I   checksum       CRC32 of bytes 8-47 (sequence and record) as written
+
+Updates follow a seqlock protocol. The writer makes the sequence odd,
+writes the record and makes it even again. A reader copies the sequence,
+the record and the sequence again, and retries if they differ or the first
+one was odd. The writer never waits for readers. A reader only retries
+when it overlapped a write, which takes about a microsecond. The sequence
+is stored and loaded as one aligned 64-bit word through a memoryview;
+struct would copy it byte by byte, and a reader could see half of it.
+It is in native byte order, which is little-endian on every platform the
+monitor runs on.
+
+The seqlock alone relies on the CPU keeping the writer's stores, and the
+reader's loads, in program order. Python emits no memory barriers: x86
+keeps that order, but ARM (Apple silicon included) may not, and a
+reader there could see the new sequence next to part of the old record.
+So the writer also stores a CRC32 of the sequence and record. A reader
+copies bytes 8-51 in one go and only returns the copy if its sequence is
+even, matches the word read before and after, and the checksum agrees;
+otherwise it retries. A torn copy that passes would need a CRC32
+collision.
+
+There must be one writer per page. With instance_lock on only the leading
+monitor writes (see leaver_core/instance.py); copies that run without it
+need a status_page each. The sequence carries on across restarts, so a
+reader can tell a new record from an old one by sequence alone.
+"""
+
+import mmap
+import os
+import struct
+import time
+import zlib
+from collections import namedtuple
+
+from .status_bus import EVENT_LEAVING, EVENT_STARTED, EVENT_STOPPED, EVENT_TICK
+
+MAGIC = b"ZALS"
+VERSION = 2
+PAGE_SIZE = 64
+
+HEADER = struct.Struct("<4sHH")
+RECORD = struct.Struct("<ddiiII")
+SEQUENCE_OFFSET = HEADER.size
+SEQUENCE_INDEX = SEQUENCE_OFFSET // 8  # In the page seen as 64-bit words
+RECORD_OFFSET = SEQUENCE_OFFSET + 8
+CHECKED = struct.Struct("<Q" + RECORD.format[1:])  # Sequence and record, as the checksum covers them
+CHECKSUM = struct.Struct("<I")
+CHECKSUM_OFFSET = SEQUENCE_OFFSET + CHECKED.size
+COPY_END = CHECKSUM_OFFSET + CHECKSUM.size  # A reader copies out the sequence, record and checksum
+CRC_RESIDUE = 0x2144DF1C  # CRC32 of any bytes followed by their own CRC32, little-endian
+
+STATE_STOPPED = 0
+STATE_MONITORING = 1
+STATE_LEAVING = 2
+STATE_NAMES = {STATE_STOPPED: "stopped", STATE_MONITORING: "monitoring", STATE_LEAVING: "leaving"}
+
+EVENT_STATES = {EVENT_STARTED: STATE_MONITORING, EVENT_TICK: STATE_MONITORING,
+                EVENT_LEAVING: STATE_LEAVING, EVENT_STOPPED: STATE_STOPPED}
+
+# One consistent copy of the record; count, threshold and tick_latency are None when unknown
+StatusRecord = namedtuple("StatusRecord", "sequence last_tick tick_latency count threshold state pid")
+
+
+def resolve_path(config):
+    """The config's status_page as an absolute path (None if unset)
+
+    A relative path is taken relative to the config file's directory.
+    """
+    path = config.get("status_page")
+    if not path:
+        return None
+    path = os.path.expanduser(path)
+    config_file = getattr(config, "config_file", None)
+    if not os.path.isabs(path) and config_file:
+        path = os.path.join(os.path.dirname(os.path.abspath(config_file)), path)
+    return path
+
+
+class StatusPage:
+    """Writer side: publish() has the StatusBus signature, so the monitor feeds it like a bus"""
+
+    def __init__(self, path, log=None):
+        self.path = path
+        self.log = log
+        self._map = None
+        self._words = None  # The page as 64-bit words, for the sequence
+        self.sequence = 0
+        self.last_tick = 0.0
+        self.tick_latency = -1.0
+        self.count = -1
+        self.threshold = -1
+        self.state = STATE_STOPPED
+        self.failed = False
+
+    @classmethod
+    def from_config(cls, config, log=None):
+        """Build and open a StatusPage for the config's status_page (None if unset or it can't be opened)"""
+        path = resolve_path(config)
+        if path is None:
+            return None
+        page = cls(path, log)
+        return page if page.open() else None
+
+    def open(self):
+        """Map the page, creating the file if needed; returns success"""
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if os.fstat(fd).st_size < PAGE_SIZE:
+                    os.ftruncate(fd, PAGE_SIZE)
+                self._map = mmap.mmap(fd, PAGE_SIZE)
+            finally:
+                os.close(fd)  # The mapping keeps the file open
+        except Exception as e:
+            if self.log:
+                self.log(f"Error opening status page {self.path}: {e}")
+            return False
+        page = self._map
+        self._words = words = memoryview(page).cast("Q")
+        if HEADER.unpack_from(page, 0) == (MAGIC, VERSION, PAGE_SIZE):
+            # Carry on from the last writer's sequence (rounded up past a write it died in)
+            sequence = words[SEQUENCE_INDEX]
+            self.sequence = sequence + (sequence & 1)
+        else:
+            words[SEQUENCE_INDEX] = 1  # Nothing valid to read yet
+            HEADER.pack_into(page, 0, MAGIC, VERSION, PAGE_SIZE)
+            self.sequence = 0
+        self._write()
+        return True
+
+    def publish(self, kind, participant_count=None, threshold=None, tick_latency=None, message=None):
+        """Fold a status event into the record and rewrite it"""
+        if self._map is None:
+            return
+        self.state = EVENT_STATES.get(kind, self.state)
+        if threshold is not None:
+            self.threshold = threshold
+        if kind == EVENT_TICK:
+            self.last_tick = time.time()
+            self.count = -1 if participant_count is None else participant_count
+            self.tick_latency = -1.0 if tick_latency is None else tick_latency
+        elif kind == EVENT_STARTED:
+            self.count = -1
+        self._write()
+
+    def _write(self):
+        page, words = self._map, self._words
+        sequence = self.sequence + 1
+        try:
+            words[SEQUENCE_INDEX] = sequence
+            checked = CHECKED.pack(sequence + 1, self.last_tick, self.tick_latency, self.count,
+                                   self.threshold, self.state, os.getpid())
+        except Exception as e:
+            # A count or threshold out of range: leave the record marked as being written
+            if self.log and not self.failed:
+                self.log(f"Error writing status page {self.path}: {e}")
+            self.failed = True
+            return
+        page[RECORD_OFFSET:CHECKSUM_OFFSET] = checked[8:]
+        CHECKSUM.pack_into(page, CHECKSUM_OFFSET, zlib.crc32(checked))
+        self.sequence = sequence + 1
+        words[SEQUENCE_INDEX] = self.sequence
+
+    def close(self):
+        """Unmap the page; the file stays, holding the last record (normally "stopped")"""
+        page, self._map = self._map, None
+        if page is not None:
+            self._words.release()
+            self._words = None
+            page.close()
+
+
+class StatusPageReader:
+    """Reader side: maps the page read-only and returns consistent copies of the record"""
+
+    def __init__(self, path, retries=1000):
+        self.path = path
+        self.retries = retries
+        self._map = None
+        self._words = None
+        self.collisions = 0  # Reads that overlapped a write and were retried
+        self.mismatches = 0  # Of those, copies the sequence let through but the checksum caught
+
+    def _open(self):
+        try:
+            with open(self.path, "rb") as f:
+                page = mmap.mmap(f.fileno(), PAGE_SIZE, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None  # No monitor has written the page yet
+        if HEADER.unpack_from(page, 0) != (MAGIC, VERSION, PAGE_SIZE):
+            page.close()
+            return None
+        self._map = page
+        self._words = memoryview(page).cast("Q")
+        return page
+
+    def read(self):
+        """The current record, or None when there is no page (or no consistent copy after `retries`)"""
+        page = self._map or self._open()
+        if page is None:
+            return None
+        words, unpack_checked, crc32 = self._words, CHECKED.unpack_from, zlib.crc32
+        for _ in range(self.retries):
+            before = words[SEQUENCE_INDEX]
+            if not before & 1:
+                copy = page[SEQUENCE_OFFSET:COPY_END]
+                if words[SEQUENCE_INDEX] == before:
+                    sequence, last_tick, tick_latency, count, threshold, state, pid = unpack_checked(copy)
+                    if sequence == before and crc32(copy) == CRC_RESIDUE:
+                        return StatusRecord(before // 2, last_tick, tick_latency if tick_latency >= 0 else None,
+                                            count if count >= 0 else None, threshold if threshold >= 0 else None,
+                                            state, pid)
+                    self.mismatches += 1
+            self.collisions += 1
+        return None
+
+    def close(self):
+        page, self._map = self._map, None
+        if page is not None:
+            self._words.release()
+            self._words = None
+            page.close()
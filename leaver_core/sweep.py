@@ -0,0 +1,266 @@
+"""
+Offline sweep of leave settings over recorded participant-count traces.
+
+Replays traces (see leaver_core.traces) through the monitor's leave rule
+for a whole grid of participant_threshold x check_interval x
+leave_confirmations at once. The monitor polls every check_interval seconds
+from the start of a trace and leaves on the first poll where the count has
+been at or below the threshold for leave_confirmations polls in a row (an
+unknown count breaks the run). Pre-arming is not modelled.
+
+For every setting the result holds:
+    delay     seconds from the count settling at or below the threshold for
+              good to the leave (the leave-time error of a right leave)
+    false     traces left while the count would still rise above the
+              threshold, or that the host ended above it
+    missed    traces that settled at or below the threshold but ended
+              before the monitor confirmed it
+    polls     window enumerations until the leave or the end of the trace
+
+Each check_interval is one NumPy pass over a chunk of traces: the count at
+every poll, a rolling maximum per confirmation setting, a running minimum,
+and one searchsorted that finds the leave poll for every threshold. Chunks
+can be spread over a process pool.
+
+Only this module needs NumPy (pip install numpy).
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+UNKNOWN = 1 << 30  # A missing count: never at or below a threshold
+DELAY_BINS = 601   # Delay histogram: one bin per second; the last one holds everything longer
+DEFAULT_CHUNK = 1000
+COUNTERS = ("left", "false", "missed", "polls")
+
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("The threshold sweep needs NumPy (pip install numpy)")
+
+
+def pack_traces(traces):
+    """Pad [(time, count), ...] lists into arrays
+
+    Returns (times, counts, lengths): times in seconds from each trace's
+    start, to the millisecond (inf as padding), counts with UNKNOWN for None. Trailing unknown counts
+    (the meeting window already gone) are dropped.
+    """
+    trimmed = []
+    for points in traces:
+        end = len(points)
+        while end > 1 and points[end - 1][1] is None:
+            end -= 1
+        trimmed.append(points[:end])
+    lengths = np.array([len(points) for points in trimmed], dtype=np.int64)
+    width = int(lengths.max())
+    times = np.full((len(trimmed), width), np.inf)
+    counts = np.full((len(trimmed), width), UNKNOWN, dtype=np.int64)
+    for row, points in enumerate(trimmed):
+        start = points[0][0]
+        times[row, :len(points)] = [round(t - start, 3) for t, _ in points]
+        counts[row, :len(points)] = [UNKNOWN if c is None else c for _, c in points]
+    return times, counts, lengths
+
+
+def first_at_or_below(rows, values):
+    """For rows of non-increasing integers, the index of the first entry <= each value
+
+    Returns an (n_rows, n_values) array; the row length where there is none.
+    Every row is shifted past the previous one's range so one searchsorted
+    over the flattened array answers all rows and values at once.
+    """
+    n, m = rows.shape
+    lo, hi = int(rows.min()), int(rows.max())
+    span = hi - lo + 2
+    offsets = np.arange(n, dtype=np.int64)[:, None]
+    keys = (offsets * span + (hi - rows)).ravel()
+    targets = np.clip(hi - np.asarray(values, dtype=np.int64), 0, span - 1)
+    found = np.searchsorted(keys, (offsets * span + targets[None, :]).ravel())
+    return found.reshape(n, len(values)) - offsets * m
+
+
+def settle_times(times, counts, lengths, thresholds):
+    """Time each trace's count drops to <= threshold for good (inf if it never does)"""
+    valid = np.isfinite(times)
+    rest_max = np.maximum.accumulate(np.where(valid, counts, -1)[:, ::-1], axis=1)[:, ::-1]
+    index = first_at_or_below(rest_max, thresholds)
+    at = np.take_along_axis(times, np.minimum(index, times.shape[1] - 1), axis=1)
+    return np.where(index < lengths[:, None], at, np.inf)
+
+
+def counts_at_polls(times, counts, lengths, interval):
+    """Count seen by each poll at 0, interval, 2*interval, ...; returns (sampled, polls per trace)
+
+    Times are compared in whole milliseconds so that a count recorded exactly
+    at a poll time is always seen by that poll.
+    """
+    n, width = times.shape
+    step = int(round(interval * 1000))
+    millis = np.where(np.isfinite(times), np.round(times * 1000), -1).astype(np.int64)
+    durations = millis[np.arange(n), lengths - 1]
+    polls = durations // step + 1
+    steps = int(polls.max())
+    span = int(durations.max()) + step + 2
+    millis[millis < 0] = span - 1  # Padding sorts after every poll of its row
+    offsets = np.arange(n, dtype=np.int64)[:, None]
+    keys = (millis + offsets * span).ravel()
+    queries = (np.arange(steps, dtype=np.int64) * step + offsets * span).ravel()
+    index = np.searchsorted(keys, queries, side="right").reshape(n, steps) - 1 - offsets * width
+    sampled = counts[offsets, index].astype(np.int32)
+    sampled[np.arange(steps)[None, :] >= polls[:, None]] = UNKNOWN
+    return sampled, polls
+
+
+def evaluate_chunk(traces, thresholds, intervals, confirmations):
+    """Totals for every setting over one chunk of traces (see sweep())"""
+    times, counts, lengths = pack_traces(traces)
+    thresholds = np.asarray(thresholds, dtype=np.int64)
+    settle = settle_times(times, counts, lengths, thresholds)
+    settles = np.isfinite(settle)
+    shape = (len(intervals), len(confirmations), len(thresholds))
+    totals = {name: np.zeros(shape, dtype=np.int64) for name in COUNTERS}
+    totals["delay"] = np.zeros(shape)
+    totals["delay_histogram"] = np.zeros(shape + (DELAY_BINS,), dtype=np.int64)
+    totals["traces"] = len(traces)
+    totals["hours"] = float(times[np.arange(len(traces)), lengths - 1].sum()) / 3600
+    columns = np.arange(len(thresholds)) * DELAY_BINS
+
+    for a, interval in enumerate(intervals):
+        sampled, polls = counts_at_polls(times, counts, lengths, interval)
+        window, width = sampled, 1
+        for b, needed in enumerate(confirmations):
+            while width < needed:  # Rolling maximum over the last `needed` polls
+                shifted = np.full_like(sampled, UNKNOWN)
+                shifted[:, width:] = sampled[:, :-width]
+                window = np.maximum(window, shifted)
+                width += 1
+            leave_poll = first_at_or_below(np.minimum.accumulate(window, axis=1), thresholds)
+            left = leave_poll < polls[:, None]
+            leave_time = leave_poll * int(round(interval * 1000)) / 1000
+            false = left & (leave_time < settle)
+            right = left & ~false
+            delay = np.where(right, leave_time - np.where(settles, settle, 0.0), 0.0)
+
+            totals["left"][a, b] = left.sum(axis=0)
+            totals["false"][a, b] = false.sum(axis=0)
+            totals["missed"][a, b] = (~left & settles).sum(axis=0)
+            totals["polls"][a, b] = np.where(left, leave_poll + 1, polls[:, None]).sum(axis=0)
+            totals["delay"][a, b] = delay.sum(axis=0)
+            bins = columns[None, :] + np.minimum(delay, DELAY_BINS - 1).astype(np.int64)
+            totals["delay_histogram"][a, b] = np.bincount(
+                bins[right], minlength=len(thresholds) * DELAY_BINS).reshape(len(thresholds), DELAY_BINS)
+    return totals
+
+
+def _combine(parts):
+    totals = parts[0]
+    for part in parts[1:]:
+        for name, value in part.items():
+            totals[name] = totals[name] + value
+    return totals
+
+
+class SweepResult:
+    """Totals per (interval, confirmations, threshold) and their per-setting summary"""
+
+    def __init__(self, thresholds, intervals, confirmations, totals, seconds):
+        self.thresholds = thresholds
+        self.intervals = intervals
+        self.confirmations = confirmations
+        self.totals = totals
+        self.seconds = seconds
+
+    @property
+    def settings(self):
+        return len(self.thresholds) * len(self.intervals) * len(self.confirmations)
+
+    def rows(self):
+        """One summary dict per setting"""
+        totals = self.totals
+        traces = totals["traces"]
+        right = totals["left"] - totals["false"]
+        cumulative = np.cumsum(totals["delay_histogram"], axis=-1)
+        p95 = np.argmax(cumulative >= np.ceil(0.95 * right)[..., None], axis=-1)
+        rows = []
+        for a, interval in enumerate(self.intervals):
+            for b, needed in enumerate(self.confirmations):
+                for c, threshold in enumerate(self.thresholds):
+                    n_right = int(right[a, b, c])
+                    rows.append({
+                        "threshold": int(threshold),
+                        "interval": interval,
+                        "confirmations": int(needed),
+                        "false_rate": round(int(totals["false"][a, b, c]) / traces, 4),
+                        "missed_rate": round(int(totals["missed"][a, b, c]) / traces, 4),
+                        "mean_delay": round(float(totals["delay"][a, b, c]) / n_right, 1) if n_right else None,
+                        "p95_delay": (int(p95[a, b, c]) + 1 if p95[a, b, c] < DELAY_BINS - 1 else None)
+                        if n_right else None,
+                        "polls_per_hour": round(int(totals["polls"][a, b, c]) / max(totals["hours"], 1e-9), 1),
+                    })
+        return rows
+
+
+def sweep(traces, thresholds, intervals, confirmations=(1,), workers=1, chunk_size=DEFAULT_CHUNK):
+    """Evaluate every threshold x interval x confirmations setting over the traces
+
+    traces is a list of [(time, count), ...] (count None when unknown).
+    With workers > 1 the chunks are evaluated in a process pool.
+    """
+    require_numpy()
+    thresholds = sorted(set(int(t) for t in thresholds))
+    intervals = sorted(set(intervals))
+    confirmations = sorted(set(int(c) for c in confirmations))
+    start = time.perf_counter()
+    chunks = [traces[i:i + chunk_size] for i in range(0, len(traces), chunk_size)]
+    arguments = (repeat(thresholds), repeat(intervals), repeat(confirmations))
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            parts = list(pool.map(evaluate_chunk, chunks, *arguments))
+    else:
+        parts = list(map(evaluate_chunk, chunks, *arguments))
+    return SweepResult(thresholds, intervals, confirmations, _combine(parts), time.perf_counter() - start)
+
+
+def synthetic_traces(count, seed=1):
+    """Event-level traces of simulated meetings (for trying the sweep without recordings)
+
+    You join first; others arrive over the first minutes, a few drop out and
+    rejoin, some leave early and the rest drain away at the end. About a
+    third of the meetings are ended by the host with people still in them.
+    """
+    require_numpy()
+    rng = np.random.default_rng(seed)
+    traces = []
+    for _ in range(count):
+        duration = rng.uniform(20, 90) * 60
+        others = int(rng.integers(3, 41))
+        joins = np.clip(rng.uniform(-120, 300, others), 0, None)
+        drain = min(600.0, duration * 0.2)
+        leaves = duration - drain * rng.random(others)
+        early = rng.random(others) < 0.15
+        leaves[early] = rng.uniform(duration * 0.2, duration, early.sum())
+        leaves = np.maximum(leaves, joins + 60)
+        host_ends = rng.random() < 0.3
+        end = duration if host_ends else float(leaves.max()) + 120
+        drops = np.flatnonzero(rng.random(others) < 0.1)
+        drop_at = rng.uniform(joins[drops], leaves[drops])
+        rejoin_at = np.minimum(drop_at + rng.uniform(10, 90, len(drops)), leaves[drops])
+        event_times = np.concatenate([joins, leaves, drop_at, rejoin_at])
+        deltas = np.concatenate([np.ones(others), -np.ones(others), -np.ones(len(drops)), np.ones(len(drops))])
+        keep = event_times < end
+        order = np.argsort(event_times[keep], kind="stable")
+        event_times, deltas = event_times[keep][order], deltas[keep][order]
+        values = 1 + np.cumsum(deltas)
+        at_start = event_times <= 0
+        points = [(0.0, int(values[at_start][-1]) if at_start.any() else 1)]
+        points += zip(event_times[~at_start].tolist(), values[~at_start].astype(int).tolist())
+        points.append((end, points[-1][1]))
+        traces.append(points)
+    return traces
@@ -0,0 +1,85 @@
+"""
+Recorded participant-count traces: one time series of counts per meeting.
+
+With "trace_file" set in config.json the monitor appends one CSV row per
+tick:
+
+    trace,time,count
+    1714557600:id:81234567731,1714557612.0,14
+    1714557600:id:81234567731,1714557622.0,
+
+trace names the run and meeting, time is Unix time and count is empty when
+no count could be read. tools/threshold_sweep.py replays these files to
+compare leave settings. Traces can also be given as JSON:
+{"<trace>": [[time, count], ...]}.
+"""
+
+import csv
+import json
+import os
+from collections import OrderedDict
+
+
+class TraceRecorder:
+    """Appends one CSV row per tick to a trace file"""
+
+    def __init__(self, path, log=None):
+        self.path = path
+        self.log = log
+        self.rows = 0
+        self._file = None
+
+    @classmethod
+    def from_config(cls, config, log=None):
+        """Build a TraceRecorder for the config's trace_file (None if unset)"""
+        path = config.get("trace_file")
+        return cls(os.path.expanduser(path), log) if path else None
+
+    def record(self, trace, when, count):
+        try:
+            if self._file is None:
+                new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+                self._file = open(self.path, "a", buffering=1)  # Line buffered: a crash loses one row at most
+                if new:
+                    self._file.write("trace,time,count\n")
+            self._file.write(f"{trace},{when:.1f},{'' if count is None else count}\n")
+            self.rows += 1
+        except Exception as e:
+            if self.log:
+                self.log(f"Error writing trace file {self.path}: {e}")
+            self.close()
+
+    def close(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._file = None
+
+
+def _parse_count(text):
+    return int(float(text)) if text not in ("", None) else None
+
+
+def read_traces(path):
+    """Read a CSV or JSON trace file; returns {trace: [(time, count), ...]} in file order"""
+    traces = OrderedDict()
+    with open(path, newline="") as f:
+        if path.endswith(".json"):
+            for name, points in json.load(f).items():
+                traces[str(name)] = [(float(t), _parse_count(c)) for t, c in points]
+            return traces
+        for row in csv.DictReader(f):
+            traces.setdefault(row["trace"], []).append((float(row["time"]), _parse_count(row["count"])))
+    return traces
+
+
+def load_traces(paths, min_points=2):
+    """Merge the traces of several files, sorted by time, dropping ones too short to evaluate"""
+    merged = OrderedDict()
+    for path in paths:
+        for name, points in read_traces(path).items():
+            merged.setdefault(name, []).extend(points)
+    return OrderedDict((name, sorted(points, key=lambda point: point[0]))
+                       for name, points in merged.items() if len(points) >= min_points)
@@ -0,0 +1,356 @@
+"""
+Participant-count source that tails the Zoom client's local log files.
+
+Window titles only carry a count while the Participants panel is open; the
+client log records joins and leaves regardless. ZoomLogSource reads each log
+file incrementally (remembering offsets and following rotation), feeds new
+lines to a running ParticipantTally, and only touches the files when the
+directory watcher reports a change: inotify on Linux, a stat snapshot
+elsewhere. An idle read therefore costs one non-blocking read or one
+directory scan. The monitor asks it only when no window title has a
+count, as the tally is reconstructed and titles state the count outright.
+
+The Zoom log format is undocumented and varies between client versions, so
+the line patterns below are deliberately loose and can be overridden.
+"""
+
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import re
+import sys
+
+DEFAULT_PATTERN = "*.log"
+
+# Regexes matched against each new log line, in this order
+LINE_PATTERNS = {
+    # An explicit count resyncs the tally ("participant count: 12", "user_count=12")
+    "count": re.compile(r"(?:participants?|user)[ _]?count\s*[=:]\s*(\d+)", re.IGNORECASE),
+    "meeting_start": re.compile(r"MEETING_STATUS_INMEETING|\bjoin(?:ed)? meeting\b", re.IGNORECASE),
+    "meeting_end": re.compile(r"MEETING_STATUS_(?:ENDED|DISCONNECTING|IDLE)|\bleft meeting\b|\bmeeting ended\b",
+                              re.IGNORECASE),
+    "join": re.compile(r"OnUserJoin\b|\buser joined\b", re.IGNORECASE),
+    "leave": re.compile(r"OnUserLeft\b|OnUserLeave\b|\buser left\b", re.IGNORECASE),
+}
+
+# "OnUserJoin users=3" joins three at once; without a number it is one user
+_BATCH = re.compile(r"\busers?\s*[=:]\s*(\d+)", re.IGNORECASE)
+
+READ_CHUNK = 64 * 1024
+
+
+def default_log_dir():
+    """Where the Zoom desktop client writes its logs on this platform"""
+    home = os.path.expanduser("~")
+    if sys.platform == "darwin":
+        return os.path.join(home, "Library", "Logs", "zoom.us")
+    if sys.platform.startswith("win"):
+        return os.path.join(os.environ.get("APPDATA", home), "Zoom", "logs")
+    return os.path.join(home, ".zoom", "logs")
+
+
+class ParticipantTally:
+    """Running participant count reconstructed from log lines
+
+    Joining a meeting doesn't say who is already in it, so after a start
+    line the count stays unknown (None) until a count line states it. Joins
+    and leaves only adjust a known count: "one joined" says nothing about
+    the 30 people who may already be there. A start line repeated inside a
+    meeting leaves the tally alone.
+    """
+
+    def __init__(self, patterns=None):
+        self.patterns = patterns or LINE_PATTERNS
+        self.count = None  # None while not in a meeting, or not known yet
+        self.in_meeting = False
+        self.events = 0
+
+    def feed(self, line):
+        """Apply one log line; returns True if the tally changed"""
+        before = self.count
+        patterns = self.patterns
+        match = patterns["count"].search(line)
+        if match:
+            self.count = int(match.group(1))
+            self.in_meeting = True
+        elif patterns["meeting_start"].search(line):
+            self.in_meeting = True
+        elif patterns["meeting_end"].search(line):
+            self.count = None
+            self.in_meeting = False
+        elif self.in_meeting and self.count is not None:
+            if patterns["join"].search(line):
+                self.count += self._batch(line)
+            elif patterns["leave"].search(line):
+                self.count = max(1, self.count - self._batch(line))
+        if self.count != before:
+            self.events += 1
+            return True
+        return False
+
+    @staticmethod
+    def _batch(line):
+        match = _BATCH.search(line)
+        return int(match.group(1)) if match else 1
+
+
+class LogTail:
+    """Incremental reader for one log file that survives rotation"""
+
+    def __init__(self, path):
+        self.path = path
+        self.handle = None
+        self.identity = None  # (st_dev, st_ino) of the open file
+        self.offset = 0
+        self.partial = b""
+        self.bytes_read = 0
+        self.rotations = 0
+
+    def _open(self):
+        try:
+            handle = open(self.path, "rb")
+        except OSError:
+            return False
+        stat = os.fstat(handle.fileno())
+        self.handle = handle
+        self.identity = (stat.st_dev, stat.st_ino)
+        self.offset = 0
+        self.partial = b""
+        return True
+
+    def _drain(self):
+        """Read everything past the offset; returns complete lines"""
+        self.handle.seek(self.offset)
+        chunks = []
+        while True:
+            chunk = self.handle.read(READ_CHUNK)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        if not chunks:
+            return []
+        data = self.partial + b"".join(chunks)
+        self.offset = self.handle.tell()
+        self.bytes_read += sum(len(chunk) for chunk in chunks)
+        lines = data.split(b"\n")
+        self.partial = lines.pop()  # Incomplete last line waits for the next read
+        return [line.decode("utf-8", "replace") for line in lines]
+
+    def read_lines(self):
+        """Return the complete lines appended since the last call"""
+        if self.handle is None and not self._open():
+            return []
+
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            stat = None  # Rotated away and not yet recreated
+
+        lines = []
+        if stat is None or (stat.st_dev, stat.st_ino) != self.identity:
+            # Finish the old file through the still-open handle, then switch
+            lines = self._drain()
+            self.close()
+            if stat is None or not self._open():
+                return lines
+            self.rotations += 1
+        elif stat.st_size < self.offset:
+            # Truncated in place (copytruncate rotation)
+            self.offset = 0
+            self.partial = b""
+            self.rotations += 1
+
+        return lines + self._drain()
+
+    def skip_to_end(self):
+        """Open the file and ignore its current contents (already read under another name)"""
+        if self._open():
+            self.offset = os.fstat(self.handle.fileno()).st_size
+
+    def close(self):
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+
+class StatWatcher:
+    """Portable change detector: compares a stat snapshot of the directory"""
+
+    name = "stat"
+
+    def __init__(self, directory, pattern=DEFAULT_PATTERN):
+        self.directory = directory
+        self.pattern = pattern
+        self.snapshot = None
+
+    def _take(self):
+        snapshot = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if fnmatch.fnmatch(entry.name, self.pattern):
+                        stat = entry.stat()
+                        snapshot[entry.name] = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            pass
+        return snapshot
+
+    def changed(self):
+        """True if any matching file appeared, vanished or changed size/mtime"""
+        snapshot = self._take()
+        changed = snapshot != self.snapshot
+        self.snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux change detector: a non-blocking inotify descriptor on the directory"""
+
+    name = "inotify"
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    def __init__(self, directory, pattern=DEFAULT_PATTERN):
+        self.directory = directory
+        self.pattern = pattern
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = (self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_FROM |
+                self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE)
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"inotify_add_watch failed for {directory}")
+        self.primed = False
+
+    def changed(self):
+        """True if the directory saw any write, create, move or delete since last call"""
+        if not self.primed:
+            self.primed = True  # First call reads whatever is already there
+            return True
+        changed = False
+        while True:
+            try:
+                if not os.read(self.fd, READ_CHUNK):
+                    break
+            except BlockingIOError:
+                break
+            changed = True
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def make_watcher(directory, pattern=DEFAULT_PATTERN):
+    """inotify where available, stat polling otherwise"""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directory, pattern)
+        except (OSError, AttributeError):
+            pass
+    return StatWatcher(directory, pattern)
+
+
+class ZoomLogSource:
+    """Participant count from incrementally tailed Zoom client logs"""
+
+    def __init__(self, directory=None, pattern=DEFAULT_PATTERN, watcher=None, patterns=None):
+        self.directory = directory or default_log_dir()
+        self.pattern = pattern
+        self.watcher = watcher or make_watcher(self.directory, pattern)
+        self.tally = ParticipantTally(patterns)
+        self.tails = {}  # path -> LogTail
+        self.consumed = set()  # (st_dev, st_ino) of every file already read
+        self.polls = 0
+        self.reads = 0
+        self.lines = 0
+
+    def _discover(self):
+        """Start tailing new files, oldest first; renamed-in rotations are not re-read"""
+        found = []
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.path not in self.tails and fnmatch.fnmatch(entry.name, self.pattern):
+                        stat = entry.stat()
+                        found.append((stat.st_mtime_ns, entry.path, (stat.st_dev, stat.st_ino)))
+        except OSError:
+            return
+        for _, path, identity in sorted(found):
+            tail = LogTail(path)
+            if identity in self.consumed:
+                tail.skip_to_end()
+            self.tails[path] = tail
+
+    def poll(self):
+        """Read any new log lines; returns True if the tally changed"""
+        self.polls += 1
+        if not self.watcher.changed():
+            return False
+        self.reads += 1
+        self._discover()
+        changed = False
+        feed = self.tally.feed
+        for path, tail in list(self.tails.items()):
+            for line in tail.read_lines():
+                self.lines += 1
+                if feed(line):
+                    changed = True
+            if tail.handle is None:
+                # Gone and not recreated; a file showing up later starts a new tail
+                self.consumed.discard(tail.identity)
+                del self.tails[path]
+            else:
+                self.consumed.add(tail.identity)
+        return changed
+
+    def participant_count(self):
+        """Current tally after reading new log lines (None when not in a meeting, or no count logged yet)"""
+        self.poll()
+        return self.tally.count
+
+    def stats(self):
+        return {
+            "watcher": self.watcher.name,
+            "files": len(self.tails),
+            "polls": self.polls,
+            "reads": self.reads,
+            "lines": self.lines,
+            "bytes": sum(tail.bytes_read for tail in self.tails.values()),
+            "rotations": sum(tail.rotations for tail in self.tails.values()),
+        }
+
+    def close(self):
+        self.watcher.close()
+        for tail in self.tails.values():
+            tail.close()
+
+
+def create_log_source(config, log=None):
+    """Build a ZoomLogSource when enabled in the config (None otherwise)"""
+    if not config.get("zoom_log_source", False):
+        return None
+    directory = config.get("zoom_log_dir") or default_log_dir()
+    if not os.path.isdir(directory):
+        if log:
+            log(f"Zoom log directory not found: {directory}. Using window titles only.")
+        return None
+    if log:
+        log(f"Reading participant counts from Zoom logs in {directory}")
+    return ZoomLogSource(directory, config.get("zoom_log_pattern", DEFAULT_PATTERN))
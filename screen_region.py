@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Visual participant-count fallback: read the count from a screen region.
+
+When no window title carries a count, the monitor can capture a small,
+configured region of the screen (for example the Participants button badge)
+and read the digits in it. Capturing is cheap; recognition is not. Every
+capture is therefore downscaled and hashed first, recognition only runs
+when the hash changes, and results are cached per hash. A count that comes
+back (12 -> 13 -> 12) is answered from the cache.
+
+Recognition uses Tesseract when pytesseract and the tesseract binary are
+installed, and otherwise a small built-in digit template matcher. Captures
+come from pyautogui, or from recorded PNG fixtures for headless replay.
+"""
+
+import hashlib
+import re
+from collections import OrderedDict
+
+from icon_drawing import PILLOW_AVAILABLE, load_font
+
+if PILLOW_AVAILABLE:
+    from PIL import Image, ImageChops, ImageDraw, ImageStat
+
+# Hashing: halve the resolution and keep 16 gray levels, so compression noise
+# and subpixel jitter don't count as a change but a different digit does
+HASH_DOWNSCALE = 2
+HASH_LEVEL_SHIFT = 4
+_HASH_LEVELS = bytes(value >> HASH_LEVEL_SHIFT for value in range(256))
+
+# Regions whose brightness range is below this hold no text
+MIN_CONTRAST = 40
+
+# Glyphs are compared as fixed-size bitmaps; above this mean difference a
+# glyph is not a digit (icons, letters) and splits the digit runs
+GLYPH_SIZE = (12, 16)
+MAX_GLYPH_DISTANCE = 0.3
+
+# Glyphs whose width/height ratio differs from a template's by more than this
+# fraction can't be that digit ("o" is not "0", "(" is not "1")
+MAX_ASPECT_DIFFERENCE = 0.2
+
+# Gaps as a fraction of glyph height: digits of one number are at most
+# MAX_DIGIT_GAP apart, a number is separate from a word beyond WORD_GAP
+MAX_DIGIT_GAP = 0.55
+WORD_GAP = 0.3
+
+# Digits of one number differ in height by at most this fraction
+HEIGHT_TOLERANCE = 0.15
+
+# Brackets around a number are taller than its digits and at most this wide
+# relative to their height
+MAX_BRACKET_ASPECT = 0.45
+
+TEMPLATE_FONT_SIZE = 48
+
+DEFAULT_CACHE_SIZE = 128
+
+
+def region_hash(image):
+    """Hash a downscaled, level-quantized grayscale copy of the image"""
+    small = image.convert('L').reduce(HASH_DOWNSCALE)
+    digest = hashlib.blake2b(small.tobytes().translate(_HASH_LEVELS), digest_size=8)
+    digest.update(repr(small.size).encode())
+    return digest.hexdigest()
+
+
+def binarize(image):
+    """Return a black/white image with the text as white ink (None if blank)"""
+    gray = image.convert('L')
+    low, high = gray.getextrema()
+    if high - low < MIN_CONTRAST:
+        return None
+    middle = (low + high) // 2
+    binary = gray.point(lambda v: 255 if v > middle else 0)
+    histogram = binary.histogram()
+    if histogram[255] > histogram[0]:
+        binary = ImageChops.invert(binary)  # Dark text on a light background
+    return binary
+
+
+def split_glyphs(binary):
+    """Split a binarized image into (left, right, crop) per glyph, left to right"""
+    width, height = binary.size
+    # Column means: a column holds ink if any pixel in it is white
+    columns = list(binary.resize((width, 1), Image.BOX).getdata())
+    glyphs = []
+    start = None
+    for x, value in enumerate(columns + [0]):
+        if value and start is None:
+            start = x
+        elif not value and start is not None:
+            column_strip = binary.crop((start, 0, x, height))
+            bbox = column_strip.getbbox()
+            if bbox:
+                glyphs.append((start, x, column_strip.crop(bbox)))
+            start = None
+    return glyphs
+
+
+def normalize_glyph(glyph):
+    """Scale a glyph to GLYPH_SIZE height, keeping its aspect ratio, centered"""
+    target_width, target_height = GLYPH_SIZE
+    width, height = glyph.size
+    scaled_width = max(1, min(target_width, round(width * target_height / height)))
+    scaled = glyph.resize((scaled_width, target_height), Image.BILINEAR)
+    canvas = Image.new('L', GLYPH_SIZE, 0)
+    canvas.paste(scaled, ((target_width - scaled_width) // 2, 0))
+    return canvas
+
+
+def glyph_distance(a, b):
+    """Mean absolute difference of two normalized glyphs, 0 (same) to 1"""
+    return ImageStat.Stat(ImageChops.difference(a, b)).mean[0] / 255
+
+
+class TemplateDigitRecognizer:
+    """Matches glyphs against digits rendered with the app's font
+
+    Works without any OCR install. Accuracy depends on the on-screen font
+    being close to the template font; use Tesseract for anything else.
+    """
+
+    name = "templates"
+
+    def __init__(self, font_size=TEMPLATE_FONT_SIZE):
+        font = load_font(font_size)
+        self.templates = []
+        for digit in "0123456789":
+            canvas = Image.new('L', (font_size * 2, font_size * 2), 0)
+            ImageDraw.Draw(canvas).text((font_size // 2, font_size // 4), digit, font=font, fill=255)
+            _, _, glyph = split_glyphs(canvas)[0]
+            self.templates.append((digit, glyph.width / glyph.height, normalize_glyph(glyph)))
+
+    def classify(self, glyph):
+        """Return (digit, distance) of the closest template (distance 1.0 if none fits)"""
+        aspect = glyph.width / glyph.height
+        normalized = None
+        best = (None, 1.0)
+        for digit, template_aspect, template in self.templates:
+            if abs(aspect - template_aspect) > template_aspect * MAX_ASPECT_DIFFERENCE:
+                continue
+            if normalized is None:
+                normalized = normalize_glyph(glyph)
+            distance = glyph_distance(normalized, template)
+            if distance < best[1]:
+                best = (digit, distance)
+        return best
+
+    def __call__(self, image):
+        binary = binarize(image)
+        if binary is None:
+            return None
+
+        # The count is the rightmost run of digits that stands on its own:
+        # separated from neighbouring glyphs by a space or enclosed in
+        # brackets. Digit-like letters inside words ("s", "o") never count.
+        glyphs = [(left, right, glyph, self.classify(glyph)) for left, right, glyph in split_glyphs(binary)]
+        end = len(glyphs) - 1
+        while end >= 0:
+            if glyphs[end][3][1] > MAX_GLYPH_DISTANCE:
+                end -= 1
+                continue
+            start = end
+            digit_height = glyphs[end][2].height
+            while start > 0 and self._continues_number(glyphs[start - 1], glyphs[start], digit_height):
+                start -= 1
+            if self._stands_alone(glyphs, start, end):
+                return int("".join(match[0] for _, _, _, match in glyphs[start:end + 1]))
+            end = start - 1
+        return None
+
+    @staticmethod
+    def _continues_number(previous, current, digit_height):
+        """True if the previous glyph is another digit of the same number"""
+        _, previous_right, glyph, (_, distance) = previous
+        return (distance <= MAX_GLYPH_DISTANCE and
+                abs(glyph.height - digit_height) <= digit_height * HEIGHT_TOLERANCE and
+                current[0] - previous_right <= digit_height * MAX_DIGIT_GAP)
+
+    @staticmethod
+    def _stands_alone(glyphs, start, end):
+        """True if the digit run glyphs[start:end+1] isn't attached to a letter"""
+        digit_height = max(glyph.height for _, _, glyph, _ in glyphs[start:end + 1])
+        for neighbour, gap in ((start - 1, glyphs[start][0] - glyphs[start - 1][1] if start else 0),
+                               (end + 1, glyphs[end + 1][0] - glyphs[end][1] if end + 1 < len(glyphs) else 0)):
+            if neighbour < 0 or neighbour >= len(glyphs) or gap > digit_height * WORD_GAP:
+                continue
+            glyph = glyphs[neighbour][2]
+            is_bracket = (glyph.height >= digit_height * (1 + HEIGHT_TOLERANCE) and
+                          glyph.width <= glyph.height * MAX_BRACKET_ASPECT)
+            if not is_bracket:  # Part of a word
+                return False
+        return True
+
+
+class TesseractDigitRecognizer:
+    """Digit OCR through pytesseract (single text line, digits only)"""
+
+    name = "tesseract"
+
+    CONFIG = "--psm 7 -c tessedit_char_whitelist=0123456789"
+
+    def __init__(self):
+        import pytesseract
+        pytesseract.get_tesseract_version()  # Raises when the binary is missing
+        self.pytesseract = pytesseract
+
+    def __call__(self, image):
+        gray = image.convert('L')
+        # Tesseract wants glyphs well above badge size
+        gray = gray.resize((gray.width * 3, gray.height * 3), Image.BICUBIC)
+        text = self.pytesseract.image_to_string(gray, config=self.CONFIG)
+        digits = re.findall(r"\d+", text)
+        return int(digits[-1]) if digits else None
+
+
+def default_recognizer():
+    """Tesseract when installed, the template matcher otherwise"""
+    try:
+        return TesseractDigitRecognizer()
+    except Exception:
+        return TemplateDigitRecognizer()
+
+
+class PyAutoGUICapture:
+    """Captures a fixed (left, top, width, height) screen region"""
+
+    def __init__(self, region):
+        import pyautogui
+        self.pyautogui = pyautogui
+        self.region = tuple(int(v) for v in region)
+
+    def __call__(self):
+        return self.pyautogui.screenshot(region=self.region)
+
+
+class FixtureCapture:
+    """Replays recorded PNG captures in order, for headless testing"""
+
+    def __init__(self, paths, loop=False):
+        self.paths = list(paths)
+        self.loop = loop
+        self.position = 0
+
+    def __call__(self):
+        if self.position >= len(self.paths):
+            if not self.loop or not self.paths:
+                return None
+            self.position = 0
+        path = self.paths[self.position]
+        self.position += 1
+        with Image.open(path) as image:
+            image.load()
+            return image
+
+
+class RegionCountSource:
+    """Participant count from a screen region, recognizing only changed captures"""
+
+    def __init__(self, capture, recognizer=None, cache_size=DEFAULT_CACHE_SIZE):
+        self.capture = capture
+        self.recognizer = recognizer or default_recognizer()
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # region hash -> recognized count (or None)
+        self.last_hash = None
+        self.last_count = None
+        self.captures = 0
+        self.unchanged = 0
+        self.cache_hits = 0
+        self.recognitions = 0
+
+    def participant_count(self):
+        """Capture the region and return its count (None if unreadable)"""
+        image = self.capture()
+        if image is None:
+            return None
+        self.captures += 1
+
+        key = region_hash(image)
+        if key == self.last_hash:
+            self.unchanged += 1
+            return self.last_count
+
+        cache = self._cache
+        if key in cache:
+            cache.move_to_end(key)
+            self.cache_hits += 1
+            count = cache[key]
+        else:
+            self.recognitions += 1
+            count = self.recognizer(image)
+            cache[key] = count
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+
+        self.last_hash = key
+        self.last_count = count
+        return count
+
+    def stats(self):
+        return {
+            "recognizer": self.recognizer.name,
+            "captures": self.captures,
+            "unchanged": self.unchanged,
+            "cache_hits": self.cache_hits,
+            "recognitions": self.recognitions,
+            "entries": len(self._cache),
+        }
+
+
+def create_region_source(config, log=None):
+    """Build a RegionCountSource when a screen_region is configured (None otherwise)"""
+    region = config.get("screen_region")
+    if not region:
+        return None
+    if not PILLOW_AVAILABLE:
+        if log:
+            log("screen_region is set but Pillow is not installed (pip install pillow). Visual fallback disabled.")
+        return None
+    try:
+        source = RegionCountSource(PyAutoGUICapture(region))
+    except Exception as e:
+        if log:
+            log(f"Could not set up screen region capture: {e}")
+        return None
+    if log:
+        log(f"Visual fallback: screen region {tuple(region)} ({source.recognizer.name})")
+    return source
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Participant-count badge for the menu bar status item.
+
+Badges are small round icons showing the live participant count, colored by
+how close the count is to the leave threshold. Only a handful of distinct
+badges exist (one per count bucket, state and scale), so every rendered badge
+is kept in a bounded LRU cache: once warm, a per-tick update is a dictionary
+lookup instead of a Pillow render.
+"""
+
+from collections import OrderedDict
+
+from icon_drawing import PILLOW_AVAILABLE, TEXT_COLOR, load_font, draw_centered_text, new_canvas
+
+if PILLOW_AVAILABLE:
+    from PIL import Image
+
+# Badge states by distance to the threshold
+STATE_UNKNOWN = "unknown"  # no participant count available
+STATE_FAR = "far"          # comfortably above the threshold
+STATE_NEAR = "near"        # within near_margin of the threshold
+STATE_LEAVE = "leave"      # at or below the threshold
+
+STATE_COLORS = {
+    STATE_UNKNOWN: (128, 128, 128, 255),
+    STATE_FAR: (46, 160, 67, 255),
+    STATE_NEAR: (230, 145, 30, 255),
+    STATE_LEAVE: (210, 45, 45, 255),
+}
+
+# Counts above this are shown as "99+"
+MAX_EXACT_COUNT = 99
+
+# Menu bar icons are 18pt; scale 2 gives the retina bitmap
+BADGE_POINTS = 18
+
+# Draw at this multiple of the target size and downsample for smooth edges
+SUPERSAMPLE = 4
+
+DEFAULT_CACHE_SIZE = 256
+
+
+def count_bucket(count):
+    """Map a participant count to the label shown on the badge"""
+    if count is None:
+        return "?"
+    if count > MAX_EXACT_COUNT:
+        return f"{MAX_EXACT_COUNT}+"
+    return str(max(count, 0))
+
+
+def badge_state(count, threshold, near_margin=2):
+    """Classify a count by its distance to the leave threshold"""
+    if count is None or threshold is None:
+        return STATE_UNKNOWN
+    if count <= threshold:
+        return STATE_LEAVE
+    if count <= threshold + near_margin:
+        return STATE_NEAR
+    return STATE_FAR
+
+
+def render_badge(label, state, scale=2):
+    """Render one badge with Pillow (the expensive, uncached path)"""
+    if not PILLOW_AVAILABLE:
+        raise RuntimeError("Pillow is required to render status badges")
+
+    size = BADGE_POINTS * scale
+    canvas_size = size * SUPERSAMPLE
+    img, draw = new_canvas(canvas_size)
+
+    # Background circle in the state color
+    margin = SUPERSAMPLE
+    draw.ellipse([margin, margin, canvas_size - margin, canvas_size - margin],
+                 fill=STATE_COLORS[state])
+
+    # Shrink the font for longer labels so "99+" still fits inside the circle
+    font_ratio = 0.62 if len(label) == 1 else 0.52 if len(label) == 2 else 0.4
+    font = load_font(int(canvas_size * font_ratio))
+    draw_centered_text(draw, canvas_size, label, font, fill=TEXT_COLOR)
+
+    return img.resize((size, size), Image.Resampling.LANCZOS)
+
+
+class BadgeRenderer:
+    """Memoizes badges per (count bucket, state, scale) in a bounded LRU cache
+
+    ``converter`` turns a Pillow image into whatever the UI needs (for example
+    an NSImage), so the conversion is cached together with the render.
+    """
+
+    def __init__(self, converter=None, max_entries=DEFAULT_CACHE_SIZE, near_margin=2):
+        self.converter = converter
+        self.max_entries = max_entries
+        self.near_margin = near_margin
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def badge_for(self, count, threshold, scale=2):
+        """Return the (converted) badge for a count, rendering it only on a cache miss"""
+        key = (count_bucket(count), badge_state(count, threshold, self.near_margin), scale)
+        badge = self._cache.get(key)
+        if badge is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return badge
+
+        self.misses += 1
+        badge = render_badge(*key)
+        if self.converter is not None:
+            badge = self.converter(badge)
+
+        self._cache[key] = badge
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return badge
+
+    def prerender(self, threshold, scale=2, counts=None):
+        """Warm the cache for the counts likely to be seen around a threshold"""
+        if counts is None:
+            counts = list(range(0, MAX_EXACT_COUNT + 2)) + [None]
+        for count in counts:
+            self.badge_for(count, threshold, scale)
+
+    def clear(self):
+        """Drop every cached badge"""
+        self._cache.clear()
+
+    def stats(self):
+        """Return cache counters"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Per-session statistics from captured monitor output.
+
+Scans log files holding the monitor's stdout (plain or .gz; directories
+are searched for *.log and *.log.gz) and rebuilds each monitoring session:
+peak and final count, duration, time from reaching the threshold to
+leaving, and leave attempts and failures (see leaver_core/log_stats.py).
+Files are spread over --workers processes. The sessions are written column
+by column to --output (.json.gz by default, or .csv) and summarized on
+screen.
+
+Usage:
+    python tools/analyze_logs.py logs/ --output sessions.json.gz
+    python tools/analyze_logs.py monitor-2026-*.log --workers 4 --output sessions.csv
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from leaver_core.log_stats import analyze_logs, summarize, write_columns
+
+
+def expand(paths):
+    """Files named on the command line, with directories replaced by their *.log and *.log.gz files"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(glob.glob(os.path.join(path, "*.log")) + glob.glob(os.path.join(path, "*.log.gz")))
+        else:
+            files.append(path)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-session statistics from captured monitor output")
+    parser.add_argument("logs", nargs="+", help="log files or directories")
+    parser.add_argument("--output", help="write the sessions to this file (.json, .json.gz or .csv)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes to spread the files over")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    files = expand(args.logs)
+    missing = [path for path in files if not os.path.isfile(path)]
+    if missing or not files:
+        print(f"❌ No such file: {missing[0]}" if missing else "❌ No log files found")
+        return 1
+
+    start = time.perf_counter()
+    rows = analyze_logs(files, workers=args.workers)
+    seconds = time.perf_counter() - start
+    megabytes = sum(os.path.getsize(path) for path in files) / 1024 / 1024
+    summary = summarize(rows)
+    if args.output:
+        write_columns(args.output, rows)
+
+    if args.json:
+        print(json.dumps(summary))
+        return 0
+    print(f"📊 {len(files)} file(s), {megabytes:.1f} MB in {seconds:.2f}s "
+          f"({megabytes / max(seconds, 1e-9):.0f} MB/s): {summary['sessions']} session(s), {summary['hours']} h")
+    for outcome, count in sorted(summary["outcomes"].items()):
+        print(f"   {outcome:<10} {count}")
+    print(f"   Leave attempts: {summary['attempts']} ({summary['failed']} failed)")
+    if summary["mean_threshold_to_leave"] is not None:
+        print(f"   Threshold to leave: mean {summary['mean_threshold_to_leave']}s, "
+              f"p95 {summary['p95_threshold_to_leave']}s")
+    if args.output:
+        print(f"   Wrote {len(rows)} session(s) to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
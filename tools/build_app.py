@@ -18,8 +18,24 @@ def check_dependencies():
         subprocess.check_call([sys.executable, "-m", "pip", "install", "pyinstaller"])
         print("✅ PyInstaller installed")
 
+def prepare_icon():
+    """Build icon assets incrementally and return the ICNS path from the manifest"""
+    try:
+        from build_icons import build_icon_assets, print_report, ROOT_DIR
+        manifest = build_icon_assets()
+        print_report(manifest)
+        if manifest["icns"]:
+            return os.path.join(ROOT_DIR, manifest["icns"])
+    except Exception as e:
+        print(f"⚠️  Skipping icon build: {e}")
+    
+    # Fall back to a hand-made icon next to the script
+    return "app_icon.icns" if os.path.exists("app_icon.icns") else None
+
 def create_app_bundle():
     """Create the macOS app bundle"""
+    icon_path = prepare_icon()
+    
     print("🔨 Building macOS app bundle...")
     
     # PyInstaller command for macOS app
@@ -31,7 +47,7 @@ def create_app_bundle():
         "--noconfirm",
         "--clean",
         "--osx-bundle-identifier", "com.achibukz.zoomautoleaver",
-        "--icon", "app_icon.icns" if os.path.exists("app_icon.icns") else None,
+        *(["--icon", icon_path] if icon_path else []),
         "--add-data", "config.json:." if os.path.exists("config.json") else None,
         "--hidden-import", "PyObjC",
         "--hidden-import", "AppKit",
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Incremental icon asset pipeline for Zoom Auto Leaver.
+
+Hashes every input of the app icon (drawing parameters, font file, source
+image and the drawing code itself) and skips regeneration when nothing
+changed. On a rebuild the size pyramid is built progressively (each size is
+downsampled from the next larger one) and PNG encoding runs across a process
+pool; @2x variants reuse the encoded file of the matching pixel size instead
+of being encoded again.
+
+Results are described in a manifest that the build scripts consume:
+    build_cache/icons/manifest.json
+
+Usage:
+    python3 tools/build_icons.py              # build if inputs changed
+    python3 tools/build_icons.py --force      # always rebuild
+    python3 tools/build_icons.py --bench      # report cold vs warm timings
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+sys.path.insert(0, ROOT_DIR)
+
+from icon_drawing import PILLOW_AVAILABLE, BRAND_COLOR, TEXT_COLOR, find_font_path
+
+if PILLOW_AVAILABLE:
+    from PIL import Image
+
+# Bump when the pipeline's output changes for the same inputs
+PIPELINE_VERSION = 1
+
+DEFAULT_OUTPUT_DIR = os.path.join("build_cache", "icons")
+MANIFEST_NAME = "manifest.json"
+ICON_NAME = "app_icon"
+
+BASE_SIZE = 1024
+
+# macOS iconset entries: (point size, scale) -> pixel size = point size * scale
+ICONSET_ENTRIES = [
+    (16, 1), (16, 2),
+    (32, 1), (32, 2),
+    (128, 1), (128, 2),
+    (256, 1), (256, 2),
+    (512, 1), (512, 2),
+]
+
+# Source files whose contents affect the rendered icon
+DRAWING_SOURCES = [
+    os.path.join(ROOT_DIR, "icon_drawing.py"),
+    os.path.join(ROOT_DIR, "tools", "create_icon.py"),
+]
+
+
+def iconset_filename(points, scale):
+    """Return the iconutil file name for an iconset entry"""
+    suffix = "@2x" if scale == 2 else ""
+    return f"icon_{points}x{points}{suffix}.png"
+
+
+def pyramid_sizes():
+    """Return the distinct pixel sizes needed by the iconset, largest first"""
+    return sorted({points * scale for points, scale in ICONSET_ENTRIES}, reverse=True)
+
+
+def _hash_file(path, digest):
+    """Feed a file's contents into digest (missing files hash as their path)"""
+    if path and os.path.exists(path):
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+    else:
+        digest.update(f"missing:{path}".encode())
+
+
+def compute_input_hash(text="ZL", subtitle="Auto Leaver", source_image=None):
+    """Hash everything that determines the generated icon"""
+    digest = hashlib.sha256()
+    params = {
+        "pipeline_version": PIPELINE_VERSION,
+        "text": text,
+        "subtitle": subtitle,
+        "background": list(BRAND_COLOR),
+        "foreground": list(TEXT_COLOR),
+        "sizes": pyramid_sizes(),
+        "source_image": os.path.basename(source_image) if source_image else None,
+    }
+    digest.update(json.dumps(params, sort_keys=True).encode())
+
+    if source_image:
+        _hash_file(source_image, digest)
+    else:
+        _hash_file(find_font_path(), digest)
+        for path in DRAWING_SOURCES:
+            _hash_file(path, digest)
+
+    return digest.hexdigest()
+
+
+def load_manifest(output_dir=DEFAULT_OUTPUT_DIR):
+    """Load the icon manifest, or None if it does not exist or is unreadable"""
+    path = os.path.join(ROOT_DIR, output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️  Ignoring unreadable icon manifest: {e}")
+        return None
+
+
+def _manifest_is_current(manifest, input_hash):
+    """Check that a manifest matches the inputs and that its files still exist"""
+    if not manifest or manifest.get("input_hash") != input_hash:
+        return False
+    for rel_path in manifest.get("files", {}):
+        if not os.path.exists(os.path.join(ROOT_DIR, rel_path)):
+            return False
+    return True
+
+
+def _render_base(text, subtitle, source_image):
+    """Render (or load) the full-size base image"""
+    if source_image:
+        img = Image.open(source_image).convert('RGBA')
+        if img.size != (BASE_SIZE, BASE_SIZE):
+            img = img.resize((BASE_SIZE, BASE_SIZE), Image.Resampling.LANCZOS)
+        return img
+
+    from create_icon import render_text_icon
+    return render_text_icon(BASE_SIZE, text=text, subtitle=subtitle)
+
+
+def _build_pyramid(base):
+    """Downsample progressively: each level is made from the next larger one"""
+    levels = {}
+    current = base
+    for size in pyramid_sizes():
+        if current.size[0] != size:
+            current = current.resize((size, size), Image.Resampling.LANCZOS)
+        levels[size] = current
+    return levels
+
+
+def _encode_level(size, mode, raw, path):
+    """Worker: encode one pyramid level to PNG and return its content hash"""
+    img = Image.frombytes(mode, (size, size), raw)
+    img.save(path, format='PNG', optimize=True)
+    with open(path, 'rb') as f:
+        return size, hashlib.sha256(f.read()).hexdigest()
+
+
+def build_icon_assets(output_dir=DEFAULT_OUTPUT_DIR, text="ZL", subtitle="Auto Leaver",
+                      source_image=None, force=False, jobs=None):
+    """Build the icon assets if their inputs changed; returns the manifest"""
+    if not PILLOW_AVAILABLE:
+        raise RuntimeError("Pillow is required to build icons (pip install pillow)")
+
+    timings = {}
+    started = time.perf_counter()
+
+    input_hash = compute_input_hash(text, subtitle, source_image)
+    timings["hash"] = time.perf_counter() - started
+
+    manifest = load_manifest(output_dir)
+    if not force and _manifest_is_current(manifest, input_hash):
+        manifest["cached"] = True
+        manifest["timings"] = {**timings, "total": time.perf_counter() - started}
+        return manifest
+
+    abs_output = os.path.join(ROOT_DIR, output_dir)
+    iconset_rel = os.path.join(output_dir, f"{ICON_NAME}.iconset")
+    iconset_dir = os.path.join(ROOT_DIR, iconset_rel)
+    if os.path.exists(iconset_dir):
+        shutil.rmtree(iconset_dir)
+    os.makedirs(iconset_dir)
+
+    stage = time.perf_counter()
+    base = _render_base(text, subtitle, source_image)
+    timings["render"] = time.perf_counter() - stage
+
+    stage = time.perf_counter()
+    levels = _build_pyramid(base)
+    timings["pyramid"] = time.perf_counter() - stage
+
+    # Encode each distinct pixel size once, in parallel
+    stage = time.perf_counter()
+    level_dir = os.path.join(abs_output, "levels")
+    os.makedirs(level_dir, exist_ok=True)
+    level_paths = {size: os.path.join(level_dir, f"{ICON_NAME}_{size}.png") for size in levels}
+    tasks = [(size, img.mode, img.tobytes(), level_paths[size]) for size, img in levels.items()]
+
+    if jobs == 1:
+        results = [_encode_level(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_encode_level, *zip(*tasks)))
+    level_hashes = dict(results)
+    timings["encode"] = time.perf_counter() - stage
+
+    # Lay out the iconset from the encoded levels (@2x shares its pixel size's file)
+    stage = time.perf_counter()
+    files = {}
+    for points, scale in ICONSET_ENTRIES:
+        pixels = points * scale
+        rel_path = os.path.join(iconset_rel, iconset_filename(points, scale))
+        shutil.copyfile(level_paths[pixels], os.path.join(ROOT_DIR, rel_path))
+        files[rel_path] = level_hashes[pixels]
+
+    png_rel = os.path.join(output_dir, f"{ICON_NAME}.png")
+    shutil.copyfile(level_paths[BASE_SIZE], os.path.join(ROOT_DIR, png_rel))
+    files[png_rel] = level_hashes[BASE_SIZE]
+    timings["iconset"] = time.perf_counter() - stage
+
+    # Convert to ICNS when iconutil is available (macOS only)
+    stage = time.perf_counter()
+    icns_rel = None
+    icns_failed = False
+    if shutil.which("iconutil"):
+        candidate = os.path.join(output_dir, f"{ICON_NAME}.icns")
+        result = subprocess.run(["iconutil", "-c", "icns", iconset_dir,
+                                 "-o", os.path.join(ROOT_DIR, candidate)],
+                                capture_output=True, text=True)
+        if result.returncode == 0:
+            icns_rel = candidate
+            with open(os.path.join(ROOT_DIR, candidate), 'rb') as f:
+                files[candidate] = hashlib.sha256(f.read()).hexdigest()
+        else:
+            icns_failed = True
+            print(f"⚠️  iconutil failed: {result.stderr.strip()}")
+    timings["icns"] = time.perf_counter() - stage
+    timings["total"] = time.perf_counter() - started
+
+    manifest = {
+        "pipeline_version": PIPELINE_VERSION,
+        "input_hash": input_hash,
+        "png": png_rel,
+        "icns": icns_rel,
+        "iconset": iconset_rel,
+        "files": files,
+        "built_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    manifest_path = os.path.join(abs_output, MANIFEST_NAME)
+    if not icns_failed:
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=4)
+    elif os.path.exists(manifest_path):
+        os.remove(manifest_path)  # Not cached, so the next build runs iconutil again
+
+    manifest["cached"] = False
+    manifest["icns_failed"] = icns_failed
+    manifest["timings"] = timings
+    return manifest
+
+
+def print_report(manifest, label=None):
+    """Print a short build report"""
+    status = "up to date (skipped)" if manifest["cached"] else "rebuilt"
+    prefix = f"{label}: " if label else ""
+    print(f"{prefix}Icons {status} in {manifest['timings']['total'] * 1000:.1f} ms")
+    for stage, seconds in manifest["timings"].items():
+        if stage != "total":
+            print(f"    {stage:<8} {seconds * 1000:8.1f} ms")
+    print(f"    png:  {manifest['png']}")
+    if manifest.get("icns_failed"):
+        print("    icns: not created (iconutil failed; not cached, the next build tries again)")
+    else:
+        print(f"    icns: {manifest['icns'] or 'not created (iconutil unavailable)'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build app icon assets incrementally")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR, help="output directory (relative to repo root)")
+    parser.add_argument("--source", help="use this image instead of drawing the text icon")
+    parser.add_argument("--text", default="ZL")
+    parser.add_argument("--subtitle", default="Auto Leaver")
+    parser.add_argument("--jobs", type=int, default=None, help="encoder processes (1 = no pool)")
+    parser.add_argument("--force", action="store_true", help="rebuild even if inputs are unchanged")
+    parser.add_argument("--bench", action="store_true", help="run a cold build followed by a warm build")
+    args = parser.parse_args()
+
+    if not PILLOW_AVAILABLE:
+        print("⚠️  Pillow not installed. Install with: pip install pillow")
+        return 1
+
+    options = dict(output_dir=args.output, text=args.text, subtitle=args.subtitle,
+                   source_image=args.source, jobs=args.jobs)
+
+    if args.bench:
+        print_report(build_icon_assets(force=True, **options), "Cold build")
+        print_report(build_icon_assets(**options), "Warm build")
+    else:
+        print_report(build_icon_assets(force=args.force, **options))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -32,6 +32,11 @@ echo "🧹 Cleaning previous builds..."
 rm -rf build dist __pycache__
 rm -f *.spec.bak
 
+# Build icon assets (skipped when unchanged; the cache survives the clean above)
+echo "🎨 Building icon assets..."
+pip install pillow
+python3 tools/build_icons.py || echo "⚠️  Icon build failed, using default icon"
+
 # Build the app
 echo "🔨 Building application..."
 pyinstaller zoom_auto_leaver_macos.spec
@@ -5,110 +5,58 @@ Uses Pillow to generate a basic icon for the app
 """
 
 import os
+import shutil
 import sys
 
-try:
+# Shared drawing helpers live next to the app scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from icon_drawing import (PILLOW_AVAILABLE, BRAND_COLOR, load_font, text_size,
+                          draw_centered_text, new_canvas)
+
+if PILLOW_AVAILABLE:
     from PIL import Image, ImageDraw, ImageFont
-    PILLOW_AVAILABLE = True
-except ImportError:
-    PILLOW_AVAILABLE = False
 
-def create_simple_icon():
-    """Create a simple text-based icon"""
-    if not PILLOW_AVAILABLE:
-        print("⚠️  Pillow not installed. Install with: pip install pillow")
-        return False
-    
-    # Create 1024x1024 icon (will be scaled down by macOS)
-    size = 1024
-    img = Image.new('RGBA', (size, size), (70, 130, 180, 255))  # Steel blue background
-    draw = ImageDraw.Draw(img)
-    
-    # Try to use a system font
-    try:
-        # Try different font paths for macOS
-        font_paths = [
-            "/System/Library/Fonts/Helvetica.ttc",
-            "/Library/Fonts/Arial.ttf",
-            "/System/Library/Fonts/Arial.ttf"
-        ]
-        
-        font = None
-        for font_path in font_paths:
-            if os.path.exists(font_path):
-                font = ImageFont.truetype(font_path, 200)
-                break
-        
-        if font is None:
-            font = ImageFont.load_default()
-            
-    except Exception:
-        font = ImageFont.load_default()
-    
-    # Draw "ZL" text (Zoom Leaver)
-    text = "ZL"
-    
-    # Get text bounding box
-    bbox = draw.textbbox((0, 0), text, font=font)
-    text_width = bbox[2] - bbox[0]
-    text_height = bbox[3] - bbox[1]
+def render_text_icon(size=1024, text="ZL", subtitle="Auto Leaver"):
+    """Render the text-based "ZL" app icon and return the image"""
+    img, draw = new_canvas(size, BRAND_COLOR)  # Steel blue background
+    scale = size / 1024
     
-    # Center the text
-    x = (size - text_width) // 2
-    y = (size - text_height) // 2 - 50  # Slightly above center
-    
-    # Draw text with white color
-    draw.text((x, y), text, font=font, fill=(255, 255, 255, 255))
+    # Draw "ZL" text (Zoom Leaver), slightly above center
+    font = load_font(max(1, int(200 * scale)))
+    x, y, text_width, text_height = draw_centered_text(draw, size, text, font,
+                                                       y_offset=int(-50 * scale))
     
     # Draw a small subtitle
-    try:
-        small_font = ImageFont.truetype(font_paths[0] if font_paths and os.path.exists(font_paths[0]) else None, 60)
-    except:
-        small_font = font
-    
-    subtitle = "Auto Leaver"
-    bbox2 = draw.textbbox((0, 0), subtitle, font=small_font)
-    subtitle_width = bbox2[2] - bbox2[0]
+    small_font = load_font(max(1, int(60 * scale)))
+    subtitle_width, _ = text_size(draw, subtitle, small_font)
     
     x2 = (size - subtitle_width) // 2
-    y2 = y + text_height + 40
+    y2 = y + text_height + int(40 * scale)
     
     draw.text((x2, y2), subtitle, font=small_font, fill=(255, 255, 255, 200))
+    return img
+
+def create_simple_icon():
+    """Create a simple text-based icon"""
+    if not PILLOW_AVAILABLE:
+        print("⚠️  Pillow not installed. Install with: pip install pillow")
+        return False
     
-    # Save as PNG first
-    img.save("app_icon.png")
+    # Incremental build: skipped entirely when the inputs are unchanged
+    from build_icons import build_icon_assets, print_report, ROOT_DIR
+    manifest = build_icon_assets()
+    print_report(manifest)
+    
+    # Keep the historical output locations next to the caller
+    shutil.copyfile(os.path.join(ROOT_DIR, manifest["png"]), "app_icon.png")
     print("✅ Created app_icon.png")
     
-    # Try to convert to ICNS (macOS format)
-    try:
-        # Create iconset directory
-        iconset_dir = "app_icon.iconset"
-        if os.path.exists(iconset_dir):
-            import shutil
-            shutil.rmtree(iconset_dir)
-        os.makedirs(iconset_dir)
-        
-        # Generate different sizes for iconset
-        sizes = [16, 32, 64, 128, 256, 512, 1024]
-        for size in sizes:
-            resized = img.resize((size, size), Image.Resampling.LANCZOS)
-            resized.save(f"{iconset_dir}/icon_{size}x{size}.png")
-            if size <= 512:  # Also create @2x versions for retina
-                resized.save(f"{iconset_dir}/icon_{size//2}x{size//2}@2x.png")
-        
-        # Convert to ICNS using iconutil (macOS command)
-        result = os.system(f"iconutil -c icns {iconset_dir}")
-        if result == 0:
-            print("✅ Created app_icon.icns")
-            # Clean up iconset
-            import shutil
-            shutil.rmtree(iconset_dir)
-            return True
-        else:
-            print("⚠️  Could not create ICNS file. PNG will be used instead.")
-            
-    except Exception as e:
-        print(f"⚠️  Error creating ICNS: {e}")
+    if manifest["icns"]:
+        shutil.copyfile(os.path.join(ROOT_DIR, manifest["icns"]), "app_icon.icns")
+        print("✅ Created app_icon.icns")
+    else:
+        print("⚠️  Could not create ICNS file. PNG will be used instead.")
     
     return True
 
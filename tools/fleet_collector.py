@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Run a fleet collector for Zoom Auto Leaver heartbeats.
+
+Point each machine's "fleet_collector" config key at this server
+(e.g. "http://10.0.0.5:8765"), then open /fleet for the summary.
+
+Usage: python tools/fleet_collector.py --bind 0.0.0.0 --port 8765
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from leaver_core.fleet import DEFAULT_HISTORY, DEFAULT_MAX_HOSTS, DEFAULT_PORT, FleetCollector, make_collector_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect heartbeats from Zoom Auto Leaver instances")
+    parser.add_argument("--bind", default="127.0.0.1", help="address to listen on (0.0.0.0 for the network)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on")
+    parser.add_argument("--history", type=int, default=DEFAULT_HISTORY, help="heartbeats kept per host")
+    parser.add_argument("--max-hosts", type=int, default=DEFAULT_MAX_HOSTS, help="hosts kept before evicting")
+    args = parser.parse_args()
+
+    collector = FleetCollector(args.history, args.max_hosts)
+    try:
+        server = make_collector_server(collector, args.bind, args.port)
+    except OSError as e:
+        print(f"Could not listen on {args.bind}:{args.port}: {e}")
+        return 1
+
+    host, port = server.server_address[:2]
+    print(f"🛰️  Fleet collector listening on http://{host}:{port} (summary at /fleet, Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    print(f"Received {collector.batches} batch(es) from {len(collector.hosts)} host(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
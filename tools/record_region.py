@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Record screen-region captures as PNG fixtures for the visual count fallback.
+
+Captures the configured screen_region (or --region) every few seconds, the
+same way the monitor does, so the captures can be replayed headless with
+benchmarks/replay_region.py. Captures are named "<ms>_<count>.png" with the
+count recognized while recording; correct any misread names before using
+them as fixtures, since the replay checks against them.
+
+Usage: python tools/record_region.py --region 1200 10 96 28 --interval 2 fixtures/meeting1
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from screen_region import PyAutoGUICapture, RegionCountSource, region_hash
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record screen-region PNG fixtures")
+    parser.add_argument("output_dir", help="directory for the PNG captures")
+    parser.add_argument("--region", type=int, nargs=4, metavar=("LEFT", "TOP", "WIDTH", "HEIGHT"),
+                        help="screen region (default: screen_region from config.json)")
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between captures")
+    parser.add_argument("--count", type=int, default=0, help="stop after this many captures (0: until Ctrl+C)")
+    parser.add_argument("--changes-only", action="store_true", help="only save captures whose hash changed")
+    args = parser.parse_args()
+
+    region = args.region
+    if not region and os.path.exists("config.json"):
+        with open("config.json") as f:
+            region = json.load(f).get("screen_region")
+    if not region:
+        print("No region given. Use --region LEFT TOP WIDTH HEIGHT or set screen_region in config.json")
+        return 1
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    capture = PyAutoGUICapture(region)
+    source = RegionCountSource(lambda: image)
+    print(f"📸 Recording region {tuple(region)} every {args.interval}s into {args.output_dir} (Ctrl+C to stop)")
+
+    saved = 0
+    last_hash = None
+    try:
+        while not args.count or saved < args.count:
+            image = capture()
+            key = region_hash(image)
+            if not args.changes_only or key != last_hash:
+                count = source.participant_count()
+                suffix = f"_{count}" if count is not None else ""
+                path = os.path.join(args.output_dir, f"{int(time.time() * 1000)}{suffix}.png")
+                image.save(path)
+                saved += 1
+                print(f"   {os.path.basename(path)}  (recognized: {count})")
+            last_hash = key
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+    print(f"Saved {saved} capture(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Compare leave settings over recorded participant-count traces.
+
+Replays trace files recorded with "trace_file" (see leaver_core/traces.py)
+through the leave rule for every combination of participant_threshold,
+check_interval and leave_confirmations, and lists the settings that leave
+soonest while staying under the false-leave and missed-leave limits. With
+--synthetic N it runs on N simulated meetings instead of recordings.
+
+Needs NumPy (pip install numpy).
+
+Usage:
+    python tools/threshold_sweep.py traces.csv --thresholds 1-10 --intervals 5,10,30
+    python tools/threshold_sweep.py --synthetic 10000 --thresholds 1-40 --confirmations 1-5 --output sweep.csv
+"""
+
+import argparse
+import csv
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from leaver_core.sweep import DEFAULT_CHUNK, sweep, synthetic_traces
+from leaver_core.traces import load_traces
+
+
+def parse_values(text, kind=int):
+    """Parse "1-5", "2,5,10" or a mix ("1-3,8") into a list"""
+    values = []
+    for part in text.split(","):
+        part = part.strip()
+        if "-" in part:
+            low, high = part.split("-", 1)
+            values.extend(range(int(low), int(high) + 1))
+        elif part:
+            values.append(kind(part))
+    return values
+
+
+def format_value(value):
+    return "-" if value is None else value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare leave settings over recorded participant-count traces")
+    parser.add_argument("traces", nargs="*", help="trace files (CSV or JSON) recorded with trace_file")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="N", help="use N simulated meetings instead")
+    parser.add_argument("--seed", type=int, default=1, help="seed for --synthetic")
+    parser.add_argument("--thresholds", default="1-10", help='participant thresholds, e.g. "1-10" or "2,5"')
+    parser.add_argument("--intervals", default="5,10,15,30", help="check intervals in seconds")
+    parser.add_argument("--confirmations", default="1-3", help="leave confirmations")
+    parser.add_argument("--workers", type=int, default=1, help="processes to spread the traces over")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK, help="traces per NumPy pass")
+    parser.add_argument("--max-false-rate", type=float, default=0.01, help="false leaves allowed per trace")
+    parser.add_argument("--max-missed-rate", type=float, default=0.05, help="missed leaves allowed per trace")
+    parser.add_argument("--top", type=int, default=10, help="settings to list")
+    parser.add_argument("--output", help="write every setting's results to this CSV file")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        traces = synthetic_traces(args.synthetic, args.seed)
+    elif args.traces:
+        traces = list(load_traces(args.traces).values())
+    else:
+        parser.error("give trace files or --synthetic N")
+    if not traces:
+        print("No traces with at least two counts found")
+        return 1
+
+    try:
+        result = sweep(traces, parse_values(args.thresholds), parse_values(args.intervals, float),
+                       parse_values(args.confirmations), workers=args.workers, chunk_size=args.chunk_size)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+    rows = result.rows()
+    print(f"📊 Evaluated {len(traces)} traces x {result.settings} settings in {result.seconds:.2f}s")
+
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"   Wrote {len(rows)} settings to {args.output}")
+
+    good = [row for row in rows if row["false_rate"] <= args.max_false_rate
+            and row["missed_rate"] <= args.max_missed_rate and row["mean_delay"] is not None]
+    found = bool(good)
+    if found:
+        good.sort(key=lambda row: (row["mean_delay"], row["polls_per_hour"]))
+        print(f"\nFastest settings under {args.max_false_rate:.1%} false and {args.max_missed_rate:.1%} missed leaves:")
+    else:
+        print(f"\n❌ No setting stays under {args.max_false_rate:.1%} false and {args.max_missed_rate:.1%} "
+              f"missed leaves; closest settings:")
+        good = sorted(rows, key=lambda row: (row["false_rate"] + row["missed_rate"], row["mean_delay"] or 0))
+    print(f"{'threshold':>9} {'interval':>8} {'confirm':>7} {'false':>7} {'missed':>7} "
+          f"{'delay s':>8} {'p95 s':>6} {'polls/h':>8}")
+    for row in good[:args.top]:
+        print(f"{row['threshold']:>9} {row['interval']:>8g} {row['confirmations']:>7} {row['false_rate']:>7.2%} "
+              f"{row['missed_rate']:>7.2%} {format_value(row['mean_delay']):>8} {format_value(row['p95_delay']):>6} "
+              f"{row['polls_per_hour']:>8.1f}")
+    return 0 if found else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Dummy Zoom window for testing the Linux/X11 backend under Xvfb.
+
+Creates a top-level window whose _NET_WM_NAME / WM_NAME can be changed on the
+fly, so the event-driven window source can be exercised without Zoom.
+
+Usage:
+    Xvfb :99 &
+    DISPLAY=:99 python3 tools/x11_dummy_window.py --count 12 --step -1 --interval 2
+    DISPLAY=:99 python3 tools/x11_dummy_window.py --stdin   # one title per input line
+"""
+
+import argparse
+import sys
+import time
+
+from Xlib import X, Xatom, display as xdisplay
+
+DEFAULT_TITLE = "Zoom Meeting"
+
+
+def participants_title(count):
+    """Title Zoom shows on the participants window"""
+    return f"Participants ({count})"
+
+
+class DummyZoomWindow:
+    """A mapped X11 window with a settable title"""
+
+    def __init__(self, title=DEFAULT_TITLE, display_name=None):
+        self.display = xdisplay.Display(display_name)
+        screen = self.display.screen()
+        self.NET_WM_NAME = self.display.intern_atom('_NET_WM_NAME')
+        self.UTF8_STRING = self.display.intern_atom('UTF8_STRING')
+        self.window = screen.root.create_window(0, 0, 320, 200, 0, screen.root_depth,
+                                                X.InputOutput, X.CopyFromParent,
+                                                background_pixel=screen.white_pixel)
+        self.set_title(title)
+        self.window.map()
+        self.display.sync()
+
+    @property
+    def id(self):
+        return self.window.id
+
+    def set_title(self, title):
+        """Set both the EWMH and the legacy title, then flush to the server"""
+        encoded = title.encode('utf-8')
+        self.window.change_property(self.NET_WM_NAME, self.UTF8_STRING, 8, encoded)
+        self.window.change_property(Xatom.WM_NAME, Xatom.STRING, 8, encoded)
+        self.display.flush()
+
+    def close(self):
+        """Destroy the window and drop the connection"""
+        self.window.destroy()
+        self.display.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dummy Zoom window for X11 backend tests")
+    parser.add_argument("--display", help="X display (default: $DISPLAY)")
+    parser.add_argument("--title", default=DEFAULT_TITLE, help="initial window title")
+    parser.add_argument("--count", type=int, help="start a 'Participants (N)' countdown at N")
+    parser.add_argument("--step", type=int, default=-1, help="change in count per interval")
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between title changes")
+    parser.add_argument("--stdin", action="store_true", help="read titles from stdin, one per line")
+    args = parser.parse_args()
+
+    title = participants_title(args.count) if args.count is not None else args.title
+    window = DummyZoomWindow(title, args.display)
+    print(f"🪟 Dummy window 0x{window.id:x}: {title}")
+
+    try:
+        if args.stdin:
+            for line in sys.stdin:
+                title = line.strip()
+                if title:
+                    window.set_title(title)
+                    print(f"   -> {title}")
+        elif args.count is not None:
+            count = args.count
+            while count >= 0:
+                time.sleep(args.interval)
+                count += args.step
+                window.set_title(participants_title(count))
+                print(f"   -> {participants_title(count)}")
+        else:
+            while True:
+                time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        window.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,17 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+import json
+import os
+
 block_cipher = None
 
+# App icon produced by tools/build_icons.py (see its manifest)
+app_icon = None
+icon_manifest = os.path.join('build_cache', 'icons', 'manifest.json')
+if os.path.exists(icon_manifest):
+    with open(icon_manifest) as f:
+        app_icon = json.load(f).get('icns')
+
 a = Analysis(
     ['zoom_auto_leaver_macos.py'],
     pathex=[],
@@ -57,7 +67,7 @@ exe = EXE(
 app = BUNDLE(
     exe,
     name='Zoom Auto Leaver.app',
-    icon=None,
+    icon=app_icon,
     bundle_identifier='com.achibukz.zoomautoleaver',
     info_plist={
         'CFBundleName': 'Zoom Auto Leaver',
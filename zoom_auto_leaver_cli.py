@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Zoom Auto Leaver - non-interactive command line
+
+Same as "python -m leaver_core"; run with --help for the subcommands.
+"""
+
+import sys
+
+from leaver_core.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
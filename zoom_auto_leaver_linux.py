@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Zoom Auto Leaver - Linux (X11) Version
+Automatically leaves Zoom meetings when participant count drops below threshold.
+Window titles arrive as X11 property-change events; leaving uses XTEST keys.
+"""
+
+try:
+    from leaver_core.platforms.linux_x11 import X11WindowSource
+except ImportError as e:
+    print(f"Required dependencies not installed: {e}")
+    print("Please run: pip install -r requirements_linux.txt")
+    exit(1)
+
+from leaver_core.config import LeaverConfig
+from leaver_core.configure import interactive_configure
+from leaver_core.monitor import Monitor, log_message
+from leaver_core.fleet import create_heartbeat_agent
+from leaver_core.hooks import create_hook_dispatcher
+from leaver_core.metrics_server import start_metrics_server
+from leaver_core.profiler import start_profiler
+from leaver_core.zoom_log import create_log_source
+from screen_region import create_region_source
+
+class ZoomAutoLeaverLinux:
+    def __init__(self, config_file="config.json", display_name=None):
+        self.config_file = config_file
+        self.config = LeaverConfig(config_file)
+        self.load_config()
+        self.adapter = X11WindowSource(self.log, display_name)
+        self.monitor = Monitor(self.adapter, self.config,
+                               fallback_source=[create_log_source(self.config, self.log),
+                                                create_region_source(self.config, self.log)],
+                               heartbeat=create_heartbeat_agent(self.config, self.log),
+                               hooks=create_hook_dispatcher(self.config, self.log))
+        self.metrics_server = start_metrics_server(self.config, self.monitor, self.log)
+        self.profiler = start_profiler(self.config, self.log)
+
+    @property
+    def running(self):
+        return self.monitor.running
+
+    @running.setter
+    def running(self, value):
+        self.monitor.running = value
+
+    def load_config(self):
+        """Load configuration from JSON file"""
+        self.config.load()
+
+    def save_config(self):
+        """Save current configuration to JSON file"""
+        self.config.save()
+
+    def log(self, message):
+        """Log activity if enabled"""
+        log_message(self.config, message)
+
+    def find_zoom_windows(self):
+        """Find all Zoom-related windows"""
+        return self.adapter.zoom_windows()
+
+    def get_participant_count_from_windows(self):
+        """Extract participant count from any Zoom window title"""
+        return self.monitor.participant_count(self.find_zoom_windows())
+
+    def leave_zoom_meeting(self):
+        """Execute the sequence to leave Zoom meeting"""
+        return self.adapter.leave()
+
+    def monitor_meeting(self):
+        """Main monitoring loop"""
+        self.monitor.run()
+
+    def stop_monitoring(self):
+        """Stop the monitoring loop"""
+        self.monitor.stop()
+
+    def configure(self):
+        """Interactive configuration"""
+        interactive_configure(self.config, "Zoom Auto Leaver (Linux)")
+
+def main():
+    try:
+        auto_leaver = ZoomAutoLeaverLinux()
+    except Exception as e:
+        print(f"❌ Could not connect to the X server: {e}")
+        print("   Zoom Auto Leaver for Linux needs an X11 (or XWayland) session with DISPLAY set.")
+        return
+
+    # Auto-start if configured
+    if auto_leaver.config.get('auto_start', False):
+        auto_leaver.monitor_meeting()
+        return
+
+    # Interactive menu
+    while True:
+        print("\n=== Zoom Auto Leaver (Linux) ===")
+        print("1. Start monitoring")
+        print("2. Configure settings")
+        print("3. Test Zoom window detection")
+        print("4. Exit")
+
+        choice = input("\nEnter your choice (1-4): ").strip()
+
+        if choice == '1':
+            try:
+                auto_leaver.monitor_meeting()
+            except KeyboardInterrupt:
+                print("\nMonitoring stopped.")
+
+        elif choice == '2':
+            auto_leaver.configure()
+
+        elif choice == '3':
+            all_windows = auto_leaver.adapter.list_windows()
+            print(f"Found {len(all_windows)} titled window(s)")
+
+            zoom_windows = auto_leaver.find_zoom_windows()
+            print(f"\nAfter filtering, found {len(zoom_windows)} Zoom window(s):")
+            for i, window in enumerate(zoom_windows):
+                print(f"  {i+1}. '{window.title}'")
+
+            participant_count = auto_leaver.get_participant_count_from_windows()
+            if participant_count is not None:
+                print(f"\nCurrent participant count: {participant_count}")
+            else:
+                print("\nCould not determine participant count from window titles")
+
+        elif choice == '4':
+            print("Goodbye!")
+            break
+
+        else:
+            print("Invalid choice. Please try again.")
+
+if __name__ == "__main__":
+    main()